@@ -1,6 +1,7 @@
 # Copyright (c) 2019 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
-from typing import List
+import os
+from typing import List, Optional
 
 from UM.Application import Application
 from UM.Job import Job
@@ -9,6 +10,7 @@ from UM.Message import Message
 from UM.Scene.SceneNode import SceneNode
 from UM.i18n import i18nCatalog
 from cura.Arranging.GridArrange import GridArrange
+from cura.Arranging.MultiBuildPlateArrange import MultiBuildPlateArrange
 from cura.Arranging.Nest2DArrange import Nest2DArrange
 
 i18n_catalog = i18nCatalog("cura")
@@ -16,12 +18,22 @@ i18n_catalog = i18nCatalog("cura")
 
 class ArrangeObjectsJob(Job):
     def __init__(self, nodes: List[SceneNode], fixed_nodes: List[SceneNode], min_offset = 8,
-                *, grid_arrange: bool = False) -> None:
+                *, grid_arrange: bool = False, multi_build_plate: bool = False) -> None:
         super().__init__()
         self._nodes = nodes
         self._fixed_nodes = fixed_nodes
         self._min_offset = min_offset
         self._grid_arrange = grid_arrange
+        self._multi_build_plate = multi_build_plate
+        self._arranger: Optional[Nest2DArrange] = None
+        self._abort_requested = False
+
+    def abort(self) -> None:
+        """Stop arranging. The objects are left where they are."""
+
+        self._abort_requested = True
+        if self._arranger is not None:
+            self._arranger.abort()
 
     def run(self):
         found_solution_for_all = False
@@ -30,24 +42,35 @@ class ArrangeObjectsJob(Job):
                                  dismissable = False,
                                  progress = 0,
                                  title = i18n_catalog.i18nc("@info:title", "Finding Location"))
-        status_message.show()
 
-        if self._grid_arrange:
+        if self._multi_build_plate:
+            arranger = MultiBuildPlateArrange(self._nodes, Application.getInstance().getBuildVolume(), self._fixed_nodes)
+        elif self._grid_arrange:
             arranger = GridArrange(self._nodes, Application.getInstance().getBuildVolume(), self._fixed_nodes)
         else:
             arranger = Nest2DArrange(self._nodes, Application.getInstance().getBuildVolume(), self._fixed_nodes,
-                                     factor=1000)
+                                     factor=1000, max_workers=(os.cpu_count() or 1) - 1,
+                                     progress_callback=lambda progress: status_message.setProgress(progress * 100))
+            status_message.addAction("cancel", i18n_catalog.i18nc("@action:button", "Cancel"), "[no_icon]", "[no_description]")
+            status_message.actionTriggered.connect(self._onMessageActionTriggered)
+            self._arranger = arranger
+            if self._abort_requested:
+                arranger.abort()
+        status_message.show()
 
         found_solution_for_all = False
         try:
-            found_solution_for_all = arranger.arrange(only_if_full_success = True)
+            grouped_operation, not_fit_count = arranger.createGroupOperationForArrange()
+            found_solution_for_all = not_fit_count == 0
+            if found_solution_for_all and not self._abort_requested:
+                grouped_operation.push()
         except:  # If the thread crashes, the message should still close
             Logger.logException("e",
                                 "Unable to arrange the objects on the buildplate. The arrange algorithm has crashed.")
 
         status_message.hide()
 
-        if not found_solution_for_all:
+        if not found_solution_for_all and not self._abort_requested:
             no_full_solution_message = Message(
                     i18n_catalog.i18nc("@info:status",
                                        "Unable to find a location within the build volume for all objects"),
@@ -56,3 +79,7 @@ class ArrangeObjectsJob(Job):
             no_full_solution_message.show()
 
         self.finished.emit(self)
+
+    def _onMessageActionTriggered(self, message: Message, action: str) -> None:
+        if action == "cancel":
+            self.abort()
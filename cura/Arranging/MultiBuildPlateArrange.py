@@ -0,0 +1,155 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import math
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from UM.Application import Application
+from UM.Logger import Logger
+from UM.Math.Matrix import Matrix
+from UM.Math.Quaternion import Quaternion
+from UM.Math.Vector import Vector
+from UM.Operations.AddSceneNodeOperation import AddSceneNodeOperation
+from UM.Operations.GroupedOperation import GroupedOperation
+from UM.Operations.RotateOperation import RotateOperation
+from UM.Operations.TranslateOperation import TranslateOperation
+from UM.Scene.Iterator.BreadthFirstIterator import BreadthFirstIterator
+from cura.Arranging.Arranger import Arranger
+from cura.Arranging.RectanglePacker import Bounds, PackedRectangle, packOnBuildPlates
+from cura.Operations.SetBuildPlateNumberOperation import SetBuildPlateNumberOperation
+from cura.Scene.SpatialIndex import SpatialIndex
+
+if TYPE_CHECKING:
+    from UM.Scene.SceneNode import SceneNode
+    from cura.BuildVolume import BuildVolume
+
+
+class MultiBuildPlateArrange(Arranger):
+    def __init__(self,
+                 nodes_to_arrange: List["SceneNode"],
+                 build_volume: "BuildVolume",
+                 fixed_nodes: Optional[List["SceneNode"]] = None,
+                 *,
+                 spacing: float = 1.5,
+                 lock_rotation: bool = False):
+        """Packs objects on as few build plates as possible.
+
+        The objects are packed by the bounding boxes of their convex hulls, which is fast enough for thousands of
+        objects. Every object that fits on a build plate gets one, starting from build plate 0.
+
+        :param nodes_to_arrange: The list of nodes that need to be moved.
+        :param build_volume: The build volume that we want to place the nodes in. It gets size & disallowed areas from this.
+        :param fixed_nodes: List of nodes that should not be moved. They are kept out of the way of on their own build
+                            plate.
+        :param spacing: The minimum distance between objects, in mm.
+        :param lock_rotation: If set to true the orientation of the objects will remain the same. Otherwise objects may be
+                              turned by 90 degrees.
+        """
+        super().__init__()
+        self._nodes_to_arrange = nodes_to_arrange
+        self._build_volume = build_volume
+        self._fixed_nodes = fixed_nodes if fixed_nodes is not None else []
+        self._spacing = spacing
+        self._lock_rotation = lock_rotation
+
+    def getBuildPlateSize(self) -> Tuple[float, float]:
+        """The size of the part of a build plate that objects are placed on, in mm."""
+
+        edge_disallowed_size = self._build_volume.getEdgeDisallowedSize()
+        width = self._build_volume.getWidth() - edge_disallowed_size * 2
+        depth = self._build_volume.getDepth() - edge_disallowed_size * 2
+        if self._build_volume.getShape() == "elliptic":
+            # Only use the largest rectangle that fits on the disc.
+            width /= math.sqrt(2)
+            depth /= math.sqrt(2)
+        return width, depth
+
+    def findNodePlacement(self) -> List[Optional[PackedRectangle]]:
+        """Find the build plate and place on it of every node.
+
+        :return: For every node to arrange where its convex hull is placed, including the spacing around it, in
+        coordinates from the front left corner of the build plate. None if the node has no convex hull or doesn't fit.
+        """
+
+        plate_width, plate_depth = self.getBuildPlateSize()
+        sizes = []  # type: List[Tuple[float, float]]
+        arranged_indices = []  # type: List[int]
+        for index, node in enumerate(self._nodes_to_arrange):
+            bounds = self._getHullBounds(node)
+            if bounds is None:
+                Logger.log("w", "Object {} cannot be arranged because it has no convex hull.".format(node.getName()))
+                continue
+            sizes.append((bounds[2] - bounds[0] + self._spacing, bounds[3] - bounds[1] + self._spacing))
+            arranged_indices.append(index)
+
+        obstacles: Dict[int, List[Bounds]] = {}
+        for node in self._fixed_nodes:
+            bounds = self._getHullBounds(node)
+            build_plate = node.callDecoration("getBuildPlateNumber")
+            if bounds is not None and build_plate is not None and build_plate >= 0:
+                obstacles.setdefault(build_plate, []).append(self._toPlateCoordinates(bounds))
+        disallowed_areas = []  # type: List[Bounds]
+        for area in self._build_volume.getDisallowedAreas():
+            bounds = SpatialIndex.getPolygonBounds([area])
+            if bounds is not None:
+                disallowed_areas.append(self._toPlateCoordinates(bounds))
+        packed = packOnBuildPlates(sizes, plate_width, plate_depth, obstacles = obstacles, common_obstacles = disallowed_areas,
+                                   allow_rotation = not self._lock_rotation)
+
+        result = [None] * len(self._nodes_to_arrange)  # type: List[Optional[PackedRectangle]]
+        for index, placement in zip(arranged_indices, packed):
+            result[index] = placement
+        return result
+
+    def createGroupOperationForArrange(self, add_new_nodes_in_scene: bool = False) -> Tuple[GroupedOperation, int]:
+        scene_root = Application.getInstance().getController().getScene().getRoot()
+        placements = self.findNodePlacement()
+        plate_width, plate_depth = self.getBuildPlateSize()
+
+        not_fit_count = 0
+        grouped_operation = GroupedOperation()
+        for node, placement in zip(self._nodes_to_arrange, placements):
+            if add_new_nodes_in_scene:
+                grouped_operation.addOperation(AddSceneNodeOperation(node, scene_root))
+
+            bounds = self._getHullBounds(node)
+            if bounds is None:
+                continue  # Can't be arranged, so leave it where it is.
+            if placement is None:
+                # We didn't find a spot
+                grouped_operation.addOperation(
+                    TranslateOperation(node, Vector(200, node.getWorldPosition().y, -not_fit_count * 20), set_position = True))
+                not_fit_count += 1
+                continue
+
+            for child_node in BreadthFirstIterator(node):
+                grouped_operation.addOperation(SetBuildPlateNumberOperation(child_node, placement.build_plate))
+
+            # Offset of the middle of the hull from the position of the node, which is what the node rotates around.
+            position = node.getWorldPosition()
+            offset_x = (bounds[0] + bounds[2]) / 2 - position.x
+            offset_z = (bounds[1] + bounds[3]) / 2 - position.z
+            width = bounds[2] - bounds[0] + self._spacing
+            depth = bounds[3] - bounds[1] + self._spacing
+            if placement.rotated:
+                rotation_matrix = Matrix()
+                rotation_matrix.setByRotationAxis(math.pi / 2, Vector(0, -1, 0))
+                grouped_operation.addOperation(RotateOperation(node, Quaternion.fromMatrix(rotation_matrix)))
+                offset_x, offset_z = -offset_z, offset_x
+                width, depth = depth, width
+
+            target_x = placement.x + width / 2 - plate_width / 2
+            target_z = placement.y + depth / 2 - plate_depth / 2
+            grouped_operation.addOperation(TranslateOperation(node, Vector(target_x - offset_x - position.x, 0, target_z - offset_z - position.z)))
+
+        return grouped_operation, not_fit_count
+
+    def _toPlateCoordinates(self, bounds: Bounds) -> Bounds:
+        """Convert bounds in scene coordinates to coordinates from the front left corner of the build plate."""
+
+        plate_width, plate_depth = self.getBuildPlateSize()
+        return bounds[0] + plate_width / 2, bounds[1] + plate_depth / 2, bounds[2] + plate_width / 2, bounds[3] + plate_depth / 2
+
+    @staticmethod
+    def _getHullBounds(node: "SceneNode") -> Optional[Bounds]:
+        return SpatialIndex.getPolygonBounds([node.callDecoration("getConvexHull")])
@@ -1,9 +1,11 @@
 # Copyright (c) 2020 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
+import math
+import threading
 import numpy
 from pynest2d import Point, Box, Item, NfpConfig, nest
-from typing import List, TYPE_CHECKING, Optional, Tuple
+from typing import Any, Callable, List, NamedTuple, TYPE_CHECKING, Optional, Sequence, Tuple
 
 from UM.Application import Application
 from UM.Decorators import deprecated
@@ -17,20 +19,166 @@ from UM.Operations.GroupedOperation import GroupedOperation
 from UM.Operations.RotateOperation import RotateOperation
 from UM.Operations.TranslateOperation import TranslateOperation
 from cura.Arranging.Arranger import Arranger
+from cura.Utils.WorkerProcesses import canForkWorkerProcesses, getForkContext
 
 if TYPE_CHECKING:
     from UM.Scene.SceneNode import SceneNode
     from cura.BuildVolume import BuildVolume
 
 
+class ArrangementResult(NamedTuple):
+    """The outcome of nesting the objects with one starting strategy and set of rotations."""
+
+    starting_point: Any  # The NfpConfig.Alignment that the nesting started from.
+    rotations: Optional[List[float]]  # The rotations that were tried for the objects, or None for the default ones.
+    num_bins: int  # The number of build plates needed to fit all objects.
+    footprint: float  # The area of the bounding box around the objects on the first build plate, in mm².
+    placements: List[Tuple[int, float, int, int]]  # Bin, rotation and translation of each object, in nesting units.
+
+
+def fewestBinsThenSmallestFootprint(result: ArrangementResult) -> Tuple[int, float]:
+    """The default objective of the arrangement: fit everything on as few build plates as possible, as compact as possible."""
+
+    return result.num_bins, result.footprint
+
+
+class ArrangedItem:
+    """The placement of an object that was found in a worker process, with the same interface as a libnest2d Item."""
+
+    def __init__(self, bin_id: int, rotation: float, translation_x: int, translation_y: int) -> None:
+        self._bin_id = bin_id
+        self._rotation = rotation
+        self._translation = Point(translation_x, translation_y)
+
+    def binId(self) -> int:
+        return self._bin_id
+
+    def rotation(self) -> float:
+        return self._rotation
+
+    def translation(self) -> Point:
+        return self._translation
+
+    def isFixed(self) -> bool:
+        return False
+
+
+class _NestProblem(NamedTuple):
+    """Everything that is needed to nest the objects, as plain data so that worker processes can use it."""
+
+    polygons_nodes_to_arrange: List[numpy.ndarray]  # Points of the convex hulls, in nesting units.
+    polygons_disallowed_areas: List[numpy.ndarray]
+    polygons_fixed_nodes: List[numpy.ndarray]
+    bin_width: int
+    bin_depth: int
+    spacing: int
+    factor: int
+
+
+def _toPoints(polygon: numpy.ndarray) -> List[Point]:
+    return [Point(x, y) for x, y in polygon.tolist()]
+
+
+def _nest(problem: _NestProblem, starting_point: Any, rotations: Optional[List[float]]) -> Tuple[int, List[Item]]:
+    """Nest the objects with one strategy.
+
+    :return: The number of bins that was needed, and the items of the objects to arrange.
+    """
+
+    # Add all the items we want to arrange
+    node_items = []
+    for polygon in problem.polygons_nodes_to_arrange:
+        node_items.append(Item(_toPoints(polygon)))
+
+    for polygon in problem.polygons_disallowed_areas:
+        disallowed_area = Item(_toPoints(polygon))
+        disallowed_area.markAsDisallowedAreaInBin(0)
+        node_items.append(disallowed_area)
+
+    for polygon in problem.polygons_fixed_nodes:
+        item = Item(_toPoints(polygon))
+        item.markAsFixedInBin(0)
+        node_items.append(item)
+
+    config = NfpConfig()
+    config.accuracy = 1.0
+    config.alignment = NfpConfig.Alignment.DONT_ALIGN
+    config.starting_point = starting_point
+    if rotations is not None:
+        config.rotations = rotations
+
+    num_bins = nest(node_items, Box(problem.bin_width, problem.bin_depth), problem.spacing, config)
+
+    # Strip the fixed items (previously placed) and the disallowed areas from the results again.
+    node_items = list(filter(lambda item: not item.isFixed(), node_items))
+    return num_bins, node_items
+
+
+def _getPlacements(node_items: Sequence[Any]) -> List[Tuple[int, float, int, int]]:
+    return [(item.binId(), item.rotation(), item.translation().x(), item.translation().y()) for item in node_items]
+
+
+def _getFootprint(problem: _NestProblem, placements: List[Tuple[int, float, int, int]]) -> float:
+    """Get the area of the bounding box around the objects on the first build plate, as placed, in mm²."""
+
+    placed_points = []
+    for polygon, (bin_id, rotation, translation_x, translation_y) in zip(problem.polygons_nodes_to_arrange, placements):
+        if bin_id != 0:
+            continue
+        cos_rotation, sin_rotation = math.cos(rotation), math.sin(rotation)
+        rotation_matrix = numpy.array([[cos_rotation, sin_rotation], [-sin_rotation, cos_rotation]])
+        placed_points.append(polygon @ rotation_matrix + numpy.array([translation_x, translation_y]))
+    if not placed_points:
+        return 0.0
+    all_points = numpy.concatenate(placed_points)
+    size = (all_points.max(axis = 0) - all_points.min(axis = 0)) / problem.factor
+    return float(size[0] * size[1])
+
+
+# The problem and the strategies that a worker process nests the objects with.
+_worker_problem = None  # type: Optional[_NestProblem]
+_worker_candidates = []  # type: List[Tuple[Any, Optional[List[float]]]]
+
+
+def _initializeWorker(problem: _NestProblem, candidates: List[Tuple[Any, Optional[List[float]]]]) -> None:
+    global _worker_problem, _worker_candidates
+    _worker_problem = problem
+    _worker_candidates = candidates
+
+
+def _nestInWorker(index: int) -> Tuple[int, int, float, List[Tuple[int, float, int, int]]]:
+    """Nest the objects with one of the strategies.
+
+    :return: The index of the strategy, the number of bins that was needed, the footprint and the placements.
+    """
+
+    assert _worker_problem is not None
+    starting_point, rotations = _worker_candidates[index]
+    num_bins, node_items = _nest(_worker_problem, starting_point, rotations)
+    placements = _getPlacements(node_items)
+    return index, num_bins, _getFootprint(_worker_problem, placements), placements
+
+
 class Nest2DArrange(Arranger):
+    StartingPoints = [NfpConfig.Alignment.CENTER,
+                      NfpConfig.Alignment.BOTTOM_LEFT,
+                      NfpConfig.Alignment.BOTTOM_RIGHT,
+                      NfpConfig.Alignment.TOP_LEFT,
+                      NfpConfig.Alignment.TOP_RIGHT]
+    # The sets of rotations to try the objects in, with None for the default of libnest2d (in steps of 90 degrees).
+    # Only the first set is tried when there are no worker processes.
+    RotationSets = [None, [step * math.pi / 4 for step in range(8)]]
+
     def __init__(self,
                  nodes_to_arrange: List["SceneNode"],
                  build_volume: "BuildVolume",
                  fixed_nodes: Optional[List["SceneNode"]] = None,
                  *,
                  factor: int = 10000,
-                 lock_rotation: bool = False):
+                 lock_rotation: bool = False,
+                 max_workers: int = 0,
+                 objective: Callable[[ArrangementResult], Any] = fewestBinsThenSmallestFootprint,
+                 progress_callback: Optional[Callable[[float], None]] = None):
         """
         :param nodes_to_arrange: The list of nodes that need to be moved.
         :param build_volume: The build volume that we want to place the nodes in. It gets size & disallowed areas from this.
@@ -38,6 +186,11 @@ class Nest2DArrange(Arranger):
                             are placed.
         :param factor: The library that we use is int based. This factor defines how accuracte we want it to be.
         :param lock_rotation: If set to true the orientation of the object will remain the same
+        :param max_workers: The maximum number of worker processes to try all strategies in. By default zero, which tries
+                            the strategies one by one in this process, until one fits all objects.
+        :param objective: Gives the key to sort the results of the strategies by, if they are tried in worker processes.
+                          The result with the lowest key is used.
+        :param progress_callback: Called with the fraction of the strategies that were tried.
         """
         super().__init__()
         self._nodes_to_arrange = nodes_to_arrange
@@ -45,14 +198,33 @@ class Nest2DArrange(Arranger):
         self._fixed_nodes = fixed_nodes
         self._factor = factor
         self._lock_rotation = lock_rotation
+        if not canForkWorkerProcesses():
+            max_workers = 0
+        self._max_workers = max_workers
+        self._objective = objective
+        self._progress_callback = progress_callback
+        self._abort_requested = threading.Event()
+
+    def abort(self) -> None:
+        """Stop trying strategies. If no strategy was tried yet, no object is moved."""
+
+        self._abort_requested.set()
+
+    def isAborted(self) -> bool:
+        return self._abort_requested.is_set()
 
     def findNodePlacement(self) -> Tuple[bool, List[Item]]:
+        """Find where to place the objects on the build plate.
+
+        :return: Whether all objects fit on the build plate, and the placement of each object. The placements are
+        libnest2d Items, or ArrangedItems if they were found in a worker process.
+        """
+
         spacing = int(1.5 * self._factor)  # 1.5mm spacing.
 
         edge_disallowed_size = self._build_volume.getEdgeDisallowedSize()
         machine_width = self._build_volume.getWidth() - (edge_disallowed_size * 2)
         machine_depth = self._build_volume.getDepth() - (edge_disallowed_size * 2)
-        build_plate_bounding_box = Box(int(machine_width * self._factor), int(machine_depth * self._factor))
 
         # Use a tiny margin for the build_plate_polygon (the nesting doesn't like overlapping disallowed areas)
         half_machine_width = 0.5 * machine_width - 1
@@ -66,10 +238,7 @@ class Nest2DArrange(Arranger):
 
         def _convert_points(points):
             if points is not None and len(points) > 2:  # numpy array has to be explicitly checked against None
-                converted_points = []
-                for point in points:
-                    converted_points.append(Point(int(point[0] * self._factor), int(point[1] * self._factor)))
-                return [converted_points]
+                return [(numpy.asarray(points) * self._factor).astype(numpy.int64)]
             else:
                 return []
 
@@ -98,46 +267,66 @@ class Nest2DArrange(Arranger):
             if hull_polygon is not None:
                 polygons_fixed_nodes += _convert_points(hull_polygon.getPoints())
 
-        strategies = [NfpConfig.Alignment.CENTER,
-                      NfpConfig.Alignment.BOTTOM_LEFT,
-                      NfpConfig.Alignment.BOTTOM_RIGHT,
-                      NfpConfig.Alignment.TOP_LEFT,
-                      NfpConfig.Alignment.TOP_RIGHT]
-        found_solution_for_all = False
-        while not found_solution_for_all and len(strategies) > 0:
-
-            # Add all the items we want to arrange
-            node_items = []
-            for polygon in polygons_nodes_to_arrange:
-                node_items.append(Item(polygon))
-
-            for polygon in polygons_disallowed_areas:
-                disallowed_area = Item(polygon)
-                disallowed_area.markAsDisallowedAreaInBin(0)
-                node_items.append(disallowed_area)
+        problem = _NestProblem(polygons_nodes_to_arrange, polygons_disallowed_areas, polygons_fixed_nodes,
+                               int(machine_width * self._factor), int(machine_depth * self._factor), spacing, self._factor)
+        rotation_sets = [[0.0]] if self._lock_rotation else self.RotationSets
+        if self._max_workers > 0:
+            candidates = [(starting_point, rotations) for rotations in rotation_sets for starting_point in self.StartingPoints]
+            return self._findBestPlacementInWorkers(problem, candidates)
+        candidates = [(starting_point, rotation_sets[0]) for starting_point in self.StartingPoints]
+        return self._findFirstPlacement(problem, candidates)
 
-            for polygon in polygons_fixed_nodes:
-                item = Item(polygon)
-                item.markAsFixedInBin(0)
-                node_items.append(item)
+    def _findFirstPlacement(self, problem: _NestProblem, candidates: List[Tuple[Any, Optional[List[float]]]]) -> Tuple[bool, List[Item]]:
+        """Try the strategies one by one in this process, until one of them fits all objects on the build plate."""
 
-            config = NfpConfig()
-            config.accuracy = 1.0
-            config.alignment = NfpConfig.Alignment.DONT_ALIGN
-            config.starting_point = strategies[0]
-            strategies = strategies[1:]
-
-            if self._lock_rotation:
-                config.rotations = [0.0]
-
-            num_bins = nest(node_items, build_plate_bounding_box, spacing, config)
+        found_solution_for_all = False
+        node_items = []  # type: List[Item]
+        for index, (starting_point, rotations) in enumerate(candidates):
+            if self.isAborted():
+                break
+            num_bins, node_items = _nest(problem, starting_point, rotations)
+            self._reportProgress((index + 1) / len(candidates))
+            found_solution_for_all = num_bins == 1
+            if found_solution_for_all:
+                break
+        return found_solution_for_all, node_items
 
-            # Strip the fixed items (previously placed) and the disallowed areas from the results again.
-            node_items = list(filter(lambda item: not item.isFixed(), node_items))
+    def _findBestPlacementInWorkers(self, problem: _NestProblem, candidates: List[Tuple[Any, Optional[List[float]]]]) -> Tuple[bool, List[Any]]:
+        """Try all strategies at the same time in worker processes, and take the best result by the objective.
 
-            found_solution_for_all = num_bins == 1
+        The workers are forked, as described in :py:mod:`cura.Utils.WorkerProcesses`. They only nest plain data.
+        """
 
-        return found_solution_for_all, node_items
+        results = []  # type: List[Tuple[int, ArrangementResult]]
+        pool = getForkContext().Pool(processes = min(self._max_workers, len(candidates)),
+                                     initializer = _initializeWorker,
+                                     initargs = (problem, candidates))
+        try:
+            pending = [pool.apply_async(_nestInWorker, (index, )) for index in range(len(candidates))]
+            while pending and not self.isAborted():
+                for async_result in [async_result for async_result in pending if async_result.ready()]:
+                    pending.remove(async_result)
+                    index, num_bins, footprint, placements = async_result.get()
+                    starting_point, rotations = candidates[index]
+                    results.append((index, ArrangementResult(starting_point, rotations, num_bins, footprint, placements)))
+                    self._reportProgress(len(results) / len(candidates))
+                if pending:
+                    pending[0].wait(0.1)
+        finally:
+            pool.terminate()  # Also stops the strategies that are still being tried, if aborted.
+            pool.join()
+
+        if not results:
+            return False, []
+        # Take the first strategy of equally good ones, for the same result as trying them one by one.
+        _, best = min(results, key = lambda index_and_result: (self._objective(index_and_result[1]), index_and_result[0]))
+        Logger.log("d", "Arranged with starting point {starting_point} and rotations {rotations} on {num_bins} build plate(s), {tried} strategies tried.".format(
+            starting_point = best.starting_point, rotations = best.rotations, num_bins = best.num_bins, tried = len(results)))
+        return best.num_bins == 1, [ArrangedItem(*placement) for placement in best.placements]
+
+    def _reportProgress(self, progress: float) -> None:
+        if self._progress_callback is not None:
+            self._progress_callback(progress)
 
     def createGroupOperationForArrange(self, add_new_nodes_in_scene: bool = False) -> Tuple[GroupedOperation, int]:
         scene_root = Application.getInstance().getController().getScene().getRoot()
@@ -0,0 +1,164 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy
+
+Bounds = Tuple[float, float, float, float]  # Minimum X, minimum Y, maximum X and maximum Y.
+
+
+class PackedRectangle(NamedTuple):
+    """Where a rectangle was placed by :py:func:`packOnBuildPlates`."""
+
+    build_plate: int
+    x: float  # Minimum X of the rectangle on the build plate.
+    y: float  # Minimum Y of the rectangle on the build plate.
+    rotated: bool  # Whether the rectangle was turned by 90 degrees, swapping its width and depth.
+
+
+class RectanglePacker:
+    """Packs rectangles on one build plate, with the MaxRects algorithm.
+
+    The free space on the plate is kept as the list of all maximal free rectangles, which may overlap. A rectangle is
+    placed in the free rectangle that leaves the least space along its shortest side, and the free rectangles that it
+    overlaps are split up.
+
+    :param width: The width of the build plate.
+    :param depth: The depth of the build plate.
+    :param obstacles: Areas of the build plate that can't be used, like disallowed areas and objects that may not move.
+    """
+
+    Epsilon = 1e-6  # Rectangles that fit within this margin are considered to fit, against rounding errors.
+
+    def __init__(self, width: float, depth: float, obstacles: Sequence[Bounds] = ()) -> None:
+        self._free = numpy.array([[0.0, 0.0, width, depth]])
+        self._max_free_width = width  # The largest width and depth of the free rectangles, to quickly skip full plates.
+        self._max_free_depth = depth
+        for obstacle in obstacles:
+            self.occupy(obstacle)
+
+    def getFreeRectangles(self) -> numpy.ndarray:
+        return self._free
+
+    def findPosition(self, width: float, depth: float, allow_rotation: bool = True) -> Optional[Tuple[float, float, bool]]:
+        """Find where to place a rectangle.
+
+        :return: The minimum X and Y of the rectangle and whether it needs to be rotated, or None if it doesn't fit.
+        """
+
+        free_widths = self._free[:, 2] - self._free[:, 0]
+        free_depths = self._free[:, 3] - self._free[:, 1]
+        best = None  # type: Optional[Tuple[float, float, float, float, bool]]
+        orientations = [(width, depth, False), (depth, width, True)] if allow_rotation and width != depth else [(width, depth, False)]
+        for rotated_width, rotated_depth, rotated in orientations:
+            fits = numpy.flatnonzero((free_widths >= rotated_width - self.Epsilon) & (free_depths >= rotated_depth - self.Epsilon))
+            if len(fits) == 0:
+                continue
+            leftover_width = free_widths[fits] - rotated_width
+            leftover_depth = free_depths[fits] - rotated_depth
+            short_sides = numpy.minimum(leftover_width, leftover_depth)
+            long_sides = numpy.maximum(leftover_width, leftover_depth)
+            best_index = numpy.lexsort((long_sides, short_sides))[0]
+            if best is None or (short_sides[best_index], long_sides[best_index]) < best[:2]:
+                free_index = fits[best_index]
+                best = (short_sides[best_index], long_sides[best_index], self._free[free_index, 0], self._free[free_index, 1], rotated)
+        if best is None:
+            return None
+        return float(best[2]), float(best[3]), best[4]
+
+    def occupy(self, bounds: Bounds) -> None:
+        """Mark an area of the build plate as used."""
+
+        min_x, min_y, max_x, max_y = bounds
+        free = self._free
+        overlapping = (free[:, 0] < max_x) & (free[:, 2] > min_x) & (free[:, 1] < max_y) & (free[:, 3] > min_y)
+        if not numpy.any(overlapping):
+            return
+
+        # Split every free rectangle that overlaps the area into the (up to four) maximal rectangles around it.
+        split_rectangles = []
+        for free_min_x, free_min_y, free_max_x, free_max_y in free[overlapping].tolist():
+            if min_x > free_min_x:
+                split_rectangles.append((free_min_x, free_min_y, min_x, free_max_y))
+            if max_x < free_max_x:
+                split_rectangles.append((max_x, free_min_y, free_max_x, free_max_y))
+            if min_y > free_min_y:
+                split_rectangles.append((free_min_x, free_min_y, free_max_x, min_y))
+            if max_y < free_max_y:
+                split_rectangles.append((free_min_x, max_y, free_max_x, free_max_y))
+        remaining = free[~overlapping]
+        if not split_rectangles:
+            self._setFreeRectangles(remaining)
+            return
+
+        # Only the new rectangles can be inside other free rectangles, since the others were maximal already.
+        new = numpy.array(split_rectangles)
+        candidates = numpy.concatenate((remaining, new))
+        contains = (candidates[numpy.newaxis, :, 0] <= new[:, numpy.newaxis, 0]) & (candidates[numpy.newaxis, :, 1] <= new[:, numpy.newaxis, 1]) \
+                   & (candidates[numpy.newaxis, :, 2] >= new[:, numpy.newaxis, 2]) & (candidates[numpy.newaxis, :, 3] >= new[:, numpy.newaxis, 3])
+        # A rectangle isn't redundant because of itself, and of equal rectangles only the first one is kept.
+        new_indices = numpy.arange(len(new)) + len(remaining)
+        equal = numpy.all(candidates[numpy.newaxis, :, :] == new[:, numpy.newaxis, :], axis = 2)
+        contains &= ~equal | (numpy.arange(len(candidates))[numpy.newaxis, :] < new_indices[:, numpy.newaxis])
+        self._setFreeRectangles(numpy.concatenate((remaining, new[~numpy.any(contains, axis = 1)])))
+
+    def canFit(self, width: float, depth: float, allow_rotation: bool = True) -> bool:
+        """Quickly check whether a rectangle may fit, without finding where."""
+
+        if width <= self._max_free_width + self.Epsilon and depth <= self._max_free_depth + self.Epsilon:
+            return True
+        return allow_rotation and depth <= self._max_free_width + self.Epsilon and width <= self._max_free_depth + self.Epsilon
+
+    def _setFreeRectangles(self, free: numpy.ndarray) -> None:
+        self._free = free
+        self._max_free_width = float(numpy.max(free[:, 2] - free[:, 0], initial = 0.0))
+        self._max_free_depth = float(numpy.max(free[:, 3] - free[:, 1], initial = 0.0))
+
+
+def packOnBuildPlates(sizes: Sequence[Tuple[float, float]], plate_width: float, plate_depth: float, *,
+                      obstacles: Optional[Dict[int, List[Bounds]]] = None,
+                      common_obstacles: Sequence[Bounds] = (),
+                      allow_rotation: bool = True) -> List[Optional[PackedRectangle]]:
+    """Pack rectangles on as few build plates as possible.
+
+    The rectangles are placed from large to small, each on the first build plate where it fits (first fit decreasing).
+    A new build plate is only used when a rectangle doesn't fit on any of the earlier ones.
+
+    :param sizes: The width and depth of every rectangle.
+    :param plate_width: The width of the build plates.
+    :param plate_depth: The depth of the build plates.
+    :param obstacles: The areas that can't be used on each build plate, by build plate number.
+    :param common_obstacles: The areas that can't be used on any build plate.
+    :param allow_rotation: Whether rectangles may be turned by 90 degrees to make them fit better.
+    :return: For every rectangle where it was placed, or None if it doesn't fit on an empty build plate.
+    """
+
+    if obstacles is None:
+        obstacles = {}
+    result = [None] * len(sizes)  # type: List[Optional[PackedRectangle]]
+    order = sorted(range(len(sizes)), key = lambda index: (-sizes[index][0] * sizes[index][1], -max(sizes[index]), index))
+    plates = []  # type: List[RectanglePacker]
+    empty_plate = RectanglePacker(plate_width, plate_depth, common_obstacles)
+    for index in order:
+        width, depth = sizes[index]
+        if empty_plate.findPosition(width, depth, allow_rotation) is None:
+            continue
+
+        # Try the plates in use, the plates with obstacles, and if needed one more (empty) plate.
+        for build_plate in range(max(len(plates), max(obstacles, default = -1) + 1) + 1):
+            if build_plate == len(plates):
+                plates.append(RectanglePacker(plate_width, plate_depth, list(common_obstacles) + obstacles.get(build_plate, [])))
+            packer = plates[build_plate]
+            if not packer.canFit(width, depth, allow_rotation):
+                continue
+            position = packer.findPosition(width, depth, allow_rotation)
+            if position is None:
+                continue
+            x, y, rotated = position
+            placed_width, placed_depth = (depth, width) if rotated else (width, depth)
+            packer.occupy((x, y, x + placed_width, y + placed_depth))
+            result[index] = PackedRectangle(build_plate, x, y, rotated)
+            break
+    return result
+
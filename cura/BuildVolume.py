@@ -4,7 +4,7 @@
 import numpy
 import math
 
-from typing import List, Optional, TYPE_CHECKING, Any, Set, cast, Iterable, Dict
+from typing import List, Optional, TYPE_CHECKING, Any, Set, cast, Iterable, Dict, Tuple
 
 from UM.Logger import Logger
 from UM.Mesh.MeshData import MeshData
@@ -29,6 +29,7 @@ from UM.View.GL.OpenGL import OpenGL
 
 from cura.Settings.GlobalStack import GlobalStack
 from cura.Scene.CuraSceneNode import CuraSceneNode
+from cura.Scene.SpatialIndex import SpatialIndex
 from cura.Settings.ExtruderManager import ExtruderManager
 
 from PyQt6.QtCore import QTimer
@@ -82,6 +83,8 @@ class BuildVolume(SceneNode):
         self._disallowed_areas_no_brim = []  # type: List[Polygon]
         self._disallowed_area_mesh = None  # type: Optional[MeshData]
         self._disallowed_area_size = 0.
+        self._disallowed_areas_index = SpatialIndex()  # type: SpatialIndex[Polygon]
+        self._disallowed_areas_index_key: Tuple[int, ...] = ()  # IDs of the disallowed areas in the index.
 
         self._error_areas = []  # type: List[Polygon]
         self._error_mesh = None  # type: Optional[MeshData]
@@ -248,6 +251,28 @@ class BuildVolume(SceneNode):
     def setDisallowedAreas(self, areas: List[Polygon]):
         self._disallowed_areas = areas
 
+    def getNearbyDisallowedAreas(self, node: SceneNode) -> List[Polygon]:
+        """Get the disallowed areas that the printing area of a node may collide with.
+
+        Only the areas of which the bounding box overlaps with that of the node are returned, so that the node doesn't
+        need to be checked against all areas. If the node has no printing area, all areas are returned.
+        """
+
+        areas = self._disallowed_areas
+        node_bounds = SpatialIndex.getPolygonBounds([node.callDecoration("getPrintingArea")])
+        if node_bounds is None:
+            return areas
+
+        key = tuple(id(area) for area in areas)
+        if key != self._disallowed_areas_index_key:  # The areas changed since the index was built.
+            self._disallowed_areas_index.clear()
+            for area in areas:
+                area_bounds = SpatialIndex.getPolygonBounds([area])
+                if area_bounds is not None:
+                    self._disallowed_areas_index.update(area, area_bounds)
+            self._disallowed_areas_index_key = key
+        return self._disallowed_areas_index.query(node_bounds)
+
     def render(self, renderer):
         if not self.getMeshData() or not self.isVisible():
             return True
@@ -310,7 +335,7 @@ class BuildVolume(SceneNode):
                     node.setOutsideBuildArea(True)
                     continue
 
-                if node.collidesWithAreas(self.getDisallowedAreas()):
+                if node.collidesWithAreas(self.getNearbyDisallowedAreas(node)):
                     node.setOutsideBuildArea(True)
                     continue
                 # If the entire node is below the build plate, still mark it as outside.
@@ -372,7 +397,7 @@ class BuildVolume(SceneNode):
                 node.setOutsideBuildArea(True)
                 return
 
-            if node.collidesWithAreas(self.getDisallowedAreas()):
+            if node.collidesWithAreas(self.getNearbyDisallowedAreas(node)):
                 node.setOutsideBuildArea(True)
                 return
 
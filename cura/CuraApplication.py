@@ -8,7 +8,7 @@ import tempfile
 import time
 import platform
 from pathlib import Path
-from typing import cast, TYPE_CHECKING, Optional, Callable, List, Any, Dict
+from typing import cast, TYPE_CHECKING, Optional, Callable, List, Any, Dict, Tuple
 import requests
 
 import numpy
@@ -82,6 +82,7 @@ from cura.Machines.Models.QualitySettingsModel import QualitySettingsModel
 from cura.Machines.Models.SettingVisibilityPresetsModel import SettingVisibilityPresetsModel
 from cura.Machines.Models.UserChangesModel import UserChangesModel
 from cura.Operations.SetParentOperation import SetParentOperation
+from cura.PluginActivator import PluginActivator
 from cura.PrinterOutput.NetworkMJPGImage import NetworkMJPGImage
 from cura.PrinterOutput.PrinterOutputDevice import PrinterOutputDevice
 from cura.Scene import ZOffsetDecorator
@@ -116,6 +117,7 @@ from cura.UI.TextManager import TextManager
 from cura.UI.WelcomePagesModel import WelcomePagesModel
 from cura.UI.WhatsNewPagesModel import WhatsNewPagesModel
 from cura.UltimakerCloud import UltimakerCloudConstants
+from cura.Utils.BootProfiler import BootProfiler, profileBoot
 from cura.Utils.NetworkingUtil import NetworkingUtil
 from . import BuildVolume
 from . import CameraAnimation
@@ -161,6 +163,7 @@ class CuraApplication(QtApplication):
 
     pyqtEnum(ResourceTypes)
 
+    @profileBoot()
     def __init__(self, *args, **kwargs):
         super().__init__(name = ApplicationMetadata.CuraAppName,
                          app_display_name = ApplicationMetadata.CuraAppDisplayName,
@@ -178,6 +181,7 @@ class CuraApplication(QtApplication):
         self.beta_change_log_url = "https://ultimaker.com/ultimaker-cura-beta-features?utm_source=cura&utm_medium=software&utm_campaign=cura-update-features"
 
         self._boot_loading_time = time.time()
+        self._boot_profiler = BootProfiler.getInstance()
 
         self._on_exit_callback_manager = OnExitCallbackManager(self)
 
@@ -266,6 +270,7 @@ class CuraApplication(QtApplication):
         self._sidebar_custom_menu_items = []  # type: list # Keeps list of custom menu items for the side bar
 
         self._plugins_loaded = False
+        self._plugin_activator = None  # type: Optional[PluginActivator]
 
         # Backups
         self._auto_save = None  # type: Optional[AutoSave]
@@ -320,6 +325,17 @@ class CuraApplication(QtApplication):
                                       action = "store_true",
                                       default = False,
                                       help = "FOR TESTING ONLY. Trigger an early crash to show the crash dialog.")
+        self._cli_parser.add_argument("--profile-boot",
+                                      dest = "profile_boot",
+                                      action = "store_true",
+                                      default = False,
+                                      help = "Measure how long the phases of starting the application take. The report is written for flame graph "
+                                             "tools (.folded) and for Chrome tracing (.json), and the slowest phases are logged.")
+        self._cli_parser.add_argument("--profile-boot-output",
+                                      dest = "profile_boot_output",
+                                      default = None,
+                                      metavar = "PATH",
+                                      help = "Where to write the report of --profile-boot, without extension. By default in the configuration folder.")
         self._cli_parser.add_argument("file", nargs = "*", help = "Files to load after starting the application.")
 
     def getContainerRegistry(self) -> "CuraContainerRegistry":
@@ -344,6 +360,7 @@ class CuraApplication(QtApplication):
             else:
                 self._files_to_open.append(os.path.abspath(filename))
 
+    @profileBoot()
     def initialize(self) -> None:
         self.__addExpectedResourceDirsAndSearchPaths()  # Must be added before init of super
 
@@ -404,6 +421,7 @@ class CuraApplication(QtApplication):
             Resources.addSearchPath(os.path.join(app_root, "..", "share", "cura", "resources"))
 
     @classmethod
+    @profileBoot()
     def _initializeSettingDefinitions(cls):
         # Need to do this before ContainerRegistry tries to load the machines
         SettingDefinition.addSupportedProperty("settable_per_mesh", DefinitionPropertyType.Any, default=True,
@@ -451,6 +469,7 @@ class CuraApplication(QtApplication):
         SettingFunction.registerOperator("valueFromContainer", self._cura_formula_functions.getValueFromContainerAtIndex)
         SettingFunction.registerOperator("extruderValueFromContainer", self._cura_formula_functions.getValueFromContainerAtIndexInExtruder)
 
+    @profileBoot()
     def __addAllResourcesAndContainerResources(self) -> None:
         """Adds all resources and container related resources."""
 
@@ -480,6 +499,7 @@ class CuraApplication(QtApplication):
         Resources.addType(self.ResourceTypes.QmlFiles, "qml")
         Resources.addType(self.ResourceTypes.Firmware, "firmware")
 
+    @profileBoot()
     def __addAllEmptyContainers(self) -> None:
         """Adds all empty containers."""
 
@@ -507,6 +527,7 @@ class CuraApplication(QtApplication):
         self._container_registry.addContainer(cura.Settings.cura_empty_instance_containers.empty_quality_changes_container)
         self.empty_quality_changes_container = cura.Settings.cura_empty_instance_containers.empty_quality_changes_container
 
+    @profileBoot()
     def __setLatestResouceVersionsForVersionUpgrade(self):
         """Initializes the version upgrade manager with by providing the paths for each resource type and the latest
         versions. """
@@ -528,6 +549,7 @@ class CuraApplication(QtApplication):
             }
         )
 
+    @profileBoot()
     def startSplashWindowPhase(self) -> None:
         """Runs preparations that needs to be done before the starting process."""
 
@@ -587,7 +609,8 @@ class CuraApplication(QtApplication):
         self._container_registry.allMetadataLoaded.connect(ContainerRegistry.getInstance)
 
         with self._container_registry.lockFile():
-            self._container_registry.loadAllMetadata()
+            with self._boot_profiler.measure("ContainerRegistry.loadAllMetadata"):
+                self._container_registry.loadAllMetadata()
 
         self._setLoadingHint(self._i18n_catalog.i18nc("@info:progress", "Setting up preferences..."))
         # Set the setting version for Preferences
@@ -834,6 +857,7 @@ class CuraApplication(QtApplication):
     def setDefaultPath(self, key, default_path):
         self.getPreferences().setValue("local_file/%s" % key, QUrl(default_path).toLocalFile())
 
+    @profileBoot()
     def _loadPlugins(self) -> None:
         """Handle loading of all plugin types (and the backend explicitly)
 
@@ -860,7 +884,14 @@ class CuraApplication(QtApplication):
         # Since it's possible to get crashes in code before the sentrylogger is loaded, we want to start this plugin
         # as quickly as possible, as we might get unsolvable crash reports without it.
         self._plugin_registry.preloaded_plugins.append("SentryLogger")
-        self._plugin_registry.loadPlugins()
+        if self._boot_profiler.isRecording():
+            # The time of register() is the time of loading the plug-in, minus the time of importing it.
+            self._boot_profiler.instrument(self._plugin_registry, "loadPlugin", lambda plugin_id, *args, **kwargs: "load plugin " + plugin_id)
+            self._boot_profiler.instrument(self._plugin_registry, "_findPlugin", lambda plugin_id, *args, **kwargs: "import plugin " + plugin_id)
+        # Plug-ins that declare activation triggers are only loaded when they are needed.
+        self._plugin_activator = PluginActivator(self)
+        with self._plugin_activator.deferTriggeredPlugins():
+            self._plugin_registry.loadPlugins()
 
         if self.getBackend() is None:
             raise RuntimeError("Could not load the backend plugin!")
@@ -879,7 +910,8 @@ class CuraApplication(QtApplication):
             self.showSplashMessage(hint)
 
     def run(self):
-        super().run()
+        with self._boot_profiler.measure("QtApplication.run"):
+            super().run()
 
         self._log_hardware_info()
 
@@ -887,17 +919,20 @@ class CuraApplication(QtApplication):
         Logger.debug("Using python dependencies: {}", str(self.pythonInstalls))
 
         Logger.log("i", "Initializing machine error checker")
-        self._machine_error_checker = MachineErrorChecker(self)
-        self._machine_error_checker.initialize()
+        with self._boot_profiler.measure("MachineErrorChecker.initialize"):
+            self._machine_error_checker = MachineErrorChecker(self)
+            self._machine_error_checker.initialize()
         self.processEvents()
 
         Logger.log("i", "Initializing machine manager")
         self._setLoadingHint(self._i18n_catalog.i18nc("@info:progress", "Initializing machine manager..."))
-        self.getMachineManager()
+        with self._boot_profiler.measure("MachineManager.__init__"):
+            self.getMachineManager()
         self.processEvents()
 
         Logger.log("i", "Initializing container manager")
-        self._container_manager = ContainerManager(self)
+        with self._boot_profiler.measure("ContainerManager.__init__"):
+            self._container_manager = ContainerManager(self)
         self.processEvents()
 
         # Check if we should run as single instance or not. If so, set up a local socket server which listener which
@@ -908,7 +943,8 @@ class CuraApplication(QtApplication):
         # Setup scene and build volume
         self._setLoadingHint(self._i18n_catalog.i18nc("@info:progress", "Initializing build volume..."))
         root = self.getController().getScene().getRoot()
-        self._volume = BuildVolume.BuildVolume(self, root)
+        with self._boot_profiler.measure("BuildVolume.__init__"):
+            self._volume = BuildVolume.BuildVolume(self, root)
 
         # initialize info objects
         self._print_information = PrintInformation.PrintInformation(self)
@@ -919,7 +955,8 @@ class CuraApplication(QtApplication):
         self._setting_visibility_presets_model = SettingVisibilityPresetsModel(self.getPreferences(), parent = self)
 
         # Initialize Cura API
-        self._cura_API.initialize()
+        with self._boot_profiler.measure("CuraAPI.initialize"):
+            self._cura_API.initialize()
         self.processEvents()
         self._output_device_manager.start()
         self._welcome_pages_model.initialize()
@@ -939,6 +976,7 @@ class CuraApplication(QtApplication):
         self.started = True
         self.initializationFinished.emit()
         Logger.log("d", "Booting Cura took %s seconds", time.time() - self._boot_loading_time)
+        self._boot_profiler.finish(self._cli_args.profile_boot_output or os.path.join(Resources.getDataStoragePath(), "boot_profile"))
 
         # For now use a timer to postpone some things that need to be done after the application and GUI are
         # initialized, for example opening files because they may show dialogs which can be closed due to incomplete
@@ -984,6 +1022,7 @@ class CuraApplication(QtApplication):
 
         self.closeSplash()
 
+    @profileBoot()
     def runWithGUI(self):
         """Run Cura with GUI (desktop mode)."""
 
@@ -1030,7 +1069,8 @@ class CuraApplication(QtApplication):
         self.setMainQml(Resources.getPath(self.ResourceTypes.QmlFiles, "Cura.qml"))
         self._qml_import_paths.append(Resources.getPath(self.ResourceTypes.QmlFiles))
         self._setLoadingHint(self._i18n_catalog.i18nc("@info:progress", "Initializing engine..."))
-        self.initializeEngine()
+        with self._boot_profiler.measure("QtApplication.initializeEngine"):
+            self.initializeEngine()
         self.getTheme().setCheckIfTrusted(ApplicationMetadata.IsEnterpriseVersion)
 
         # Initialize UI state
@@ -1095,6 +1135,9 @@ class CuraApplication(QtApplication):
             self._cura_formula_functions = CuraFormulaFunctions(self)
         return self._cura_formula_functions
 
+    def getPluginActivator(self) -> Optional[PluginActivator]:
+        return self._plugin_activator
+
     def getMachineErrorChecker(self, *args) -> MachineErrorChecker:
         return self._machine_error_checker
 
@@ -1274,6 +1317,7 @@ class CuraApplication(QtApplication):
     def getCuraAPI(self, *args, **kwargs) -> "CuraAPI":
         return self._cura_API
 
+    @profileBoot()
     def registerObjects(self, engine):
         """Registers objects for the QML engine to use.
 
@@ -1560,8 +1604,26 @@ class CuraApplication(QtApplication):
         self._arrangeAll(grid_arrangement = True)
 
     def _arrangeAll(self, *, grid_arrangement: bool) -> None:
+        nodes_to_arrange, locked_nodes = self._getNodesToArrange(self.getMultiBuildPlateModel().activeBuildPlate)
+        self.arrange(nodes_to_arrange, locked_nodes, grid_arrangement = grid_arrangement)
+
+    # Multiple build plates
+    @pyqtSlot()
+    def arrangeAllOnBuildPlates(self) -> None:
+        """Pack the objects of all build plates on as few build plates as possible."""
+
+        nodes_to_arrange, locked_nodes = self._getNodesToArrange()
+        self.arrange(nodes_to_arrange, locked_nodes, multi_build_plate = True)
+
+    def _getNodesToArrange(self, build_plate_number: Optional[int] = None) -> Tuple[List[SceneNode], List[SceneNode]]:
+        """Get the objects in the scene that can be arranged.
+
+        :param build_plate_number: Only get the objects on this build plate that fit in the build volume, or the objects
+        of all build plates if not given.
+        :return: The objects to arrange, and the objects that are locked in place.
+        """
+
         nodes_to_arrange = []
-        active_build_plate = self.getMultiBuildPlateModel().activeBuildPlate
         locked_nodes = []
         for node in DepthFirstIterator(self.getController().getScene().getRoot()):
             if not isinstance(node, SceneNode):
@@ -1580,26 +1642,33 @@ class CuraApplication(QtApplication):
             if not node.callDecoration("isSliceable") and not node.callDecoration("isGroup"):
                 continue  # i.e. node with layer data
 
-            if node.callDecoration("getBuildPlateNumber") == active_build_plate:
+            if build_plate_number is not None:
+                if node.callDecoration("getBuildPlateNumber") != build_plate_number:
+                    continue
                 # Skip nodes that are too big
                 bounding_box = node.getBoundingBox()
-                if bounding_box is None or bounding_box.width < self._volume.getBoundingBox().width or bounding_box.depth < self._volume.getBoundingBox().depth:
-                    # Arrange only the unlocked nodes and keep the locked ones in place
-                    if node.getSetting(SceneNodeSettings.LockPosition):
-                        locked_nodes.append(node)
-                    else:
-                        nodes_to_arrange.append(node)
-        self.arrange(nodes_to_arrange, locked_nodes, grid_arrangement = grid_arrangement)
+                if bounding_box is not None and bounding_box.width >= self._volume.getBoundingBox().width and bounding_box.depth >= self._volume.getBoundingBox().depth:
+                    continue
+
+            # Arrange only the unlocked nodes and keep the locked ones in place
+            if node.getSetting(SceneNodeSettings.LockPosition):
+                locked_nodes.append(node)
+            else:
+                nodes_to_arrange.append(node)
+        return nodes_to_arrange, locked_nodes
 
-    def arrange(self, nodes: List[SceneNode], fixed_nodes: List[SceneNode], *,  grid_arrangement: bool = False) -> None:
+    def arrange(self, nodes: List[SceneNode], fixed_nodes: List[SceneNode], *,  grid_arrangement: bool = False,
+                multi_build_plate: bool = False) -> None:
         """Arrange a set of nodes given a set of fixed nodes
 
         :param nodes: nodes that we have to place
         :param fixed_nodes: nodes that are placed in the arranger before finding spots for nodes
         :param grid_arrangement: If set to true if objects are to be placed in a grid
+        :param multi_build_plate: If set to true the objects are packed on as few build plates as possible
         """
         min_offset = self.getBuildVolume().getEdgeDisallowedSize() + 2  # Allow for some rounding errors
-        job = ArrangeObjectsJob(nodes, fixed_nodes, min_offset = max(min_offset, 8), grid_arrange = grid_arrangement)
+        job = ArrangeObjectsJob(nodes, fixed_nodes, min_offset = max(min_offset, 8), grid_arrange = grid_arrangement,
+                                multi_build_plate = multi_build_plate)
         job.start()
 
     @pyqtSlot()
@@ -1645,6 +1714,8 @@ class CuraApplication(QtApplication):
                     Logger.log("w", "Unable to reload data because we don't have a filename.")
 
         for file_name, nodes in objects_in_filename.items():
+            if self._plugin_activator is not None:
+                self._plugin_activator.activateFileExtension(file_name)
             file_path = os.path.normpath(os.path.dirname(file_name))
             job = ReadMeshJob(file_name,
                               add_to_recent_files=file_path != tempfile.gettempdir())  # Don't add temp files to the recent files list
@@ -2011,6 +2082,8 @@ class CuraApplication(QtApplication):
         Logger.log("i", "Attempting to read file %s", file.toString())
         if not file.isValid():
             return
+        if self._plugin_activator is not None:
+            self._plugin_activator.activateFileExtension(file.toLocalFile())  # Before a job looks for the reader.
         self._open_project_mode = project_mode
         scene = self.getController().getScene()
 
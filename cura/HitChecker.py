@@ -1,30 +1,35 @@
-from typing import List, Dict
+from typing import Dict, List, Optional, Tuple
+
+import numpy
+
+from UM.Math.Polygon import Polygon
+
 from cura.Scene.CuraSceneNode import CuraSceneNode
 
 
 class HitChecker:
     """Checks if nodes can be printed without causing any collisions and interference"""
 
+    SeparationMargin = 1e-4  # Pairs of polygons that are closer than this to touching are checked with Polygon itself.
+    MaxProjectionsPerChunk = 1000000  # To limit the memory used to compare all pairs of polygons at once.
+
     def __init__(self, nodes: List[CuraSceneNode]) -> None:
+        self._node_indices: Dict[CuraSceneNode, int] = {node: index for index, node in enumerate(nodes)}
         self._hit_map = self._buildHitMap(nodes)
 
     def anyTwoNodesBlockEachOther(self, nodes: List[CuraSceneNode]) -> bool:
         """Returns True if any 2 nodes block each other"""
-        for a in nodes:
-            for b in nodes:
-                if self._hit_map[a][b] and self._hit_map[b][a]:
-                    return True
-        return False
+        indices = self._getIndices(nodes)
+        hits = self._hit_map[numpy.ix_(indices, indices)]
+        return bool(numpy.any(hits & hits.T))
 
     def canPrintBefore(self, node: CuraSceneNode, other_nodes: List[CuraSceneNode]) -> bool:
         """Returns True if node doesn't block other_nodes and can be printed before them"""
-        no_hits = all(not self._hit_map[node][other_node] for other_node in other_nodes)
-        return no_hits
+        return not numpy.any(self._hit_map[self._node_indices[node], self._getIndices(other_nodes)])
 
     def canPrintAfter(self, node: CuraSceneNode, other_nodes: List[CuraSceneNode]) -> bool:
         """Returns True if node doesn't hit other nodes and can be printed after them"""
-        no_hits = all(not self._hit_map[other_node][node] for other_node in other_nodes)
-        return no_hits
+        return not numpy.any(self._hit_map[self._getIndices(other_nodes), self._node_indices[node]])
 
     def calculateScore(self, a: CuraSceneNode, b: CuraSceneNode) -> int:
         """Calculate score simply sums the number of other objects it 'blocks'
@@ -34,9 +39,11 @@ class HitChecker:
         :return: sum of the number of other objects
         """
 
-        score_a = sum(self._hit_map[a].values())
-        score_b = sum(self._hit_map[b].values())
-        return score_a - score_b
+        return self.getBlockedCount(a) - self.getBlockedCount(b)
+
+    def getBlockedCount(self, node: CuraSceneNode) -> int:
+        """The number of other objects that a node 'blocks', i.e. that it can't be printed before"""
+        return int(numpy.count_nonzero(self._hit_map[self._node_indices[node]]))
 
     def canPrintNodesInProvidedOrder(self, ordered_nodes: List[CuraSceneNode]) -> bool:
         """Returns True If nodes don't have any hits in provided order"""
@@ -47,42 +54,121 @@ class HitChecker:
                 return False
         return True
 
+    def getPrintOrder(self, nodes: List[CuraSceneNode]) -> List[CuraSceneNode]:
+        """Find an order in which the nodes can be printed without any hits
+
+        Nodes that don't block any of the remaining nodes can be printed first. Printing those never prevents a solution,
+        so taking them one by one finds a solution if one exists, without searching. Of the nodes that could be printed,
+        the last one in the provided list is taken.
+
+        :param nodes: The nodes to order, in order of preference.
+        :return: The nodes in printing order, or an empty list if they block each other in a cycle.
+        """
+
+        indices = self._getIndices(nodes)
+        hits = self._hit_map[numpy.ix_(indices, indices)]
+        remaining = numpy.ones(len(nodes), dtype = bool)
+        blocked_counts = numpy.count_nonzero(hits, axis = 1)  # How many of the remaining nodes each node blocks.
+        order = []  # type: List[CuraSceneNode]
+        for _ in range(len(nodes)):
+            candidates = numpy.flatnonzero(remaining & (blocked_counts == 0))
+            if len(candidates) == 0:
+                return []  # The remaining nodes block each other, so there is no solution.
+            next_index = candidates[-1]
+            remaining[next_index] = False
+            blocked_counts -= hits[:, next_index]
+            order.append(nodes[next_index])
+        return order
+
+    def _getIndices(self, nodes: List[CuraSceneNode]) -> List[int]:
+        return [self._node_indices[node] for node in nodes]
+
     @staticmethod
-    def _buildHitMap(nodes: List[CuraSceneNode]) -> Dict[CuraSceneNode, CuraSceneNode]:
+    def _buildHitMap(nodes: List[CuraSceneNode]) -> numpy.ndarray:
         """Pre-computes all hits between all objects
 
         :nodes: nodes that need to be checked for collisions
-        :return: dictionary where hit_map[node1][node2] is False if there node1 can be printed before node2
+        :return: matrix where hit_map[index1][index2] is False if node1 can be printed before node2
         """
-        hit_map = {j: {i: HitChecker._checkHit(j, i) for i in nodes} for j in nodes}
+        hit_map = HitChecker._intersectPolygons([node.callDecoration("getConvexHullBoundary") for node in nodes],
+                                                [node.callDecoration("getConvexHullHeadFull") for node in nodes])
+        # Adhesion areas must never overlap, regardless of printing order
+        # This would cause over-extrusion
+        adhesion_areas = [node.callDecoration("getAdhesionArea") for node in nodes]
+        hit_map |= HitChecker._intersectPolygons(adhesion_areas, adhesion_areas)
+        numpy.fill_diagonal(hit_map, False)
         return hit_map
 
     @staticmethod
-    def _checkHit(a: CuraSceneNode, b: CuraSceneNode) -> bool:
-        """Checks if a can be printed before b
+    def _intersectPolygons(polygons_a: List[Optional[Polygon]], polygons_b: List[Optional[Polygon]]) -> numpy.ndarray:
+        """Check which polygons intersect, with a separating axis test over all pairs at once
 
-        :param a: node
-        :param b: node
-        :return: False if a can be printed before b
+        :return: matrix where result[index_a][index_b] is whether polygons_a[index_a] intersects polygons_b[index_b]
         """
 
-        if a == b:
-            return False
+        points_a, normals_a, valid_a = HitChecker._padPolygons(polygons_a)
+        points_b, normals_b, valid_b = HitChecker._padPolygons(polygons_b)
 
-        a_hit_hull = a.callDecoration("getConvexHullBoundary")
-        b_hit_hull = b.callDecoration("getConvexHullHeadFull")
-        overlap = a_hit_hull.intersectsPolygon(b_hit_hull)
+        # The largest gap between the projections of each pair, over the edge normals of both. Positive if separated.
+        gaps = numpy.maximum(HitChecker._getSeparationGaps(points_b, points_a, normals_a).T,
+                             HitChecker._getSeparationGaps(points_a, points_b, normals_b))
 
-        if overlap:
-            return True
+        result = gaps < 0
+        # Leave the pairs that (nearly) touch, and polygons that can't be tested like this, to Polygon itself.
+        uncertain = (numpy.abs(gaps) <= HitChecker.SeparationMargin) | ~valid_a[:, numpy.newaxis] | ~valid_b[numpy.newaxis, :]
+        for index_a, index_b in zip(*numpy.nonzero(uncertain)):
+            result[index_a, index_b] = bool(polygons_a[index_a].intersectsPolygon(polygons_b[index_b]))
+        return result
 
-        # Adhesion areas must never overlap, regardless of printing order
-        # This would cause over-extrusion
-        a_hit_hull = a.callDecoration("getAdhesionArea")
-        b_hit_hull = b.callDecoration("getAdhesionArea")
-        overlap = a_hit_hull.intersectsPolygon(b_hit_hull)
-
-        if overlap:
-            return True
-        else:
-            return False
+    @staticmethod
+    def _getSeparationGaps(points: numpy.ndarray, axis_points: numpy.ndarray, axis_normals: numpy.ndarray) -> numpy.ndarray:
+        """Get how far polygons are apart when projected on the edge normals of other polygons
+
+        :param points: The points of the polygons to project.
+        :param axis_points: The points of the polygons of which the edge normals are used.
+        :param axis_normals: The edge normals of those polygons.
+        :return: matrix where result[index][axis_index] is the largest gap between polygon index and polygon axis_index on
+        the normals of polygon axis_index. Negative if they overlap on every normal.
+        """
+
+        polygon_count, point_count = points.shape[:2]
+        axis_polygon_count, normal_count = axis_normals.shape[:2]
+        has_normal = numpy.any(axis_normals != 0, axis = 2)  # Padding and repeated points have no edge.
+        own_projections = numpy.matmul(axis_points, axis_normals.transpose((0, 2, 1)))
+        own_min = own_projections.min(axis = 1)
+        own_max = own_projections.max(axis = 1)
+
+        gaps = numpy.empty((polygon_count, axis_polygon_count))
+        flat_points = points.reshape((-1, 2))
+        chunk_size = max(1, HitChecker.MaxProjectionsPerChunk // max(1, flat_points.shape[0] * normal_count))
+        for start in range(0, axis_polygon_count, chunk_size):
+            end = min(start + chunk_size, axis_polygon_count)
+            projections = (flat_points @ axis_normals[start:end].reshape((-1, 2)).T).reshape((polygon_count, point_count, end - start, normal_count))
+            chunk_gaps = numpy.maximum(own_min[start:end] - projections.max(axis = 1), projections.min(axis = 1) - own_max[start:end])
+            gaps[:, start:end] = numpy.where(has_normal[start:end], chunk_gaps, -numpy.inf).max(axis = 2)
+        return gaps
+
+    @staticmethod
+    def _padPolygons(polygons: List[Optional[Polygon]]) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """Put the points of polygons in one array, with their edge normals
+
+        Polygons with fewer points are padded by repeating their last point, which doesn't add any edges.
+
+        :return: The points, the unit normals of the edges (zero for no edge) and whether each polygon has an area.
+        """
+
+        point_lists = [polygon.getPoints() if polygon is not None else None for polygon in polygons]
+        valid = numpy.array([points is not None and len(points) >= 3 for points in point_lists], dtype = bool)
+        point_count = max([len(points) for points, is_valid in zip(point_lists, valid) if is_valid], default = 1)
+        padded_points = numpy.zeros((len(polygons), point_count, 2))
+        for index, points in enumerate(point_lists):
+            if valid[index]:
+                padded_points[index, :len(points)] = points
+                padded_points[index, len(points):] = points[-1]
+
+        edges = padded_points - numpy.roll(padded_points, 1, axis = 1)
+        # The closing edge goes from the last real point to the first, which is the same after padding.
+        normals = numpy.stack((-edges[:, :, 1], edges[:, :, 0]), axis = 2)
+        lengths = numpy.linalg.norm(normals, axis = 2, keepdims = True)
+        normals = numpy.divide(normals, lengths, out = numpy.zeros_like(normals), where = lengths > 0)
+        return padded_points, normals, valid
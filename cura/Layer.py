@@ -1,7 +1,8 @@
 # Copyright (c) 2019 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
-from typing import List
+import copy
+from typing import List, Optional
 import numpy
 
 from UM.Mesh.MeshBuilder import MeshBuilder
@@ -16,6 +17,7 @@ class Layer:
         self._thickness = 0.0
         self._polygons = []  # type: List[LayerPolygon]
         self._element_count = 0
+        self._cumulative_line_duration: Optional[numpy.ndarray] = None
 
     @property
     def height(self):
@@ -33,6 +35,35 @@ class Layer:
     def elementCount(self):
         return self._element_count
 
+    def cumulativeLineDuration(self) -> numpy.ndarray:
+        """The time from the start of the layer to the end of every line, in seconds.
+
+        After the lines of every polygon there's an extra entry with the same time, for the tool change, so that there
+        is an entry for every path that the simulation view shows.
+        """
+
+        if self._cumulative_line_duration is None:
+            self._cumulative_line_duration = self._computeCumulativeLineDuration()
+        return self._cumulative_line_duration
+
+    @property
+    def duration(self) -> float:
+        """The time it takes to print the layer, in seconds."""
+
+        cumulative_line_duration = self.cumulativeLineDuration()
+        return float(cumulative_line_duration[-1]) if len(cumulative_line_duration) > 0 else 0.0
+
+    def copy(self) -> "Layer":
+        """Copy the layer, to build it again without changing this layer.
+
+        Building a layer changes where its polygons are in the mesh. The polygons are copied as well, but they share
+        their arrays with the polygons of this layer, since building only replaces those.
+        """
+
+        result = copy.copy(self)
+        result._polygons = [copy.copy(polygon) for polygon in self._polygons]
+        return result
+
     def setHeight(self, height: float) -> None:
         self._height = height
 
@@ -65,6 +96,20 @@ class Layer:
 
         return result_vertex_offset, result_index_offset
 
+    def _computeCumulativeLineDuration(self) -> numpy.ndarray:
+        line_durations = []
+        for polygon in self._polygons:
+            line_lengths = numpy.asarray(polygon.lineLengths, dtype = numpy.float64)
+            line_feedrates = numpy.asarray(polygon.lineFeedrates, dtype = numpy.float64).reshape(-1)[:len(line_lengths)]
+            # Lines with a feedrate of 0 are wrong, so give them an arbitrary non-null duration.
+            durations = numpy.full(len(line_lengths), 0.1)
+            numpy.divide(line_lengths, line_feedrates, out = durations, where = line_feedrates > 0.0)
+            line_durations.append(durations)
+            line_durations.append(numpy.zeros(1))  # For the tool change.
+        if not line_durations:
+            return numpy.zeros(0)
+        return numpy.cumsum(numpy.concatenate(line_durations))
+
     def createMesh(self) -> MeshData:
         return self.createMeshOrJumps(True)
 
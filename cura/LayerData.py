@@ -1,5 +1,9 @@
 # Copyright (c) 2015 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
+from typing import Optional, Tuple
+
+import numpy
+
 from UM.Mesh.MeshData import MeshData
 
 
@@ -15,6 +19,7 @@ class LayerData(MeshData):
                          file_name=file_name, center_position=center_position, attributes=attributes)
         self._layers = layers
         self._element_counts = element_counts
+        self._print_timeline: Optional[Tuple[numpy.ndarray, numpy.ndarray]] = None
 
     def getLayer(self, layer):
         if layer in self._layers:
@@ -26,3 +31,17 @@ class LayerData(MeshData):
 
     def getElementCounts(self):
         return self._element_counts
+
+    def getPrintTimeline(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """The times at which the layers are printed.
+
+        :return: The numbers of the layers in the order in which they are printed, and for each of them the time from
+        the start of the print to the end of the layer, in seconds. Find the layer that is printed at a certain time
+        with ``numpy.searchsorted``.
+        """
+
+        if self._print_timeline is None:
+            layer_numbers = numpy.array(sorted(self._layers), dtype = numpy.int64)
+            layer_durations = numpy.array([self._layers[layer_number].duration for layer_number in layer_numbers], dtype = numpy.float64)
+            self._print_timeline = (layer_numbers, numpy.cumsum(layer_durations))
+        return self._print_timeline
@@ -13,11 +13,31 @@ from typing import Dict, Optional
 class LayerDataBuilder(MeshBuilder):
     """Builder class for constructing a :py:class:`cura.LayerData.LayerData` object"""
 
+    __move_types = [LayerPolygon.MoveUnretractedType, LayerPolygon.MoveRetractedType,
+                    LayerPolygon.MoveWhileRetractingType, LayerPolygon.MoveWhileUnretractingType]
+
+    # Shape of a single vertex (or index) entry and data type of every buffer of the mesh.
+    __buffer_layouts = {
+        "vertices": ((3, ), numpy.float32),
+        "line_dimensions": ((2, ), numpy.float32),
+        "colors": ((4, ), numpy.float32),
+        "material_colors": ((4, ), numpy.float32),
+        "feedrates": ((), numpy.float32),
+        "extruders": ((), numpy.float32),
+        "line_types": ((), numpy.float32),
+        "indices": ((2, ), numpy.int32)
+    }
+
     def __init__(self) -> None:
         super().__init__()
         self._layers = {}  # type: Dict[int, Layer]
         self._element_counts = {}  # type: Dict[int, int]
 
+        # Growable buffers of the mesh of all layers built so far, see buildIncrementally.
+        self._buffers = {}  # type: Dict[str, numpy.ndarray]
+        self._vertex_count = 0
+        self._index_count = 0
+
     def addLayer(self, layer: int) -> None:
         if layer not in self._layers:
             self._layers[layer] = Layer(layer)
@@ -50,73 +70,124 @@ class LayerDataBuilder(MeshBuilder):
         :param line_type_brightness: compatibility layer view uses line type brightness of 0.5
         """
 
-        vertex_count = 0
-        index_count = 0
-        for layer, data in self._layers.items():
-            vertex_count += data.lineMeshVertexCount()
-            index_count += data.lineMeshElementCount()
-
-        vertices = numpy.empty((vertex_count, 3), numpy.float32)
-        line_dimensions = numpy.empty((vertex_count, 2), numpy.float32)
-        colors = numpy.empty((vertex_count, 4), numpy.float32)
-        indices = numpy.empty((index_count, 2), numpy.int32)
-        feedrates = numpy.empty((vertex_count), numpy.float32)
-        extruders = numpy.empty((vertex_count), numpy.float32)
-        line_types = numpy.empty((vertex_count), numpy.float32)
-
-        vertex_offset = 0
-        index_offset = 0
-        for layer, data in sorted(self._layers.items()):
-            vertex_offset, index_offset = data.build(vertex_offset, index_offset, vertices, colors, line_dimensions, feedrates, extruders, line_types, indices)
-            self._element_counts[layer] = data.elementCount
-
-        self.addVertices(vertices)
-        colors[:, 0:3] *= line_type_brightness
-        self.addColors(colors)
-        self.addIndices(indices.flatten())
+        self._resetBuffers()
+        return self.buildIncrementally(material_color_map, line_type_brightness)
+
+    def buildIncrementally(self, material_color_map, line_type_brightness = 1.0) -> LayerData:
+        """Add the layers that were added since the previous build to the mesh, and return all layers built so far.
+
+        This allows showing layers while they are still coming in. The mesh is stored in buffers that grow
+        geometrically, so every layer is only built once. The returned :py:class:`cura.LayerData.LayerData` holds
+        read-only views on these buffers, which later calls only append to. If a layer was added below a layer that
+        was already built, the whole mesh is rebuilt into new buffers since the layers need to be stored in order.
+
+        :param material_color_map: [r, g, b, a] for each extruder row.
+        :param line_type_brightness: compatibility layer view uses line type brightness of 0.5
+        """
+
+        new_layers = sorted(layer for layer in self._layers if layer not in self._element_counts)
+        if new_layers and self._element_counts and new_layers[0] < max(self._element_counts):
+            self._resetBuffers()
+            new_layers = sorted(self._layers)
+
+        vertex_begin = self._vertex_count
+        vertex_count = vertex_begin
+        index_count = self._index_count
+        for layer in new_layers:
+            vertex_count += self._layers[layer].lineMeshVertexCount()
+            index_count += self._layers[layer].lineMeshElementCount()
+        self._reserve(vertex_count, index_count)
+
+        buffers = self._buffers
+        vertices = buffers["vertices"]
+        colors = buffers["colors"]
+        line_types = buffers["line_types"]
+        for layer in new_layers:
+            self._vertex_count, self._index_count = self._layers[layer].build(self._vertex_count, self._index_count, vertices, colors, buffers["line_dimensions"], buffers["feedrates"], buffers["extruders"], line_types, buffers["indices"])
+            self._element_counts[layer] = self._layers[layer].elementCount
+            self._layers[layer].cumulativeLineDuration()  # Computed now, so it's ready when the layer is simulated.
+
+        new_vertices = slice(vertex_begin, self._vertex_count)
+        colors[new_vertices, 0:3] *= line_type_brightness
 
         # Note: we're using numpy indexing here.
         # See also: https://docs.scipy.org/doc/numpy/reference/arrays.indexing.html
-        material_colors = numpy.zeros((line_dimensions.shape[0], 4), dtype=numpy.float32)
+        material_colors = buffers["material_colors"][new_vertices]
+        material_colors[:] = 0
+        new_extruders = buffers["extruders"][new_vertices]
         for extruder_nr in range(material_color_map.shape[0]):
-            material_colors[extruders == extruder_nr] = material_color_map[extruder_nr]
-        # Set material_colors with indices where line_types (also numpy array) == MoveUnretractedType
-        material_colors[line_types == LayerPolygon.MoveUnretractedType] = colors[line_types == LayerPolygon.MoveUnretractedType]
-        material_colors[line_types == LayerPolygon.MoveRetractedType] = colors[line_types == LayerPolygon.MoveRetractedType]
-        material_colors[line_types == LayerPolygon.MoveWhileRetractingType] = colors[
-            line_types == LayerPolygon.MoveWhileRetractingType]
-        material_colors[line_types == LayerPolygon.MoveWhileUnretractingType] = colors[
-            line_types == LayerPolygon.MoveWhileUnretractingType]
+            material_colors[new_extruders == extruder_nr] = material_color_map[extruder_nr]
+        # Travel moves keep the color of their line type (MoveUnretractedType, MoveRetractedType etc.)
+        new_line_types = line_types[new_vertices]
+        is_move = numpy.isin(new_line_types, self.__move_types)
+        material_colors[is_move] = colors[new_vertices][is_move]
 
         attributes = {
             "line_dimensions": {
-                "value": line_dimensions,
+                "value": self._builtView("line_dimensions"),
                 "opengl_name": "a_line_dim",
                 "opengl_type": "vector2f"
                 },
             "extruders": {
-                "value": extruders,
+                "value": self._builtView("extruders"),
                 "opengl_name": "a_extruder",
                 "opengl_type": "float"  # Strangely enough, the type has to be float while it is actually an int.
                 },
             "colors": {
-                "value": material_colors,
+                "value": self._builtView("material_colors"),
                 "opengl_name": "a_material_color",
                 "opengl_type": "vector4f"
                 },
             "line_types": {
-                "value": line_types,
+                "value": self._builtView("line_types"),
                 "opengl_name": "a_line_type",
                 "opengl_type": "float"
                 },
             "feedrates": {
-                "value": feedrates,
+                "value": self._builtView("feedrates"),
                 "opengl_name": "a_feedrate",
                 "opengl_type": "float"
                 }
             }
 
-        return LayerData(vertices=self.getVertices(), normals=self.getNormals(), indices=self.getIndices(),
-                        colors=self.getColors(), uvs=self.getUVCoordinates(), file_name=self.getFileName(),
-                        center_position=self.getCenterPosition(), layers=self._layers,
-                        element_counts=self._element_counts, attributes=attributes)
+        # The layer data gets copies of the dictionaries, so layers that are added afterwards (possibly from another
+        # thread) don't show up in it.
+        return LayerData(vertices=self._builtView("vertices"), normals=self.getNormals(), indices=self._builtView("indices").reshape(-1),
+                        colors=self._builtView("colors"), uvs=self.getUVCoordinates(), file_name=self.getFileName(),
+                        center_position=self.getCenterPosition(), layers={layer: self._layers[layer] for layer in self._element_counts},
+                        element_counts=dict(self._element_counts), attributes=attributes)
+
+    def _resetBuffers(self) -> None:
+        # Allocate new buffers rather than overwriting the old ones, since those can still be in use by layer data.
+        self._buffers = {}  # type: Dict[str, numpy.ndarray]
+        if self._element_counts:
+            # The layers that were built are in use by layer data too, possibly while it's drawn. Building them again
+            # would move their polygons in the mesh, so copies are built instead.
+            self._layers = {layer_number: layer.copy() for layer_number, layer in self._layers.items()}
+        self._vertex_count = 0
+        self._index_count = 0
+        self._element_counts = {}
+
+    def _reserve(self, vertex_count: int, index_count: int) -> None:
+        """Make sure the buffers can hold the given number of vertices and indices, keeping the data in them."""
+
+        for name, (shape, dtype) in self.__buffer_layouts.items():
+            required, used = (index_count, self._index_count) if name == "indices" else (vertex_count, self._vertex_count)
+            buffer = self._buffers.get(name)
+            if buffer is not None and len(buffer) >= required:
+                continue
+            capacity = required if buffer is None else max(required, 2 * len(buffer))
+            new_buffer = numpy.empty((capacity, ) + shape, dtype)
+            if buffer is not None:
+                new_buffer[:used] = buffer[:used]
+            self._buffers[name] = new_buffer
+
+    def _builtView(self, name: str) -> numpy.ndarray:
+        """Get a read-only view on the part of a buffer that has been built.
+
+        Since it is read-only, the mesh data doesn't need to make a copy of it.
+        """
+
+        view = self._buffers[name][:self._index_count if name == "indices" else self._vertex_count]
+        view.flags.writeable = False
+        return view
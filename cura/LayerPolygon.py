@@ -129,32 +129,29 @@ class LayerPolygon:
         needed_points_list = self._build_cache_needed_points
 
         # Index to the points we need to represent the line mesh.
-        # This is constructed by generating simple start and end points for each line.
-        # For line segment n, these are points n and n+1. Row n reads [n n+1]
-        # Then the indices for the points we don't need are thrown away based on the pre-calculated list.
-        index_list = (numpy.arange(len(self._types)).reshape((-1, 1)) + numpy.array([[0, 1]])).reshape((-1, 1))[needed_points_list.reshape((-1, 1))]
+        # Conceptually, every line segment n has a start and end vertex: row n reads [n n+1]. The vertices we don't
+        # need are thrown away based on the pre-calculated list. Of what remains, every vertex k of this flattened
+        # list belongs to line k // 2 and is point (k // 2) + (k % 2). All per-line attributes are gathered with the
+        # line index directly into the destination arrays, rather than duplicating every attribute per vertex first.
+        needed_vertices = numpy.flatnonzero(needed_points_list)
+        line_index = needed_vertices >> 1
+        point_index = line_index + (needed_vertices & 1)
 
         # The relative values of begin and end indices have already been set in buildCache, so we only need to offset them to the parents offset.
         self._vertex_begin += vertex_offset
         self._vertex_end += vertex_offset
+        vertex_range = slice(self._vertex_begin, self._vertex_end)
 
         # Points are picked based on the index list to get the vertices needed.
-        vertices[self._vertex_begin:self._vertex_end, :] = self._data[index_list, :]
-
-        # Create an array with colors for each vertex and remove the color data for the points that has been thrown away.
-        colors[self._vertex_begin:self._vertex_end, :] = numpy.tile(self._colors, (1, 2)).reshape((-1, 4))[needed_points_list.ravel()]
-
-        # Create an array with line widths and thicknesses for each vertex.
-        line_dimensions[self._vertex_begin:self._vertex_end, 0] = numpy.tile(self._line_widths, (1, 2)).reshape((-1, 1))[needed_points_list.ravel()][:, 0]
-        line_dimensions[self._vertex_begin:self._vertex_end, 1] = numpy.tile(self._line_thicknesses, (1, 2)).reshape((-1, 1))[needed_points_list.ravel()][:, 0]
-
-        # Create an array with feedrates for each line
-        feedrates[self._vertex_begin:self._vertex_end] = numpy.tile(self._line_feedrates, (1, 2)).reshape((-1, 1))[needed_points_list.ravel()][:, 0]
-
-        extruders[self._vertex_begin:self._vertex_end] = self._extruder
-
-        # Convert type per vertex to type per line
-        line_types[self._vertex_begin:self._vertex_end] = numpy.tile(self._types, (1, 2)).reshape((-1, 1))[needed_points_list.ravel()][:, 0]
+        vertices[vertex_range, :] = self._data[point_index, :]
+
+        # The colors, line widths, thicknesses, feedrates and types of the line each vertex belongs to.
+        colors[vertex_range, :] = self._colors.reshape((-1, 4))[line_index]
+        line_dimensions[vertex_range, 0] = self._line_widths.reshape(-1)[line_index]
+        line_dimensions[vertex_range, 1] = self._line_thicknesses.reshape(-1)[line_index]
+        feedrates[vertex_range] = self._line_feedrates.reshape(-1)[line_index]
+        extruders[vertex_range] = self._extruder
+        line_types[vertex_range] = self._types.reshape(-1)[line_index]
 
         # The relative values of begin and end indices have already been set in buildCache,
         # so we only need to offset them to the parents offset.
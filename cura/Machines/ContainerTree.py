@@ -9,6 +9,7 @@ from UM.Signal import Signal
 import cura.CuraApplication  # Imported like this to prevent circular dependencies.
 from cura.Machines.MachineNode import MachineNode
 from cura.Settings.GlobalStack import GlobalStack  # To listen only to global stacks being added.
+from cura.Utils.BootProfiler import BootProfiler
 
 from typing import Dict, List, Optional, TYPE_CHECKING
 import time
@@ -115,7 +116,8 @@ class ContainerTree:
 
             if definition_id not in self._machines:
                 start_time = time.time()
-                self._machines[definition_id] = MachineNode(definition_id)
+                with BootProfiler.getInstance().measure("ContainerTree machine node", definition_id = definition_id):
+                    self._machines[definition_id] = MachineNode(definition_id)
                 self._machines[definition_id].materialsChanged.connect(ContainerTree.getInstance().materialsChanged)
                 Logger.log("d", "Adding container tree for {definition_id} took {duration} seconds.".format(definition_id = definition_id, duration = time.time() - start_time))
             return self._machines[definition_id]
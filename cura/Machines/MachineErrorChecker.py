@@ -1,19 +1,24 @@
 # Copyright (c) 2020 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
+import threading
 import time
 
 from collections import deque
 
 from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtProperty
-from typing import Optional, Any, Set
+from typing import Callable, Deque, Dict, Optional, Any, Set, Tuple, TYPE_CHECKING
 
 from UM.Logger import Logger
 from UM.Settings.SettingDefinition import SettingDefinition
+from UM.Settings.SettingRelation import RelationType
 from UM.Settings.Validator import ValidatorState
 
 import cura.CuraApplication
 
+if TYPE_CHECKING:
+    from UM.Settings.ContainerStack import ContainerStack
+
 
 class MachineErrorChecker(QObject):
     """This class performs setting error checks for the currently active machine.
@@ -23,22 +28,30 @@ class MachineErrorChecker(QObject):
     stack. According to my profiling results, the maximal runtime for such a sub-task is <0.03 secs, which should be
     good enough. Moreover, if any changes happened to the machine, we can cancel the check in progress without wait
     for it to finish the complete work.
+
+    All settings are only checked when the machine or the containers in its stacks change. When a setting value
+    changes, only that setting and the settings that depend on it (following the setting relations) are checked again,
+    and the settings that have errors are kept in between checks.
     """
 
+    _error_states = (ValidatorState.Exception, ValidatorState.MaximumError, ValidatorState.MinimumError, ValidatorState.Invalid)
+
     def __init__(self, parent: Optional[QObject] = None) -> None:
         super().__init__(parent)
 
         self._global_stack = None
 
         self._has_errors = True  # Result of the error check, indicating whether there are errors in the stack
-        self._error_keys = set()  # type: Set[str] # A set of settings keys that have errors
-        self._error_keys_in_progress = set()  # type: Set[str]  # The variable that stores the results of the currently in progress check
+        self._error_keys: Set[Tuple[str, str]] = set()  # The (stack ID, settings key) pairs that have errors
 
-        self._stacks_and_keys_to_check = None  # type: Optional[deque]  # a FIFO queue of tuples (stack, key) to check for errors
+        self._stacks_and_keys_to_check: Optional[Deque[Tuple["ContainerStack", str]]] = None  # a FIFO queue of tuples (stack, key) to check for errors
+        self._checking_all_keys = False  # Whether the check in progress checks all keys, or only the changed ones.
 
         self._need_to_check = False  # Whether we need to schedule a new check or not. This flag is set when a new
                                      # error check needs to take place while there is already one running at the moment.
         self._check_in_progress = False  # Whether there is an error check running in progress at the moment.
+        self._result_ready = threading.Event()  # Set when there is no check scheduled or in progress, for other threads.
+        self._result_ready.set()
 
         self._application = cura.CuraApplication.CuraApplication.getInstance()
         self._machine_manager = self._application.getMachineManager()
@@ -47,9 +60,11 @@ class MachineErrorChecker(QObject):
 
         self._setCheckTimer()
 
-        self._keys_to_check = set()  # type: Set[str]
+        self._keys_to_check = set()  # type: Set[str]  # The settings of which the value changed since the last check.
+        self._check_all_keys = True  # Whether all settings need to be checked, since the machine or its containers changed.
+        self._dependents: Dict[str, Set[str]] = {}  # By setting key, the settings that depend on it, directly or indirectly.
 
-        self._num_keys_to_check_per_update = 1
+        self._max_check_time_per_update = 0.01  # In seconds. Keys are checked until this time is up, before handling other events.
 
     def initialize(self) -> None:
         self._error_check_timer.timeout.connect(self._rescheduleCheck)
@@ -84,6 +99,7 @@ class MachineErrorChecker(QObject):
                 extruder.containersChanged.disconnect(self.startErrorCheck)
 
         self._global_stack = self._machine_manager.activeMachine
+        self._dependents = {}  # The machine may have other setting definitions.
 
         if self._global_stack:
             self._global_stack.propertyChanged.connect(self.startErrorCheckPropertyChanged)
@@ -105,10 +121,26 @@ class MachineErrorChecker(QObject):
     def needToWaitForResult(self) -> bool:
         return self._need_to_check or self._check_in_progress
 
+    def getErrorKeys(self) -> Set[str]:
+        """The keys of the settings that had errors in any of the stacks, as of the last check."""
+
+        return {key for _, key in self._error_keys}
+
+    def waitForResult(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the error check is finished. This is meant for other threads than the main thread, which runs the check.
+
+        :param timeout: The maximum time to wait, in seconds, or None to wait for as long as it takes.
+        :return: Whether the check is finished.
+        """
+
+        return self._result_ready.wait(timeout)
+
     def startErrorCheckPropertyChanged(self, key: str, property_name: str) -> None:
         """Start the error check for property changed
         this is separate from the startErrorCheck because it ignores a number property types
 
+        Only the setting and the settings that depend on it are checked.
+
         :param key:
         :param property_name:
         """
@@ -116,19 +148,30 @@ class MachineErrorChecker(QObject):
         if property_name != "value":
             return
         self._keys_to_check.add(key)
-        self.startErrorCheck()
+        self._scheduleCheck()
 
     def startErrorCheck(self, *args: Any) -> None:
-        """Starts the error check timer to schedule a new error check.
+        """Starts the error check timer to schedule a new error check of all settings.
 
         :param args:
         """
 
+        self._check_all_keys = True
+        self._scheduleCheck()
+
+    def _scheduleCheck(self) -> None:
         if not self._check_in_progress:
             self._need_to_check = True
-            self.needToWaitForResultChanged.emit()
+            self._emitNeedToWaitForResultChanged()
         self._error_check_timer.start()
 
+    def _emitNeedToWaitForResultChanged(self) -> None:
+        if self.needToWaitForResult:
+            self._result_ready.clear()
+        else:
+            self._result_ready.set()
+        self.needToWaitForResultChanged.emit()
+
     def _rescheduleCheck(self) -> None:
         """This function is called by the timer to reschedule a new error check.
 
@@ -138,84 +181,142 @@ class MachineErrorChecker(QObject):
 
         if self._check_in_progress and not self._need_to_check:
             self._need_to_check = True
-            self.needToWaitForResultChanged.emit()
+            self._emitNeedToWaitForResultChanged()
             return
 
-        self._error_keys_in_progress = set()
         self._need_to_check = False
-        self.needToWaitForResultChanged.emit()
 
         global_stack = self._machine_manager.activeMachine
         if global_stack is None:
             Logger.log("i", "No active machine, nothing to check.")
+            self._emitNeedToWaitForResultChanged()
             return
 
         # Populate the (stack, key) tuples to check
+        self._checking_all_keys = self._check_all_keys
+        if self._checking_all_keys:
+            self._error_keys = set()
+        keys_to_check = self._getKeysToCheck(global_stack)
+        self._check_all_keys = False
+        self._keys_to_check = set()
         self._stacks_and_keys_to_check = deque()
         for stack in global_stack.extruderList:
-            if not self._keys_to_check:
-                self._keys_to_check = stack.getAllKeys()
-
-            for key in self._keys_to_check:
+            stack_keys = stack.getAllKeys() if keys_to_check is None else keys_to_check
+            for key in stack_keys:
                 self._stacks_and_keys_to_check.append((stack, key))
 
+        self._check_in_progress = True
+        self._emitNeedToWaitForResultChanged()
         self._application.callLater(self._checkStack)
         self._check_start_time = time.time()
-        Logger.log("d", "New error check scheduled.")
+        Logger.log("d", "New error check scheduled for {count} settings.".format(count = len(self._stacks_and_keys_to_check)))
+
+    def _getKeysToCheck(self, global_stack: "ContainerStack") -> Optional[Set[str]]:
+        """The keys of the settings to check, or None to check all settings."""
+
+        if self._checking_all_keys:
+            return None
+        keys = set()  # type: Set[str]
+        for key in self._keys_to_check:
+            keys.add(key)
+            keys |= self._getDependents(global_stack, key)
+        return keys
+
+    def _getDependents(self, global_stack: "ContainerStack", key: str) -> Set[str]:
+        """Get the keys of the settings of which a property depends on a setting, directly or indirectly."""
+
+        if key not in self._dependents:
+            self._dependents[key] = self.findDependents(key, global_stack.getSettingDefinition)
+        return self._dependents[key]
+
+    @staticmethod
+    def findDependents(key: str, get_definition: Callable[[str], Optional[SettingDefinition]]) -> Set[str]:
+        """Follow the relations of the setting definitions to find all settings that depend on a setting.
+
+        Any property counts, so also settings of which the minimum value or whether it's enabled depends on the
+        setting.
+
+        :param key: The key of the setting that changed.
+        :param get_definition: Gets the definition of a setting by its key.
+        :return: The keys of the settings that depend on it, directly or indirectly, not including the setting itself.
+        """
+
+        dependents = set()  # type: Set[str]
+        definition = get_definition(key)
+        if definition is None:
+            return dependents
+        to_visit: Deque[SettingDefinition] = deque([definition])
+        while to_visit:
+            current = to_visit.popleft()
+            for relation in current.relations:
+                if relation.type == RelationType.RequiresTarget:
+                    continue
+                target_key = relation.target.key
+                if target_key == key or target_key in dependents:
+                    continue
+                dependents.add(target_key)
+                to_visit.append(relation.target)
+        return dependents
 
     def _checkStack(self) -> None:
         if self._need_to_check:
             Logger.log("d", "Need to check for errors again. Discard the current progress and reschedule a check.")
+            # The keys that were not checked yet still need to be checked with the next check.
+            if self._checking_all_keys:
+                self._check_all_keys = True
+            elif self._stacks_and_keys_to_check:
+                self._keys_to_check |= {key for _, key in self._stacks_and_keys_to_check}
             self._check_in_progress = False
-            self._application.callLater(self.startErrorCheck)
+            self._application.callLater(self._scheduleCheck)
             return
 
-        self._check_in_progress = True
-
-        for i in range(self._num_keys_to_check_per_update):
-            # If there is nothing to check any more, it means there is no error.
-            if not self._stacks_and_keys_to_check:
-                # Finish
-                self._setResult(False)
-                return
-
+        deadline = time.perf_counter() + self._max_check_time_per_update
+        while self._stacks_and_keys_to_check:
             # Get the next stack and key to check
             stack, key = self._stacks_and_keys_to_check.popleft()
+            if self._hasError(stack, key):
+                self._error_keys.add((stack.getId(), key))
+            else:
+                self._error_keys.discard((stack.getId(), key))
+            if time.perf_counter() >= deadline:
+                break
+
+        # If there is nothing to check any more, the settings with errors are known.
+        if not self._stacks_and_keys_to_check:
+            self._setResult(bool(self._error_keys))
+            return
 
-            enabled = stack.getProperty(key, "enabled")
-            if not enabled:
-                continue
-
-            validation_state = stack.getProperty(key, "validationState")
-            if validation_state is None:
-                # Setting is not validated. This can happen if there is only a setting definition.
-                # We do need to validate it, because a setting definitions value can be set by a function, which could
-                # be an invalid setting.
-                definition = stack.getSettingDefinition(key)
-                validator_type = SettingDefinition.getValidatorForType(definition.type)
-                if validator_type:
-                    validator = validator_type(key)
-                    validation_state = validator(stack)
-            if validation_state in (ValidatorState.Exception, ValidatorState.MaximumError, ValidatorState.MinimumError, ValidatorState.Invalid):
-                # Since we don't know if any of the settings we didn't check is has an error value, store the list for the
-                # next check.
-                keys_to_recheck = {setting_key for stack, setting_key in self._stacks_and_keys_to_check}
-                keys_to_recheck.add(key)
-                self._setResult(True, keys_to_recheck = keys_to_recheck)
-                return
-
-        # Schedule the check for the next key
+        # Schedule the check for the next keys
         self._application.callLater(self._checkStack)
 
-    def _setResult(self, result: bool, keys_to_recheck = None) -> None:
+    @classmethod
+    def _hasError(cls, stack: "ContainerStack", key: str) -> bool:
+        enabled = stack.getProperty(key, "enabled")
+        if not enabled:
+            return False
+
+        validation_state = stack.getProperty(key, "validationState")
+        if validation_state is None:
+            # Setting is not validated. This can happen if there is only a setting definition.
+            # We do need to validate it, because a setting definitions value can be set by a function, which could
+            # be an invalid setting.
+            definition = stack.getSettingDefinition(key)
+            if definition is None:
+                return False
+            validator_type = SettingDefinition.getValidatorForType(definition.type)
+            if validator_type:
+                validator = validator_type(key)
+                validation_state = validator(stack)
+        return validation_state in cls._error_states
+
+    def _setResult(self, result: bool) -> None:
         if result != self._has_errors:
             self._has_errors = result
             self.hasErrorUpdated.emit()
             self._machine_manager.stacksValidationChanged.emit()
-        self._keys_to_check = keys_to_recheck if keys_to_recheck else set()
         self._need_to_check = False
         self._check_in_progress = False
-        self.needToWaitForResultChanged.emit()
+        self._emitNeedToWaitForResultChanged()
         self.errorCheckFinished.emit()
         execution_time = time.time() - self._check_start_time
         Logger.info(f"Error check finished, result = {result}, time = {execution_time:.2f}s")
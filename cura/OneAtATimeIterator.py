@@ -5,7 +5,6 @@ from typing import List
 
 from UM.Scene.Iterator import Iterator
 from UM.Scene.SceneNode import SceneNode
-from functools import cmp_to_key
 
 from cura.HitChecker import HitChecker
 from cura.PrintOrderManager import PrintOrderManager
@@ -66,35 +65,7 @@ class OneAtATimeIterator(Iterator.Iterator):
         if hit_checker.anyTwoNodesBlockEachOther(node_list):
             return []  # No solution
 
-        # Sort the original list so that items that block the most other objects are at the beginning.
-        # This does not decrease the worst case running time, but should improve it in most cases.
-        node_list = sorted(node_list, key = cmp_to_key(hit_checker.calculateScore))
-
-        todo_node_list = [_ObjectOrder([], node_list)]
-        while len(todo_node_list) > 0:
-            current = todo_node_list.pop()
-            for node in current.todo:
-                # Check if the object can be placed with what we have and still allows for a solution in the future
-                if hit_checker.canPrintAfter(node, current.order) and hit_checker.canPrintBefore(node, current.todo):
-                    # We found a possible result. Create new todo & order list.
-                    new_todo_list = current.todo[:]
-                    new_todo_list.remove(node)
-                    new_order = current.order[:] + [node]
-                    if len(new_todo_list) == 0:
-                        # We have no more nodes to check, so quit looking.
-                        return new_order # Solution found!
-                    todo_node_list.append(_ObjectOrder(new_order, new_todo_list))
-        return []  # No result found!
-
-
-class _ObjectOrder:
-    """Internal object used to keep track of a possible order in which to print objects."""
-
-    def __init__(self, order: List[SceneNode], todo: List[SceneNode]) -> None:
-        """Creates the _ObjectOrder instance.
-
-        :param order: List of indices in which to print objects, ordered by printing order.
-        :param todo: List of indices which are not yet inserted into the order list.
-        """
-        self.order = order
-        self.todo = todo
+        # Sort the original list so that items that block the most other objects are at the end. Of the objects that
+        # can be printed next, the last one is taken.
+        node_list = sorted(node_list, key = hit_checker.getBlockedCount)
+        return hit_checker.getPrintOrder(node_list)
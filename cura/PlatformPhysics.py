@@ -12,6 +12,7 @@ from UM.Scene.Selection import Selection
 from UM.Scene.SceneNodeSettings import SceneNodeSettings
 
 from cura.Scene.ConvexHullDecorator import ConvexHullDecorator
+from cura.Scene.SpatialIndex import SpatialIndex
 
 from cura.Operations import PlatformPhysicsOperation
 from cura.Scene import ZOffsetDecorator
@@ -36,6 +37,7 @@ class PlatformPhysics:
         self._move_factor = 1.1  # By how much should we multiply overlap to calculate a new spot?
         self._max_overlap_checks = 10  # How many times should we try to find a new spot per tick?
         self._minimum_gap = 2  # It is a minimum distance (in mm) between two models, applicable for small models
+        self._hull_index = SpatialIndex()  # The bounds of the convex hulls of the nodes, to find the nodes that may overlap.
 
         Application.getInstance().getPreferences().addPreference("physics/automatic_push_free", False)
         Application.getInstance().getPreferences().addPreference("physics/automatic_drop_down", True)
@@ -69,6 +71,9 @@ class PlatformPhysics:
         transformed_nodes = []
 
         nodes = list(BreadthFirstIterator(root))
+        if app_automatic_push_free:
+            self._updateHullIndex(nodes)
+        node_order = {id(node): index for index, node in enumerate(nodes)}  # To check the other nodes in the same order every time.
 
         # Only check nodes inside build area.
         nodes = [node for node in nodes if (hasattr(node, "_outside_buildarea") and not node._outside_buildarea)]
@@ -99,8 +104,11 @@ class PlatformPhysics:
                 if node.getSetting(SceneNodeSettings.LockPosition):
                     continue
 
-                # Check for collisions between convex hulls
-                for other_node in BreadthFirstIterator(root):
+                # Check for collisions between convex hulls, only with the nodes of which the hulls are close enough.
+                query_vector = move_vector
+                candidates = self._findCollisionCandidates(node, move_vector, node_order, -1)
+                while candidates:
+                    other_node = candidates.pop(0)
                     # Ignore root, ourselves and anything that is not a normal SceneNode.
                     if other_node is root or not issubclass(type(other_node), SceneNode) or other_node is node or other_node.callDecoration("getBuildPlateNumber") != node.callDecoration("getBuildPlateNumber"):
                         continue
@@ -168,6 +176,10 @@ class PlatformPhysics:
                                 # Simply waiting for the next tick seems to resolve this correctly.
                                 overlap = None
 
+                    if move_vector is not query_vector:  # Moved, so different nodes may be in the way now.
+                        query_vector = move_vector
+                        candidates = self._findCollisionCandidates(node, move_vector, node_order, node_order[id(other_node)])
+
             if not Vector.Null.equals(move_vector, epsilon = 1e-5):
                 transformed_nodes.append(node)
                 op = PlatformPhysicsOperation.PlatformPhysicsOperation(node, move_vector)
@@ -178,6 +190,40 @@ class PlatformPhysics:
         # After moving, we have to evaluate the boundary checks for nodes
         build_volume.updateNodeBoundaryCheck()
 
+    def _updateHullIndex(self, nodes):
+        """Update the bounds of the convex hulls of the nodes in the index, and remove the nodes that are gone."""
+
+        indexed_nodes = set()
+        for node in nodes:
+            if not isinstance(node, SceneNode) or node.callDecoration("isNonPrintingMesh") or not node.callDecoration("getConvexHull"):
+                continue
+            bounds = self._getHullBounds(node)
+            if bounds is not None:
+                self._hull_index.update(node, bounds)
+                indexed_nodes.add(id(node))
+        for node in self._hull_index.getItems():
+            if id(node) not in indexed_nodes:
+                self._hull_index.remove(node)
+
+    def _findCollisionCandidates(self, node, move_vector, node_order, after_index):
+        """Get the nodes of which the convex hulls may overlap with those of a node, after it is moved.
+
+        :param node_order: The index of each node in the scene, to sort the nodes by.
+        :param after_index: Only get the nodes after this index.
+        """
+
+        bounds = self._getHullBounds(node)
+        if bounds is None:
+            return []
+        bounds = (bounds[0] + move_vector.x, bounds[1] + move_vector.z, bounds[2] + move_vector.x, bounds[3] + move_vector.z)
+        candidates = [other_node for other_node in self._hull_index.query(bounds) if node_order.get(id(other_node), -1) > after_index]
+        candidates.sort(key = lambda other_node: node_order[id(other_node)])
+        return candidates
+
+    @staticmethod
+    def _getHullBounds(node):
+        return SpatialIndex.getPolygonBounds([node.callDecoration("getConvexHull"), node.callDecoration("getConvexHullHead")])
+
     def _onToolOperationStarted(self, tool):
         self._enabled = False
 
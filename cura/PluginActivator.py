@@ -0,0 +1,110 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from contextlib import contextmanager
+import functools
+from typing import Dict, Iterator, List, Set, TYPE_CHECKING
+
+from UM.Logger import Logger
+from UM.PluginError import PluginNotFoundError
+
+if TYPE_CHECKING:
+    from cura.CuraApplication import CuraApplication
+
+
+class PluginActivator:
+    """Loads file reader plug-ins when a file that they read is first opened, instead of at start-up.
+
+    A reader plug-in can declare the extensions of the files that it reads in the "activation" entry of its plugin.json,
+    for example ``"activation": {"file_extensions": ["x3d"]}``. Such a plug-in is not imported nor registered while the
+    plug-ins are loaded at start-up. The application activates it on the main thread as soon as a file with one of
+    these extensions is opened, before the file is read in a job. Asking for the plug-in object from the plug-in
+    registry loads the plug-in as well.
+
+    The metadata of the plug-in is still read at start-up, so its file types are listed in the file dialogs. Its
+    ``__init__.py`` should therefore only import the implementation of the plug-in in ``register()``.
+
+    Writers can't be deferred. Output devices list the file formats of the writers that are loaded before they ask for
+    a writer, so a deferred writer would never be used.
+    """
+
+    TriggerKinds = ("file_extensions", )
+
+    def __init__(self, application: "CuraApplication") -> None:
+        self._application = application
+        self._plugin_registry = application.getPluginRegistry()
+
+        self._deferred_plugin_ids: Set[str] = set()
+        self._triggers: Dict[str, Dict[str, List[str]]] = {kind: {} for kind in self.TriggerKinds}  # For each kind, the plug-ins by trigger.
+
+    @contextmanager
+    def deferTriggeredPlugins(self) -> Iterator[None]:
+        """Defer loading the plug-ins that declare activation triggers, while loading all plug-ins in this block.
+
+        Only the registry's own loading of plug-ins is changed, and only within this block.
+        """
+
+        load_plugin = self._plugin_registry.loadPlugin
+
+        @functools.wraps(load_plugin)
+        def loadOrDeferPlugin(plugin_id: str) -> None:
+            if not self._deferPlugin(plugin_id):
+                load_plugin(plugin_id)
+
+        self._plugin_registry.loadPlugin = loadOrDeferPlugin
+        try:
+            yield
+        finally:
+            self._plugin_registry.loadPlugin = load_plugin
+        if self._deferred_plugin_ids:
+            Logger.info("Deferred loading the plug-ins {plugin_ids} until they are needed.".format(plugin_ids = ", ".join(sorted(self._deferred_plugin_ids))))
+
+    def getDeferredPluginIds(self) -> List[str]:
+        """The plug-ins that declared activation triggers, and that didn't get activated yet."""
+
+        return sorted(self._deferred_plugin_ids)
+
+    def activatePlugin(self, plugin_id: str) -> None:
+        """Load a deferred plug-in now. Nothing happens if it was not deferred or was already activated.
+
+        Must be called on the main thread, since the plug-in is registered with the application.
+        """
+
+        if plugin_id not in self._deferred_plugin_ids:
+            return
+        self._deferred_plugin_ids.remove(plugin_id)
+        Logger.info("Activating the deferred plug-in {plugin_id}.".format(plugin_id = plugin_id))
+        try:
+            self._plugin_registry.loadPlugin(plugin_id)
+        except PluginNotFoundError:
+            Logger.warning("Unable to activate the deferred plug-in {plugin_id}, since it can't be found anymore.".format(plugin_id = plugin_id))
+
+    def activateFileExtension(self, file_name: str) -> None:
+        """Load the deferred plug-ins for reading a file. Must be called on the main thread, before reading the file."""
+
+        file_name = file_name.lower()
+        for extension, plugin_ids in list(self._triggers["file_extensions"].items()):
+            if file_name.endswith("." + extension):
+                for plugin_id in plugin_ids:
+                    self.activatePlugin(plugin_id)
+
+    def _deferPlugin(self, plugin_id: str) -> bool:
+        """Store the activation triggers of a plug-in, if it declares any.
+
+        :return: Whether the plug-in is deferred. If not, it needs to be loaded now.
+        """
+
+        activation = self._plugin_registry.getMetaData(plugin_id).get("plugin", {}).get("activation")
+        if not activation:
+            return False
+        if not isinstance(activation, dict) or not set(activation).issubset(self.TriggerKinds):
+            Logger.warning("Plug-in {plugin_id} has invalid activation triggers, so it's loaded at start-up.".format(plugin_id = plugin_id))
+            return False
+
+        for kind, triggers in activation.items():
+            for trigger in triggers:
+                if kind == "file_extensions":
+                    trigger = trigger.lower().lstrip(".")
+                self._triggers[kind].setdefault(trigger, []).append(plugin_id)
+        self._deferred_plugin_ids.add(plugin_id)
+        return True
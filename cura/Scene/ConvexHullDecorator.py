@@ -1,8 +1,6 @@
 # Copyright (c) 2020 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
-from PyQt6.QtCore import QTimer
-
 from UM.Application import Application
 from UM.Math.Polygon import Polygon
 from UM.Scene.SceneNodeDecorator import SceneNodeDecorator
@@ -10,10 +8,13 @@ from UM.Settings.ContainerRegistry import ContainerRegistry
 
 from cura.Settings.ExtruderManager import ExtruderManager
 from cura.Scene import ConvexHullNode
+from cura.Scene.ConvexHullRecomputeJob import ConvexHullRecomputeScheduler
 
 import numpy
+import threading
+import weakref
 
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, Optional, Tuple
 
 if TYPE_CHECKING:
     from UM.Scene.SceneNode import SceneNode
@@ -28,6 +29,13 @@ class ConvexHullDecorator(SceneNodeDecorator):
     If a scene node has a convex hull decorator, it will have a shadow in which other objects can not be printed.
     """
 
+    _TiltTolerance = 1e-6
+    """How much the projection of a mesh on the build plate may depend on the height, to still count as not tilted."""
+
+    # The points of the 2D convex hulls of meshes in their own coordinates, by ID of the mesh.
+    _local_2d_convex_hulls = weakref.WeakValueDictionary()  # type: weakref.WeakValueDictionary[int, numpy.ndarray]
+    _local_2d_convex_hulls_lock = threading.Lock()
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -36,15 +44,8 @@ class ConvexHullDecorator(SceneNodeDecorator):
 
         self._global_stack = None  # type: Optional[GlobalStack]
 
-        # Make sure the timer is created on the main thread
-        self._recompute_convex_hull_timer = None  # type: Optional[QTimer]
-        self._timer_scheduled_to_be_created = False
-        from cura.CuraApplication import CuraApplication
-        if CuraApplication.getInstance() is not None:
-            self._timer_scheduled_to_be_created = True
-            CuraApplication.getInstance().callLater(self.createRecomputeConvexHullTimer)
-
         self._raft_thickness = 0.0
+        from cura.CuraApplication import CuraApplication
         self._build_volume = CuraApplication.getInstance().getBuildVolume()
         self._build_volume.raftThicknessChanged.connect(self._onChanged)
 
@@ -58,12 +59,6 @@ class ConvexHullDecorator(SceneNodeDecorator):
 
         self._onGlobalStackChanged()
 
-    def createRecomputeConvexHullTimer(self) -> None:
-        self._recompute_convex_hull_timer = QTimer()
-        self._recompute_convex_hull_timer.setInterval(200)
-        self._recompute_convex_hull_timer.setSingleShot(True)
-        self._recompute_convex_hull_timer.timeout.connect(self.recomputeConvexHull)
-
     def setNode(self, node: "SceneNode") -> None:
         previous_node = self._node
         # Disconnect from previous node signals
@@ -184,18 +179,16 @@ class ConvexHullDecorator(SceneNodeDecorator):
         return printing_area
 
     def recomputeConvexHullDelayed(self) -> None:
-        """The same as recomputeConvexHull, but using a timer if it was set."""
-        if self._recompute_convex_hull_timer is not None:
-            self._recompute_convex_hull_timer.start()
-        else:
-            from cura.CuraApplication import CuraApplication
-            if not self._timer_scheduled_to_be_created:
-                # The timer is not created and we never scheduled it. Time to create it now!
-                CuraApplication.getInstance().callLater(self.createRecomputeConvexHullTimer)
-            # Now we know for sure that the timer has been scheduled for creation, so we can try this again.
-            CuraApplication.getInstance().callLater(self.recomputeConvexHullDelayed)
-
-    def recomputeConvexHull(self) -> None:
+        """The same as recomputeConvexHull, but delayed and batched with the hulls of other nodes that change."""
+
+        ConvexHullRecomputeScheduler.getInstance().schedule(self)
+
+    def recomputeConvexHull(self, printing_area: Optional[Polygon] = None) -> None:
+        """Update the node that shows the convex hull.
+
+        :param printing_area: The printing area of the node, if it was just computed already.
+        """
+
         if self._node is None or not self.__isDescendant(self._root, self._node):
             if self._convex_hull_node:
                 # Convex hull node still exists, but the node is removed or no longer in the scene.
@@ -205,7 +198,9 @@ class ConvexHullDecorator(SceneNodeDecorator):
 
         if self._convex_hull_node:
             self._convex_hull_node.setParent(None)
-        hull_node = ConvexHullNode.ConvexHullNode(self._node, self.getPrintingArea(), self._raft_thickness, self._root)
+        if printing_area is None:
+            printing_area = self.getPrintingArea()
+        hull_node = ConvexHullNode.ConvexHullNode(self._node, printing_area, self._raft_thickness, self._root)
         self._convex_hull_node = hull_node
 
     def _onSettingValueChanged(self, key: str, property_name: str) -> None:
@@ -219,14 +214,13 @@ class ConvexHullDecorator(SceneNodeDecorator):
             self._onChanged()
 
     def _init2DConvexHullCache(self) -> None:
-        # Cache for the group code path in _compute2DConvexHull()
-        self._2d_convex_hull_group_child_polygon = None  # type: Optional[Polygon]
-        self._2d_convex_hull_group_result = None  # type: Optional[Polygon]
+        # Cache for the group code path in _compute2DConvexHull(): the points of the children and the hull.
+        self._2d_convex_hull_group_cache: Optional[Tuple[Polygon, Polygon]] = None
 
-        # Cache for the mesh code path in _compute2DConvexHull()
-        self._2d_convex_hull_mesh = None  # type: Optional[MeshData]
-        self._2d_convex_hull_mesh_world_transform = None  # type: Optional[Matrix]
-        self._2d_convex_hull_mesh_result = None  # type: Optional[Polygon]
+        # Cache for the mesh code path in _compute2DConvexHull(): the mesh, its world transformation and the hull.
+        self._2d_convex_hull_mesh_cache: Optional[Tuple[MeshData, Matrix, Polygon]] = None
+        # The mesh and the points of its 2D convex hull in its own coordinates.
+        self._2d_convex_hull_local: Optional[Tuple[MeshData, numpy.ndarray]] = None
 
     def _compute2DConvexHull(self) -> Optional[Polygon]:
         if self._node is None:
@@ -246,15 +240,15 @@ class ConvexHullDecorator(SceneNodeDecorator):
             child_polygon = Polygon(points)
 
             # Check the cache
-            if child_polygon == self._2d_convex_hull_group_child_polygon:
-                return self._2d_convex_hull_group_result
+            cache = self._2d_convex_hull_group_cache
+            if cache is not None and child_polygon == cache[0]:
+                return cache[1]
 
             convex_hull = child_polygon.getConvexHull() #First calculate the normal convex hull around the points.
             offset_hull = self._offsetHull(convex_hull) #Then apply the offset from the settings.
 
-            # Store the result in the cache
-            self._2d_convex_hull_group_child_polygon = child_polygon
-            self._2d_convex_hull_group_result = offset_hull
+            # Store the result in the cache. Stored in one go, since hulls may be computed on a worker thread.
+            self._2d_convex_hull_group_cache = (child_polygon, offset_hull)
 
             return offset_hull
 
@@ -268,45 +262,102 @@ class ConvexHullDecorator(SceneNodeDecorator):
             world_transform = self._node.getWorldTransformation(copy = True)
 
             # Check the cache
-            if mesh is self._2d_convex_hull_mesh and world_transform == self._2d_convex_hull_mesh_world_transform:
-                return self._offsetHull(self._2d_convex_hull_mesh_result)
-
-            vertex_data = mesh.getConvexHullTransformedVertices(world_transform)
-            # Don't use data below 0.
-            # TODO; We need a better check for this as this gives poor results for meshes with long edges.
-            # Do not throw away vertices: the convex hull may be too small and objects can collide.
-            # vertex_data = vertex_data[vertex_data[:,1] >= -0.01]
-
-            if vertex_data is not None and len(vertex_data) >= 4:  # type: ignore # mypy and numpy don't play along well just yet.
-                # Round the vertex data to 1/10th of a mm, then remove all duplicate vertices
-                # This is done to greatly speed up further convex hull calculations as the convex hull
-                # becomes much less complex when dealing with highly detailed models.
-                vertex_data = numpy.round(vertex_data, 1)
+            cache = self._2d_convex_hull_mesh_cache
+            if cache is not None and mesh is cache[0] and world_transform == cache[1]:
+                convex_hull = cache[2]
+            else:
+                convex_hull = self._transformLocal2DConvexHull(mesh, world_transform)
+                if convex_hull is None:  # The hull changes shape with this transformation, so compute it from the vertices.
+                    convex_hull = self._computeProjected2DConvexHull(mesh.getConvexHullTransformedVertices(world_transform))
+                # Store the result in the cache. Stored in one go, since hulls may be computed on a worker thread.
+                self._2d_convex_hull_mesh_cache = (mesh, world_transform, convex_hull)
 
-                vertex_data = vertex_data[:, [0, 2]]  # Drop the Y components to project to 2D.
+            if len(convex_hull.getPoints()) == 0:
+                return convex_hull
+            return self._offsetHull(convex_hull)
 
-                # Grab the set of unique points.
-                #
-                # This basically finds the unique rows in the array by treating them as opaque groups of bytes
-                # which are as long as the 2 float64s in each row, and giving this view to numpy.unique() to munch.
-                # See http://stackoverflow.com/questions/16970982/find-unique-rows-in-numpy-array
-                vertex_byte_view = numpy.ascontiguousarray(vertex_data).view(
-                    numpy.dtype((numpy.void, vertex_data.dtype.itemsize * vertex_data.shape[1])))
-                _, idx = numpy.unique(vertex_byte_view, return_index = True)
-                vertex_data = vertex_data[idx]  # Select the unique rows by index.
+    def _transformLocal2DConvexHull(self, mesh: "MeshData", world_transform: "Matrix") -> Optional[Polygon]:
+        """Get the convex hull of a mesh by transforming the convex hull of the mesh in its own coordinates.
 
-                hull = Polygon(vertex_data)
+        This works for every transformation of which the projection on the build plate doesn't depend on the height,
+        like moving, rotating around the vertical axis and scaling, which is all that most objects ever get. The hull in
+        the coordinates of the mesh is only computed once per mesh, and only its few points need to be transformed.
 
-                if len(vertex_data) >= 3:
-                    convex_hull = hull.getConvexHull()
-                    offset_hull = self._offsetHull(convex_hull)
+        :return: The convex hull, or None if the transformation tilts the mesh.
+        """
 
-            # Store the result in the cache
-            self._2d_convex_hull_mesh = mesh
-            self._2d_convex_hull_mesh_world_transform = world_transform
-            self._2d_convex_hull_mesh_result = convex_hull
+        matrix = world_transform.getData()
+        if abs(matrix[0, 1]) > self._TiltTolerance or abs(matrix[2, 1]) > self._TiltTolerance:
+            return None
 
-            return offset_hull
+        local_hull = self._2d_convex_hull_local
+        if local_hull is None or local_hull[0] is not mesh:
+            local_hull = (mesh, self._getLocal2DConvexHullPoints(mesh))
+            self._2d_convex_hull_local = local_hull
+        points = local_hull[1]
+        if len(points) == 0:
+            return Polygon([])
+
+        # Only the X and Z coordinates of the mesh end up on the build plate. Drop the Y components to project to 2D.
+        linear = matrix[numpy.ix_([0, 2], [0, 2])]
+        points = points.dot(linear.T) + matrix[[0, 2], 3]
+        if numpy.linalg.det(linear) < 0:  # Mirrored, so keep the points in the same winding order.
+            points = points[::-1]
+        return Polygon(points)
+
+    @classmethod
+    def _getLocal2DConvexHullPoints(cls, mesh: "MeshData") -> numpy.ndarray:
+        """Get the points of the 2D convex hull of a mesh in its own coordinates, shared by all nodes with the mesh."""
+
+        with cls._local_2d_convex_hulls_lock:
+            points = cls._local_2d_convex_hulls.get(id(mesh))
+        if points is None:
+            # Not rounded, since the nodes may scale the points up, and the rounding error with them.
+            points = cls._computeProjected2DConvexHull(mesh.getConvexHullVertices(), round_vertices = False).getPoints()
+            # The mesh can't be replaced by another with the same ID while the points are in use, since every decorator
+            # that uses the points also refers to the mesh.
+            with cls._local_2d_convex_hulls_lock:
+                cls._local_2d_convex_hulls[id(mesh)] = points
+        return points
+
+    @staticmethod
+    def _computeProjected2DConvexHull(vertex_data: Optional[numpy.ndarray], round_vertices: bool = True) -> Polygon:
+        """Compute the convex hull of vertices projected on the build plate.
+
+        :param vertex_data: The vertices to project.
+        :param round_vertices: Whether to round the vertices to 1/10th of a mm first, to get fewer unique vertices.
+        """
+
+        convex_hull = Polygon([])
+        # Don't use data below 0.
+        # TODO; We need a better check for this as this gives poor results for meshes with long edges.
+        # Do not throw away vertices: the convex hull may be too small and objects can collide.
+        # vertex_data = vertex_data[vertex_data[:,1] >= -0.01]
+
+        if vertex_data is not None and len(vertex_data) >= 4:  # type: ignore # mypy and numpy don't play along well just yet.
+            # Round the vertex data to 1/10th of a mm, then remove all duplicate vertices
+            # This is done to greatly speed up further convex hull calculations as the convex hull
+            # becomes much less complex when dealing with highly detailed models.
+            if round_vertices:
+                vertex_data = numpy.round(vertex_data, 1)
+
+            vertex_data = vertex_data[:, [0, 2]]  # Drop the Y components to project to 2D.
+
+            # Grab the set of unique points.
+            #
+            # This basically finds the unique rows in the array by treating them as opaque groups of bytes
+            # which are as long as the 2 float64s in each row, and giving this view to numpy.unique() to munch.
+            # See http://stackoverflow.com/questions/16970982/find-unique-rows-in-numpy-array
+            vertex_byte_view = numpy.ascontiguousarray(vertex_data).view(
+                numpy.dtype((numpy.void, vertex_data.dtype.itemsize * vertex_data.shape[1])))
+            _, idx = numpy.unique(vertex_byte_view, return_index = True)
+            vertex_data = vertex_data[idx]  # Select the unique rows by index.
+
+            hull = Polygon(vertex_data)
+
+            if len(vertex_data) >= 3:
+                convex_hull = hull.getConvexHull()
+        return convex_hull
 
     def _getHeadAndFans(self) -> Polygon:
         if not self._global_stack:
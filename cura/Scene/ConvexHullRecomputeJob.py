@@ -0,0 +1,110 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import threading
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from PyQt6.QtCore import QTimer
+
+from UM.Job import Job
+from UM.Logger import Logger
+from UM.Math.Polygon import Polygon
+
+if TYPE_CHECKING:
+    from cura.Scene.ConvexHullDecorator import ConvexHullDecorator
+
+
+class ConvexHullRecomputeJob(Job):
+    """Computes the printing areas of a batch of nodes on a worker thread.
+
+    The convex hull decorators cache the hulls, so only creating the nodes that show the hulls is left for the main
+    thread afterwards.
+    """
+
+    def __init__(self, decorators: List["ConvexHullDecorator"]) -> None:
+        super().__init__()
+        self._decorators = decorators
+
+    def run(self) -> None:
+        printing_areas: List[Tuple["ConvexHullDecorator", Optional[Polygon]]] = []
+        for decorator in self._decorators:
+            try:
+                printing_areas.append((decorator, decorator.getPrintingArea()))
+            except Exception:  # The node may have changed while computing. It's computed again on the main thread then.
+                Logger.logException("w", "Unable to compute the convex hull in the background.")
+                printing_areas.append((decorator, None))
+        self.setResult(printing_areas)
+
+
+class ConvexHullRecomputeScheduler:
+    """Collects the convex hulls that need to be recomputed, to recompute them in one batch.
+
+    When many nodes change at once, like after transforming a selection of objects or changing a setting, their hulls
+    are computed together in a :py:class:`ConvexHullRecomputeJob`, a short while after the last change.
+    """
+
+    __instance: Optional["ConvexHullRecomputeScheduler"] = None
+
+    @classmethod
+    def getInstance(cls) -> "ConvexHullRecomputeScheduler":
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    def __init__(self, delay: int = 200) -> None:
+        self._delay = delay  # In milliseconds.
+        self._lock = threading.Lock()
+        self._pending: Dict[int, "ConvexHullDecorator"] = {}  # By ID of the decorator.
+        self._timer: Optional[QTimer] = None
+        self._timer_start_scheduled = False
+        self._job: Optional[ConvexHullRecomputeJob] = None
+
+    def schedule(self, decorator: "ConvexHullDecorator") -> None:
+        """Recompute the convex hull of a decorator with the next batch. Can be called from any thread."""
+
+        from cura.CuraApplication import CuraApplication
+        application = CuraApplication.getInstance()
+        if application is None:
+            decorator.recomputeConvexHull()
+            return
+
+        with self._lock:
+            self._pending[id(decorator)] = decorator
+            if self._timer_start_scheduled:
+                return
+            self._timer_start_scheduled = True
+        # Make sure the timer is (re)started on the main thread.
+        application.callLater(self._startTimer)
+
+    def _startTimer(self) -> None:
+        with self._lock:
+            self._timer_start_scheduled = False
+        if self._timer is None:
+            self._timer = QTimer()
+            self._timer.setInterval(self._delay)
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self._startJob)
+        self._timer.start()
+
+    def _startJob(self) -> None:
+        if self._job is not None:
+            return  # Started again when the running job is finished.
+        with self._lock:
+            decorators = list(self._pending.values())
+            self._pending.clear()
+        if not decorators:
+            return
+        self._job = ConvexHullRecomputeJob(decorators)
+        self._job.finished.connect(self._onJobFinished)
+        self._job.start()
+
+    def _onJobFinished(self, job: ConvexHullRecomputeJob) -> None:
+        self._job = None
+        with self._lock:
+            changed_again = set(self._pending)
+        for decorator, printing_area in job.getResult():
+            if id(decorator) in changed_again:
+                continue  # The area may be outdated. It's recomputed with the next batch.
+            decorator.recomputeConvexHull(printing_area)
+        if changed_again:
+            self._startJob()
@@ -0,0 +1,161 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import mmap
+import tempfile
+import threading
+from array import array
+from typing import Any, Iterable, Iterator, List, MutableSequence, Optional, Union, overload
+
+
+class FileBackedGCodeList(MutableSequence[str]):
+    """A list of g-code strings that keeps the g-code in a temporary file instead of in memory.
+
+    The g-code is appended to the file as UTF-8, and for every item only its offset and length in the file are kept, so
+    for g-code that is stored per layer this is a small layer offset index. The file is memory-mapped when the g-code is
+    read, which lets the operating system page it out again when the g-code is no longer being used.
+
+    It can be used wherever a list of g-code is expected, like ``scene.gcode_dict`` and the
+    :py:class:`cura.Scene.GCodeListDecorator.GCodeListDecorator`. Replacing or inserting an item writes the new g-code to
+    the end of the file, so the file only grows until the list is closed.
+    """
+
+    def __init__(self, gcode: Iterable[str] = ()) -> None:
+        self._file = tempfile.TemporaryFile(prefix = "cura_gcode_")
+        self._file_size = 0
+        self._offsets = array("q")
+        self._lengths = array("q")
+        self._map: Optional[mmap.mmap] = None
+        self._map_size = 0
+        self._lock = threading.RLock()  # The engine's g-code is appended from jobs, while it may be read from the main thread.
+
+        self.extend(gcode)
+
+    def _write(self, gcode: str) -> int:
+        """Append g-code to the file.
+
+        :return: The offset in the file where the g-code starts.
+        """
+
+        data = gcode.encode("utf-8", "surrogatepass")
+        offset = self._file_size
+        self._file.write(data)
+        self._file_size += len(data)
+        return offset
+
+    def _read(self, offset: int, length: int) -> str:
+        if length == 0:
+            return ""
+        if self._map is None or self._map_size < offset + length:
+            # The file has grown since it was mapped.
+            self._closeMap()
+            self._file.flush()
+            self._map = mmap.mmap(self._file.fileno(), 0, access = mmap.ACCESS_READ)
+            self._map_size = self._file_size
+        return self._map[offset:offset + length].decode("utf-8", "surrogatepass")
+
+    def _closeMap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._map_size = 0
+
+    def _normalizeIndex(self, index: int) -> int:
+        if index < 0:
+            index += len(self._offsets)
+        if index < 0 or index >= len(self._offsets):
+            raise IndexError("g-code list index out of range")
+        return index
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        with self._lock:
+            if isinstance(index, slice):
+                # Slices are materialised as a normal list, like slicing a list would copy it.
+                return [self._read(self._offsets[i], self._lengths[i]) for i in range(*index.indices(len(self._offsets)))]
+            index = self._normalizeIndex(index)
+            return self._read(self._offsets[index], self._lengths[index])
+
+    def __setitem__(self, index: Any, gcode: Any) -> None:
+        with self._lock:
+            if isinstance(index, slice):
+                offsets = array("q")
+                lengths = array("q")
+                for item in gcode:
+                    offsets.append(self._write(item))
+                    lengths.append(self._file_size - offsets[-1])
+                self._offsets[index] = offsets
+                self._lengths[index] = lengths
+                return
+            index = self._normalizeIndex(index)
+            self._offsets[index] = self._write(gcode)
+            self._lengths[index] = self._file_size - self._offsets[index]
+
+    def __delitem__(self, index: Any) -> None:
+        with self._lock:
+            if isinstance(index, slice):
+                del self._offsets[index]
+                del self._lengths[index]
+                return
+            index = self._normalizeIndex(index)
+            del self._offsets[index]
+            del self._lengths[index]
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self._offsets)):
+            try:
+                yield self[index]
+            except IndexError:  # Items were removed while iterating.
+                return
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (list, tuple, FileBackedGCodeList)):
+            return NotImplemented
+        return len(self) == len(other) and all(own == theirs for own, theirs in zip(self, other))
+
+    def __repr__(self) -> str:
+        return "<FileBackedGCodeList with {count} items, {size} bytes>".format(count = len(self), size = self._file_size)
+
+    def insert(self, index: int, gcode: str) -> None:
+        with self._lock:
+            offset = self._write(gcode)
+            self._offsets.insert(index, offset)
+            self._lengths.insert(index, self._file_size - offset)
+
+    def append(self, gcode: str) -> None:
+        with self._lock:
+            offset = self._write(gcode)
+            self._offsets.append(offset)
+            self._lengths.append(self._file_size - offset)
+
+    def clear(self) -> None:
+        with self._lock:
+            del self._offsets[:]
+            del self._lengths[:]
+
+    def fileSize(self) -> int:
+        """The number of bytes in the temporary file, including g-code that was replaced or removed since."""
+
+        return self._file_size
+
+    def close(self) -> None:
+        """Remove the temporary file. The list is empty afterwards."""
+
+        with self._lock:
+            self._closeMap()
+            del self._offsets[:]
+            del self._lengths[:]
+            self._file.close()
+
+    def __del__(self) -> None:
+        try:
+            self._closeMap()
+            self._file.close()
+        except (AttributeError, ValueError):  # Not completely constructed, or already closed.
+            pass
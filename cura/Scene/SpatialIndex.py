@@ -0,0 +1,144 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import math
+from typing import Any, Dict, Generic, Iterable, List, Optional, Set, Tuple, TypeVar, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from UM.Math.Polygon import Polygon
+
+T = TypeVar("T")
+Bounds = Tuple[float, float, float, float]  # Minimum X, minimum Y, maximum X and maximum Y.
+Cell = Tuple[int, int]
+
+
+class SpatialIndex(Generic[T]):
+    """Finds the items of which the 2D bounding box overlaps an area, without checking every item.
+
+    The plane is divided in a grid of square cells. Every item is stored in the cells that its bounding box touches, so
+    an area only needs to be compared with the items in the cells that it touches. Items are kept by identity, and
+    updating an item that didn't move is cheap, so the index can be kept up to date with the scene.
+
+    :param cell_size: The size of the cells. Finding items is fastest when most items span only a few cells.
+    """
+
+    MaxCellsPerItem = 1024  # Items that are larger than this many cells are always compared, to limit memory.
+
+    def __init__(self, cell_size: float = 20.0) -> None:
+        self._cell_size = cell_size
+        self._cells: Dict[Cell, Set[int]] = {}
+        self._large_items: Set[int] = set()  # Items that are not stored in the cells.
+        self._items: Dict[int, Tuple[T, Bounds, List[Cell], int]] = {}  # By ID of the item. Also the order of adding.
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: Any) -> bool:
+        return id(item) in self._items
+
+    def getItems(self) -> List[T]:
+        return [entry[0] for entry in self._items.values()]
+
+    def getBounds(self, item: T) -> Optional[Bounds]:
+        entry = self._items.get(id(item))
+        return entry[1] if entry is not None else None
+
+    def update(self, item: T, bounds: Bounds) -> None:
+        """Add an item, or move it if it is already in the index."""
+
+        item_id = id(item)
+        entry = self._items.get(item_id)
+        if entry is not None:
+            if entry[1] == bounds:
+                return  # Didn't move.
+            self.remove(item)
+
+        cells: List[Cell] = []
+        if self._countCells(bounds) > self.MaxCellsPerItem:
+            self._large_items.add(item_id)
+        else:
+            cells = self._getCells(bounds)
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(item_id)
+        self._items[item_id] = (item, bounds, cells, self._next_order)
+        self._next_order += 1
+
+    def remove(self, item: T) -> None:
+        item_id = id(item)
+        entry = self._items.pop(item_id, None)
+        if entry is None:
+            return
+        self._large_items.discard(item_id)
+        for cell in entry[2]:
+            cell_items = self._cells[cell]
+            cell_items.discard(item_id)
+            if not cell_items:
+                del self._cells[cell]
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._large_items.clear()
+        self._items.clear()
+        self._next_order = 0
+
+    def query(self, bounds: Bounds) -> List[T]:
+        """Get the items of which the bounding box overlaps or touches an area.
+
+        :param bounds: The bounding box of the area.
+        :return: The items, in the order in which they were added.
+        """
+
+        min_x, min_y, max_x, max_y = bounds
+        candidate_ids = set(self._large_items)
+        if self._countCells(bounds) > len(self._cells):  # Cheaper to go over the cells that are in use.
+            min_column, min_row, max_column, max_row = self._getCellRange(bounds)
+            for (column, row), cell_items in self._cells.items():
+                if min_column <= column <= max_column and min_row <= row <= max_row:
+                    candidate_ids.update(cell_items)
+        else:
+            for cell in self._getCells(bounds):
+                candidate_ids.update(self._cells.get(cell, ()))
+
+        result = []
+        for item_id in candidate_ids:
+            item, (item_min_x, item_min_y, item_max_x, item_max_y), _, order = self._items[item_id]
+            if item_min_x <= max_x and min_x <= item_max_x and item_min_y <= max_y and min_y <= item_max_y:
+                result.append((order, item))
+        result.sort(key = lambda entry: entry[0])
+        return [item for _, item in result]
+
+    def _getCellRange(self, bounds: Bounds) -> Tuple[int, int, int, int]:
+        min_x, min_y, max_x, max_y = bounds
+        return math.floor(min_x / self._cell_size), math.floor(min_y / self._cell_size), math.floor(max_x / self._cell_size), math.floor(max_y / self._cell_size)
+
+    def _countCells(self, bounds: Bounds) -> int:
+        min_column, min_row, max_column, max_row = self._getCellRange(bounds)
+        return (max_column - min_column + 1) * (max_row - min_row + 1)
+
+    def _getCells(self, bounds: Bounds) -> List[Cell]:
+        min_column, min_row, max_column, max_row = self._getCellRange(bounds)
+        return [(column, row) for column in range(min_column, max_column + 1) for row in range(min_row, max_row + 1)]
+
+    @staticmethod
+    def getPolygonBounds(polygons: Iterable[Optional["Polygon"]]) -> Optional[Bounds]:
+        """Get the bounding box around the points of polygons.
+
+        :return: The bounding box, or None if none of the polygons have points.
+        """
+
+        bounds = None
+        for polygon in polygons:
+            if polygon is None:
+                continue
+            points = polygon.getPoints()
+            if points is None or len(points) == 0:
+                continue
+            minimum = points.min(axis = 0)
+            maximum = points.max(axis = 0)
+            polygon_bounds = (float(minimum[0]), float(minimum[1]), float(maximum[0]), float(maximum[1]))
+            if bounds is None:
+                bounds = polygon_bounds
+            else:
+                bounds = (min(bounds[0], polygon_bounds[0]), min(bounds[1], polygon_bounds[1]), max(bounds[2], polygon_bounds[2]), max(bounds[3], polygon_bounds[3]))
+        return bounds
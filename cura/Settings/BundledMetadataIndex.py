@@ -0,0 +1,203 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote_plus
+
+from UM.Logger import Logger
+
+
+class BundledMetadataIndex:
+    """An index of the metadata of all containers that are bundled with Cura, stored in a single file.
+
+    Parsing the thousands of bundled definition, quality, variant and intent files takes a large part of the start-up
+    time. Their metadata is stored in one file instead, which is memory-mapped when it's loaded, so that only the
+    metadata that is asked for is read and unpickled.
+
+    The index is only valid for one state of the bundled files. It has a resource hash of the names, sizes and
+    modification times of all bundled files and of the application version. If any of them changes, the index is not
+    loaded and has to be written again.
+
+    The file starts with the magic bytes and the version of the format, and the size of the header. The header is JSON
+    with the resource hash and, by container ID, the offset and size of the pickled metadata after the header and the
+    path of the file that the metadata came from. Containers with the same ID in other files, like those of the user, are
+    not taken from the index.
+
+    :param file_name: Where the index is stored.
+    """
+
+    Version = 2  # Increase when changing the format of the file.
+    Magic = b"CURAMETA"
+    _prefix = struct.Struct("<8sII")  # Magic, version and the size of the header.
+
+    # The directories in the bundled resources with the containers to index, and the extensions of the container files.
+    ResourceDirectories = ("definitions", "extruders", "quality", "variants", "intent")
+    ContainerExtensions = (".def.json", ".inst.cfg")
+
+    def __init__(self, file_name: str) -> None:
+        self._file_name = file_name
+        self._file = None  # type: Optional[Any]
+        self._mmap = None  # type: Optional[mmap.mmap]
+        self._entries: Dict[str, Tuple[int, int, str]] = {}  # By container ID, the offset and size of the metadata and the path of its file.
+
+    @classmethod
+    def findContainerFiles(cls, resource_roots: Iterable[str]) -> Dict[str, str]:
+        """Find the container files in bundled resources.
+
+        :param resource_roots: The resource directories that are bundled with Cura.
+        :return: By container ID, the path of the container file. The ID is the file name without the extension, like
+        the ID that the local container provider uses.
+        """
+
+        files = {}  # type: Dict[str, str]
+        for root in resource_roots:
+            for directory in cls.ResourceDirectories:
+                for path, _, file_names in os.walk(os.path.join(root, directory)):
+                    for file_name in file_names:
+                        for extension in cls.ContainerExtensions:
+                            if file_name.endswith(extension):
+                                files.setdefault(unquote_plus(file_name[:-len(extension)]), os.path.join(path, file_name))
+                                break
+        return files
+
+    @staticmethod
+    def computeResourceHash(files: Dict[str, str], application_version: str) -> str:
+        """Get a hash that changes when any of the container files is added, removed or changed.
+
+        Only the sizes and modification times of the files are used, so that none of them has to be read.
+
+        :param files: By container ID, the path of the container file, see :py:meth:`findContainerFiles`.
+        :param application_version: The version of the application, since other versions may read files differently.
+        """
+
+        resource_hash = hashlib.sha256()
+        resource_hash.update("{version}\0{application_version}\0".format(version = BundledMetadataIndex.Version, application_version = application_version).encode("utf-8"))
+        for container_id in sorted(files):
+            path = files[container_id]
+            try:
+                stat = os.stat(path)
+                file_state = "{size}\0{modified}".format(size = stat.st_size, modified = stat.st_mtime_ns)
+            except OSError:
+                file_state = "missing"
+            resource_hash.update("{container_id}\0{path}\0{state}\0".format(container_id = container_id, path = path, state = file_state).encode("utf-8"))
+        return resource_hash.hexdigest()
+
+    def load(self, resource_hash: str) -> bool:
+        """Open the index, if it was written for the current bundled files.
+
+        :param resource_hash: The hash of the current bundled files, see :py:meth:`computeResourceHash`.
+        :return: Whether the index could be used.
+        """
+
+        self.close()
+        try:
+            index_file = open(self._file_name, "rb")
+        except OSError:
+            return False
+        try:
+            index_map = mmap.mmap(index_file.fileno(), 0, access = mmap.ACCESS_READ)
+            magic, version, header_size = self._prefix.unpack_from(index_map, 0)
+            if magic != self.Magic or version != self.Version:
+                raise ValueError("Unknown format of the metadata index.")
+            header = json.loads(index_map[self._prefix.size:self._prefix.size + header_size].decode("utf-8"))
+            if header["resource_hash"] != resource_hash:
+                index_map.close()
+                index_file.close()
+                return False
+            data_start = self._prefix.size + header_size
+            entries = {container_id: (data_start + offset, size, path) for container_id, (offset, size, path) in header["entries"].items()}
+            if any(offset + size > len(index_map) for offset, size, _ in entries.values()):
+                raise ValueError("The metadata index is truncated.")
+        except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+            Logger.warning("Unable to read the bundled metadata index {file_name}: {err}".format(file_name = self._file_name, err = str(e)))
+            index_file.close()
+            return False
+
+        self._file = index_file
+        self._mmap = index_map
+        self._entries = entries
+        return True
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._entries = {}
+
+    def getContainerIds(self) -> List[str]:
+        return list(self._entries)
+
+    def hasMetadata(self, container_id: str, file_path: str) -> bool:
+        """Whether the index has the metadata of a container, read from the given file."""
+
+        entry = self._entries.get(container_id)
+        return entry is not None and entry[2] == self._normalizePath(file_path)
+
+    def getMetadata(self, container_id: str) -> Optional[Dict[str, Any]]:
+        """Get the metadata of a container from the index, or None if it's not in the index."""
+
+        entry = self._entries.get(container_id)
+        if entry is None or self._mmap is None:
+            return None
+        offset, size, _ = entry
+        try:
+            return pickle.loads(self._mmap[offset:offset + size])
+        except Exception as e:  # Unpickling can raise about anything if the file is damaged.
+            Logger.warning("Unable to read the metadata of {container_id} from the bundled metadata index: {err}".format(container_id = container_id, err = str(e)))
+            return None
+
+    def write(self, resource_hash: str, metadata: Dict[str, Dict[str, Any]], files: Dict[str, str]) -> None:
+        """Write a new index.
+
+        :param resource_hash: The hash of the current bundled files, see :py:meth:`computeResourceHash`.
+        :param metadata: By container ID, the metadata of the bundled containers.
+        :param files: By container ID, the path of the container file, see :py:meth:`findContainerFiles`. Only the
+        metadata of containers with a file is written.
+        """
+
+        entries: Dict[str, Tuple[int, int, str]] = {}
+        blobs = []  # type: List[bytes]
+        offset = 0
+        for container_id, container_metadata in metadata.items():
+            if container_id not in files:
+                continue
+            try:
+                blob = pickle.dumps(container_metadata, protocol = pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError):  # Is loaded from its file then.
+                continue
+            entries[container_id] = (offset, len(blob), self._normalizePath(files[container_id]))
+            blobs.append(blob)
+            offset += len(blob)
+        header = json.dumps({"resource_hash": resource_hash, "entries": entries}).encode("utf-8")
+
+        temp_file_name = None
+        try:
+            os.makedirs(os.path.dirname(self._file_name), exist_ok = True)
+            file_descriptor, temp_file_name = tempfile.mkstemp(prefix = os.path.basename(self._file_name), dir = os.path.dirname(self._file_name))
+            with os.fdopen(file_descriptor, "wb") as f:
+                f.write(self._prefix.pack(self.Magic, self.Version, len(header)))
+                f.write(header)
+                for blob in blobs:
+                    f.write(blob)
+            self.close()  # Replacing a file that is still mapped fails on Windows.
+            os.replace(temp_file_name, self._file_name)
+        except OSError as e:
+            Logger.warning("Unable to write the bundled metadata index {file_name}: {err}".format(file_name = self._file_name, err = str(e)))
+            if temp_file_name is not None and os.path.exists(temp_file_name):
+                os.remove(temp_file_name)
+            return
+        Logger.info("Wrote the metadata of {count} bundled containers to {file_name}.".format(count = len(entries), file_name = self._file_name))
+
+    @staticmethod
+    def _normalizePath(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
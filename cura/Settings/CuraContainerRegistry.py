@@ -27,11 +27,13 @@ from . import ExtruderStack
 from . import GlobalStack
 
 import cura.CuraApplication
+from cura import ApplicationMetadata
 from cura.Settings.cura_empty_instance_containers import empty_quality_container
 from cura.Machines.ContainerTree import ContainerTree
 from cura.ReaderWriters.ProfileReader import NoProfileException, ProfileReader
 
 from UM.i18n import i18nCatalog
+from .BundledMetadataIndex import BundledMetadataIndex
 from .DatabaseHandlers.IntentDatabaseHandler import IntentDatabaseHandler
 from .DatabaseHandlers.QualityDatabaseHandler import QualityDatabaseHandler
 from .DatabaseHandlers.VariantDatabaseHandler import VariantDatabaseHandler
@@ -376,9 +378,46 @@ class CuraContainerRegistry(ContainerRegistry):
 
     @override(ContainerRegistry)
     def loadAllMetadata(self) -> None:
+        bundled_files = BundledMetadataIndex.findContainerFiles(Resources.getSecureSearchPaths())
+        application_version = "{version}-{setting_version}".format(version = ApplicationMetadata.CuraVersion, setting_version = cura.CuraApplication.CuraApplication.SettingVersion)
+        resource_hash = BundledMetadataIndex.computeResourceHash(bundled_files, application_version)
+        bundled_index = BundledMetadataIndex(os.path.join(Resources.getCacheStoragePath(), "bundled_metadata.index"))
+        index_is_valid = bundled_index.load(resource_hash)
+        if index_is_valid:
+            self._loadMetadataFromIndex(bundled_index)
+
         super().loadAllMetadata()
+
+        if not index_is_valid and bundled_files:
+            # Store the metadata of the bundled containers, so they don't need to be parsed at the next start.
+            bundled_index.write(resource_hash, {container_id: self.metadata[container_id] for container_id in bundled_files if container_id in self.metadata}, bundled_files)
+        bundled_index.close()
         self._cleanUpInvalidQualityChanges()
 
+    def _loadMetadataFromIndex(self, bundled_index: BundledMetadataIndex) -> None:
+        """Add the metadata of the bundled containers from the index, so the providers don't need to parse their files.
+
+        The containers themselves are still loaded from their files by their provider, when they are needed. Metadata is
+        only taken from the index if the provider has the container in the same file as the index, since a provider may
+        have a container with the same ID in another file, like a user's copy.
+        """
+
+        for provider in self._providers:
+            get_file_path = getattr(provider, "getContainerFilePathById", None)
+            if get_file_path is None:  # Not a provider of container files.
+                continue
+            for container_id in provider.getAllIds():
+                if container_id in self.metadata:
+                    continue
+                file_path = get_file_path(container_id)
+                if file_path is None or not bundled_index.hasMetadata(container_id, file_path):
+                    continue
+                metadata = bundled_index.getMetadata(container_id)
+                if not self._isMetadataValid(metadata):
+                    continue  # Loaded by the provider instead.
+                self.metadata[container_id] = metadata
+                self.source_provider[container_id] = provider
+
     def _cleanUpInvalidQualityChanges(self) -> None:
         # We've seen cases where it was possible for quality_changes to be incorrectly added. This is to ensure that
         # any such leftovers are purged from the registry.
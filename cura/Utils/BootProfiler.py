@@ -0,0 +1,229 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from contextlib import contextmanager
+import functools
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from UM.Logger import Logger
+
+
+class BootSpan(NamedTuple):
+    """One phase of starting the application, as measured by the :py:class:`BootProfiler`."""
+
+    path: Tuple[str, ...]  # The names of the phases that this phase is part of, ending with the name of this phase.
+    start: float  # Seconds since the profiler started.
+    duration: float  # In seconds.
+    self_duration: float  # The duration minus the duration of the phases within it, in seconds.
+    thread_name: str
+    args: Dict[str, Any]
+
+    @property
+    def name(self) -> str:
+        return self.path[-1]
+
+
+class BootProfiler:
+    """Records how long the phases of starting the application take, to find out where start-up time goes.
+
+    Phases are measured with :py:meth:`measure`, or with the :py:func:`profileBoot` decorator, and can be nested. Each
+    thread has its own nesting. Nothing is recorded unless the profiler was started, and the recording stops at
+    :py:meth:`finish`, which writes the report: the spans in the folded stack format of flame graph tools, and a
+    timeline in the Chrome trace event format.
+    """
+
+    TopOffenderCount = 10
+
+    __instance = None  # type: Optional[BootProfiler]
+
+    @classmethod
+    def getInstance(cls) -> "BootProfiler":
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    def __init__(self) -> None:
+        self._recording = False
+        self._start_time = time.time()
+        self._start_counter = time.perf_counter()
+        self._lock = threading.Lock()
+        self._spans = []  # type: List[BootSpan]
+        self._open_spans = threading.local()  # For each thread, a stack of the name, start and child duration of the spans that didn't end yet.
+
+    def start(self) -> None:
+        """Start recording. The times of the spans are relative to this."""
+
+        with self._lock:
+            self._recording = True
+            self._start_time = time.time()
+            self._start_counter = time.perf_counter()
+            self._spans = []
+
+    def stop(self) -> None:
+        """Stop recording. The spans that were recorded are kept."""
+
+        with self._lock:
+            self._recording = False
+
+    def isRecording(self) -> bool:
+        return self._recording
+
+    @contextmanager
+    def measure(self, name: str, **args: Any) -> Iterator[Dict[str, Any]]:
+        """Measure the phase that is executed in a ``with`` block, if recording.
+
+        :return: The extra information of the phase, to add to from within the block.
+        """
+
+        if not self._recording:
+            yield args
+            return
+
+        stack = self._getOpenSpans()
+        stack.append([name, time.perf_counter(), 0.0])
+        try:
+            yield args
+        finally:
+            end_counter = time.perf_counter()
+            path = tuple(open_span[0] for open_span in stack)
+            _, start_counter, child_duration = stack.pop()
+            duration = end_counter - start_counter
+            if stack:
+                stack[-1][2] += duration
+            span = BootSpan(path, start_counter - self._start_counter, duration, max(duration - child_duration, 0.0), threading.current_thread().name, args)
+            with self._lock:
+                if self._recording:
+                    self._spans.append(span)
+
+    def instrument(self, target: Any, method_name: str, get_span_name: Callable[..., str]) -> None:
+        """Measure every call of a method of an object, from outside of the object.
+
+        Only the method of this object is replaced, and only if it exists. This is meant for objects of other libraries.
+
+        :param target: The object with the method.
+        :param method_name: The name of the method.
+        :param get_span_name: Gets the name of the span from the arguments of a call.
+        """
+
+        method = getattr(target, method_name, None)
+        if method is None:
+            Logger.warning("Unable to profile {method_name}, since it doesn't exist.".format(method_name = method_name))
+            return
+
+        @functools.wraps(method)
+        def measuredMethod(*args: Any, **kwargs: Any) -> Any:
+            with self.measure(get_span_name(*args, **kwargs)):
+                return method(*args, **kwargs)
+        setattr(target, method_name, measuredMethod)
+
+    def getSpans(self) -> List[BootSpan]:
+        with self._lock:
+            return sorted(self._spans, key = lambda span: span.start)
+
+    def getDuration(self) -> float:
+        """The time from the start of the recording until the end of the last span, in seconds."""
+
+        return max((span.start + span.duration for span in self.getSpans()), default = 0.0)
+
+    def getTopOffenders(self, count: int) -> List[Tuple[str, float]]:
+        """The phases that took the most time themselves, not counting the phases within them.
+
+        :return: The names of the phases and their total duration, in seconds, longest first.
+        """
+
+        self_durations = {}  # type: Dict[str, float]
+        for span in self.getSpans():
+            self_durations[span.name] = self_durations.get(span.name, 0.0) + span.self_duration
+        return sorted(self_durations.items(), key = lambda item: item[1], reverse = True)[:count]
+
+    def toFoldedStacks(self) -> str:
+        """Get the spans in the folded stack format, as used by flamegraph.pl, Speedscope and Inferno.
+
+        Every line has the names of the nested phases, separated by semicolons, and the time spent in the innermost phase
+        itself, in microseconds. Phases in other threads than the main thread are below a frame for their thread.
+        """
+
+        self_durations = {}  # type: Dict[Tuple[str, ...], float]
+        main_thread_name = threading.main_thread().name
+        for span in self.getSpans():
+            path = span.path if span.thread_name == main_thread_name else (span.thread_name, ) + span.path
+            self_durations[path] = self_durations.get(path, 0.0) + span.self_duration
+        lines = []
+        for path, self_duration in self_durations.items():
+            names = ";".join(name.replace(";", ",").replace(" ", "_") for name in path)
+            lines.append("{names} {microseconds}".format(names = names, microseconds = round(self_duration * 1e6)))
+        return "\n".join(lines) + "\n"
+
+    def toChromeTrace(self) -> Dict[str, Any]:
+        """Get the spans as events in the Chrome trace event format, to see them on a timeline."""
+
+        thread_ids = {}  # type: Dict[str, int]
+        events = [{
+            "name": "process_name", "ph": "M", "pid": 1, "tid": 0,
+            "args": {"name": "Start-up at {start}".format(start = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self._start_time)))}
+        }]  # type: List[Dict[str, Any]]
+        for span in self.getSpans():
+            if span.thread_name not in thread_ids:
+                thread_ids[span.thread_name] = len(thread_ids) + 1
+                events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": thread_ids[span.thread_name], "args": {"name": span.thread_name}})
+            events.append({
+                "name": span.name, "cat": "boot", "ph": "X", "pid": 1, "tid": thread_ids[span.thread_name],
+                "ts": span.start * 1e6, "dur": span.duration * 1e6, "args": span.args
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def finish(self, report_path: str) -> None:
+        """Stop recording, write the report and log the phases that took the most time.
+
+        :param report_path: The path to write the report to, without extension. The folded stacks are written to a
+        ``.folded`` file and the timeline to a ``.json`` file.
+        """
+
+        if not self._recording:
+            return
+        self.stop()
+
+        duration = self.getDuration()
+        Logger.info("Start-up took {duration:.2f}s. The phases that took the most time themselves:".format(duration = duration))
+        for name, self_duration in self.getTopOffenders(self.TopOffenderCount):
+            Logger.info("    {name}: {self_duration:.3f}s ({fraction:.1%})".format(name = name, self_duration = self_duration, fraction = self_duration / duration if duration > 0 else 0.0))
+
+        try:
+            with open(report_path + ".folded", "w", encoding = "utf-8") as f:
+                f.write(self.toFoldedStacks())
+            with open(report_path + ".json", "w", encoding = "utf-8") as f:
+                json.dump(self.toChromeTrace(), f, default = str)
+        except OSError as e:
+            Logger.warning("Unable to write the start-up profile to {path}: {err}".format(path = report_path, err = str(e)))
+            return
+        Logger.info("Wrote the start-up profile to {path}.folded and {path}.json".format(path = report_path))
+
+    def _getOpenSpans(self) -> List[List[Any]]:
+        stack = getattr(self._open_spans, "stack", None)
+        if stack is None:
+            stack = []
+            self._open_spans.stack = stack
+        return stack
+
+
+def profileBoot(name: Optional[str] = None) -> Callable:
+    """Decorator to measure every call of a function as a phase of the start-up, while the boot profiler is recording.
+
+    :param name: The name of the phase. By default, the qualified name of the function.
+    """
+
+    def profileBootDecorator(function: Callable) -> Callable:
+        span_name = name if name is not None else function.__qualname__
+
+        @functools.wraps(function)
+        def profileBootWrapper(*args: Any, **kwargs: Any) -> Any:
+            profiler = BootProfiler.getInstance()
+            if not profiler.isRecording():
+                return function(*args, **kwargs)
+            with profiler.measure(span_name):
+                return function(*args, **kwargs)
+        return profileBootWrapper
+    return profileBootDecorator
@@ -0,0 +1,35 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import multiprocessing
+import multiprocessing.context
+import sys
+
+# Worker processes are forked rather than spawned. The work functions are often closures, which can't be pickled, and a
+# spawned process would have to import Cura again (or, in a frozen build, start the executable again) before it could
+# do anything.
+#
+# Forking copies only the thread that forks, so a lock that another thread held at that moment stays locked in the
+# child. That includes the locks of Qt, OpenGL and other threads of Cura. Forking is safe here because the worker
+# processes never touch any of those. They only do this:
+# - run the work function on the arguments they get;
+# - send back the results through a pipe;
+# - leave through os._exit, without running exit handlers or Qt destructors.
+# The interpreter re-initializes the locks it needs after forking: the GIL, the import lock and the locks of the logging
+# module. So does glibc for the memory allocator. Work functions must therefore only compute. They may not use Qt, the
+# application, the settings or locks of their own.
+
+
+def canForkWorkerProcesses() -> bool:
+    """Whether work can be divided over forked worker processes.
+
+    Only on Linux. On MacOS, the system frameworks don't support forking, and Windows can't fork at all.
+    """
+
+    return sys.platform == "linux" and "fork" in multiprocessing.get_all_start_methods()
+
+
+def getForkContext() -> multiprocessing.context.BaseContext:
+    """The multiprocessing context to create worker processes with. See the notes at the top of this module."""
+
+    return multiprocessing.get_context("fork")
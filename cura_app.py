@@ -44,6 +44,13 @@ parser.add_argument("--debug",
                     default = False,
                     help = "Turn on the debug mode by setting this option."
                     )
+parser.add_argument("--profile-boot",
+                    dest = "profile_boot",
+                    action = "store_true",
+                    default = False,
+                    help = "Measure how long the phases of starting the application take. The report is written for flame graph "
+                           "tools (.folded) and for Chrome tracing (.json), and the slowest phases are logged."
+                    )
 
 known_args = vars(parser.parse_known_args()[0])
 
@@ -194,7 +201,12 @@ if sys.stderr and not sys.stderr.closed:
 elif sys.stdout and not sys.stdout.closed:
     faulthandler.enable(file = sys.stdout, all_threads = True)
 
-from cura.CuraApplication import CuraApplication
+from cura.Utils.BootProfiler import BootProfiler
+if known_args["profile_boot"]:
+    # Started as early as possible, so that importing the application is measured as well.
+    BootProfiler.getInstance().start()
+with BootProfiler.getInstance().measure("import CuraApplication"):
+    from cura.CuraApplication import CuraApplication
 
 
 # WORKAROUND: CURA-6739
@@ -1,8 +1,6 @@
 # Copyright (c) 2019 fieldOfView
 # Cura is released under the terms of the LGPLv3 or higher.
 
-from . import AMFReader
-
 from UM.i18n import i18nCatalog
 i18n_catalog = i18nCatalog("uranium")
 
@@ -18,4 +16,5 @@ def getMetaData():
     }
 
 def register(app):
+    from . import AMFReader  # Imports trimesh, so it's deferred until an AMF file is opened.
     return {"mesh_reader": AMFReader.AMFReader()}
@@ -19,6 +19,7 @@ from UM.Message import Message
 from UM.PluginRegistry import PluginRegistry
 from UM.Platform import Platform
 from UM.Qt.Duration import DurationFormat
+from UM.Resources import Resources
 from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
 from UM.Settings.Interfaces import DefinitionContainerInterface
 from UM.Settings.SettingInstance import SettingInstance #For typing.
@@ -26,9 +27,14 @@ from UM.Tool import Tool #For typing.
 
 from cura.CuraApplication import CuraApplication
 from cura.Settings.ExtruderManager import ExtruderManager
+from cura.Scene.FileBackedGCodeList import FileBackedGCodeList
 from cura.Snapshot import Snapshot
 from cura.Utils.Threading import call_on_qt_thread
+from .EnginePool import EnginePool, EngineSession
 from .ProcessSlicedLayersJob import ProcessSlicedLayersJob
+from .SliceCache import SliceCache, SliceCacheWriter
+from .SliceMessageCache import SliceMessageCache
+from .SliceProfiler import SliceProfile, SliceProfiler
 from .StartSliceJob import StartSliceJob, StartJobResult
 
 import pyArcus as Arcus
@@ -44,6 +50,8 @@ catalog = i18nCatalog("cura")
 
 
 class CuraEngineBackend(QObject, Backend):
+    EnginePoolPortOffset = 100  # The engines of the engine pool listen on ports from this far after the main engine.
+
     backendError = Signal()
 
     printDurationMessage = Signal()
@@ -169,6 +177,23 @@ class CuraEngineBackend(QObject, Backend):
         application.getPreferences().addPreference("general/auto_slice", False)
         application.getPreferences().addPreference("info/send_engine_crash", True)
         application.getPreferences().addPreference("info/anonymous_engine_crash_report", True)
+        application.getPreferences().addPreference("backend/slice_cache_size", 1024)  # In MiB. 0 disables the cache.
+        application.getPreferences().addPreference("backend/engine_pool_size", 1)  # Number of engines to slice build plates with at the same time.
+        application.getPreferences().addPreference("backend/slice_profile_history", 20)  # Number of slices to keep the timings of.
+
+        # Results of earlier slices, so that slicing the same thing again doesn't need the engine.
+        self._slice_cache = SliceCache(os.path.join(Resources.getCacheStoragePath(), "slice_cache"),
+                                       self._getSliceCacheSize())
+        self._slice_cache_writer: Optional[SliceCacheWriter] = None  # Stores the result of the current slice.
+
+        # Timings of the stages of the last slices.
+        self._slice_profiler = SliceProfiler(self._getSliceProfileHistorySize())
+
+        # Parts of the previous slice messages that can be reused for the next ones.
+        self._slice_message_cache = SliceMessageCache(512 * 1024 * 1024)
+
+        # Extra engines, that slice other build plates while this engine slices one.
+        self._engine_pool: Optional[EnginePool] = None
 
         self._use_timer: bool = False
 
@@ -245,6 +270,23 @@ class CuraEngineBackend(QObject, Backend):
         self._resetLastSliceTimeStats()
         return last_slice_data
 
+    def getSliceProfiles(self) -> List[Dict[str, Any]]:
+        """Get the timings of the stages of the last slices, oldest first.
+
+        Each slice has the build plate it was for, its start time, its duration, the total duration of each stage, and
+        all separate stages. All times are in seconds.
+        """
+
+        return [profile.toDict() for profile in self._slice_profiler.getHistory()]
+
+    def exportSliceTrace(self, file_path: str) -> bool:
+        """Write the timings of the last slices to a file in the Chrome trace event format.
+
+        :return: Whether the file could be written.
+        """
+
+        return self._slice_profiler.exportChromeTrace(file_path)
+
     def initialize(self) -> None:
         application = CuraApplication.getInstance()
         self._multi_build_plate_model = application.getMultiBuildPlateModel()
@@ -284,11 +326,14 @@ class CuraEngineBackend(QObject, Backend):
 
         # Terminate CuraEngine if it is still running at this point
         self._terminate()
+        if self._engine_pool is not None:
+            self._engine_pool.close()
 
-    def getEngineCommand(self) -> List[str]:
+    def getEngineCommand(self, port: Optional[int] = None) -> List[str]:
         """Get the command that is used to call the engine.
 
         This is useful for debugging and used to actually start the engine.
+        :param port: The port that the engine should connect to. By default, the port of the main engine.
         :return: list of commands and args / parameters.
         """
         from cura import ApplicationMetadata
@@ -296,7 +341,7 @@ class CuraEngineBackend(QObject, Backend):
             command = [self._default_engine_location]
         else:
             command = [CuraApplication.getInstance().getPreferences().getValue("backend/location")]
-        command += ["connect", "127.0.0.1:{0}".format(self._port), ""]
+        command += ["connect", "127.0.0.1:{0}".format(self._port if port is None else port), ""]
 
         parser = argparse.ArgumentParser(prog = "cura", add_help = False)
         parser.add_argument("--debug", action = "store_true", default = False,
@@ -309,6 +354,12 @@ class CuraEngineBackend(QObject, Backend):
 
     @pyqtSlot()
     def stopSlicing(self) -> None:
+        self._stopSlicing()
+        self._abortEnginePoolSlices()
+
+    def _stopSlicing(self) -> None:
+        """Stop the main engine, but let the engines of the engine pool continue slicing their build plates."""
+
         self.setState(BackendState.NotStarted)
         if self._slicing:  # We were already slicing. Stop the old job.
             self._terminate()
@@ -396,13 +447,14 @@ class CuraEngineBackend(QObject, Backend):
 
         if self._process is None:  # type: ignore
             self._createSocket()
-        self.stopSlicing()
+        self._stopSlicing()
         self._engine_is_fresh = False  # Yes we're going to use the engine
 
         self.processingProgress.emit(0.0)
         self.backendStateChange.emit(BackendState.NotStarted)
 
-        self._scene.gcode_dict[build_plate_to_be_sliced] = []  # type: ignore #[] indexed by build plate number
+        # The g-code of every build plate is kept in a temporary file, so it doesn't take up memory while it's not used.
+        self._scene.gcode_dict[build_plate_to_be_sliced] = FileBackedGCodeList()  # type: ignore #[] indexed by build plate number
         self._slicing = True
         self.slicingStarted.emit()
 
@@ -412,9 +464,13 @@ class CuraEngineBackend(QObject, Backend):
         self._start_slice_job = StartSliceJob(slice_message)
         self._start_slice_job_build_plate = build_plate_to_be_sliced
         self._start_slice_job.setBuildPlate(self._start_slice_job_build_plate)
+        self._start_slice_job.setSliceMessageCache(self._slice_message_cache)
+        self._start_slice_job.setSliceProfile(self._slice_profiler.startSlice(build_plate_to_be_sliced))
         self._start_slice_job.start()
         self._start_slice_job.finished.connect(self._onStartSliceCompleted)
 
+        self._startEnginePoolSlices()
+
     def _terminate(self) -> None:
         """Terminate the engine process.
 
@@ -422,10 +478,16 @@ class CuraEngineBackend(QObject, Backend):
         """
         self._slicing = False
         self._stored_layer_data = []
+        self._discardSliceCacheWriter()
         if self._start_slice_job_build_plate in self._stored_optimized_layer_data:
             del self._stored_optimized_layer_data[self._start_slice_job_build_plate]
         if self._start_slice_job is not None:
             self._start_slice_job.cancel()
+        if self._process_layers_job is not None:
+            # A job that streams the layers of this engine would otherwise keep waiting for more layers.
+            Logger.log("i", "Aborting process layers job...")
+            self._process_layers_job.abort()
+            self._process_layers_job = None
 
         self.stopPlugins()
 
@@ -581,8 +643,18 @@ class CuraEngineBackend(QObject, Backend):
             self._invokeSlice()
             return
 
-        # Preparation completed, send it to the backend.
-        immediate_success = self._socket.sendMessage(job.getSliceMessage())
+        # Preparation completed. If the same thing was sliced before, use that result instead of slicing it again.
+        if self._restoreSliceFromCache(job):
+            return
+        self._discardSliceCacheWriter()
+        if self._useSliceCache():
+            self._slice_cache_writer = self._slice_cache.createWriter(self._slice_cache.createKey(job.getSliceFingerprint(), self._getEngineIdentity()))
+
+        # Send it to the backend.
+        slice_profile = self._getSliceProfile(self._start_slice_job_build_plate)
+        with slice_profile.measureStage("send_slice_message"):
+            immediate_success = self._socket.sendMessage(job.getSliceMessage())
+        slice_profile.beginStage("engine_slicing")
         if (not CuraApplication.getInstance().getUseExternalBackend()) and (not immediate_success):
             if self._last_socket_error is not None and self._last_socket_error.getErrorCode() == Arcus.ErrorCode.MessageTooBigError:
                 error_txt = catalog.i18nc("@info:status", "Unable to send the model data to the engine. Please try to use a less detailed model, or reduce the number of instances.")
@@ -760,6 +832,7 @@ class CuraEngineBackend(QObject, Backend):
     def needsSlicing(self) -> None:
         """Convenient function: mark everything to slice, emit state and clear layer data"""
 
+        self._slice_message_cache.invalidateSettings()
         # CURA-6604: If there's no slicable object, do not (try to) trigger slice, which will clear all the current
         # gcode. This can break Gcode file loading if it tries to remove it afterwards.
         if not self.hasSlicableObject():
@@ -813,6 +886,13 @@ class CuraEngineBackend(QObject, Backend):
             if self._start_slice_job_build_plate not in self._stored_optimized_layer_data:
                 self._stored_optimized_layer_data[self._start_slice_job_build_plate] = []
             self._stored_optimized_layer_data[self._start_slice_job_build_plate].append(message)
+            if self._slice_cache_writer is not None:
+                self._slice_cache_writer.addLayer(message)
+            self._onEngineSentLayer(self._start_slice_job_build_plate)
+
+            # Show the layers while the rest of them is still being sliced.
+            if self._process_layers_job is None and self._canProcessSlicedLayers(self._start_slice_job_build_plate):
+                self._startProcessSlicedLayersJob(self._start_slice_job_build_plate, streaming = True)
 
     def _onProgressMessage(self, message: Arcus.PythonMessage) -> None:
         """Called when a progress message is received from the engine.
@@ -822,6 +902,7 @@ class CuraEngineBackend(QObject, Backend):
 
         self.processingProgress.emit(message.amount)
         self.setState(BackendState.Processing)
+        self._getSliceProfile(self._start_slice_job_build_plate).addCounter("engine_progress", message.amount)
 
     def _invokeSlice(self) -> None:
         if self._use_timer:
@@ -843,6 +924,14 @@ class CuraEngineBackend(QObject, Backend):
         """
 
         self.stopPlugins()
+        self._onEngineFinished(self._start_slice_job_build_plate)
+        if self._slice_cache_writer is not None:
+            self._slice_cache_writer.finish()
+            self._slice_cache_writer = None
+        self._finishSlicing()
+
+    def _finishSlicing(self) -> None:
+        """Show the result of slicing the current build plate, and continue with the next build plate to slice."""
 
         self.setState(BackendState.Done)
         self.processingProgress.emit(1.0)
@@ -854,15 +943,9 @@ class CuraEngineBackend(QObject, Backend):
         except KeyError:
             # Can occur if the g-code has been cleared while a slice message is still arriving from the other end.
             gcode_list = []
-        application = CuraApplication.getInstance()
-        for index, line in enumerate(gcode_list):
-            replaced = line.replace("{print_time}", str(application.getPrintInformation().currentPrintTime.getDisplayString(DurationFormat.Format.ISO8601)))
-            replaced = replaced.replace("{filament_amount}", str(application.getPrintInformation().materialLengths))
-            replaced = replaced.replace("{filament_weight}", str(application.getPrintInformation().materialWeights))
-            replaced = replaced.replace("{filament_cost}", str(application.getPrintInformation().materialCosts))
-            replaced = replaced.replace("{jobname}", str(application.getPrintInformation().jobName))
-
-            gcode_list[index] = replaced
+        with self._getSliceProfile(self._start_slice_job_build_plate).measureStage("gcode_assembly", gcode_items = len(gcode_list)):
+            self._replaceGCodePlaceholders(gcode_list)
+        self._exportSliceTrace()
 
         self._slicing = False
         if self._time_start_process:
@@ -870,14 +953,11 @@ class CuraEngineBackend(QObject, Backend):
         Logger.log("d", "Number of models per buildplate: %s", dict(self._numObjectsPerBuildPlate()))
 
         # See if we need to process the sliced layers job.
-        active_build_plate = application.getMultiBuildPlateModel().activeBuildPlate
-        if (
-            self._layer_view_active and
-            (self._process_layers_job is None or not self._process_layers_job.isRunning()) and
-            active_build_plate == self._start_slice_job_build_plate and
-            active_build_plate not in self._build_plates_to_be_sliced):
-
-            self._startProcessSlicedLayersJob(active_build_plate)
+        if self._process_layers_job is not None and self._process_layers_job.isStreaming() and self._process_layers_job.getBuildPlate() == self._start_slice_job_build_plate:
+            # The layers were already being processed while they came in.
+            self._process_layers_job.finishStreaming()
+        elif self._canProcessSlicedLayers(self._start_slice_job_build_plate):
+            self._startProcessSlicedLayersJob(self._start_slice_job_build_plate)
         # self._onActiveViewChanged()
         self._start_slice_job_build_plate = None
 
@@ -885,9 +965,55 @@ class CuraEngineBackend(QObject, Backend):
         # Somehow this results in an Arcus Error
         # self.slice()
         # Call slice again using the timer, allowing the backend to restart
-        if self._build_plates_to_be_sliced:
-            self.enableTimer()  # manually enable timer to be able to invoke slice, also when in manual slice mode
-            self._invokeSlice()
+        self._continueSlicing()
+
+    def _getSliceProfile(self, build_plate_number: Optional[int]) -> SliceProfile:
+        """Get the profile of the last slice of a build plate, to add timings to.
+
+        If it is no longer in the history, a profile is returned that is not kept.
+        """
+
+        profile = self._slice_profiler.getLatestProfile(build_plate_number)
+        if profile is None:
+            profile = SliceProfile(cast(int, build_plate_number))
+        return profile
+
+    def _getSliceProfileHistorySize(self) -> int:
+        try:
+            return max(int(CuraApplication.getInstance().getPreferences().getValue("backend/slice_profile_history")), 1)
+        except (TypeError, ValueError):
+            return 1
+
+    def _exportSliceTrace(self) -> None:
+        """Keep the timings of the last slices in the data storage, next to the log file."""
+
+        self._slice_profiler.exportChromeTrace(os.path.join(Resources.getDataStoragePath(), "slice_trace.json"))
+
+    def _onEngineSentLayer(self, build_plate_number: Optional[int]) -> None:
+        # The engine sends the layers once it's done slicing them.
+        slice_profile = self._getSliceProfile(build_plate_number)
+        if slice_profile.isStageOpen("engine_slicing"):
+            slice_profile.endStage("engine_slicing")
+            slice_profile.beginStage("engine_sending_results")
+
+    def _onEngineFinished(self, build_plate_number: Optional[int]) -> None:
+        slice_profile = self._getSliceProfile(build_plate_number)
+        slice_profile.endStage("engine_slicing")
+        slice_profile.endStage("engine_sending_results")
+
+    def _replaceGCodePlaceholders(self, gcode_list: List[str]) -> None:
+        """Fill in the print information in the placeholders that the engine left in the g-code."""
+
+        print_information = CuraApplication.getInstance().getPrintInformation()
+        for index, line in enumerate(gcode_list):
+            replaced = line.replace("{print_time}", str(print_information.currentPrintTime.getDisplayString(DurationFormat.Format.ISO8601)))
+            replaced = replaced.replace("{filament_amount}", str(print_information.materialLengths))
+            replaced = replaced.replace("{filament_weight}", str(print_information.materialWeights))
+            replaced = replaced.replace("{filament_cost}", str(print_information.materialCosts))
+            replaced = replaced.replace("{jobname}", str(print_information.jobName))
+
+            if replaced != line:  # Only rewrite the g-code that had placeholders in it.
+                gcode_list[index] = replaced
 
     def _onGCodeLayerMessage(self, message: Arcus.PythonMessage) -> None:
         """Called when a g-code message is received from the engine.
@@ -899,7 +1025,10 @@ class CuraEngineBackend(QObject, Backend):
             self._scene.gcode_dict[self._start_slice_job_build_plate].append(message.data.decode("utf-8", "replace")) #type: ignore #Because we generate this attribute dynamically.
         except KeyError:
             # Can occur if the g-code has been cleared while a slice message is still arriving from the other end.
-            pass  # Throw the message away.
+            self._discardSliceCacheWriter()
+            return  # Throw the message away.
+        if self._slice_cache_writer is not None:
+            self._slice_cache_writer.addGCode(message.data.decode("utf-8", "replace"))
 
     def _onGCodePrefixMessage(self, message: Arcus.PythonMessage) -> None:
         """Called when a g-code prefix message is received from the engine.
@@ -912,27 +1041,296 @@ class CuraEngineBackend(QObject, Backend):
             self._scene.gcode_dict[self._start_slice_job_build_plate].insert(0, message.data.decode("utf-8", "replace")) #type: ignore #Because we generate this attribute dynamically.
         except KeyError:
             # Can occur if the g-code has been cleared while a slice message is still arriving from the other end.
-            pass  # Throw the message away.
+            self._discardSliceCacheWriter()
+            return  # Throw the message away.
+        if self._slice_cache_writer is not None:
+            self._slice_cache_writer.setGCodePrefix(message.data.decode("utf-8", "replace"))
 
     def _onSliceUUIDMessage(self, message: Arcus.PythonMessage) -> None:
         application = CuraApplication.getInstance()
         application.getPrintInformation().slice_uuid = message.slice_uuid
+        if self._slice_cache_writer is not None:
+            self._slice_cache_writer.setSliceUUID(message.slice_uuid)
+
+    def _setActiveSliceUUID(self, build_plate_number: int, slice_uuid: str) -> None:
+        """Show the ID of a slice in the print information, if it's the slice of the active build plate.
+
+        The print information is about the active build plate, while the engine pool and the slice cache also deliver
+        the results of the other build plates.
+        """
+
+        application = CuraApplication.getInstance()
+        if build_plate_number == application.getMultiBuildPlateModel().activeBuildPlate:
+            application.getPrintInformation().slice_uuid = slice_uuid
+
+    def _getSliceCacheSize(self) -> int:
+        """The maximum size of the slice cache in bytes, from the preferences."""
+
+        try:
+            return max(int(CuraApplication.getInstance().getPreferences().getValue("backend/slice_cache_size")), 0) * 1024 * 1024
+        except (TypeError, ValueError):
+            return 0
+
+    def _useSliceCache(self) -> bool:
+        # An external engine may be rebuilt at any moment, so its results can't be reused.
+        return self._slice_cache.isEnabled() and not CuraApplication.getInstance().getUseExternalBackend()
+
+    def _getEngineIdentity(self) -> str:
+        """Something that changes when a different version of the engine is used, to not reuse its slice results."""
+
+        engine_location = self.getEngineCommand()[0]
+        try:
+            engine_stat = os.stat(engine_location)
+        except OSError:
+            return engine_location
+        return "{location}|{size}|{modified}".format(location = engine_location, size = engine_stat.st_size, modified = engine_stat.st_mtime_ns)
+
+    def _discardSliceCacheWriter(self) -> None:
+        if self._slice_cache_writer is not None:
+            self._slice_cache_writer.discard()
+            self._slice_cache_writer = None
+
+    def _restoreSliceFromCache(self, job: StartSliceJob) -> bool:
+        """Use the result of an earlier slice of the same slice message, if it is in the cache.
+
+        :param job: The job that created the slice message.
+        :return: Whether the result was taken from the cache. If so, the slice message doesn't need to be sent.
+        """
+
+        if not self._loadCachedSlice(job, cast(int, self._start_slice_job_build_plate)):
+            return False
+        self.stopPlugins()
+        self._finishSlicing()
+        return True
+
+    def _loadCachedSlice(self, job: StartSliceJob, build_plate_number: int) -> bool:
+        """Put the result of an earlier slice of the same slice message in place of slicing it, if it is in the cache.
+
+        :param job: The job that created the slice message.
+        :param build_plate_number: The build plate that the slice message is for.
+        :return: Whether the result was taken from the cache.
+        """
+
+        if not self._useSliceCache():
+            return False
+        with self._getSliceProfile(build_plate_number).measureStage("slice_cache_lookup") as stage_args:
+            cached_slice = self._slice_cache.load(self._slice_cache.createKey(job.getSliceFingerprint(), self._getEngineIdentity()))
+            stage_args["hit"] = cached_slice is not None
+        if cached_slice is None:
+            return False
+
+        Logger.log("i", "Using the cached slice result for build plate %s.", build_plate_number)
+        self._scene.gcode_dict[build_plate_number] = FileBackedGCodeList(cached_slice.gcode)  # type: ignore
+        self._stored_optimized_layer_data[build_plate_number] = cast(List[Arcus.PythonMessage], cached_slice.layers)
+        if cached_slice.slice_uuid is not None:
+            self._setActiveSliceUUID(build_plate_number, cached_slice.slice_uuid)
+        self.printDurationMessage.emit(build_plate_number, cached_slice.print_times, cached_slice.material_amounts)
+        return True
 
     def _createSocket(self, protocol_file: str = None) -> None:
         """Creates a new socket connection."""
 
         if not protocol_file:
-            if not self.getPluginId():
-                Logger.error("Can't create socket before CuraEngineBackend plug-in is registered.")
+            protocol_file = self._getProtocolFile()
+            if not protocol_file:
                 return
-            plugin_path = PluginRegistry.getInstance().getPluginPath(self.getPluginId())
-            if not plugin_path:
-                Logger.error("Could not get plugin path!", self.getPluginId())
-                return
-            protocol_file = os.path.abspath(os.path.join(plugin_path, "Cura.proto"))
         super()._createSocket(protocol_file)
         self._engine_is_fresh = True
 
+    def _getProtocolFile(self) -> Optional[str]:
+        """The path to the file that describes the messages that are sent to and from the engine."""
+
+        if not self.getPluginId():
+            Logger.error("Can't create socket before CuraEngineBackend plug-in is registered.")
+            return None
+        plugin_path = PluginRegistry.getInstance().getPluginPath(self.getPluginId())
+        if not plugin_path:
+            Logger.error("Could not get plugin path!", self.getPluginId())
+            return None
+        return os.path.abspath(os.path.join(plugin_path, "Cura.proto"))
+
+    def _getEnginePoolSize(self) -> int:
+        """The number of engines to slice with at the same time, including the main engine, from the preferences."""
+
+        try:
+            return max(int(CuraApplication.getInstance().getPreferences().getValue("backend/engine_pool_size")), 1)
+        except (TypeError, ValueError):
+            return 1
+
+    def _useEnginePool(self) -> bool:
+        application = CuraApplication.getInstance()
+        if self._getEnginePoolSize() < 2 or application.getUseExternalBackend():
+            return False
+        # Backend plug-ins are stopped when the main engine is done, while the engine pool may still need them.
+        return not any(backend_plugin.usePlugin() for backend_plugin in application.getBackendPlugins())
+
+    def _getEnginePool(self) -> Optional[EnginePool]:
+        if self._engine_pool is None:
+            protocol_file = self._getProtocolFile()
+            if not protocol_file:
+                return None
+            self._engine_pool = EnginePool(protocol_file, self._port + self.EnginePoolPortOffset, self.getEngineCommand,
+                                           self._runEngineProcess, self._onEnginePoolMessage, self._onEnginePoolError)
+            self._engine_pool.setSize(self._getEnginePoolSize() - 1)
+        return self._engine_pool
+
+    def _startEnginePoolSlices(self) -> None:
+        """Let the idle engines of the engine pool slice build plates that are waiting to be sliced.
+
+        The active build plate is always left to the main engine, so that the state of the backend is about that one.
+        """
+
+        if not self._useEnginePool():
+            return
+        engine_pool = self._getEnginePool()
+        if engine_pool is None:
+            return
+        if not hasattr(self._scene, "gcode_dict"):
+            self._scene.gcode_dict = {}  # type: ignore
+
+        active_build_plate = CuraApplication.getInstance().getMultiBuildPlateModel().activeBuildPlate
+        num_objects = self._numObjectsPerBuildPlate()
+        for build_plate_number in list(self._build_plates_to_be_sliced):
+            if build_plate_number == active_build_plate or num_objects[build_plate_number] == 0:
+                continue  # The main engine skips empty build plates quickly.
+            session = engine_pool.getIdleSession()
+            if session is None:
+                return
+            self._build_plates_to_be_sliced.remove(build_plate_number)
+            Logger.log("d", "Going to slice build plate [%s] with the engine on port %s!", build_plate_number, session.getPort())
+
+            self._stored_optimized_layer_data[build_plate_number] = []
+            self._scene.gcode_dict[build_plate_number] = FileBackedGCodeList()  # type: ignore
+            job = StartSliceJob(session.createSliceMessage())
+            job.setBuildPlate(build_plate_number)
+            job.setSliceMessageCache(self._slice_message_cache)
+            job.setSliceProfile(self._slice_profiler.startSlice(build_plate_number))
+            session.startSlice(build_plate_number, job)
+            job.finished.connect(self._onEnginePoolStartSliceCompleted)
+            job.start()
+
+    def _onEnginePoolStartSliceCompleted(self, job: StartSliceJob) -> None:
+        if self._engine_pool is None:
+            return
+        session = next((session for session in self._engine_pool.getBusySessions() if session.getStartSliceJob() is job), None)
+        if session is None or job.isCancelled():
+            return  # Slicing this build plate was aborted.
+        build_plate_number = cast(int, session.getBuildPlate())
+
+        if job.getError() or job.getResult() != StartJobResult.Finished:
+            # Let the main engine slice it instead. That shows the user what is wrong.
+            Logger.log("w", "Unable to slice build plate %s with the engine pool, result %s.", build_plate_number, job.getResult())
+            self._returnToMainEngine(session)
+            return
+
+        if self._loadCachedSlice(job, build_plate_number):
+            self._finishEnginePoolSlice(session)
+            return
+        if self._useSliceCache():
+            session.setSliceCacheWriter(self._slice_cache.createWriter(self._slice_cache.createKey(job.getSliceFingerprint(), self._getEngineIdentity())))
+        slice_profile = self._getSliceProfile(build_plate_number)
+        with slice_profile.measureStage("send_slice_message", engine_port = session.getPort()):
+            session.sendSliceMessage(job.getSliceMessage())
+        slice_profile.beginStage("engine_slicing")
+
+    def _onEnginePoolMessage(self, session: EngineSession, message: Arcus.PythonMessage) -> None:
+        """Called when an engine of the engine pool sends a message about the build plate it slices.
+
+        The results are stored per build plate, the same as the results of the main engine. Its progress is not shown,
+        since the progress is about the active build plate.
+        """
+
+        build_plate_number = cast(int, session.getBuildPlate())
+        slice_cache_writer = session.getSliceCacheWriter()
+        message_type = message.getTypeName()
+        if message_type == "cura.proto.LayerOptimized":
+            self._stored_optimized_layer_data.setdefault(build_plate_number, []).append(message)
+            if slice_cache_writer is not None:
+                slice_cache_writer.addLayer(message)
+            self._onEngineSentLayer(build_plate_number)
+        elif message_type == "cura.proto.GCodeLayer" or message_type == "cura.proto.GCodePrefix":
+            gcode = message.data.decode("utf-8", "replace")
+            gcode_list = getattr(self._scene, "gcode_dict", {}).get(build_plate_number)
+            if gcode_list is None:
+                return  # The g-code was cleared. Throw the message away.
+            if message_type == "cura.proto.GCodeLayer":
+                gcode_list.append(gcode)
+                if slice_cache_writer is not None:
+                    slice_cache_writer.addGCode(gcode)
+            else:
+                gcode_list.insert(0, gcode)
+                if slice_cache_writer is not None:
+                    slice_cache_writer.setGCodePrefix(gcode)
+        elif message_type == "cura.proto.SliceUUID":
+            self._setActiveSliceUUID(build_plate_number, message.slice_uuid)
+            if slice_cache_writer is not None:
+                slice_cache_writer.setSliceUUID(message.slice_uuid)
+        elif message_type == "cura.proto.PrintTimeMaterialEstimates":
+            material_amounts = []
+            for index in range(message.repeatedMessageCount("materialEstimates")):
+                material_amounts.append(message.getRepeatedMessage("materialEstimates", index).material_amount)
+            times = self._parseMessagePrintTimes(message)
+            if slice_cache_writer is not None:
+                slice_cache_writer.setPrintEstimates(times, material_amounts)
+            self.printDurationMessage.emit(build_plate_number, times, material_amounts)
+        elif message_type == "cura.proto.Progress":
+            self._getSliceProfile(build_plate_number).addCounter("engine_progress", message.amount)
+        elif message_type == "cura.proto.SlicingFinished":
+            self._onEngineFinished(build_plate_number)
+            if slice_cache_writer is not None:
+                slice_cache_writer.finish()
+                session.setSliceCacheWriter(None)
+            self._finishEnginePoolSlice(session)
+
+    def _onEnginePoolError(self, session: EngineSession) -> None:
+        """Called when an engine of the engine pool stopped before it finished slicing its build plate."""
+
+        self._returnToMainEngine(session)
+
+    def _finishEnginePoolSlice(self, session: EngineSession) -> None:
+        build_plate_number = cast(int, session.getBuildPlate())
+        session.finishSlice()
+        Logger.log("d", "The engine on port %s finished slicing build plate %s.", session.getPort(), build_plate_number)
+        gcode_list = getattr(self._scene, "gcode_dict", {}).get(build_plate_number, [])
+        with self._getSliceProfile(build_plate_number).measureStage("gcode_assembly", gcode_items = len(gcode_list)):
+            self._replaceGCodePlaceholders(gcode_list)
+        self._exportSliceTrace()
+
+        if self._canProcessSlicedLayers(build_plate_number):
+            self._startProcessSlicedLayersJob(build_plate_number)
+        self._startEnginePoolSlices()
+        self._continueSlicing()
+
+    def _returnToMainEngine(self, session: EngineSession) -> None:
+        """Stop slicing the build plate of an engine of the engine pool, and let the main engine slice it instead."""
+
+        build_plate_number = cast(int, session.getBuildPlate())
+        session.finishSlice()
+        self._stored_optimized_layer_data.pop(build_plate_number, None)
+        if build_plate_number in self._build_plates_to_be_sliced:
+            self._build_plates_to_be_sliced.remove(build_plate_number)
+        self._build_plates_to_be_sliced.insert(0, build_plate_number)
+        self._continueSlicing()
+
+    def _abortEnginePoolSlices(self) -> None:
+        """Stop the engines of the engine pool. The build plates they were slicing need to be sliced again."""
+
+        if self._engine_pool is None:
+            return
+        for session in self._engine_pool.getBusySessions():
+            build_plate_number = cast(int, session.getBuildPlate())
+            session.abort()
+            self._stored_optimized_layer_data.pop(build_plate_number, None)
+            if build_plate_number not in self._build_plates_to_be_sliced:
+                self._build_plates_to_be_sliced.append(build_plate_number)
+
+    def _continueSlicing(self) -> None:
+        """Let the main engine slice the next build plate, if it is idle and something still needs slicing."""
+
+        if self._build_plates_to_be_sliced and not self._slicing:
+            self.enableTimer()  # manually enable timer to be able to invoke slice, also when in manual slice mode
+            self._invokeSlice()
+
     def _onChanged(self, *args: Any, **kwargs: Any) -> None:
         """Called when anything has changed to the stuff that needs to be sliced.
 
@@ -964,6 +1362,8 @@ class CuraEngineBackend(QObject, Backend):
             material_amounts.append(message.getRepeatedMessage("materialEstimates", index).material_amount)
 
         times = self._parseMessagePrintTimes(message)
+        if self._slice_cache_writer is not None:
+            self._slice_cache_writer.setPrintEstimates(times, material_amounts)
         self.printDurationMessage.emit(self._start_slice_job_build_plate, times, material_amounts)
 
     def _parseMessagePrintTimes(self, message: Arcus.PythonMessage) -> Dict[str, float]:
@@ -1026,9 +1426,26 @@ class CuraEngineBackend(QObject, Backend):
             source = self._postponed_scene_change_sources.pop(0)
             self._onSceneChanged(source)
 
-    def _startProcessSlicedLayersJob(self, build_plate_number: int) -> None:
-        self._process_layers_job = ProcessSlicedLayersJob(self._stored_optimized_layer_data[build_plate_number])
+    def _canProcessSlicedLayers(self, build_plate_number: Optional[int]) -> bool:
+        """Whether the sliced layers of a build plate should be processed into layer data right now."""
+
+        active_build_plate = CuraApplication.getInstance().getMultiBuildPlateModel().activeBuildPlate
+        return (
+            self._layer_view_active and
+            (self._process_layers_job is None or not self._process_layers_job.isRunning()) and
+            active_build_plate == build_plate_number and
+            active_build_plate not in self._build_plates_to_be_sliced)
+
+    def _startProcessSlicedLayersJob(self, build_plate_number: int, streaming: bool = False) -> None:
+        """Start processing the layers of a build plate into layer data.
+
+        :param build_plate_number: The build plate to process the layers of.
+        :param streaming: Whether the engine is still sending layers of this build plate.
+        """
+
+        self._process_layers_job = ProcessSlicedLayersJob(self._stored_optimized_layer_data[build_plate_number], streaming = streaming)
         self._process_layers_job.setBuildPlate(build_plate_number)
+        self._process_layers_job.setSliceProfile(self._getSliceProfile(build_plate_number))
         self._process_layers_job.finished.connect(self._onProcessLayersFinished)
         self._process_layers_job.start()
 
@@ -1101,11 +1518,15 @@ class CuraEngineBackend(QObject, Backend):
             self._onChanged()
 
     def _onProcessLayersFinished(self, job: ProcessSlicedLayersJob) -> None:
+        if job is not self._process_layers_job:
+            # This job was aborted. Its layers may already belong to a new slice, so leave them alone.
+            return
         if job.getBuildPlate() in self._stored_optimized_layer_data:
             del self._stored_optimized_layer_data[job.getBuildPlate()]
         else:
             Logger.log("w", "The optimized layer data was already deleted for buildplate %s", job.getBuildPlate())
         self._process_layers_job = None
+        self._exportSliceTrace()
         Logger.log("d", "See if there is more to slice(2)...")
         self._invokeSlice()
 
@@ -1126,6 +1547,16 @@ class CuraEngineBackend(QObject, Backend):
             self._change_timer.timeout.disconnect(self.slice)
 
     def _onPreferencesChanged(self, preference: str) -> None:
+        if preference == "backend/slice_cache_size":
+            self._slice_cache.setMaxSize(self._getSliceCacheSize())
+            return
+        if preference == "backend/slice_profile_history":
+            self._slice_profiler.setHistorySize(self._getSliceProfileHistorySize())
+            return
+        if preference == "backend/engine_pool_size":
+            if self._engine_pool is not None:
+                self._engine_pool.setSize(self._getEnginePoolSize() - 1)
+            return
         if preference != "general/auto_slice" and preference != "info/send_engine_crash" and preference != "info/anonymous_engine_crash_report":
             return
         if preference == "general/auto_slice":
@@ -1142,6 +1573,7 @@ class CuraEngineBackend(QObject, Backend):
             self._change_timer.start()
 
     def _extruderChanged(self) -> None:
+        self._slice_message_cache.invalidateSettings()
         if not self._multi_build_plate_model:
             Logger.log("w", "CuraEngineBackend does not have multi_build_plate_model assigned!")
             return
@@ -0,0 +1,307 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from collections import deque
+import subprocess
+import sys
+import threading
+from typing import Callable, Deque, IO, List, Optional, TYPE_CHECKING
+
+import pyArcus as Arcus
+
+from UM.Backend.SignalSocket import SignalSocket
+from UM.Logger import Logger
+from UM.Platform import Platform
+
+if TYPE_CHECKING:
+    from .SliceCache import SliceCacheWriter
+    from .StartSliceJob import StartSliceJob
+
+EngineCommandFactory = Callable[[int], List[str]]  # Creates the command to start an engine that connects to a port.
+EngineProcessRunner = Callable[[List[str]], Optional[subprocess.Popen]]
+
+
+class EngineSession:
+    """An extra engine process with its own socket, that slices one build plate at a time.
+
+    The engine quits after every slice, but the session keeps its port and starts a new engine right away. That engine
+    connects while nothing needs to be sliced yet, so that the next slice can be sent to it without waiting for it.
+
+    :param protocol_file: The protocol file that describes the messages of the engine.
+    :param port: The port to listen on for the engine to connect to.
+    :param create_engine_command: Creates the command to start the engine with, for a port.
+    :param run_engine_process: Starts the engine process for a command.
+    :param message_handler: Called with the session and each message that the engine sends.
+    :param error_handler: Called with the session when the engine stopped before it finished slicing its build plate.
+    """
+
+    OutputLines = 200  # Number of lines of the output of the engine to keep, for debugging.
+
+    def __init__(self, protocol_file: str, port: int, create_engine_command: EngineCommandFactory,
+                 run_engine_process: EngineProcessRunner,
+                 message_handler: Callable[["EngineSession", Arcus.PythonMessage], None],
+                 error_handler: Callable[["EngineSession"], None]) -> None:
+        self._protocol_file = protocol_file
+        self._port = port
+        self._create_engine_command = create_engine_command
+        self._run_engine_process = run_engine_process
+        self._message_handler = message_handler
+        self._error_handler = error_handler
+
+        self._socket: Optional[SignalSocket] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._is_connected = False
+        self._is_closed = False
+        self._output: Deque[str] = deque(maxlen = self.OutputLines)
+
+        self._build_plate_number: Optional[int] = None  # The build plate that is being sliced, if any.
+        self._start_slice_job: Optional["StartSliceJob"] = None
+        self._slice_message: Optional[Arcus.PythonMessage] = None  # Waiting for the engine to connect.
+        self._slice_cache_writer: Optional["SliceCacheWriter"] = None
+
+        self._createSocket()
+
+    def getPort(self) -> int:
+        return self._port
+
+    def isBusy(self) -> bool:
+        return self._build_plate_number is not None
+
+    def getBuildPlate(self) -> Optional[int]:
+        return self._build_plate_number
+
+    def getStartSliceJob(self) -> Optional["StartSliceJob"]:
+        return self._start_slice_job
+
+    def getSliceCacheWriter(self) -> Optional["SliceCacheWriter"]:
+        return self._slice_cache_writer
+
+    def setSliceCacheWriter(self, writer: Optional["SliceCacheWriter"]) -> None:
+        self._slice_cache_writer = writer
+
+    def getOutput(self) -> List[str]:
+        """The last lines that the engine wrote to its output."""
+
+        return list(self._output)
+
+    def createSliceMessage(self) -> Arcus.PythonMessage:
+        assert self._socket is not None
+        return self._socket.createMessage("cura.proto.Slice")
+
+    def startSlice(self, build_plate_number: int, start_slice_job: "StartSliceJob") -> None:
+        """Claim this session to slice a build plate, while the job prepares the slice message.
+
+        :param build_plate_number: The build plate to slice.
+        :param start_slice_job: The job that creates the slice message, from :py:meth:`createSliceMessage`.
+        """
+
+        self._build_plate_number = build_plate_number
+        self._start_slice_job = start_slice_job
+
+    def sendSliceMessage(self, slice_message: Arcus.PythonMessage) -> None:
+        """Send the slice message to the engine, as soon as it is connected."""
+
+        self._start_slice_job = None
+        if self._is_connected and self._socket is not None:
+            if self._socket.sendMessage(slice_message):
+                return
+            Logger.warning("Unable to send the slice message to the engine on port {port}.".format(port = self._port))
+            self.restart()
+            self._error_handler(self)
+            return
+        self._slice_message = slice_message
+
+    def finishSlice(self) -> None:
+        """Make the session available to slice another build plate."""
+
+        self._build_plate_number = None
+        self._start_slice_job = None
+        self._slice_message = None
+        if self._slice_cache_writer is not None:
+            self._slice_cache_writer.discard()
+            self._slice_cache_writer = None
+
+    def abort(self) -> None:
+        """Stop slicing the current build plate, and restart the engine for the next one."""
+
+        if self._start_slice_job is not None:
+            self._start_slice_job.cancel()
+        is_slicing = self._isEngineSlicing()
+        self.finishSlice()
+        if is_slicing:  # The only way to stop the engine is to stop the engine process.
+            self.restart()
+
+    def restart(self) -> None:
+        """Stop the engine and start a new one."""
+
+        self._terminate()
+        self._createSocket()
+
+    def close(self) -> None:
+        self._is_closed = True
+        self.finishSlice()
+        self._terminate()
+
+    def _createSocket(self) -> None:
+        if self._is_closed:
+            return
+        self._is_connected = False
+        self._socket = SignalSocket()
+        self._socket.stateChanged.connect(self._onSocketStateChanged)
+        self._socket.messageReceived.connect(self._onMessageReceived)
+        self._socket.error.connect(self._onSocketError)
+
+        protocol_file = self._protocol_file
+        if Platform.isWindows():
+            # The protobuf DiskSourceTree needs forward slashes, and the path in the file system encoding.
+            protocol_file = protocol_file.replace("\\", "/").encode(sys.getfilesystemencoding())
+        if not self._socket.registerAllMessageTypes(protocol_file):
+            Logger.error("Could not register the engine protocol messages: {err}".format(err = self._socket.getLastError()))
+        self._socket.listen("127.0.0.1", self._port)
+
+    def _terminate(self) -> None:
+        self._is_connected = False
+        if self._socket is not None:
+            self._socket.stateChanged.disconnect(self._onSocketStateChanged)
+            self._socket.messageReceived.disconnect(self._onMessageReceived)
+            self._socket.error.disconnect(self._onSocketError)
+            self._socket.close()
+            self._socket = None
+        if self._process is not None:
+            try:
+                self._process.terminate()
+                self._process.wait()
+            except Exception as e:  # Terminating a process that is already terminating causes an exception.
+                Logger.debug("Exception occurred while trying to stop the engine on port {port}: {err}".format(port = self._port, err = str(e)))
+            self._process = None
+
+    def _startEngine(self) -> None:
+        self._process = self._run_engine_process(self._create_engine_command(self._port))
+        if self._process is None:
+            Logger.error("Unable to start an engine on port {port}.".format(port = self._port))
+            return
+        for stream in (self._process.stdout, self._process.stderr):
+            if stream is not None:
+                threading.Thread(target = self._storeOutput, args = (stream, ), daemon = True).start()
+
+    def _storeOutput(self, stream: IO[bytes]) -> None:
+        # The output needs to be read, or the engine blocks when the pipe is full.
+        for line in iter(stream.readline, b""):
+            self._output.append(line.decode("utf-8", "replace"))
+
+    def _onSocketStateChanged(self, state: Arcus.SocketState) -> None:
+        if state == Arcus.SocketState.Listening:
+            self._startEngine()
+        elif state == Arcus.SocketState.Connected:
+            self._is_connected = True
+            if self._slice_message is not None:
+                slice_message = self._slice_message
+                self._slice_message = None
+                self.sendSliceMessage(slice_message)
+
+    def _onMessageReceived(self) -> None:
+        if self._socket is None:
+            return
+        message = self._socket.takeNextMessage()
+        if message is not None and self._build_plate_number is not None:
+            self._message_handler(self, message)
+
+    def _onSocketError(self, error: Arcus.Error) -> None:
+        if error.getErrorCode() == Arcus.ErrorCode.Debug:
+            return
+        if error.getErrorCode() == Arcus.ErrorCode.BindFailedError:
+            self._port += 1  # The port is taken by another application. Try the next one.
+            Logger.info("The port of an engine session was taken, listening on port {port} instead.".format(port = self._port))
+
+        # This also happens when the engine quits after slicing. Then it is restarted for the next slice.
+        lost_slice = self._isEngineSlicing()
+        self.restart()
+        if lost_slice:
+            Logger.warning("An engine session stopped while slicing build plate {build_plate}: {err}".format(build_plate = self._build_plate_number, err = error.toString()))
+            self._error_handler(self)
+
+    def _isEngineSlicing(self) -> bool:
+        """Whether the slice message was sent to the engine, but the engine didn't finish slicing yet."""
+
+        return self.isBusy() and self._start_slice_job is None and self._slice_message is None
+
+
+class EnginePool:
+    """A number of engine sessions, to slice several build plates at the same time.
+
+    The sessions are created when they are first needed, and kept open for later slices.
+
+    :param protocol_file: The protocol file that describes the messages of the engine.
+    :param first_port: The port of the first session. Every next session uses the next port.
+    :param create_engine_command: Creates the command to start an engine with, for a port.
+    :param run_engine_process: Starts an engine process for a command.
+    :param message_handler: Called with a session and each message that its engine sends.
+    :param error_handler: Called with a session when its engine stopped before it finished slicing.
+    """
+
+    def __init__(self, protocol_file: str, first_port: int, create_engine_command: EngineCommandFactory,
+                 run_engine_process: EngineProcessRunner,
+                 message_handler: Callable[[EngineSession, Arcus.PythonMessage], None],
+                 error_handler: Callable[[EngineSession], None]) -> None:
+        self._protocol_file = protocol_file
+        self._first_port = first_port
+        self._create_engine_command = create_engine_command
+        self._run_engine_process = run_engine_process
+        self._message_handler = message_handler
+        self._error_handler = error_handler
+        self._size = 0
+        self._sessions: List[EngineSession] = []
+
+    def setSize(self, size: int) -> None:
+        """Change the maximum number of sessions. Sessions that are no longer allowed are closed when they are idle."""
+
+        self._size = max(size, 0)
+        self._closeSurplusSessions()
+
+    def getSize(self) -> int:
+        return self._size
+
+    def getSessions(self) -> List[EngineSession]:
+        return list(self._sessions)
+
+    def getBusySessions(self) -> List[EngineSession]:
+        return [session for session in self._sessions if session.isBusy()]
+
+    def getIdleSession(self) -> Optional[EngineSession]:
+        """Get a session that is not slicing, creating one if the pool is not full yet.
+
+        :return: The idle session, or None if all sessions are busy.
+        """
+
+        for session in self._sessions:
+            if not session.isBusy():
+                return session
+        if len(self._sessions) >= self._size:
+            return None
+        port = max([session.getPort() + 1 for session in self._sessions], default = self._first_port)
+        session = EngineSession(self._protocol_file, port, self._create_engine_command, self._run_engine_process,
+                                self._onMessage, self._onError)
+        self._sessions.append(session)
+        return session
+
+    def close(self) -> None:
+        for session in self._sessions:
+            session.close()
+        self._sessions = []
+
+    def _onMessage(self, session: EngineSession, message: Arcus.PythonMessage) -> None:
+        self._message_handler(session, message)
+        if not session.isBusy():  # Finished slicing.
+            self._closeSurplusSessions()
+
+    def _onError(self, session: EngineSession) -> None:
+        self._error_handler(session)
+        self._closeSurplusSessions()
+
+    def _closeSurplusSessions(self) -> None:
+        while len(self._sessions) > self._size:
+            idle_sessions = [session for session in self._sessions if not session.isBusy()]
+            if not idle_sessions:
+                return
+            idle_sessions[-1].close()
+            self._sessions.remove(idle_sessions[-1])
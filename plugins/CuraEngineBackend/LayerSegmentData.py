@@ -0,0 +1,117 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from itertools import accumulate
+from typing import Any, List, Sequence, Tuple
+
+import numpy
+
+
+class LayerSegmentData:
+    """All path segments of one layer message from CuraEngine, read into contiguous arrays.
+
+    Every attribute of every path segment is read through a ``numpy.frombuffer`` view on the message bytes. The views
+    are copied into one array per attribute with a single concatenation per layer, instead of copying each attribute of
+    each segment into its own array. The arrays that are handed out per segment by :py:meth:`getSegment` are views into
+    these layer-wide arrays, so they are not copied again.
+
+    :param layer: The ``LayerOptimized`` message to read.
+    """
+
+    def __init__(self, layer: Any) -> None:
+        segments = [layer.getRepeatedMessage("path_segment", index) for index in range(layer.repeatedMessageCount("path_segment"))]
+
+        self._extruders = [segment.extruder for segment in segments]  # type: List[int]
+        self._line_types, self._line_type_offsets = self._concatenate(segments, "line_type", "u1")
+        self._line_widths, self._line_width_offsets = self._concatenate(segments, "line_width", "f4")
+        self._line_thicknesses, self._line_thickness_offsets = self._concatenate(segments, "line_thickness", "f4")
+        self._line_feedrates, self._line_feedrate_offsets = self._concatenate(segments, "line_feedrate", "f4")
+        self._points, self._point_offsets = self._readPoints(segments, layer.height)
+
+    def segmentCount(self) -> int:
+        return len(self._extruders)
+
+    def getSegment(self, index: int) -> Tuple[int, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """Get the data of one path segment, in the order of the arguments of :py:class:`cura.LayerPolygon.LayerPolygon`.
+
+        :param index: The index of the path segment in the layer message.
+        :return: A tuple of extruder, line types, points, line widths, line thicknesses and line feedrates.
+        """
+
+        return (self._extruders[index],
+                self._slice(self._line_types, self._line_type_offsets, index),
+                self._slice(self._points, self._point_offsets, index),
+                self._slice(self._line_widths, self._line_width_offsets, index),
+                self._slice(self._line_thicknesses, self._line_thickness_offsets, index),
+                self._slice(self._line_feedrates, self._line_feedrate_offsets, index))
+
+    @property
+    def lineTypes(self) -> numpy.ndarray:
+        return self._line_types
+
+    @property
+    def points(self) -> numpy.ndarray:
+        return self._points
+
+    @property
+    def lineWidths(self) -> numpy.ndarray:
+        return self._line_widths
+
+    @property
+    def lineThicknesses(self) -> numpy.ndarray:
+        return self._line_thicknesses
+
+    @property
+    def lineFeedrates(self) -> numpy.ndarray:
+        return self._line_feedrates
+
+    @staticmethod
+    def _slice(array: numpy.ndarray, offsets: List[int], index: int) -> numpy.ndarray:
+        return array[offsets[index]:offsets[index + 1]]
+
+    @staticmethod
+    def _offsets(lengths: Sequence[int]) -> List[int]:
+        # Plain integers, since slicing with numpy scalars is a lot slower than with Python integers.
+        return [0] + list(accumulate(lengths))
+
+    @classmethod
+    def _concatenate(cls, segments: List[Any], field: str, dtype: str) -> Tuple[numpy.ndarray, List[int]]:
+        """Concatenate one bytes field of all segments into a single (writable) column array."""
+
+        views = [numpy.frombuffer(getattr(segment, field), dtype = dtype) for segment in segments]
+        if not views:
+            return numpy.empty((0, 1), dtype = dtype), cls._offsets([])
+        return numpy.concatenate(views).reshape((-1, 1)), cls._offsets([len(view) for view in views])
+
+    @classmethod
+    def _readPoints(cls, segments: List[Any], layer_height: float) -> Tuple[numpy.ndarray, List[int]]:
+        """Read the points of all segments into one (N, 3) array in Cura's coordinate system."""
+
+        views = [numpy.frombuffer(segment.points, dtype = "f4") for segment in segments]
+        point_counts = [len(view) // (2 if segment.point_type == 0 else 3) for segment, view in zip(segments, views)]
+        offsets = cls._offsets(point_counts)
+        points = numpy.empty((offsets[-1], 3), numpy.float32)
+        if not views:
+            return points, offsets
+
+        point_types = {segment.point_type for segment in segments}
+        if len(point_types) == 1:
+            # The common case: all segments use the same point type, so they can be converted in one go.
+            cls._fillPoints(points, numpy.concatenate(views), point_types.pop(), layer_height)
+        else:
+            for index, (segment, view) in enumerate(zip(segments, views)):
+                cls._fillPoints(cls._slice(points, offsets, index), view, segment.point_type, layer_height)
+        return points, offsets
+
+    @staticmethod
+    def _fillPoints(target: numpy.ndarray, raw_points: numpy.ndarray, point_type: int, layer_height: float) -> None:
+        if point_type == 0:  # Point2D
+            raw_points = raw_points.reshape((-1, 2))
+            target[:, 0] = raw_points[:, 0]
+            target[:, 1] = layer_height / 1000  # layer height value is in backend representation
+            target[:, 2] = -raw_points[:, 1]
+        else:  # Point3D
+            raw_points = raw_points.reshape((-1, 3))
+            target[:, 0] = raw_points[:, 0]
+            target[:, 1] = raw_points[:, 2]
+            target[:, 2] = -raw_points[:, 1]
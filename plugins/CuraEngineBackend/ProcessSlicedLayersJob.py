@@ -1,8 +1,11 @@
 #Copyright (c) 2019 Ultimaker B.V.
 #Cura is released under the terms of the LGPLv3 or higher.
 
+from contextlib import nullcontext
 import gc
 import sys
+import threading
+from typing import Optional
 
 from UM.Job import Job
 from UM.Application import Application
@@ -23,8 +26,12 @@ from cura import LayerDataDecorator
 from cura import LayerPolygon
 
 import numpy
-from time import time
+from time import perf_counter, time
 from cura.Machines.Models.ExtrudersModel import ExtrudersModel
+
+from .LayerSegmentData import LayerSegmentData
+from .SliceProfiler import SliceProfile
+
 catalog = i18nCatalog("cura")
 
 
@@ -45,7 +52,17 @@ def colorCodeToRGBA(color_code):
 
 
 class ProcessSlicedLayersJob(Job):
-    def __init__(self, layers):
+    PublishInterval = 0.5  # Minimum number of seconds between showing updates of the layers while they stream in.
+
+    def __init__(self, layers, streaming = False):
+        """Creates a job to turn the layer messages from the engine into layer data.
+
+        :param layers: The optimized layer messages from the engine. While streaming, the backend keeps adding the
+        layers that come in to this list.
+        :param streaming: Whether the engine is still sending layers. The layers that are already processed are then
+        shown while the rest comes in, until :py:meth:`finishStreaming` is called.
+        """
+
         super().__init__()
         self._layers = layers
         self._scene = Application.getInstance().getController().getScene()
@@ -53,16 +70,37 @@ class ProcessSlicedLayersJob(Job):
         self._abort_requested = False
         self._build_plate_number = None
 
+        self._all_layers_received = threading.Event()
+        if not streaming:
+            self._all_layers_received.set()
+
+        self._layer_data: Optional[LayerDataBuilder.LayerDataBuilder] = None
+        self._layer_data_decorator: Optional[LayerDataDecorator.LayerDataDecorator] = None
+        self._min_layer_number = sys.maxsize
+        self._negative_layers = 0
+        self._slice_profile: Optional[SliceProfile] = None
+
     def abort(self):
         """Aborts the processing of layers.
 
         This abort is made on a best-effort basis, meaning that the actual
         job thread will check once in a while to see whether an abort is
         requested and then stop processing by itself. There is no guarantee
-        that the abort will stop the job any time soon or even at all.
+        that the abort will stop the job any time soon or even at all. Its
+        message is hidden right away.
         """
 
         self._abort_requested = True
+        if self._progress_message:
+            self._progress_message.hide()
+
+    def finishStreaming(self):
+        """Indicates that the engine has sent all layers, so the layer data can be completed."""
+
+        self._all_layers_received.set()
+
+    def isStreaming(self):
+        return not self._all_layers_received.is_set()
 
     def setBuildPlate(self, new_value):
         self._build_plate_number = new_value
@@ -70,7 +108,25 @@ class ProcessSlicedLayersJob(Job):
     def getBuildPlate(self):
         return self._build_plate_number
 
+    def setSliceProfile(self, slice_profile):
+        """Keep the timings of processing the layers in the profile of the slice that the layers came from."""
+
+        self._slice_profile = slice_profile
+
     def run(self):
+        start_time = perf_counter()
+        try:
+            self._processLayers()
+        finally:
+            if self._slice_profile is not None:
+                self._slice_profile.addStage("process_layers", start_time, perf_counter(), aborted = self._abort_requested)
+
+    def _measureStage(self, name, **args):
+        if self._slice_profile is None:
+            return nullcontext()
+        return self._slice_profile.measureStage(name, **args)
+
+    def _processLayers(self):
         Logger.log("d", "Processing new layer for build plate %s..." % self._build_plate_number)
         start_time = time()
         view = Application.getInstance().getController().getActiveView()
@@ -96,104 +152,139 @@ class ProcessSlicedLayersJob(Job):
         gc.collect()
 
         mesh = MeshData()
-        layer_data = LayerDataBuilder.LayerDataBuilder()
-        layer_count = len(self._layers)
-
-        # Find the minimum layer number
-        # When disabling the remove empty first layers setting, the minimum layer number will be a positive
-        # value. In that case the first empty layers will be discarded and start processing layers from the
-        # first layer with data.
-        # When using a raft, the raft layers are sent as layers < 0. Instead of allowing layers < 0, we
-        # simply offset all other layers so the lowest layer is always 0. It could happens that the first
-        # raft layer has value -8 but there are just 4 raft (negative) layers.
-        min_layer_number = sys.maxsize
-        negative_layers = 0
-        for layer in self._layers:
-            if layer.repeatedMessageCount("path_segment") > 0:
-                if layer.id < min_layer_number:
-                    min_layer_number = layer.id
-                if layer.id < 0:
-                    negative_layers += 1
+        self._layer_data = LayerDataBuilder.LayerDataBuilder()
+        material_color_map = self._getMaterialColorMap()
 
-        current_layer = 0
+        # We have to scale the colors for compatibility mode
+        if OpenGLContext.isLegacyOpenGL() or bool(Application.getInstance().getPreferences().getValue("view/force_layer_view_compatibility_mode")):
+            line_type_brightness = 0.5  # for compatibility mode
+        else:
+            line_type_brightness = 1.0
 
-        for layer in self._layers:
-            # If the layer is below the minimum, it means that there is no data, so that we don't create a layer
-            # data. However, if there are empty layers in between, we compute them.
-            if layer.id < min_layer_number:
-                continue
+        processed_count = 0
+        last_publish_time = 0.0
+        while True:
+            # Check this before looking at the layers, so that no layer that comes in meanwhile is missed.
+            all_layers_received = self._all_layers_received.is_set()
+            received_count = len(self._layers)
+
+            if self._updateLayerNumbering(self._layers[processed_count:received_count], processed_count) and processed_count > 0:
+                # Layers came in out of order, so the layers that are already processed got a different number.
+                Logger.log("d", "Layer numbering changed, processing the layers of build plate %s again", self._build_plate_number)
+                self._layer_data = LayerDataBuilder.LayerDataBuilder()
+                processed_count = 0
+
+            with self._measureStage("ingest_layers", layers = received_count - processed_count):
+                for layer in self._layers[processed_count:received_count]:
+                    self._processLayer(layer)
+                    Job.yieldThread()
+                    processed_count += 1
+                    progress = (processed_count / len(self._layers)) * 99
+
+                    if self._abort_requested:
+                        self._cancel(new_node)
+                        return
+                    if self._progress_message:
+                        self._progress_message.setProgress(progress)
+
+            if all_layers_received:
+                break
+
+            # Show what we have so far, while the engine is still sending layers.
+            if processed_count > 0 and time() - last_publish_time >= self.PublishInterval:
+                with self._measureStage("build_layer_data", layers = processed_count):
+                    layer_mesh = self._layer_data.buildIncrementally(material_color_map, line_type_brightness)
+                self._showLayerData(new_node, mesh, layer_mesh)
+                last_publish_time = time()
+            self._all_layers_received.wait(0.1)
+            if self._abort_requested:
+                self._cancel(new_node)
+                return
 
-            # Layers are offset by the minimum layer number. In case the raft (negative layers) is being used,
-            # then the absolute layer number is adjusted by removing the empty layers that can be in between raft
-            # and the model
-            abs_layer_number = layer.id - min_layer_number
-            if layer.id >= 0 and negative_layers != 0:
-                abs_layer_number += (min_layer_number + negative_layers)
+        # We are done processing all the layers we got from the engine, now complete the mesh out of the data
+        with self._measureStage("build_layer_data", layers = processed_count):
+            layer_mesh = self._layer_data.buildIncrementally(material_color_map, line_type_brightness)
 
-            layer_data.addLayer(abs_layer_number)
-            this_layer = layer_data.getLayer(abs_layer_number)
-            layer_data.setLayerHeight(abs_layer_number, layer.height)
-            layer_data.setLayerThickness(abs_layer_number, layer.thickness)
+        if self._abort_requested:
+            self._cancel(new_node)
+            return
+
+        self._showLayerData(new_node, mesh, layer_mesh)
+
+        if self._progress_message:
+            self._progress_message.setProgress(100)
+
+        if self._progress_message:
+            self._progress_message.hide()
 
-            for p in range(layer.repeatedMessageCount("path_segment")):
-                polygon = layer.getRepeatedMessage("path_segment", p)
+        # Clear the unparsed layers. This saves us a bunch of memory if the Job does not get destroyed.
+        self._layers = None
+        self._layer_data = None
 
-                extruder = polygon.extruder
+        Logger.log("d", "Processing layers took %s seconds", time() - start_time)
 
-                line_types = numpy.fromstring(polygon.line_type, dtype = "u1")  # Convert bytearray to numpy array
+    def _updateLayerNumbering(self, new_layers, processed_count):
+        """Find the minimum layer number and the number of raft layers, including the layers that just came in.
 
-                line_types = line_types.reshape((-1,1))
+        When disabling the remove empty first layers setting, the minimum layer number will be a positive
+        value. In that case the first empty layers will be discarded and start processing layers from the
+        first layer with data.
+        When using a raft, the raft layers are sent as layers < 0. Instead of allowing layers < 0, we
+        simply offset all other layers so the lowest layer is always 0. It could happens that the first
+        raft layer has value -8 but there are just 4 raft (negative) layers.
 
-                points = numpy.fromstring(polygon.points, dtype = "f4")  # Convert bytearray to numpy array
-                if polygon.point_type == 0: # Point2D
-                    points = points.reshape((-1,2))  # We get a linear list of pairs that make up the points, so make numpy interpret them correctly.
-                else:  # Point3D
-                    points = points.reshape((-1,3))
+        :param new_layers: The layers that came in since the previous update.
+        :param processed_count: The number of layers that have already been processed.
+        :return: Whether the numbers of the processed layers changed because of the new layers. The engine sends
+        the layers bottom up, so this is normally not the case.
+        """
 
-                line_widths = numpy.fromstring(polygon.line_width, dtype = "f4")  # Convert bytearray to numpy array
-                line_widths = line_widths.reshape((-1,1))  # We get a linear list of pairs that make up the points, so make numpy interpret them correctly.
+        min_layer_number = self._min_layer_number
+        negative_layers = self._negative_layers
+        for layer in new_layers:
+            if layer.repeatedMessageCount("path_segment") > 0:
+                if layer.id < min_layer_number:
+                    min_layer_number = layer.id
+                if layer.id < 0:
+                    negative_layers += 1
 
-                line_thicknesses = numpy.fromstring(polygon.line_thickness, dtype = "f4")  # Convert bytearray to numpy array
-                line_thicknesses = line_thicknesses.reshape((-1,1))  # We get a linear list of pairs that make up the points, so make numpy interpret them correctly.
+        min_layer_number_changed = min_layer_number != self._min_layer_number
+        negative_layers_changed = negative_layers != self._negative_layers
+        self._min_layer_number = min_layer_number
+        self._negative_layers = negative_layers
 
-                line_feedrates = numpy.fromstring(polygon.line_feedrate, dtype = "f4")  # Convert bytearray to numpy array
-                line_feedrates = line_feedrates.reshape((-1,1))  # We get a linear list of pairs that make up the points, so make numpy interpret them correctly.
+        # The raft layers only shift the number of the layers that are not part of the raft.
+        return min_layer_number_changed or (negative_layers_changed and any(layer.id >= 0 for layer in self._layers[:processed_count]))
 
-                # Create a new 3D-array, copy the 2D points over and insert the right height.
-                # This uses manual array creation + copy rather than numpy.insert since this is
-                # faster.
-                new_points = numpy.empty((len(points), 3), numpy.float32)
-                if polygon.point_type == 0:  # Point2D
-                    new_points[:, 0] = points[:, 0]
-                    new_points[:, 1] = layer.height / 1000  # layer height value is in backend representation
-                    new_points[:, 2] = -points[:, 1]
-                else: # Point3D
-                    new_points[:, 0] = points[:, 0]
-                    new_points[:, 1] = points[:, 2]
-                    new_points[:, 2] = -points[:, 1]
+    def _processLayer(self, layer):
+        # If the layer is below the minimum, it means that there is no data, so that we don't create a layer
+        # data. However, if there are empty layers in between, we compute them.
+        if layer.id < self._min_layer_number:
+            return
 
-                this_poly = LayerPolygon.LayerPolygon(extruder, line_types, new_points, line_widths, line_thicknesses, line_feedrates)
-                this_poly.buildCache()
+        # Layers are offset by the minimum layer number. In case the raft (negative layers) is being used,
+        # then the absolute layer number is adjusted by removing the empty layers that can be in between raft
+        # and the model
+        abs_layer_number = layer.id - self._min_layer_number
+        if layer.id >= 0 and self._negative_layers != 0:
+            abs_layer_number += (self._min_layer_number + self._negative_layers)
 
-                this_layer.polygons.append(this_poly)
+        self._layer_data.addLayer(abs_layer_number)
+        this_layer = self._layer_data.getLayer(abs_layer_number)
+        self._layer_data.setLayerHeight(abs_layer_number, layer.height)
+        self._layer_data.setLayerThickness(abs_layer_number, layer.thickness)
 
-                Job.yieldThread()
-            Job.yieldThread()
-            current_layer += 1
-            progress = (current_layer / layer_count) * 99
-            # TODO: Rebuild the layer data mesh once the layer has been processed.
-            # This needs some work in LayerData so we can add the new layers instead of recreating the entire mesh.
+        # All path segments of the layer are read into contiguous arrays at once, the polygons are views into them.
+        segment_data = LayerSegmentData(layer)
+        for index in range(segment_data.segmentCount()):
+            this_poly = LayerPolygon.LayerPolygon(*segment_data.getSegment(index))
+            this_poly.buildCache()
 
-            if self._abort_requested:
-                if self._progress_message:
-                    self._progress_message.hide()
-                return
-            if self._progress_message:
-                self._progress_message.setProgress(progress)
+            this_layer.polygons.append(this_poly)
 
-        # We are done processing all the layers we got from the engine, now create a mesh out of the data
+    def _getMaterialColorMap(self):
+        """Find out colors per extruder"""
 
-        # Find out colors per extruder
         global_container_stack = Application.getInstance().getGlobalContainerStack()
         manager = ExtruderManager.getInstance()
         extruders = manager.getActiveExtruderStacks()
@@ -214,44 +305,48 @@ class ProcessSlicedLayersJob(Job):
             color_code = global_container_stack.material.getMetaDataEntry("color_code", default = "#e0e000")
             color = colorCodeToRGBA(color_code)
             material_color_map[0, :] = color
+        return material_color_map
 
-        # We have to scale the colors for compatibility mode
-        if OpenGLContext.isLegacyOpenGL() or bool(Application.getInstance().getPreferences().getValue("view/force_layer_view_compatibility_mode")):
-            line_type_brightness = 0.5  # for compatibility mode
-        else:
-            line_type_brightness = 1.0
-        layer_mesh = layer_data.build(material_color_map, line_type_brightness)
+    def _showLayerData(self, new_node, mesh, layer_mesh):
+        """Puts the (partial) layer data in the scene.
 
-        if self._abort_requested:
-            if self._progress_message:
-                self._progress_message.hide()
+        The scene is changed on the main thread, like every other change of the scene graph. Since the calls are queued
+        in order, the last layer data is always the one that ends up in the scene.
+        """
+
+        Application.getInstance().callLater(self._setLayerDataOfNode, new_node, mesh, layer_mesh)
+
+    def _setLayerDataOfNode(self, new_node, mesh, layer_mesh):
+        """The first time, the node that holds the layer data is added to the scene. After that, only its layer data is
+        replaced.
+        """
+
+        if self._layer_data_decorator is not None:
+            self._layer_data_decorator.setLayerData(layer_mesh)
+            new_node.setMeshData(mesh)  # Lets the scene (and so the simulation view) know that the layer data changed.
             return
 
         # Add LayerDataDecorator to scene node to indicate that the node has layer data
-        decorator = LayerDataDecorator.LayerDataDecorator()
-        decorator.setLayerData(layer_mesh)
-        new_node.addDecorator(decorator)
+        self._layer_data_decorator = LayerDataDecorator.LayerDataDecorator()
+        self._layer_data_decorator.setLayerData(layer_mesh)
+        new_node.addDecorator(self._layer_data_decorator)
 
         new_node.setMeshData(mesh)
         # Set build volume as parent, the build volume can move as a result of raft settings.
         # It makes sense to set the build volume as parent: the print is actually printed on it.
         new_node_parent = Application.getInstance().getBuildVolume()
-        new_node.setParent(new_node_parent)  # Note: After this we can no longer abort!
+        new_node.setParent(new_node_parent)
 
         settings = Application.getInstance().getGlobalContainerStack()
         if not settings.getProperty("machine_center_is_zero", "value"):
             new_node.setPosition(Vector(-settings.getProperty("machine_width", "value") / 2, 0.0, settings.getProperty("machine_depth", "value") / 2))
 
-        if self._progress_message:
-            self._progress_message.setProgress(100)
-
+    def _cancel(self, new_node):
         if self._progress_message:
             self._progress_message.hide()
-
-        # Clear the unparsed layers. This saves us a bunch of memory if the Job does not get destroyed.
-        self._layers = None
-
-        Logger.log("d", "Processing layers took %s seconds", time() - start_time)
+        # Partial layer data may have been shown while streaming, but it is outdated now. This is queued after showing
+        # it, so it's also removed if it wasn't added to the scene yet.
+        Application.getInstance().callLater(new_node.setParent, None)
 
     def _onActiveViewChanged(self):
         if self.isRunning():
@@ -0,0 +1,281 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, BinaryIO, Dict, List, NamedTuple, Optional
+
+from UM.Logger import Logger
+
+# The bytes fields of a path segment, in the order they are stored in the cache.
+_SEGMENT_FIELDS = ("points", "line_type", "line_width", "line_thickness", "line_feedrate")
+
+
+class CachedPathSegment:
+    """A path segment of a cached layer, with the same fields as the ``PathSegment`` message of the engine."""
+
+    def __init__(self, extruder: int, point_type: int, points: memoryview, line_type: memoryview,
+                 line_width: memoryview, line_thickness: memoryview, line_feedrate: memoryview) -> None:
+        self.extruder = extruder
+        self.point_type = point_type
+        self.points = points
+        self.line_type = line_type
+        self.line_width = line_width
+        self.line_thickness = line_thickness
+        self.line_feedrate = line_feedrate
+
+
+class CachedLayerMessage:
+    """A cached layer, that can be processed in place of the ``LayerOptimized`` message of the engine."""
+
+    def __init__(self, layer_id: int, height: float, thickness: float, path_segments: List[CachedPathSegment]) -> None:
+        self.id = layer_id
+        self.height = height
+        self.thickness = thickness
+        self._path_segments = path_segments
+
+    def repeatedMessageCount(self, field_name: str) -> int:
+        return len(self._path_segments) if field_name == "path_segment" else 0
+
+    def getRepeatedMessage(self, field_name: str, index: int) -> CachedPathSegment:
+        if field_name != "path_segment":
+            raise KeyError(field_name)
+        return self._path_segments[index]
+
+
+class CachedSlice(NamedTuple):
+    """Everything the engine sent for one slice, as far as the front-end needs it."""
+
+    gcode: List[str]  # The g-code list, starting with the g-code prefix.
+    layers: List[CachedLayerMessage]
+    print_times: Dict[str, float]
+    material_amounts: List[float]
+    slice_uuid: Optional[str]
+
+
+class SliceCacheWriter:
+    """Stores the result of one slice in the cache while the engine sends it.
+
+    The g-code and layers are written to files as they come in, so there is no need to keep them in memory until the
+    slice is finished. The entry only appears in the cache when :py:meth:`finish` is called.
+    """
+
+    def __init__(self, cache: "SliceCache", key: str, directory: str) -> None:
+        self._cache = cache
+        self._key = key
+        self._directory = directory
+        self._gcode_file: BinaryIO = open(os.path.join(directory, "gcode.bin"), "wb")
+        self._layers_file: BinaryIO = open(os.path.join(directory, "layers.bin"), "wb")
+        self._metadata = {
+            "version": SliceCache.Version,
+            "gcode_prefix": "",
+            "gcode_lengths": [],
+            "layers": [],
+            "print_times": {},
+            "material_amounts": [],
+            "slice_uuid": None
+        }  # type: Dict[str, Any]
+
+    def addGCode(self, gcode: str) -> None:
+        data = gcode.encode("utf-8", "surrogatepass")
+        self._gcode_file.write(data)
+        self._metadata["gcode_lengths"].append(len(data))
+
+    def setGCodePrefix(self, gcode_prefix: str) -> None:
+        self._metadata["gcode_prefix"] = gcode_prefix
+
+    def addLayer(self, layer: Any) -> None:
+        """Store a ``LayerOptimized`` message."""
+
+        segments = []
+        for index in range(layer.repeatedMessageCount("path_segment")):
+            segment = layer.getRepeatedMessage("path_segment", index)
+            lengths = []
+            for field in _SEGMENT_FIELDS:
+                data = getattr(segment, field)
+                self._layers_file.write(data)
+                lengths.append(len(data))
+            segments.append([segment.extruder, segment.point_type, lengths])
+        self._metadata["layers"].append({"id": layer.id, "height": layer.height, "thickness": layer.thickness, "segments": segments})
+
+    def setPrintEstimates(self, print_times: Dict[str, float], material_amounts: List[float]) -> None:
+        self._metadata["print_times"] = print_times
+        self._metadata["material_amounts"] = material_amounts
+
+    def setSliceUUID(self, slice_uuid: str) -> None:
+        self._metadata["slice_uuid"] = slice_uuid
+
+    def finish(self) -> None:
+        """Add the slice to the cache."""
+
+        try:
+            self._gcode_file.close()
+            self._layers_file.close()
+            with open(os.path.join(self._directory, "metadata.json"), "w", encoding = "utf-8") as f:
+                json.dump(self._metadata, f)
+        except OSError as e:
+            Logger.warning("Unable to store the slice result in the cache: {err}".format(err = str(e)))
+            self.discard()
+            return
+        self._cache._addEntry(self._key, self._directory)
+
+    def discard(self) -> None:
+        """Throw away what was stored so far, if the slice was not completed."""
+
+        self._gcode_file.close()
+        self._layers_file.close()
+        shutil.rmtree(self._directory, ignore_errors = True)
+
+
+class SliceCache:
+    """Stores the results of slices on disk, so that slicing the same thing again doesn't have to run the engine.
+
+    Every entry is stored under a key that is a hash of everything that is sent to the engine to slice. Entries that
+    were used longest ago are removed when the cache grows beyond its maximum size.
+
+    :param directory: The directory to store the cache in.
+    :param max_size: The maximum total size of all entries, in bytes. Zero disables the cache.
+    """
+
+    Version = 1  # Increase when changing the format of the entries.
+    IncompletePrefix = ".incomplete_"  # Entries that are still being written.
+
+    def __init__(self, directory: str, max_size: int) -> None:
+        self._directory = directory
+        self._max_size = max_size
+
+    def setMaxSize(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._evict()
+
+    def isEnabled(self) -> bool:
+        return self._max_size > 0
+
+    def createKey(self, slice_fingerprint: str, engine_identity: str) -> str:
+        """Get the key for the slice result of a slice message.
+
+        :param slice_fingerprint: A hash of the contents of the slice message.
+        :param engine_identity: Something that changes when the engine changes, to not use the results of another
+        version of the engine.
+        """
+
+        key_hash = hashlib.sha256()
+        for part in (str(self.Version), engine_identity, slice_fingerprint):
+            key_hash.update(part.encode("utf-8"))
+            key_hash.update(b"\0")
+        return key_hash.hexdigest()
+
+    def load(self, key: str) -> Optional[CachedSlice]:
+        """Get a slice result from the cache.
+
+        :return: The slice result, or None if it is not in the cache.
+        """
+
+        if not self.isEnabled():
+            return None
+        entry_directory = os.path.join(self._directory, key)
+        metadata_path = os.path.join(entry_directory, "metadata.json")
+        try:
+            with open(metadata_path, encoding = "utf-8") as f:
+                metadata = json.load(f)
+            if metadata.get("version") != self.Version:
+                return None
+            with open(os.path.join(entry_directory, "gcode.bin"), "rb") as f:
+                gcode_data = f.read()
+            with open(os.path.join(entry_directory, "layers.bin"), "rb") as f:
+                layers_data = memoryview(f.read())
+            os.utime(metadata_path)  # Mark it as recently used.
+        except (OSError, ValueError):  # Not in the cache, or not readable.
+            return None
+
+        gcode = [metadata["gcode_prefix"]]
+        offset = 0
+        for length in metadata["gcode_lengths"]:
+            gcode.append(gcode_data[offset:offset + length].decode("utf-8", "surrogatepass"))
+            offset += length
+
+        layers = []
+        offset = 0
+        for layer in metadata["layers"]:
+            segments = []
+            for extruder, point_type, lengths in layer["segments"]:
+                fields = []
+                for length in lengths:
+                    fields.append(layers_data[offset:offset + length])
+                    offset += length
+                segments.append(CachedPathSegment(extruder, point_type, *fields))
+            layers.append(CachedLayerMessage(layer["id"], layer["height"], layer["thickness"], segments))
+
+        return CachedSlice(gcode, layers, metadata["print_times"], metadata["material_amounts"], metadata["slice_uuid"])
+
+    def createWriter(self, key: str) -> Optional[SliceCacheWriter]:
+        """Start storing a slice result in the cache.
+
+        :return: The writer to store the slice result with, or None if the cache is disabled or can't be written.
+        """
+
+        if not self.isEnabled():
+            return None
+        try:
+            os.makedirs(self._directory, exist_ok = True)
+            return SliceCacheWriter(self, key, tempfile.mkdtemp(prefix = self.IncompletePrefix, dir = self._directory))
+        except OSError as e:
+            Logger.warning("Unable to store slice results in the cache at {directory}: {err}".format(directory = self._directory, err = str(e)))
+            return None
+
+    def clear(self) -> None:
+        shutil.rmtree(self._directory, ignore_errors = True)
+
+    def _addEntry(self, key: str, entry_directory: str) -> None:
+        destination = os.path.join(self._directory, key)
+        shutil.rmtree(destination, ignore_errors = True)
+        try:
+            os.replace(entry_directory, destination)
+        except OSError as e:
+            Logger.warning("Unable to store the slice result in the cache: {err}".format(err = str(e)))
+            shutil.rmtree(entry_directory, ignore_errors = True)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove the entries that were used longest ago, until the cache is small enough."""
+
+        try:
+            names = os.listdir(self._directory)
+        except OSError:
+            return
+        entry_names = []
+        for name in names:
+            if name.startswith(SliceCache.IncompletePrefix):
+                # Left behind when Cura was closed while slicing. Others may still be written to.
+                incomplete_directory = os.path.join(self._directory, name)
+                try:
+                    if os.path.getmtime(incomplete_directory) < time.time() - 24 * 60 * 60:
+                        shutil.rmtree(incomplete_directory, ignore_errors = True)
+                except OSError:
+                    pass
+                continue
+            entry_names.append(name)
+        entries = []
+        total_size = 0
+        for name in entry_names:
+            entry_directory = os.path.join(self._directory, name)
+            try:
+                last_used = os.path.getmtime(os.path.join(entry_directory, "metadata.json"))
+                size = sum(entry.stat().st_size for entry in os.scandir(entry_directory))
+            except OSError:  # Broken entry.
+                last_used = 0
+                size = 0
+            entries.append((last_used, size, entry_directory))
+            total_size += size
+
+        entries.sort()
+        for last_used, size, entry_directory in entries:
+            if total_size <= self._max_size and last_used > 0:
+                break
+            shutil.rmtree(entry_directory, ignore_errors = True)
+            total_size -= size
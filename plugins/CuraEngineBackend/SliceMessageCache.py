@@ -0,0 +1,115 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from collections import OrderedDict
+import threading
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+import numpy
+
+if TYPE_CHECKING:
+    from UM.Mesh.MeshData import MeshData
+
+
+class CachedObjectVertices(NamedTuple):
+    """The vertex data of one object in a slice message."""
+
+    mesh_data: "MeshData"  # Kept to check whether the object still has the same mesh.
+    transformation: bytes  # The world transformation of the object.
+    vertices: numpy.ndarray
+    digest: bytes  # Hash of the vertex data, for the fingerprint of the slice message.
+    build_time: float  # How long it took to compute the vertex data, in seconds.
+
+
+class SliceMessageStatistics(NamedTuple):
+    """How much of a slice message could be taken from the :py:class:`SliceMessageCache`."""
+
+    build_time: float  # Time it took to build the slice message, in seconds.
+    reused_objects: int
+    built_objects: int
+    reused_bytes: int  # Vertex data that was taken from the cache.
+    built_bytes: int  # Vertex data that had to be computed.
+    saved_time: float  # How long it took to compute what was taken from the cache, in seconds.
+
+
+class SliceMessageCache:
+    """Keeps the parts of slice messages that take long to build, to reuse them in the next slice messages.
+
+    The engine needs the complete slice message for every slice, so all of it is still sent. But the vertex data of
+    objects that didn't change or move doesn't need to be transformed again, and the setting values of stacks don't
+    need to be evaluated again until a setting changes.
+
+    :param max_vertices_size: The maximum size of the vertex data to keep, in bytes. The data of the objects that were
+    used longest ago is removed first.
+    """
+
+    def __init__(self, max_vertices_size: int) -> None:
+        self._max_vertices_size = max_vertices_size
+        self._lock = threading.Lock()  # Slice messages for different build plates can be built at the same time.
+
+        self._object_vertices: "OrderedDict[int, CachedObjectVertices]" = OrderedDict()  # By ID of the scene node.
+        self._vertices_size = 0
+
+        self._settings_revision = 0
+        self._setting_values: Dict[Tuple[str, str], Tuple[int, Dict[str, Any]]] = {}  # By stack ID and property.
+
+    def invalidateSettings(self) -> None:
+        """Call when any setting may have changed, so that the setting values are evaluated again."""
+
+        with self._lock:
+            self._settings_revision += 1
+            self._setting_values.clear()
+
+    def getSettingsRevision(self) -> int:
+        return self._settings_revision
+
+    def getSettingValues(self, stack_id: str, property_name: str, settings_revision: int) -> Optional[Dict[str, Any]]:
+        """Get the values of a property of all settings in a stack, if they didn't change since they were stored.
+
+        :param settings_revision: The revision of the settings that the values need to be from.
+        """
+
+        with self._lock:
+            revision, values = self._setting_values.get((stack_id, property_name), (-1, {}))
+        return values if revision == settings_revision else None
+
+    def putSettingValues(self, stack_id: str, property_name: str, settings_revision: int, values: Dict[str, Any]) -> None:
+        with self._lock:
+            if settings_revision == self._settings_revision:  # Otherwise the values may already be outdated.
+                self._setting_values[(stack_id, property_name)] = (settings_revision, values)
+
+    def getObjectVertices(self, node_id: int, mesh_data: "MeshData", transformation: bytes) -> Optional[CachedObjectVertices]:
+        """Get the vertex data of a scene node, if its mesh and transformation are still the same."""
+
+        with self._lock:
+            cached = self._object_vertices.get(node_id)
+            if cached is None or cached.mesh_data is not mesh_data or cached.transformation != transformation:
+                return None
+            self._object_vertices.move_to_end(node_id)
+            return cached
+
+    def putObjectVertices(self, node_id: int, object_vertices: CachedObjectVertices) -> None:
+        with self._lock:
+            self._removeObjectVertices(node_id)
+            if object_vertices.vertices.nbytes > self._max_vertices_size:
+                return
+            self._object_vertices[node_id] = object_vertices
+            self._vertices_size += object_vertices.vertices.nbytes
+            while self._vertices_size > self._max_vertices_size:
+                self._removeObjectVertices(next(iter(self._object_vertices)))
+
+    def removeOtherObjects(self, node_ids: Iterable[int]) -> None:
+        """Forget the vertex data of all scene nodes except the given ones, since those were removed from the scene."""
+
+        keep_ids = set(node_ids)
+        with self._lock:
+            for node_id in [node_id for node_id in self._object_vertices if node_id not in keep_ids]:
+                self._removeObjectVertices(node_id)
+
+    def getVerticesSize(self) -> int:
+        return self._vertices_size
+
+    def _removeObjectVertices(self, node_id: int) -> None:
+        cached = self._object_vertices.pop(node_id, None)
+        if cached is not None:
+            self._vertices_size -= cached.vertices.nbytes
@@ -0,0 +1,211 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from collections import deque
+from contextlib import contextmanager
+import json
+import threading
+import time
+from typing import Any, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from UM.Logger import Logger
+
+
+class SliceStage(NamedTuple):
+    """One stage of slicing, as measured by the :py:class:`SliceProfile`."""
+
+    name: str
+    start: float  # Seconds since the slice started.
+    duration: float  # In seconds.
+    thread_name: str
+    args: Dict[str, Any]  # Extra information about the stage, like the amount of data it processed.
+
+
+class SliceProfile:
+    """The timings of the stages of one slice of one build plate.
+
+    Stages can be measured from any thread, while they happen.
+    """
+
+    def __init__(self, build_plate_number: int) -> None:
+        self._build_plate_number = build_plate_number
+        self._start_time = time.time()  # To show when the slice happened.
+        self._start_counter = time.perf_counter()  # To measure with.
+        self._lock = threading.Lock()
+        self._stages: List[SliceStage] = []
+        self._open_stages: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._counters: List[Tuple[str, float, float]] = []  # Name, seconds since the slice started and value.
+
+    def getBuildPlate(self) -> int:
+        return self._build_plate_number
+
+    def getStartTime(self) -> float:
+        """When the slice started, in seconds since the epoch."""
+
+        return self._start_time
+
+    def getStartCounter(self) -> float:
+        """When the slice started, in the time of ``time.perf_counter``."""
+
+        return self._start_counter
+
+    def addStage(self, name: str, start_counter: float, end_counter: float, **args: Any) -> None:
+        """Add a stage that was measured with ``time.perf_counter``."""
+
+        stage = SliceStage(name, start_counter - self._start_counter, end_counter - start_counter, threading.current_thread().name, args)
+        with self._lock:
+            self._stages.append(stage)
+
+    @contextmanager
+    def measureStage(self, name: str, **args: Any) -> Iterator[Dict[str, Any]]:
+        """Measure the stage that is executed in a ``with`` block.
+
+        :return: The extra information of the stage, to add to from within the block.
+        """
+
+        start_counter = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.addStage(name, start_counter, time.perf_counter(), **args)
+
+    def beginStage(self, name: str, **args: Any) -> None:
+        """Start a stage that ends in a later call, with :py:meth:`endStage`."""
+
+        with self._lock:
+            self._open_stages[name] = (time.perf_counter(), args)
+
+    def endStage(self, name: str, **args: Any) -> None:
+        """End a stage that was started with :py:meth:`beginStage`. Does nothing if it was not started."""
+
+        with self._lock:
+            start_counter, begin_args = self._open_stages.pop(name, (None, {}))
+        if start_counter is not None:
+            self.addStage(name, start_counter, time.perf_counter(), **begin_args, **args)
+
+    def isStageOpen(self, name: str) -> bool:
+        with self._lock:
+            return name in self._open_stages
+
+    def addCounter(self, name: str, value: float) -> None:
+        """Record the value of something that changes during slicing, like the progress of the engine."""
+
+        with self._lock:
+            self._counters.append((name, time.perf_counter() - self._start_counter, value))
+
+    def getStages(self) -> List[SliceStage]:
+        with self._lock:
+            return sorted(self._stages, key = lambda stage: stage.start)
+
+    def getStageDurations(self) -> Dict[str, float]:
+        """The total time spent in each stage, in seconds."""
+
+        durations: Dict[str, float] = {}
+        for stage in self.getStages():
+            durations[stage.name] = durations.get(stage.name, 0.0) + stage.duration
+        return durations
+
+    def getDuration(self) -> float:
+        """The time from the start of the slice until the end of the last stage, in seconds."""
+
+        return max((stage.start + stage.duration for stage in self.getStages()), default = 0.0)
+
+    def toDict(self) -> Dict[str, Any]:
+        return {
+            "build_plate": self._build_plate_number,
+            "start_time": self._start_time,
+            "duration": self.getDuration(),
+            "stage_durations": self.getStageDurations(),
+            "stages": [stage._asdict() for stage in self.getStages()],
+        }
+
+    def toTraceEvents(self, process_id: int, time_offset: float) -> List[Dict[str, Any]]:
+        """Get the stages as events in the Chrome trace event format.
+
+        :param process_id: The process that the events are shown as. Every slice gets its own.
+        :param time_offset: The time of the start of this slice in the trace, in seconds.
+        """
+
+        thread_ids: Dict[str, int] = {}
+        events: List[Dict[str, Any]] = [{
+            "name": "process_name", "ph": "M", "pid": process_id, "tid": 0,
+            "args": {"name": "Slice of build plate {build_plate} at {start}".format(build_plate = self._build_plate_number, start = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self._start_time)))}
+        }]
+        for stage in self.getStages():
+            if stage.thread_name not in thread_ids:
+                thread_ids[stage.thread_name] = len(thread_ids) + 1
+                events.append({"name": "thread_name", "ph": "M", "pid": process_id, "tid": thread_ids[stage.thread_name], "args": {"name": stage.thread_name}})
+            events.append({
+                "name": stage.name, "cat": "slice", "ph": "X", "pid": process_id, "tid": thread_ids[stage.thread_name],
+                "ts": (time_offset + stage.start) * 1e6, "dur": stage.duration * 1e6, "args": stage.args
+            })
+        with self._lock:
+            counters = list(self._counters)
+        for name, counter_time, value in counters:
+            events.append({"name": name, "ph": "C", "pid": process_id, "ts": (time_offset + counter_time) * 1e6, "args": {name: value}})
+        return events
+
+
+class SliceProfiler:
+    """Keeps the profiles of the last slices, to see where the time of slicing goes.
+
+    :param history_size: The number of slices to keep the profiles of.
+    """
+
+    def __init__(self, history_size: int) -> None:
+        self._lock = threading.Lock()
+        self._history: Deque[SliceProfile] = deque(maxlen = max(history_size, 1))
+
+    def setHistorySize(self, history_size: int) -> None:
+        with self._lock:
+            self._history = deque(self._history, maxlen = max(history_size, 1))
+
+    def startSlice(self, build_plate_number: int) -> SliceProfile:
+        """Start profiling a new slice of a build plate."""
+
+        profile = SliceProfile(build_plate_number)
+        with self._lock:
+            self._history.append(profile)
+        return profile
+
+    def getLatestProfile(self, build_plate_number: Optional[int]) -> Optional[SliceProfile]:
+        """Get the profile of the last slice of a build plate, if it is still in the history."""
+
+        with self._lock:
+            for profile in reversed(self._history):
+                if profile.getBuildPlate() == build_plate_number:
+                    return profile
+        return None
+
+    def getHistory(self) -> List[SliceProfile]:
+        """The profiles of the last slices, oldest first."""
+
+        with self._lock:
+            return list(self._history)
+
+    def toChromeTrace(self) -> Dict[str, Any]:
+        """Get the profiles of all slices in the history, in the Chrome trace event format.
+
+        The slices are shown on one timeline, as they happened.
+        """
+
+        history = self.getHistory()
+        first_start = min((profile.getStartCounter() for profile in history), default = 0.0)
+        events: List[Dict[str, Any]] = []
+        for index, profile in enumerate(history):
+            events.extend(profile.toTraceEvents(index + 1, profile.getStartCounter() - first_start))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def exportChromeTrace(self, file_path: str) -> bool:
+        """Write the profiles of the slices in the history to a file that can be opened in a Chrome tracing viewer.
+
+        :return: Whether the file could be written.
+        """
+
+        try:
+            with open(file_path, "w", encoding = "utf-8") as f:
+                json.dump(self.toChromeTrace(), f, default = str)
+        except OSError as e:
+            Logger.warning("Unable to write the slice trace to {path}: {err}".format(path = file_path, err = str(e)))
+            return False
+        return True
@@ -1,5 +1,6 @@
 #  Copyright (c) 2024 UltiMaker
 #  Cura is released under the terms of the LGPLv3 or higher.
+import hashlib
 import uuid
 
 import os
@@ -15,6 +16,7 @@ from PyQt6.QtCore import QCoreApplication
 
 from UM.Job import Job
 from UM.Logger import Logger
+from UM.Mesh.MeshData import MeshData
 from UM.Scene.SceneNode import SceneNode
 from UM.Settings.ContainerStack import ContainerStack #For typing.
 from UM.Settings.InstanceContainer import InstanceContainer
@@ -34,6 +36,9 @@ from cura.OneAtATimeIterator import OneAtATimeIterator
 from cura.Settings.ExtruderManager import ExtruderManager
 from cura.CuraVersion import CuraVersion
 
+from .SliceMessageCache import CachedObjectVertices, SliceMessageCache, SliceMessageStatistics
+from .SliceProfiler import SliceProfile
+
 
 NON_PRINTING_MESH_SETTINGS = ["anti_overhang_mesh", "infill_mesh", "cutting_mesh"]
 
@@ -227,6 +232,10 @@ class GcodeStartEndFormatter:
 class StartSliceJob(Job):
     """Job class that builds up the message of scene data to send to CuraEngine."""
 
+    # Replacement tokens with the time at which the message is built. They are sent along, but they would make every
+    # slice message different, while they only influence the result through the start and end g-code.
+    ClockReplacementTokens = {"time", "date", "day"}
+
     def __init__(self, slice_message: Arcus.PythonMessage) -> None:
         super().__init__()
 
@@ -239,9 +248,54 @@ class StartSliceJob(Job):
         # cache for all setting values from all stacks (global & extruder) for the current machine
         self._all_extruders_settings: Optional[Dict[str, Any]] = None
 
+        # Hash of everything in the slice message that influences the result of slicing.
+        self._slice_fingerprint = hashlib.sha256()
+
+        # Parts of earlier slice messages that can be reused.
+        self._slice_message_cache: Optional[SliceMessageCache] = None
+        self._settings_revision = -1
+        self._slice_message_statistics: Optional[SliceMessageStatistics] = None
+
+        # Where to keep the timings of the stages of this job.
+        self._slice_profile: Optional[SliceProfile] = None
+
     def getSliceMessage(self) -> Arcus.PythonMessage:
         return self._slice_message
 
+    def getSliceFingerprint(self) -> str:
+        """Get a hash of the contents of the slice message that determine the result of slicing.
+
+        Messages with the same fingerprint give the same slice result. Information that is only sent for crash reports
+        is left out.
+        """
+
+        return self._slice_fingerprint.hexdigest()
+
+    def _addToFingerprint(self, section: str, values: Dict[str, Any]) -> None:
+        """Add part of the slice message to the fingerprint.
+
+        The values are sorted, since the order in which settings are sent doesn't influence the result. The replacement
+        tokens with the current time are left out. The start and end g-code in which they are expanded are added.
+        """
+
+        self._slice_fingerprint.update(section.encode("utf-8") + b"\0")
+        for key, value in sorted((str(key), str(value)) for key, value in values.items() if key not in self.ClockReplacementTokens):
+            self._slice_fingerprint.update(key.encode("utf-8") + b"=" + value.encode("utf-8", "surrogatepass") + b"\0")
+
+    def setSliceMessageCache(self, slice_message_cache: SliceMessageCache) -> None:
+        """Reuse the parts of earlier slice messages that didn't change, and store the parts of this one."""
+
+        self._slice_message_cache = slice_message_cache
+        self._settings_revision = slice_message_cache.getSettingsRevision()
+
+    def getSliceMessageStatistics(self) -> Optional[SliceMessageStatistics]:
+        """How much of the slice message was reused from earlier slice messages, once the message is complete."""
+
+        return self._slice_message_statistics
+
+    def setSliceProfile(self, slice_profile: SliceProfile) -> None:
+        self._slice_profile = slice_profile
+
     def getAssociatedDisabledExtruders(self) -> Optional[str]:
         return self._associated_disabled_extruders
 
@@ -287,6 +341,14 @@ class StartSliceJob(Job):
     def run(self) -> None:
         """Runs the job that initiates the slicing."""
 
+        start_time = time.perf_counter()
+        try:
+            self._buildSliceMessage()
+        finally:
+            if self._slice_profile is not None:
+                self._slice_profile.addStage("start_slice_job", start_time, time.perf_counter(), result = str(self.getResult()))
+
+    def _buildSliceMessage(self) -> None:
         if self._build_plate_number is None:
             self.setResult(StartJobResult.Error)
             return
@@ -306,8 +368,10 @@ class StartSliceJob(Job):
             return
 
         # Wait for error checker to be done.
-        while CuraApplication.getInstance().getMachineErrorChecker().needToWaitForResult:
-            time.sleep(0.1)
+        wait_start_time = time.perf_counter()
+        CuraApplication.getInstance().getMachineErrorChecker().waitForResult()
+        if self._slice_profile is not None:
+            self._slice_profile.addStage("wait_for_error_check", wait_start_time, time.perf_counter())
 
         if CuraApplication.getInstance().getMachineErrorChecker().hasError:
             self.setResult(StartJobResult.SettingError)
@@ -436,6 +500,10 @@ class StartSliceJob(Job):
             self.setResult(StartJobResult.NothingToSlice)
             return
 
+        message_start_time = time.perf_counter()
+        reused_objects = built_objects = reused_bytes = built_bytes = 0
+        saved_time = 0.0
+
         self._buildGlobalSettingsMessage(stack)
         self._buildGlobalInheritsStackMessage(stack)
 
@@ -475,9 +543,11 @@ class StartSliceJob(Job):
                 plugin_message.port = plugin.getPort()
                 plugin_message.plugin_name = plugin.getPluginId()
                 plugin_message.plugin_version = plugin.getVersion()
+                self._addToFingerprint("engine_plugin", {"id": slot, "plugin_name": plugin.getPluginId(), "plugin_version": plugin.getVersion()})
 
         for group in filtered_object_groups:
             group_message = self._slice_message.addRepeatedMessage("object_lists")
+            self._addToFingerprint("object_list", {})
             parent = group[0].getParent()
             if parent is not None and parent.callDecoration("isGroup"):
                 self._handlePerObjectSettings(cast(CuraSceneNode, parent), group_message)
@@ -486,35 +556,90 @@ class StartSliceJob(Job):
                 mesh_data = object.getMeshData()
                 if mesh_data is None:
                     continue
-                rot_scale = object.getWorldTransformation().getTransposed().getData()[0:3, 0:3]
-                translate = object.getWorldTransformation().getData()[:3, 3]
-
-                # This effectively performs a limited form of MeshData.getTransformed that ignores normals.
-                verts = mesh_data.getVertices()
-                verts = verts.dot(rot_scale)
-                verts += translate
-
-                # Convert from Y up axes to Z up axes. Equals a 90 degree rotation.
-                verts[:, [1, 2]] = verts[:, [2, 1]]
-                verts[:, 1] *= -1
+                object_vertices, is_reused = self._getObjectVertices(object, mesh_data)
+                if is_reused:
+                    reused_objects += 1
+                    reused_bytes += object_vertices.vertices.nbytes
+                    saved_time += object_vertices.build_time
+                else:
+                    built_objects += 1
+                    built_bytes += object_vertices.vertices.nbytes
 
                 obj = group_message.addRepeatedMessage("objects")
                 obj.id = id(object)
                 obj.name = object.getName()
-                indices = mesh_data.getIndices()
-                if indices is not None:
-                    flat_verts = numpy.take(verts, indices.flatten(), axis=0)
-                else:
-                    flat_verts = numpy.array(verts)
-
-                obj.vertices = flat_verts
+                obj.vertices = object_vertices.vertices
+                self._addToFingerprint("object", {"name": object.getName()})
+                self._slice_fingerprint.update(object_vertices.digest)
 
                 self._handlePerObjectSettings(cast(CuraSceneNode, object), obj)
 
                 Job.yieldThread()
 
+        if self._slice_message_cache is not None:
+            self._slice_message_cache.removeOtherObjects(id(node) for node in DepthFirstIterator(self._scene.getRoot()))
+        self._slice_message_statistics = SliceMessageStatistics(time.perf_counter() - message_start_time, reused_objects, built_objects, reused_bytes, built_bytes, saved_time)
+        if self._slice_profile is not None:
+            self._slice_profile.addStage("build_slice_message", message_start_time, time.perf_counter(), **self._slice_message_statistics._asdict())
+        Logger.log("d", "Built the slice message in %.3f s. Reused the vertex data of %s of %s objects (%s of %s bytes), which saved about %.3f s.",
+                   self._slice_message_statistics.build_time, reused_objects, reused_objects + built_objects, reused_bytes, reused_bytes + built_bytes, saved_time)
+
         self.setResult(StartJobResult.Finished)
 
+    def _getObjectVertices(self, node: SceneNode, mesh_data: MeshData) -> Tuple[CachedObjectVertices, bool]:
+        """Get the vertex data to send to the engine for a scene node, in the coordinates of the engine.
+
+        :return: The vertex data, and whether it was taken from the slice message cache.
+        """
+
+        world_transformation = node.getWorldTransformation()
+        transformation = world_transformation.getData().tobytes()
+        if self._slice_message_cache is not None:
+            cached = self._slice_message_cache.getObjectVertices(id(node), mesh_data, transformation)
+            if cached is not None:
+                return cached, True
+
+        start_time = time.perf_counter()
+        rot_scale = world_transformation.getTransposed().getData()[0:3, 0:3]
+        translate = world_transformation.getData()[:3, 3]
+
+        # This effectively performs a limited form of MeshData.getTransformed that ignores normals.
+        verts = mesh_data.getVertices()
+        verts = verts.dot(rot_scale)
+        verts += translate
+
+        # Convert from Y up axes to Z up axes. Equals a 90 degree rotation.
+        verts[:, [1, 2]] = verts[:, [2, 1]]
+        verts[:, 1] *= -1
+
+        indices = mesh_data.getIndices()
+        if indices is not None:
+            flat_verts = numpy.take(verts, indices.flatten(), axis=0)
+        else:
+            flat_verts = numpy.array(verts)
+        digest = hashlib.sha256(numpy.ascontiguousarray(flat_verts).tobytes()).digest()
+
+        object_vertices = CachedObjectVertices(mesh_data, transformation, flat_verts, digest, time.perf_counter() - start_time)
+        if self._slice_message_cache is not None:
+            self._slice_message_cache.putObjectVertices(id(node), object_vertices)
+        return object_vertices, False
+
+    def _getSettingValues(self, stack: ContainerStack, property_name: str) -> Dict[str, Any]:
+        """Get a property of all settings in a stack, from the slice message cache if the settings didn't change."""
+
+        if self._slice_message_cache is not None:
+            values = self._slice_message_cache.getSettingValues(stack.getId(), property_name, self._settings_revision)
+            if values is not None:
+                return values
+
+        values = {}
+        for key in stack.getAllKeys():
+            values[key] = stack.getProperty(key, property_name)
+            Job.yieldThread()
+        if self._slice_message_cache is not None:
+            self._slice_message_cache.putSettingValues(stack.getId(), property_name, self._settings_revision, values)
+        return values
+
     def cancel(self) -> None:
         super().cancel()
         self._is_cancelled = True
@@ -533,10 +658,7 @@ class StartSliceJob(Job):
         :return: A dictionary of replacement tokens to the values they should be replaced with.
         """
 
-        result = {}
-        for key in stack.getAllKeys():
-            result[key] = stack.getProperty(key, "value")
-            Job.yieldThread()
+        result = dict(self._getSettingValues(stack, "value"))
 
         # Material identification in addition to non-human-readable GUID
         result["material_id"] = stack.material.getMetaDataEntry("base_file", "")
@@ -621,6 +743,7 @@ class StartSliceJob(Job):
         global_definition = cast(ContainerInterface, cast(ContainerStack, stack.getNextStack()).getBottom())
         own_definition = cast(ContainerInterface, stack.getBottom())
 
+        sent_settings = {}
         for key, value in settings.items():
             # Do not send settings that are not settable_per_extruder.
             # Since these can only be set in definition files, we only have to ask there.
@@ -630,7 +753,9 @@ class StartSliceJob(Job):
             setting = message.getMessage("settings").addRepeatedMessage("settings")
             setting.name = key
             setting.value = str(value).encode("utf-8")
+            sent_settings[key] = value
             Job.yieldThread()
+        self._addToFingerprint("extruder {position}".format(position = message.id), sent_settings)
 
     def _buildGlobalSettingsMessage(self, stack: ContainerStack) -> None:
         """Sends all global settings to the engine.
@@ -678,6 +803,7 @@ class StartSliceJob(Job):
             setting_message.name = key
             setting_message.value = str(value).encode("utf-8")
             Job.yieldThread()
+        self._addToFingerprint("global_settings", settings)
 
     def _buildGlobalInheritsStackMessage(self, stack: ContainerStack) -> None:
         """Sends for some settings which extruder they should fallback to if not set.
@@ -689,13 +815,16 @@ class StartSliceJob(Job):
             limit_to_extruder property.
         """
 
-        for key in stack.getAllKeys():
-            extruder_position = int(round(float(stack.getProperty(key, "limit_to_extruder"))))
+        limit_to_extruder = {}
+        for key, limit_to_extruder_value in self._getSettingValues(stack, "limit_to_extruder").items():
+            extruder_position = int(round(float(limit_to_extruder_value)))
             if extruder_position >= 0:  # Set to a specific extruder.
                 setting_extruder = self._slice_message.addRepeatedMessage("limit_to_extruder")
                 setting_extruder.name = key
                 setting_extruder.extruder = extruder_position
+                limit_to_extruder[key] = extruder_position
             Job.yieldThread()
+        self._addToFingerprint("limit_to_extruder", limit_to_extruder)
 
     def _handlePerObjectSettings(self, node: CuraSceneNode, message: Arcus.PythonMessage):
         """Check if a node has per object settings and ensure that they are set correctly in the message
@@ -724,6 +853,7 @@ class StartSliceJob(Job):
         changed_setting_keys.add("extruder_nr")
 
         # Get values for all changed settings
+        sent_settings = {}
         for key in changed_setting_keys:
             setting = message.addRepeatedMessage("settings")
             setting.name = key
@@ -735,9 +865,12 @@ class StartSliceJob(Job):
             else:
                 limited_stack = stack
 
-            setting.value = str(limited_stack.getProperty(key, "value")).encode("utf-8")
+            value = limited_stack.getProperty(key, "value")
+            setting.value = str(value).encode("utf-8")
+            sent_settings[key] = value
 
             Job.yieldThread()
+        self._addToFingerprint("object_settings", sent_settings)
 
     def _addRelations(self, relations_set: Set[str], relations: List[SettingRelation]):
         """Recursive function to put all settings that require each other for value changes in a list
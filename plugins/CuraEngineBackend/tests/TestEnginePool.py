@@ -0,0 +1,112 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import EnginePool as EnginePoolModule
+from EnginePool import EnginePool
+
+
+@pytest.fixture
+def sockets(monkeypatch):
+    """Replace the sockets of the engine sessions, and keep track of them."""
+
+    created_sockets = []
+
+    def createSocket():
+        socket = MagicMock()
+        created_sockets.append(socket)
+        return socket
+
+    monkeypatch.setattr(EnginePoolModule, "SignalSocket", createSocket)
+    return created_sockets
+
+
+def createPool(size, message_handler = None, error_handler = None):
+    pool = EnginePool("Cura.proto", 49774, lambda port: ["CuraEngine", "connect", "127.0.0.1:{port}".format(port = port)],
+                      MagicMock(), message_handler or MagicMock(), error_handler or MagicMock())
+    pool.setSize(size)
+    return pool
+
+
+def test_createSessionsUpToSize(sockets):
+    pool = createPool(2)
+
+    first_session = pool.getIdleSession()
+    assert pool.getIdleSession() is first_session  # Reused while it is idle.
+    first_session.startSlice(0, MagicMock())
+    second_session = pool.getIdleSession()
+    second_session.startSlice(1, MagicMock())
+
+    assert pool.getIdleSession() is None
+    assert [session.getPort() for session in pool.getSessions()] == [49774, 49775]
+    assert [socket.listen.call_args[0] for socket in sockets] == [("127.0.0.1", 49774), ("127.0.0.1", 49775)]
+    assert pool.getBusySessions() == [first_session, second_session]
+
+
+def test_reuseSessionAfterSlice(sockets):
+    pool = createPool(1)
+    session = pool.getIdleSession()
+    session.startSlice(3, MagicMock())
+    session.sendSliceMessage(MagicMock())
+    session.finishSlice()
+
+    assert pool.getIdleSession() is session
+    assert len(sockets) == 1
+
+
+def test_messagesOnlyWhileSlicing(sockets):
+    message_handler = MagicMock()
+    pool = createPool(1, message_handler = message_handler)
+    session = pool.getIdleSession()
+
+    session._onMessageReceived()  # Left over from an aborted slice.
+    message_handler.assert_not_called()
+
+    session.startSlice(2, MagicMock())
+    session._onMessageReceived()
+    message_handler.assert_called_once_with(session, sockets[0].takeNextMessage.return_value)
+
+
+def test_sendWhenConnected(sockets):
+    pool = createPool(1)
+    session = pool.getIdleSession()
+    session.startSlice(0, MagicMock())
+    slice_message = MagicMock()
+    session.sendSliceMessage(slice_message)
+    sockets[0].sendMessage.assert_not_called()  # The engine didn't connect yet.
+
+    session._onSocketStateChanged(EnginePoolModule.Arcus.SocketState.Connected)
+    sockets[0].sendMessage.assert_called_once_with(slice_message)
+
+
+def test_engineStoppedWhileSlicing(sockets):
+    error_handler = MagicMock()
+    pool = createPool(1, error_handler = error_handler)
+    session = pool.getIdleSession()
+    session.startSlice(0, MagicMock())
+    session._onSocketStateChanged(EnginePoolModule.Arcus.SocketState.Connected)
+    session.sendSliceMessage(MagicMock())
+
+    session._onSocketError(MagicMock())
+
+    error_handler.assert_called_once_with(session)
+    assert len(sockets) == 2  # Listening again, for a new engine.
+
+
+def test_shrinkPool(sockets):
+    pool = createPool(2)
+    busy_session = pool.getIdleSession()
+    busy_session.startSlice(0, MagicMock())
+    pool.getIdleSession()
+
+    pool.setSize(0)
+
+    assert pool.getSessions() == [busy_session]  # Still slicing, so it is kept until it is done.
+    sockets[1].close.assert_called_once_with()
@@ -0,0 +1,77 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from LayerSegmentData import LayerSegmentData
+
+
+class FakeLayerMessage:
+    def __init__(self, segments, height = 200.0):
+        self._segments = segments
+        self.height = height
+
+    def repeatedMessageCount(self, name):
+        return len(self._segments)
+
+    def getRepeatedMessage(self, name, index):
+        return self._segments[index]
+
+
+def createSegment(extruder, point_type, points, line_types):
+    line_count = len(line_types)
+    return SimpleNamespace(
+        extruder = extruder,
+        point_type = point_type,
+        points = numpy.array(points, dtype = "f4").tobytes(),
+        line_type = numpy.array(line_types, dtype = "u1").tobytes(),
+        line_width = numpy.full(line_count, 0.4, dtype = "f4").tobytes(),
+        line_thickness = numpy.full(line_count, 0.2, dtype = "f4").tobytes(),
+        line_feedrate = numpy.arange(line_count, dtype = "f4").tobytes()
+    )
+
+
+def test_emptyLayer():
+    segment_data = LayerSegmentData(FakeLayerMessage([]))
+    assert segment_data.segmentCount() == 0
+    assert segment_data.points.shape == (0, 3)
+
+
+def test_point2DSegments():
+    layer = FakeLayerMessage([createSegment(0, 0, [[1, 2], [3, 4], [5, 6]], [1, 2]),
+                              createSegment(1, 0, [[7, 8], [9, 10]], [3])])
+    segment_data = LayerSegmentData(layer)
+
+    assert segment_data.segmentCount() == 2
+    extruder, line_types, points, line_widths, line_thicknesses, line_feedrates = segment_data.getSegment(1)
+    assert extruder == 1
+    assert line_types.shape == (1, 1)
+    assert line_types[0, 0] == 3
+    numpy.testing.assert_array_almost_equal(points, [[7, 0.2, -8], [9, 0.2, -10]])
+    assert line_widths.shape == (1, 1)
+    assert line_feedrates[0, 0] == 0
+
+    # The segments are views into the arrays of the whole layer.
+    assert numpy.shares_memory(points, segment_data.points)
+    assert numpy.shares_memory(line_types, segment_data.lineTypes)
+
+
+def test_mixedPointTypes():
+    layer = FakeLayerMessage([createSegment(0, 0, [[1, 2], [3, 4]], [1]),
+                              createSegment(0, 1, [[5, 6, 0.5], [7, 8, 0.7]], [1])])
+    segment_data = LayerSegmentData(layer)
+
+    numpy.testing.assert_array_almost_equal(segment_data.getSegment(0)[2], [[1, 0.2, -2], [3, 0.2, -4]])
+    numpy.testing.assert_array_almost_equal(segment_data.getSegment(1)[2], [[5, 0.5, -6], [7, 0.7, -8]])
+
+
+def test_lineTypesAreWritable():
+    # LayerPolygon replaces unknown line types in place, so the arrays must not be read-only views on the message.
+    segment_data = LayerSegmentData(FakeLayerMessage([createSegment(0, 0, [[1, 2], [3, 4]], [1])]))
+    assert segment_data.getSegment(0)[1].flags.writeable
@@ -0,0 +1,114 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from LayerSegmentData import LayerSegmentData
+from SliceCache import SliceCache
+
+
+class FakeLayerMessage:
+    def __init__(self, layer_id, segments):
+        self.id = layer_id
+        self.height = 200.0 * (layer_id + 1)
+        self.thickness = 200.0
+        self._segments = segments
+
+    def repeatedMessageCount(self, name):
+        return len(self._segments)
+
+    def getRepeatedMessage(self, name, index):
+        return self._segments[index]
+
+
+def createSegment(extruder, line_count):
+    return SimpleNamespace(
+        extruder = extruder,
+        point_type = 0,
+        points = numpy.arange((line_count + 1) * 2, dtype = "f4").tobytes(),
+        line_type = numpy.full(line_count, 1, dtype = "u1").tobytes(),
+        line_width = numpy.full(line_count, 0.4, dtype = "f4").tobytes(),
+        line_thickness = numpy.full(line_count, 0.2, dtype = "f4").tobytes(),
+        line_feedrate = numpy.arange(line_count, dtype = "f4").tobytes()
+    )
+
+
+def storeSlice(cache, key, gcode_layer_size = 10):
+    writer = cache.createWriter(key)
+    layers = [FakeLayerMessage(layer_id, [createSegment(0, 3), createSegment(1, 5)]) for layer_id in range(3)]
+    for layer in layers:
+        writer.addLayer(layer)
+        writer.addGCode(";LAYER:{layer_id}\n".format(layer_id = layer.id) + "G1 X1\n" * gcode_layer_size)
+    writer.setGCodePrefix(";FLAVOR:Marlin\n;PRINT.TIME:{print_time}\n")
+    writer.setPrintEstimates({"infill": 12.5, "travel": 3.0}, [1200.0])
+    writer.setSliceUUID("slice-uuid")
+    writer.finish()
+    return layers
+
+
+def test_storeAndLoad(tmp_path):
+    cache = SliceCache(str(tmp_path), 1024 * 1024)
+    key = cache.createKey("fingerprint", "engine")
+    assert cache.load(key) is None
+
+    layers = storeSlice(cache, key)
+    cached_slice = cache.load(key)
+
+    assert cached_slice.gcode == [";FLAVOR:Marlin\n;PRINT.TIME:{print_time}\n"] + [";LAYER:{layer_id}\n".format(layer_id = layer_id) + "G1 X1\n" * 10 for layer_id in range(3)]
+    assert cached_slice.print_times == {"infill": 12.5, "travel": 3.0}
+    assert cached_slice.material_amounts == [1200.0]
+    assert cached_slice.slice_uuid == "slice-uuid"
+    assert len(cached_slice.layers) == 3
+    for layer, cached_layer in zip(layers, cached_slice.layers):
+        assert (cached_layer.id, cached_layer.height, cached_layer.thickness) == (layer.id, layer.height, layer.thickness)
+        expected = LayerSegmentData(layer)
+        result = LayerSegmentData(cached_layer)
+        assert result.segmentCount() == 2
+        numpy.testing.assert_array_equal(result.points, expected.points)
+        numpy.testing.assert_array_equal(result.lineTypes, expected.lineTypes)
+        numpy.testing.assert_array_equal(result.lineFeedrates, expected.lineFeedrates)
+
+
+def test_keyDependsOnEngine():
+    cache = SliceCache("unused", 1024)
+    assert cache.createKey("fingerprint", "engine") != cache.createKey("fingerprint", "other engine")
+    assert cache.createKey("fingerprint", "engine") != cache.createKey("other fingerprint", "engine")
+
+
+def test_discard(tmp_path):
+    cache = SliceCache(str(tmp_path), 1024 * 1024)
+    key = cache.createKey("fingerprint", "engine")
+    writer = cache.createWriter(key)
+    writer.addGCode(";LAYER:0\n")
+    writer.discard()
+
+    assert cache.load(key) is None
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_evictLeastRecentlyUsed(tmp_path):
+    cache = SliceCache(str(tmp_path), 1024 * 1024)
+    keys = [cache.createKey(str(index), "engine") for index in range(3)]
+    for index, key in enumerate(keys):
+        storeSlice(cache, key, gcode_layer_size = 10000)
+        os.utime(os.path.join(str(tmp_path), key, "metadata.json"), (index + 1, index + 1))  # Stored at different times.
+    cache.load(keys[0])  # Now the first one was used most recently.
+
+    entry_size = sum(entry.stat().st_size for entry in os.scandir(os.path.join(str(tmp_path), keys[0])))
+    cache.setMaxSize(entry_size * 2)
+
+    assert cache.load(keys[0]) is not None
+    assert cache.load(keys[1]) is None
+    assert cache.load(keys[2]) is not None
+
+
+def test_disabled(tmp_path):
+    cache = SliceCache(str(tmp_path), 0)
+    assert cache.createWriter(cache.createKey("fingerprint", "engine")) is None
+    assert cache.load(cache.createKey("fingerprint", "engine")) is None
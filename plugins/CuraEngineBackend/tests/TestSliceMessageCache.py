@@ -0,0 +1,71 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import sys
+
+import numpy
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from SliceMessageCache import CachedObjectVertices, SliceMessageCache
+
+
+class FakeMeshData:
+    pass
+
+
+def createObjectVertices(mesh_data, transformation = b"identity", vertex_count = 30):
+    vertices = numpy.zeros((vertex_count, 3), dtype = numpy.float32)
+    return CachedObjectVertices(mesh_data, transformation, vertices, b"digest", 0.5)
+
+
+def test_reuseObjectVertices():
+    cache = SliceMessageCache(1024 * 1024)
+    mesh_data = FakeMeshData()
+    object_vertices = createObjectVertices(mesh_data)
+    cache.putObjectVertices(1, object_vertices)
+
+    assert cache.getObjectVertices(1, mesh_data, b"identity") is object_vertices
+    assert cache.getObjectVertices(1, mesh_data, b"moved") is None  # Transformed differently.
+    assert cache.getObjectVertices(1, FakeMeshData(), b"identity") is None  # Different mesh.
+    assert cache.getObjectVertices(2, mesh_data, b"identity") is None  # Different scene node.
+
+
+def test_removeOtherObjects():
+    cache = SliceMessageCache(1024 * 1024)
+    mesh_data = FakeMeshData()
+    for node_id in range(3):
+        cache.putObjectVertices(node_id, createObjectVertices(mesh_data))
+
+    cache.removeOtherObjects([1])
+
+    assert [cache.getObjectVertices(node_id, mesh_data, b"identity") is not None for node_id in range(3)] == [False, True, False]
+    assert cache.getVerticesSize() == 30 * 3 * 4
+
+
+def test_limitVerticesSize():
+    cache = SliceMessageCache(2 * 30 * 3 * 4)  # Room for two objects.
+    mesh_data = FakeMeshData()
+    for node_id in range(3):
+        cache.putObjectVertices(node_id, createObjectVertices(mesh_data))
+        cache.getObjectVertices(0, mesh_data, b"identity")  # Keep using the first one.
+
+    assert cache.getObjectVertices(0, mesh_data, b"identity") is not None
+    assert cache.getObjectVertices(1, mesh_data, b"identity") is None  # Used longest ago.
+    assert cache.getObjectVertices(2, mesh_data, b"identity") is not None
+    assert cache.getVerticesSize() == 2 * 30 * 3 * 4
+
+
+def test_settingValuesUntilInvalidated():
+    cache = SliceMessageCache(0)
+    revision = cache.getSettingsRevision()
+    cache.putSettingValues("global", "value", revision, {"layer_height": 0.1})
+    assert cache.getSettingValues("global", "value", revision) == {"layer_height": 0.1}
+    assert cache.getSettingValues("global", "limit_to_extruder", revision) is None
+
+    cache.invalidateSettings()
+
+    assert cache.getSettingValues("global", "value", cache.getSettingsRevision()) is None
+    cache.putSettingValues("global", "value", revision, {"layer_height": 0.1})  # Evaluated before the change.
+    assert cache.getSettingValues("global", "value", cache.getSettingsRevision()) is None
@@ -0,0 +1,68 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from SliceProfiler import SliceProfiler
+
+
+def test_measureStages():
+    profile = SliceProfiler(5).startSlice(2)
+    with profile.measureStage("build_slice_message", objects = 3) as stage_args:
+        stage_args["reused_objects"] = 1
+    profile.beginStage("engine_slicing")
+    assert profile.isStageOpen("engine_slicing")
+    profile.endStage("engine_slicing")
+    profile.endStage("engine_sending_results")  # Never started, so not added.
+    start_time = time.perf_counter()
+    profile.addStage("ingest_layers", start_time, start_time + 0.25, layers = 10)
+    profile.addStage("ingest_layers", start_time, start_time + 0.5, layers = 20)
+
+    assert [stage.name for stage in profile.getStages()] == ["build_slice_message", "engine_slicing", "ingest_layers", "ingest_layers"]
+    assert profile.getStages()[0].args == {"objects": 3, "reused_objects": 1}
+    assert not profile.isStageOpen("engine_slicing")
+    durations = profile.getStageDurations()
+    assert abs(durations["ingest_layers"] - 0.75) < 1e-9
+    assert profile.toDict()["build_plate"] == 2
+
+
+def test_history():
+    profiler = SliceProfiler(2)
+    first_profile = profiler.startSlice(0)
+    second_profile = profiler.startSlice(1)
+    third_profile = profiler.startSlice(0)
+
+    assert profiler.getHistory() == [second_profile, third_profile]  # Only the last slices are kept.
+    assert profiler.getLatestProfile(0) is third_profile
+    assert profiler.getLatestProfile(1) is second_profile
+    assert profiler.getLatestProfile(3) is None
+    assert first_profile not in profiler.getHistory()
+
+    profiler.setHistorySize(1)
+    assert profiler.getHistory() == [third_profile]
+
+
+def test_exportChromeTrace(tmp_path):
+    profiler = SliceProfiler(5)
+    for build_plate_number in range(2):
+        profile = profiler.startSlice(build_plate_number)
+        with profile.measureStage("send_slice_message"):
+            pass
+        profile.addCounter("engine_progress", 0.5)
+
+    file_path = os.path.join(str(tmp_path), "trace.json")
+    assert profiler.exportChromeTrace(file_path)
+    with open(file_path, encoding = "utf-8") as f:
+        trace = json.load(f)
+
+    complete_events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert [(event["name"], event["pid"]) for event in complete_events] == [("send_slice_message", 1), ("send_slice_message", 2)]
+    assert complete_events[1]["ts"] >= complete_events[0]["ts"]  # On one timeline.
+    assert all(event["dur"] >= 0 for event in complete_events)
+    assert len([event for event in trace["traceEvents"] if event["ph"] == "C"]) == 2
+    assert {event["pid"] for event in trace["traceEvents"] if event["name"] == "process_name"} == {1, 2}
@@ -26,10 +26,13 @@ class GCodeGzReader(MeshReader):
         self._supported_extensions = [".gcode.gz"]
 
     def _read(self, file_name):
-        with open(file_name, "rb") as file:
-            file_data = file.read()
-        uncompressed_gcode = gzip.decompress(file_data).decode("utf-8")
-        PluginRegistry.getInstance().getPluginObject("GCodeReader").preReadFromStream(uncompressed_gcode)
-        result = PluginRegistry.getInstance().getPluginObject("GCodeReader").readFromStream(uncompressed_gcode, file_name)
+        gcode_reader = PluginRegistry.getInstance().getPluginObject("GCodeReader")
+        # Decompress while parsing, so the uncompressed g-code never has to be in memory all at once. Line endings are
+        # left as they are, just like decoding all of the decompressed data did.
+        with gzip.open(file_name, "rt", encoding = "utf-8", newline = "\n") as file:
+            gcode_reader.preReadFromStream(file)
+        content_hash = gcode_reader.getContentHash(file_name)  # Of the compressed file, which is quicker to read.
+        with gzip.open(file_name, "rt", encoding = "utf-8", newline = "\n") as file:
+            result = gcode_reader.readFromStream(file, file_name, content_hash = content_hash)
 
         return result
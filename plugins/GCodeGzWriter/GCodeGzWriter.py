@@ -2,9 +2,10 @@
 # Cura is released under the terms of the LGPLv3 or higher.
 
 import gzip
-from io import StringIO, BufferedIOBase #To write the g-code to a temporary buffer, and for typing.
-from typing import cast, List
+from io import BufferedIOBase #For typing.
+from typing import cast, List, Optional
 
+from UM.Application import Application
 from UM.Logger import Logger
 from UM.Mesh.MeshWriter import MeshWriter #The class we're extending/implementing.
 from UM.PluginRegistry import PluginRegistry
@@ -18,12 +19,19 @@ class GCodeGzWriter(MeshWriter):
     """A file writer that writes gzipped g-code.
 
     If you're zipping g-code, you might as well use gzip!
+
+    The g-code is compressed while it is produced by the g-code writer, so only
+    a small part of it is in memory at any time.
     """
 
 
     def __init__(self) -> None:
         super().__init__(add_to_recent_files = False)
 
+        application = Application.getInstance()
+        if application is not None:
+            application.getPreferences().addPreference("gcode_gz_writer/compression_level", 9)  # 0 to 9, like gzip.
+
     def write(self, stream: BufferedIOBase, nodes: List[SceneNode], mode = MeshWriter.OutputMode.BinaryMode, **kwargs) -> bool:
         """Writes the gzipped g-code to a stream.
 
@@ -35,6 +43,11 @@ class GCodeGzWriter(MeshWriter):
         :param nodes: This is ignored.
         :param mode: Additional information on what type of stream to use. This
             must always be binary mode.
+        :param compression_level: Optional keyword argument. The gzip
+            compression level, from 0 to 9. If not given, the level from the
+            preferences is used.
+        :param progress_callback: Optional keyword argument. Called every now
+            and then with the fraction of the g-code that was written so far.
         :return: Whether the write was successful.
         """
 
@@ -44,13 +57,30 @@ class GCodeGzWriter(MeshWriter):
             return False
 
         #Get the g-code from the g-code writer.
-        gcode_textio = StringIO() #We have to convert the g-code into bytes.
         gcode_writer = cast(MeshWriter, PluginRegistry.getInstance().getPluginObject("GCodeWriter"))
-        success = gcode_writer.write(gcode_textio, None)
-        if not success: #Writing the g-code failed. Then I can also not write the gzipped g-code.
+        gcode_chunks = gcode_writer.iterateGCode(kwargs.get("progress_callback"))
+        if gcode_chunks is None: #Getting the g-code failed. Then I can also not write the gzipped g-code.
             self.setInformation(gcode_writer.getInformation())
             return False
 
-        result = gzip.compress(gcode_textio.getvalue().encode("utf-8"))
-        stream.write(result)
+        compression_level = kwargs.get("compression_level")
+        if compression_level is None:
+            compression_level = self._getCompressionLevel()
+        #Without file name, the header is the same as that of gzip.compress, so the result is too.
+        with gzip.GzipFile(filename = "", mode = "wb", fileobj = stream, compresslevel = compression_level) as gzip_file:
+            for gcode in gcode_chunks:
+                gzip_file.write(gcode.encode("utf-8"))
         return True
+
+    @staticmethod
+    def _getCompressionLevel() -> int:
+        application = Application.getInstance()
+        level: Optional[int] = None
+        if application is not None:
+            try:
+                level = int(application.getPreferences().getValue("gcode_gz_writer/compression_level"))
+            except (TypeError, ValueError):
+                level = None
+        if level is None or not 0 <= level <= 9:
+            return 9  # Same as gzip.compress.
+        return level
@@ -0,0 +1,66 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import gzip
+import io
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "GCodeWriter"))
+
+import GCodeWriter as GCodeWriterModule
+from GCodeGzWriter import GCodeGzWriter
+from GCodeWriter import GCodeWriter
+
+test_gcode = [";FLAVOR:Marlin\n;LAYER_COUNT:200\n"] + [";LAYER:{layer}\nG1 X{layer} Y{layer} E{layer}.5 ☃\n".format(layer = layer) * 50 for layer in range(200)] + [";SETTING_3 {}\n"]
+
+
+def withoutTimestamp(data: bytes) -> bytes:
+    return data[:4] + b"\x00\x00\x00\x00" + data[8:]  # The modification time in the gzip header.
+
+
+@pytest.fixture
+def gcode_writer():
+    application = MagicMock()
+    application.getMultiBuildPlateModel().activeBuildPlate = 0
+    application.getController().getScene().gcode_dict = {0: test_gcode}
+    application.getPreferences().getValue = MagicMock(return_value = 6)  # The compression level of the gzip writer.
+    with patch.object(GCodeWriterModule.Application, "getInstance", MagicMock(return_value = application)):
+        yield GCodeWriter()
+
+
+@pytest.fixture
+def gcode_gz_writer(gcode_writer):
+    registry = MagicMock()
+    registry.getPluginObject = MagicMock(return_value = gcode_writer)
+    with patch("UM.PluginRegistry.PluginRegistry.getInstance", MagicMock(return_value = registry)):
+        yield GCodeGzWriter()
+
+
+def test_writeGCode(gcode_writer):
+    stream = io.StringIO()
+    progress = []
+    assert gcode_writer.write(stream, None, progress_callback = progress.append)
+    assert stream.getvalue() == "".join(test_gcode)
+    assert progress == sorted(progress)
+    assert progress[-1] == 1.0
+
+
+@pytest.mark.parametrize("compression_level", [None, 1, 6, 9])
+def test_writeGzippedGCodeSameAsInOneGo(gcode_gz_writer, compression_level):
+    stream = io.BytesIO()
+    assert gcode_gz_writer.write(stream, None, GCodeGzWriter.OutputMode.BinaryMode, compression_level = compression_level)
+
+    expected = gzip.compress("".join(test_gcode).encode("utf-8"), compresslevel = 6 if compression_level is None else compression_level)
+    assert withoutTimestamp(stream.getvalue()) == withoutTimestamp(expected)
+    assert gzip.decompress(stream.getvalue()).decode("utf-8") == "".join(test_gcode)
+
+
+def test_writeGzippedGCodeWithoutGCode(gcode_gz_writer, gcode_writer):
+    GCodeWriterModule.Application.getInstance().getController().getScene().gcode_dict = {}
+
+    assert not gcode_gz_writer.write(io.BytesIO(), None, GCodeGzWriter.OutputMode.BinaryMode)
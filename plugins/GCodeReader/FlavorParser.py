@@ -1,9 +1,11 @@
 # Copyright (c) 2022 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
+import io
+import json
 import math
 import re
-from typing import Dict, List, NamedTuple, Optional, Union, Set
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union, Set, TYPE_CHECKING
 
 import numpy
 
@@ -22,6 +24,9 @@ from cura.Scene.CuraSceneNode import CuraSceneNode
 from cura.Scene.GCodeListDecorator import GCodeListDecorator
 from cura.Settings.ExtruderManager import ExtruderManager
 
+if TYPE_CHECKING:
+    from .GCodePreviewCache import GCodePreviewCache
+
 catalog = i18nCatalog("cura")
 
 PositionOptional = NamedTuple("PositionOptional", [("x", Optional[float]), ("y", Optional[float]), ("z", Optional[float]), ("f", Optional[float]), ("e", Optional[float])])
@@ -34,6 +39,12 @@ class FlavorParser:
     MAX_EXTRUDER_COUNT = 16
     DEFAULT_FILAMENT_DIAMETER = 2.85
 
+    # The end of the value of a code in a line.
+    _value_end_pattern = re.compile("[;\\s]")
+    # A parameter of a command, like X10.5. These are separated by spaces, so this matches the part of each word after a
+    # space that starts with one of the parameter letters that are used.
+    _parameter_pattern = re.compile(" ([XYZFE])([^ ]+)")
+
     def __init__(self) -> None:
         CuraApplication.getInstance().hideMessageSignal.connect(self._onHideMessage)
         self._cancelled = False
@@ -41,7 +52,7 @@ class FlavorParser:
         self._layer_number = 0
         self._extruder_number = 0
         # All extruder numbers that have been seen
-        self._extruders_seen = {0}  # type: Set[int]
+        self._extruders_seen: Set[int] = {0}
         self._clearValues()
         self._scene_node = None
         # X, Y, Z position, F feedrate and E extruder values are stored
@@ -51,6 +62,7 @@ class FlavorParser:
         self._current_layer_thickness = 0.2  # default
         self._current_filament_diameter = 2.85       # default
         self._previous_extrusion_value = 0.0  # keep track of the filament retractions
+        self._gcode_functions: Dict[int, Optional[Callable[[Position, PositionOptional, List[List[Union[float, int]]]], Position]]] = {}
 
         CuraApplication.getInstance().getPreferences().addPreference("gcodereader/show_caution", True)
 
@@ -70,8 +82,7 @@ class FlavorParser:
         if n < 0:
             return None
         n += len(code)
-        pattern = re.compile("[;\\s]")
-        match = pattern.search(line, n)
+        match = FlavorParser._value_end_pattern.search(line, n)
         m = match.start() if match is not None else -1
         try:
             if m < 0:
@@ -99,14 +110,7 @@ class FlavorParser:
             self._cancelled = True
 
     def _createPolygon(self, layer_thickness: float, path: List[List[Union[float, int]]], extruder_offsets: List[float]) -> bool:
-        countvalid = 0
-        for point in path:
-            if point[5] > 0:
-                countvalid += 1
-                if countvalid >= 2:
-                    # we know what to do now, no need to count further
-                    continue
-        if countvalid < 2:
+        if sum(1 for point in path if point[5] > 0) < 2:
             return False
         try:
             self._layer_data_builder.addLayer(self._layer_number)
@@ -117,31 +121,28 @@ class FlavorParser:
                 return False
         except ValueError:
             return False
-        count = len(path)
-        line_types = numpy.empty((count - 1, 1), numpy.int32)
-        line_widths = numpy.empty((count - 1, 1), numpy.float32)
-        line_thicknesses = numpy.empty((count - 1, 1), numpy.float32)
-        line_feedrates = numpy.empty((count - 1, 1), numpy.float32)
-        line_widths[:, 0] = 0.35  # Just a guess
-        line_thicknesses[:, 0] = layer_thickness
+
+        # Columns of the path are x, y, z, feedrate, extrusion and line type.
+        path_array = numpy.array(path, dtype = numpy.float64)
+        count = len(path_array)
         points = numpy.empty((count, 3), numpy.float32)
-        extrusion_values = numpy.empty((count, 1), numpy.float32)
-        i = 0
-        for point in path:
-            points[i, :] = [point[0] + extruder_offsets[0], point[2], -point[1] - extruder_offsets[1]]
-            extrusion_values[i] = point[4]
-            if i > 0:
-                line_feedrates[i - 1] = point[3]
-                line_types[i - 1] = point[5]
-                if point[5] in [LayerPolygon.MoveUnretractedType,
-                                LayerPolygon.MoveRetractedType,
-                                LayerPolygon.MoveWhileRetractingType,
-                                LayerPolygon.MoveWhileUnretractingType]:
-                    line_widths[i - 1] = 0.1
-                    line_thicknesses[i - 1] = 0.0 # Travels are set as zero thickness lines
-                else:
-                    line_widths[i - 1] = self._calculateLineWidth(points[i], points[i-1], extrusion_values[i], extrusion_values[i-1], layer_thickness)
-            i += 1
+        points[:, 0] = path_array[:, 0] + extruder_offsets[0]
+        points[:, 1] = path_array[:, 2]
+        points[:, 2] = -path_array[:, 1] - extruder_offsets[1]
+        extrusion_values = path_array[:, 4].astype(numpy.float32)
+
+        line_types = path_array[1:, 5].astype(numpy.int32).reshape((-1, 1))
+        line_feedrates = path_array[1:, 3].astype(numpy.float32).reshape((-1, 1))
+        line_thicknesses = numpy.full((count - 1, 1), layer_thickness, numpy.float32)
+        line_widths = numpy.empty((count - 1, 1), numpy.float32)
+
+        is_travel = numpy.isin(line_types[:, 0], [LayerPolygon.MoveUnretractedType,
+                                                  LayerPolygon.MoveRetractedType,
+                                                  LayerPolygon.MoveWhileRetractingType,
+                                                  LayerPolygon.MoveWhileUnretractingType])
+        line_widths[is_travel, 0] = 0.1
+        line_thicknesses[is_travel, 0] = 0.0  # Travels are set as zero thickness lines
+        line_widths[~is_travel, 0] = self._calculateLineWidths(points, extrusion_values, layer_thickness)[~is_travel]
 
         this_poly = LayerPolygon(self._extruder_number, line_types, points, line_widths, line_thicknesses, line_feedrates)
         this_poly.buildCache()
@@ -154,30 +155,36 @@ class FlavorParser:
         self._layer_data_builder.setLayerHeight(layer_number, 0)
         self._layer_data_builder.setLayerThickness(layer_number, 0)
 
-    def _calculateLineWidth(self, current_point: Position, previous_point: Position, current_extrusion: float, previous_extrusion: float, layer_thickness: float) -> float:
+    def _calculateLineWidths(self, points: numpy.ndarray, extrusion_values: numpy.ndarray, layer_thickness: float) -> numpy.ndarray:
+        """Calculate the width of the lines between consecutive points from the amount of filament extruded for them.
+
+        :param points: The points of the path, as (x, z, -y) in float32.
+        :param extrusion_values: The extrusion position of the E axis at each point, in float32.
+        :param layer_thickness: The thickness of the lines.
+        :return: The width of each line, so one fewer than there are points.
+        """
+
         # Area of the filament
         Af = (self._current_filament_diameter / 2) ** 2 * numpy.pi
         # Length of the extruded filament
-        de = current_extrusion - previous_extrusion
+        de = extrusion_values[1:] - extrusion_values[:-1]
         # Volume of the extruded filament
         dVe = de * Af
         # Length of the printed line
-        dX = numpy.sqrt((current_point[0] - previous_point[0])**2 + (current_point[2] - previous_point[2])**2)
-        # When the extruder recovers from a retraction, we get zero distance
-        if dX == 0:
-            return 0.1
-        # Area of the printed line. This area is a rectangle
-        Ae = dVe / dX
-        # This area is a rectangle with area equal to layer_thickness * layer_width
-        line_width = Ae / layer_thickness
+        dX = numpy.sqrt((points[1:, 0] - points[:-1, 0]) ** 2 + (points[1:, 2] - points[:-1, 2]) ** 2)
+        with numpy.errstate(divide = "ignore", invalid = "ignore"):
+            # Area of the printed line. This area is a rectangle
+            Ae = dVe / dX
+            # This area is a rectangle with area equal to layer_thickness * layer_width
+            line_widths = Ae / layer_thickness
 
-        # A threshold is set to avoid weird paths in the GCode
-        if line_width > 1.2:
-            return 0.35
         # Prevent showing infinitely wide lines
-        if line_width < 0.0:
-            return 0.0
-        return line_width
+        line_widths[line_widths < 0.0] = 0.0
+        # A threshold is set to avoid weird paths in the GCode
+        line_widths[line_widths > 1.2] = 0.35
+        # When the extruder recovers from a retraction, we get zero distance
+        line_widths[dX == 0] = 0.1
+        return line_widths
 
     def _gCode0(self, position: Position, params: PositionOptional, path: List[List[Union[float, int]]]) -> Position:
         x, y, z, f, e = position
@@ -262,30 +269,20 @@ class FlavorParser:
             position.e)
 
     def processGCode(self, G: int, line: str, position: Position, path: List[List[Union[float, int]]]) -> Position:
-        func = getattr(self, "_gCode%s" % G, None)
+        try:
+            func = self._gcode_functions[G]
+        except KeyError:
+            func = self._gcode_functions[G] = getattr(self, "_gCode%s" % G, None)
         line = line.split(";", 1)[0]  # Remove comments (if any)
         if func is not None:
-            s = line.upper().split(" ")
-            x, y, z, f, e = None, None, None, None, None
-            for item in s[1:]:
-                if len(item) <= 1:
-                    continue
-                if item.startswith(";"):
-                    continue
+            values = {}  # type: Dict[str, float]
+            for code, value in self._parameter_pattern.findall(line.upper()):
                 try:
-                    if item[0] == "X":
-                        x = float(item[1:])
-                    elif item[0] == "Y":
-                        y = float(item[1:])
-                    elif item[0] == "Z":
-                        z = float(item[1:])
-                    elif item[0] == "F":
-                        f = float(item[1:]) / 60
-                    elif item[0] == "E":
-                        e = float(item[1:])
+                    values[code] = float(value)
                 except ValueError:  # Improperly formatted g-code: Coordinates are not floats.
                     continue  # Skip the command then.
-            params = PositionOptional(x, y, z, f, e)
+            f = values.get("F")
+            params = PositionOptional(values.get("X"), values.get("Y"), values.get("Z"), f / 60 if f is not None else None, values.get("E"))
             return func(position, params, path)
         return position
 
@@ -310,6 +307,7 @@ class FlavorParser:
             # Set relative extrusion mode
             self._is_absolute_extrusion = False
 
+    _move_prefixes = ("G0 ", "G1 ")
     _type_keyword = ";TYPE:"
     _layer_keyword = ";LAYER:"
 
@@ -323,12 +321,44 @@ class FlavorParser:
                 extruder.getProperty("machine_nozzle_offset_y", "value")]
         return result
 
+    @staticmethod
+    def _iterateLines(stream: Union[str, Iterable[str]]) -> Iterator[str]:
+        """Iterate over the lines of the g-code without their line endings, as ``stream.split("\\n")`` would.
+
+        :param stream: Either the complete g-code, or something that produces it line by line, like a file opened in
+        text mode. The latter keeps only one line of the file in memory at a time.
+        """
+
+        if isinstance(stream, str):
+            stream = io.StringIO(stream)  # Splits on "\n" only, like str.split does.
+
+        last_line = "\n"  # An empty file still has one (empty) line.
+        for line in stream:
+            yield line[:-1] if line.endswith("\n") else line
+            last_line = line
+        if last_line.endswith("\n"):
+            yield ""
+
     #
     # CURA-6643
     # This function needs the filename so it can be set to the SceneNode. Otherwise, if you load a GCode file and press
     # F5, that gcode SceneNode will be removed because it doesn't have a file to be reloaded from.
     #
-    def processGCodeStream(self, stream: str, filename: str) -> Optional["CuraSceneNode"]:
+    def processGCodeStream(self, stream: Union[str, Iterable[str]], filename: str, stream_size: Optional[int] = None,
+                           preview_cache: Optional["GCodePreviewCache"] = None, content_hash: Optional[str] = None) -> Optional["CuraSceneNode"]:
+        """Parse g-code into a scene node with its layer data.
+
+        The g-code is parsed in a single pass. Every layer is turned into arrays for the layer data as soon as it ends,
+        so apart from the g-code list itself, only the moves of the current layer are kept in memory.
+
+        :param stream: The g-code, either as one string or as an iterable of lines (like a file opened in text mode).
+        :param filename: The file the g-code was read from.
+        :param stream_size: The number of characters in the stream, used to show the progress. If not given for an
+        iterable of lines, no progress is shown.
+        :param preview_cache: A cache to get the layers from instead of parsing them, and to store them in otherwise.
+        :param content_hash: A hash of the contents of the file, to find the layers in the preview cache with.
+        """
+
         Logger.log("d", "Preparing to load g-code")
         self._cancelled = False
         # We obtain the filament diameter from the selected extruder to calculate line widths
@@ -350,18 +380,27 @@ class FlavorParser:
 
         self._extruder_offsets = self._extruderOffsets()  # dict with index the extruder number. can be empty
 
+        preview_cache_key = None  # type: Optional[str]
+        if preview_cache is not None and content_hash is not None and preview_cache.isEnabled():
+            preview_cache_key = preview_cache.createKey(content_hash, self._getPreviewSettingsFingerprint(global_stack))
+            cached_layer_data_builder = preview_cache.load(preview_cache_key)
+            if cached_layer_data_builder is not None:
+                Logger.log("d", "Loading the layers of the g-code from the preview cache.")
+                self._clearValues()
+                self._layer_data_builder = cached_layer_data_builder
+                self._layer_number = len(cached_layer_data_builder.getLayers())
+                for line in self._iterateLines(stream):  # The g-code itself is still needed to print it.
+                    gcode_list.append(line + "\n")
+                return self._createSceneNode(scene_node, gcode_list, filename, global_stack)
+
         ##############################################################################################
         ##  This part is where the action starts
         ##############################################################################################
-        file_lines = 0
-        current_line = 0
-        for line in stream.split("\n"):
-            file_lines += 1
-            gcode_list.append(line + "\n")
-            if not self._is_layers_in_file and line[:len(self._layer_keyword)] == self._layer_keyword:
-                self._is_layers_in_file = True
-
-        file_step = max(math.floor(file_lines / 100), 1)
+        if stream_size is None and isinstance(stream, str):
+            stream_size = len(stream)
+        characters_read = 0
+        progress_step = max(math.floor(stream_size / 100), 1) if stream_size else 0
+        next_progress = progress_step
 
         self._clearValues()
 
@@ -370,7 +409,7 @@ class FlavorParser:
                                 title = catalog.i18nc("@info:title", "G-code Details"))
 
         assert(self._message is not None) # use for typing purposes
-        self._message.setProgress(0)
+        self._message.setProgress(0 if stream_size else -1)
         self._message.show()
 
         Logger.log("d", "Parsing g-code...")
@@ -382,72 +421,76 @@ class FlavorParser:
         previous_layer = 0
         self._previous_extrusion_value = 0.0
 
-        for line in stream.split("\n"):
+        for line in self._iterateLines(stream):
             if self._cancelled:
                 Logger.log("d", "Parsing g-code file cancelled.")
                 return None
-            current_line += 1
+            gcode_list.append(line + "\n")
 
-            if current_line % file_step == 0:
-                self._message.setProgress(math.floor(current_line / file_lines * 100))
+            characters_read += len(line) + 1
+            if progress_step and characters_read >= next_progress:
+                self._message.setProgress(min(math.floor(characters_read / stream_size * 100), 100))
+                next_progress = characters_read + progress_step
                 Job.yieldThread()
             if len(line) == 0:
                 continue
 
-            if line.find(self._type_keyword) == 0:
-                type = line[len(self._type_keyword):].strip()
-                if type == "WALL-INNER":
-                    self._layer_type = LayerPolygon.InsetXType
-                elif type == "WALL-OUTER":
-                    self._layer_type = LayerPolygon.Inset0Type
-                elif type == "SKIN":
-                    self._layer_type = LayerPolygon.SkinType
-                elif type == "SKIRT":
-                    self._layer_type = LayerPolygon.SkirtType
-                elif type == "SUPPORT":
-                    self._layer_type = LayerPolygon.SupportType
-                elif type == "FILL":
-                    self._layer_type = LayerPolygon.InfillType
-                elif type == "SUPPORT-INTERFACE":
-                    self._layer_type = LayerPolygon.SupportInterfaceType
-                elif type == "PRIME-TOWER":
-                    self._layer_type = LayerPolygon.PrimeTowerType
-                else:
-                    Logger.log("w", "Encountered a unknown type (%s) while parsing g-code.", type)
-
-            # When the layer change is reached, the polygon is computed so we have just one layer per extruder
-            if self._is_layers_in_file and line[:len(self._layer_keyword)] == self._layer_keyword:
-                try:
-                    layer_number = int(line[len(self._layer_keyword):])
-                    self._createPolygon(self._current_layer_thickness, current_path, self._extruder_offsets.get(self._extruder_number, [0, 0]))
-                    current_path.clear()
-                    # Start the new layer at the end position of the last layer
-                    current_path.append([current_position.x, current_position.y, current_position.z, current_position.f, current_position.e[self._extruder_number], LayerPolygon.MoveUnretractedType])
-
-                    # When using a raft, the raft layers are stored as layers < 0, it mimics the same behavior
-                    # as in ProcessSlicedLayersJob
-                    if layer_number < min_layer_number:
-                        min_layer_number = layer_number
-                    if layer_number < 0:
-                        layer_number += abs(min_layer_number)
-                        negative_layers += 1
+            if line[0] == ";":
+                if line.startswith(self._type_keyword):
+                    type = line[len(self._type_keyword):].strip()
+                    if type == "WALL-INNER":
+                        self._layer_type = LayerPolygon.InsetXType
+                    elif type == "WALL-OUTER":
+                        self._layer_type = LayerPolygon.Inset0Type
+                    elif type == "SKIN":
+                        self._layer_type = LayerPolygon.SkinType
+                    elif type == "SKIRT":
+                        self._layer_type = LayerPolygon.SkirtType
+                    elif type == "SUPPORT":
+                        self._layer_type = LayerPolygon.SupportType
+                    elif type == "FILL":
+                        self._layer_type = LayerPolygon.InfillType
+                    elif type == "SUPPORT-INTERFACE":
+                        self._layer_type = LayerPolygon.SupportInterfaceType
+                    elif type == "PRIME-TOWER":
+                        self._layer_type = LayerPolygon.PrimeTowerType
                     else:
-                        layer_number += negative_layers
-
-                    # In case there is a gap in the layer count, empty layers are created
-                    for empty_layer in range(previous_layer + 1, layer_number):
-                        self._createEmptyLayer(empty_layer)
-
-                    self._layer_number = layer_number
-                    previous_layer = layer_number
-                except:
-                    pass
-
-            # This line is a comment. Ignore it (except for the layer_keyword)
-            if line.startswith(";"):
+                        Logger.log("w", "Encountered a unknown type (%s) while parsing g-code.", type)
+
+                # When the layer change is reached, the polygon is computed so we have just one layer per extruder
+                elif line.startswith(self._layer_keyword):
+                    self._is_layers_in_file = True
+                    try:
+                        layer_number = int(line[len(self._layer_keyword):])
+                        self._createPolygon(self._current_layer_thickness, current_path, self._extruder_offsets.get(self._extruder_number, [0, 0]))
+                        current_path.clear()
+                        # Start the new layer at the end position of the last layer
+                        current_path.append([current_position.x, current_position.y, current_position.z, current_position.f, current_position.e[self._extruder_number], LayerPolygon.MoveUnretractedType])
+
+                        # When using a raft, the raft layers are stored as layers < 0, it mimics the same behavior
+                        # as in ProcessSlicedLayersJob
+                        if layer_number < min_layer_number:
+                            min_layer_number = layer_number
+                        if layer_number < 0:
+                            layer_number += abs(min_layer_number)
+                            negative_layers += 1
+                        else:
+                            layer_number += negative_layers
+
+                        # In case there is a gap in the layer count, empty layers are created
+                        for empty_layer in range(previous_layer + 1, layer_number):
+                            self._createEmptyLayer(empty_layer)
+
+                        self._layer_number = layer_number
+                        previous_layer = layer_number
+                    except:
+                        pass
+
+                # This line is a comment. Ignore it (except for the type and layer keywords)
                 continue
 
-            G = self._getInt(line, "G")
+            # Most lines are moves, for which the code can be read directly.
+            G = int(line[1]) if line.startswith(self._move_prefixes) else self._getInt(line, "G")
             if G is not None:
                 # When find a movement, the new position is calculated and added to the current_path, but
                 # don't need to create a polygon until the end of the layer
@@ -479,6 +522,25 @@ class FlavorParser:
                 self._layer_number += 1
                 current_path.clear()
 
+        if preview_cache is not None and preview_cache_key is not None:
+            preview_cache.store(preview_cache_key, self._layer_data_builder)
+
+        Logger.log("d", "Finished parsing g-code.")
+        return self._createSceneNode(scene_node, gcode_list, filename, global_stack)
+
+    def _getPreviewSettingsFingerprint(self, global_stack) -> str:
+        """The settings that change the layers that are parsed from g-code, for the key in the preview cache."""
+
+        return json.dumps({
+            "flavor": type(self).__name__,
+            "extruder_nr": self._extruder_number,  # The filament diameter of this extruder is used until the first T.
+            "material_diameters": [extruder.getProperty("material_diameter", "value") for extruder in global_stack.extruderList],
+            "extruder_offsets": {str(position): offset for position, offset in self._extruder_offsets.items()}
+        }, sort_keys = True)
+
+    def _createSceneNode(self, scene_node: CuraSceneNode, gcode_list: List[str], filename: str, global_stack) -> CuraSceneNode:
+        """Build the layers that were parsed into the scene node, and make its g-code the g-code of the scene."""
+
         material_color_map = numpy.zeros((8, 4), dtype = numpy.float32)
         material_color_map[0, :] = [0.0, 0.7, 0.9, 1.0]
         material_color_map[1, :] = [0.7, 0.9, 0.0, 1.0]
@@ -503,8 +565,8 @@ class FlavorParser:
         gcode_dict = {active_build_plate_id: gcode_list}
         CuraApplication.getInstance().getController().getScene().gcode_dict = gcode_dict #type: ignore #Because gcode_dict is generated dynamically.
 
-        Logger.log("d", "Finished parsing g-code.")
-        self._message.hide()
+        if self._message is not None:
+            self._message.hide()
 
         if self._layer_number == 0:
             Logger.log("w", "File doesn't contain any valid layers")
@@ -0,0 +1,196 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy
+
+from UM.Logger import Logger
+
+from cura.LayerDataBuilder import LayerDataBuilder
+from cura.LayerPolygon import LayerPolygon
+
+# The arrays of the polygons, in the order of the arguments of LayerPolygon. Each is stored as the polygons of all layers
+# concatenated, in a .npy file of its own.
+_POLYGON_ARRAYS = ("line_types", "points", "line_widths", "line_thicknesses", "line_feedrates")
+
+
+class GCodePreviewCache:
+    """Stores the parsed layers of g-code files on disk, so that opening the same file again doesn't have to parse it.
+
+    Every entry is stored under a key that is a hash of the contents of the file and of the settings that the parser
+    uses. The polygons of the layers are stored as numpy arrays, which are memory-mapped when the entry is loaded.
+    Entries that were used longest ago are removed when the cache grows beyond its maximum size.
+
+    :param directory: The directory to store the cache in.
+    :param max_size: The maximum total size of all entries, in bytes. Zero disables the cache.
+    """
+
+    Version = 1  # Increase when changing the format of the entries.
+    IncompletePrefix = ".incomplete_"  # Entries that are still being written.
+
+    def __init__(self, directory: str, max_size: int) -> None:
+        self._directory = directory
+        self._max_size = max_size
+
+    def setMaxSize(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._evict()
+
+    def isEnabled(self) -> bool:
+        return self._max_size > 0
+
+    @staticmethod
+    def hashFile(file_name: str) -> str:
+        """Get a hash of the contents of a file, without reading all of it into memory at once."""
+
+        content_hash = hashlib.sha256()
+        with open(file_name, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                content_hash.update(block)
+        return content_hash.hexdigest()
+
+    def createKey(self, content_hash: str, settings_fingerprint: str) -> str:
+        """Get the key for the preview of a file.
+
+        :param content_hash: A hash of the contents of the file, see :py:meth:`hashFile`.
+        :param settings_fingerprint: The settings that change how the file is parsed, like the filament diameters.
+        """
+
+        key_hash = hashlib.sha256()
+        for part in (str(self.Version), content_hash, settings_fingerprint):
+            key_hash.update(part.encode("utf-8"))
+            key_hash.update(b"\0")
+        return key_hash.hexdigest()
+
+    def load(self, key: str) -> Optional[LayerDataBuilder]:
+        """Get the layers of a file from the cache.
+
+        :return: A layer data builder with the layers of the file, ready to build, or None if they are not in the cache.
+        """
+
+        if not self.isEnabled():
+            return None
+        entry_directory = os.path.join(self._directory, key)
+        metadata_path = os.path.join(entry_directory, "metadata.json")
+        try:
+            with open(metadata_path, encoding = "utf-8") as f:
+                metadata = json.load(f)
+            if metadata.get("version") != self.Version:
+                return None
+            arrays: Dict[str, numpy.ndarray] = {}
+            if metadata["polygons"]:
+                # Copy on write, since the parser's arrays may be changed in place by the layer polygons.
+                for name in _POLYGON_ARRAYS + ("polygons", ):
+                    arrays[name] = numpy.load(os.path.join(entry_directory, name + ".npy"), mmap_mode = "c", allow_pickle = False)
+            os.utime(metadata_path)  # Mark it as recently used.
+        except (OSError, ValueError, KeyError):  # Not in the cache, or not readable.
+            return None
+
+        builder = LayerDataBuilder()
+        for number, height, thickness in metadata["layers"]:
+            builder.addLayer(number)
+            builder.setLayerHeight(number, height)
+            builder.setLayerThickness(number, thickness)
+        if not arrays:
+            return builder
+
+        point_begin = 0
+        line_begin = 0
+        for layer_number, extruder, point_count in arrays["polygons"].tolist():
+            point_end = point_begin + point_count
+            line_end = line_begin + point_count - 1
+            polygon = LayerPolygon(extruder, arrays["line_types"][line_begin:line_end], arrays["points"][point_begin:point_end],
+                                   arrays["line_widths"][line_begin:line_end], arrays["line_thicknesses"][line_begin:line_end],
+                                   arrays["line_feedrates"][line_begin:line_end])
+            polygon.buildCache()
+            builder.getLayer(layer_number).polygons.append(polygon)
+            point_begin = point_end
+            line_begin = line_end
+        return builder
+
+    def store(self, key: str, builder: LayerDataBuilder) -> None:
+        """Store the layers of a file in the cache.
+
+        :param key: The key of the file, see :py:meth:`createKey`.
+        :param builder: The layer data builder with the layers that were parsed from the file.
+        """
+
+        if not self.isEnabled():
+            return
+        layers: List[List[Any]] = []
+        polygons: List[List[int]] = []
+        polygon_arrays: Dict[str, List[numpy.ndarray]] = {name: [] for name in _POLYGON_ARRAYS}
+        for number, layer in builder.getLayers().items():
+            layers.append([number, float(layer.height), float(layer.thickness)])
+            for polygon in layer.polygons:
+                polygons.append([number, polygon.extruder, len(polygon.data)])
+                polygon_arrays["line_types"].append(polygon.types)
+                polygon_arrays["points"].append(polygon.data)
+                polygon_arrays["line_widths"].append(polygon.lineWidths)
+                polygon_arrays["line_thicknesses"].append(polygon.lineThicknesses)
+                polygon_arrays["line_feedrates"].append(polygon.lineFeedrates)
+
+        entry_directory = None
+        try:
+            os.makedirs(self._directory, exist_ok = True)
+            entry_directory = tempfile.mkdtemp(prefix = self.IncompletePrefix, dir = self._directory)
+            if polygons:
+                numpy.save(os.path.join(entry_directory, "polygons.npy"), numpy.array(polygons, dtype = numpy.int64))
+                for name, arrays in polygon_arrays.items():
+                    numpy.save(os.path.join(entry_directory, name + ".npy"), numpy.concatenate(arrays))
+            with open(os.path.join(entry_directory, "metadata.json"), "w", encoding = "utf-8") as f:
+                json.dump({"version": self.Version, "layers": layers, "polygons": len(polygons)}, f)
+            destination = os.path.join(self._directory, key)
+            shutil.rmtree(destination, ignore_errors = True)
+            os.replace(entry_directory, destination)
+        except (OSError, ValueError) as e:
+            Logger.warning("Unable to store the g-code preview in the cache: {err}".format(err = str(e)))
+            if entry_directory is not None:
+                shutil.rmtree(entry_directory, ignore_errors = True)
+            return
+        self._evict()
+
+    def clear(self) -> None:
+        shutil.rmtree(self._directory, ignore_errors = True)
+
+    def _evict(self) -> None:
+        """Remove the entries that were used longest ago, until the cache is small enough."""
+
+        try:
+            names = os.listdir(self._directory)
+        except OSError:
+            return
+        entries = []
+        total_size = 0
+        for name in names:
+            entry_directory = os.path.join(self._directory, name)
+            if name.startswith(self.IncompletePrefix):
+                # Left behind when Cura was closed while storing a preview. Others may still be written to.
+                try:
+                    if os.path.getmtime(entry_directory) < time.time() - 24 * 60 * 60:
+                        shutil.rmtree(entry_directory, ignore_errors = True)
+                except OSError:
+                    pass
+                continue
+            try:
+                last_used = os.path.getmtime(os.path.join(entry_directory, "metadata.json"))
+                size = sum(entry.stat().st_size for entry in os.scandir(entry_directory))
+            except OSError:  # Broken entry.
+                last_used = 0
+                size = 0
+            entries.append((last_used, size, entry_directory))
+            total_size += size
+
+        entries.sort()
+        for last_used, size, entry_directory in entries:
+            if total_size <= self._max_size and last_used > 0:
+                break
+            shutil.rmtree(entry_directory, ignore_errors = True)
+            total_size -= size
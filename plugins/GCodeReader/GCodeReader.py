@@ -2,17 +2,22 @@
 # Copyright (c) 2020 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
-from typing import Optional, Union, List, TYPE_CHECKING
+import io
+import os
+from typing import Iterable, Optional, Union, List, TYPE_CHECKING
 
 from UM.FileHandler.FileReader import FileReader
+from UM.Logger import Logger
 from UM.Mesh.MeshReader import MeshReader
 from UM.i18n import i18nCatalog
 from UM.Application import Application
 from UM.MimeTypeDatabase import MimeTypeDatabase, MimeType
+from UM.Resources import Resources
 
 catalog = i18nCatalog("cura")
 
 from .FlavorParser import FlavorParser
+from .GCodePreviewCache import GCodePreviewCache
 from . import MarlinFlavorParser, RepRapFlavorParser
 
 if TYPE_CHECKING:
@@ -41,9 +46,42 @@ class GCodeReader(MeshReader):
         self._flavor_reader = None  # type: Optional[FlavorParser]
 
         Application.getInstance().getPreferences().addPreference("gcodereader/show_caution", True)
+        Application.getInstance().getPreferences().addPreference("gcodereader/preview_cache_size", 512)  # In MiB. 0 disables the cache.
 
-    def preReadFromStream(self, stream, *args, **kwargs):
-        for line in stream.split("\n"):
+        self._preview_cache = GCodePreviewCache(os.path.join(Resources.getCacheStoragePath(), "gcode_preview_cache"),
+                                                self._getPreviewCacheSize())
+        Application.getInstance().getPreferences().preferenceChanged.connect(self._onPreferenceChanged)
+
+    def _getPreviewCacheSize(self) -> int:
+        try:
+            return max(int(Application.getInstance().getPreferences().getValue("gcodereader/preview_cache_size")), 0) * 1024 * 1024
+        except (TypeError, ValueError):
+            return 0
+
+    def _onPreferenceChanged(self, preference: str) -> None:
+        if preference == "gcodereader/preview_cache_size":
+            self._preview_cache.setMaxSize(self._getPreviewCacheSize())
+
+    def getContentHash(self, file_name: str) -> Optional[str]:
+        """Get the hash of a g-code file to find it in the preview cache with, or None if the cache is not used."""
+
+        if not self._preview_cache.isEnabled():
+            return None
+        try:
+            return self._preview_cache.hashFile(file_name)
+        except OSError as e:
+            Logger.warning("Unable to read {file_name} to find it in the preview cache: {err}".format(file_name = file_name, err = str(e)))
+            return None
+
+    def preReadFromStream(self, stream: Union[str, Iterable[str]], *args, **kwargs):
+        """Select the flavor parser from the ;FLAVOR: line of the g-code.
+
+        :param stream: The g-code, either as one string or as an iterable of lines. Reading stops at the flavor line.
+        """
+
+        if isinstance(stream, str):
+            stream = io.StringIO(stream)
+        for line in stream:
             if line[:len(self._flavor_keyword)] == self._flavor_keyword:
                 try:
                     self._flavor_reader = self._flavor_readers_dict[line[len(self._flavor_keyword):].rstrip()]
@@ -59,19 +97,31 @@ class GCodeReader(MeshReader):
     # PreRead is used to get the correct flavor. If not, Marlin is set by default
     def preRead(self, file_name, *args, **kwargs):
         with open(file_name, "r", encoding = "utf-8") as file:
-            file_data = file.read()
-        return self.preReadFromStream(file_data, args, kwargs)
+            return self.preReadFromStream(file, args, kwargs)
+
+    def readFromStream(self, stream: Union[str, Iterable[str]], filename: str, stream_size: Optional[int] = None,
+                       content_hash: Optional[str] = None) -> Optional["CuraSceneNode"]:
+        """Parse the g-code with the flavor parser that was selected when pre-reading.
+
+        :param stream: The g-code, either as one string or as an iterable of lines, like a file opened in text mode.
+        :param filename: The file the g-code was read from.
+        :param stream_size: The (approximate) number of characters in the stream, to show the progress.
+        :param content_hash: The hash of the file from :py:meth:`getContentHash`. If given, the layers are taken from
+        the preview cache when the file was read before, and stored in it otherwise.
+        """
 
-    def readFromStream(self, stream: str, filename: str) -> Optional["CuraSceneNode"]:
         if self._flavor_reader is None:
             return None
-        return self._flavor_reader.processGCodeStream(stream, filename)
+        return self._flavor_reader.processGCodeStream(stream, filename, stream_size,
+                                                      preview_cache = self._preview_cache if content_hash is not None else None,
+                                                      content_hash = content_hash)
 
     def _read(self, file_name: str) -> Union["SceneNode", List["SceneNode"]]:
-        with open(file_name, "r", encoding = "utf-8") as file:
-            file_data = file.read()
         result = []  # type: List[SceneNode]
-        node = self.readFromStream(file_data, file_name)
+        # Stream the file line by line, instead of reading all of it into memory first.
+        content_hash = self.getContentHash(file_name)
+        with open(file_name, "r", encoding = "utf-8") as file:
+            node = self.readFromStream(file, file_name, os.path.getsize(file_name), content_hash)
         if node is not None:
             result.append(node)
         return result
@@ -0,0 +1,103 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import numpy
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from FlavorParser import FlavorParser
+from cura.LayerPolygon import LayerPolygon
+
+color_map = numpy.linspace(0, 1, 15 * 4, dtype = numpy.float32).reshape((15, 4))
+
+# Two raft layers, two layers of the model and a layer number that is skipped in between.
+gcode = """;FLAVOR:Marlin
+G28
+M82
+G92 E0
+;LAYER:-2
+;TYPE:SUPPORT
+G0 F6000 X10 Y10 Z0.3
+G1 F1200 X20 Y10 E0.1
+G1 X20 Y20 E0.2
+;LAYER:-1
+G0 X10 Y10 Z0.6
+G1 X20 Y10 E0.3
+;LAYER:0
+;TYPE:WALL-OUTER
+G0 X10 Y10 Z0.8
+G1 F1800 X20 Y10 E0.4
+;TYPE:FILL
+G1 X20 Y20 E0.5
+;LAYER:2
+G0 X10 Y10 Z1.0
+G1 X20 Y10 E0.6
+"""
+
+
+def expectedWidth(extruded: float, length: float, layer_thickness: float) -> float:
+    return extruded * numpy.pi * (FlavorParser.DEFAULT_FILAMENT_DIAMETER / 2) ** 2 / (length * layer_thickness)
+
+
+@pytest.fixture
+def parser():
+    application = MagicMock()
+    application.getGlobalContainerStack.return_value = MagicMock(extruderList = [])  # Uses the default filament diameter.
+    extruder_manager = MagicMock()
+    extruder_manager.getActiveExtruderStacks.return_value = []
+    with patch("FlavorParser.CuraApplication.getInstance", return_value = application):
+        with patch("FlavorParser.ExtruderManager.getInstance", return_value = extruder_manager):
+            with patch("FlavorParser.CuraSceneNode"):
+                with patch("FlavorParser.Message"):
+                    with patch("cura.LayerPolygon.LayerPolygon.getColorMap", return_value = color_map):
+                        yield FlavorParser()
+
+
+def test_processGCodeStreamLayers(parser):
+    assert parser.processGCodeStream(gcode, "test.gcode") is not None
+
+    layers = parser._layer_data_builder.getLayers()
+    # The raft layers come first, and the layer that was skipped is added as an empty layer.
+    assert sorted(layers) == [0, 1, 2, 3, 4]
+    assert parser._layer_number == 5
+    assert [len(layers[layer_number].polygons) for layer_number in sorted(layers)] == [1, 1, 1, 0, 1]
+    assert layers[3].height == 0
+    assert layers[3].thickness == 0
+
+
+def test_processGCodeStreamLineTypes(parser):
+    parser.processGCodeStream(gcode, "test.gcode")
+    layers = parser._layer_data_builder.getLayers()
+
+    def lineTypes(layer_number):
+        return layers[layer_number].polygons[0].types[:, 0].tolist()
+
+    assert lineTypes(0) == [LayerPolygon.MoveUnretractedType, LayerPolygon.SupportType, LayerPolygon.SupportType]
+    assert lineTypes(1) == [LayerPolygon.MoveUnretractedType, LayerPolygon.SupportType]
+    assert lineTypes(2) == [LayerPolygon.MoveUnretractedType, LayerPolygon.Inset0Type, LayerPolygon.InfillType]
+    assert lineTypes(4) == [LayerPolygon.MoveUnretractedType, LayerPolygon.InfillType]
+
+
+def test_processGCodeStreamWidthsAndFeedrates(parser):
+    parser.processGCodeStream(gcode, "test.gcode")
+    layers = parser._layer_data_builder.getLayers()
+
+    raft_polygon = layers[0].polygons[0]
+    # The first extruding move sets the layer thickness to its height above the build plate.
+    assert layers[0].thickness == pytest.approx(0.3)
+    assert raft_polygon.lineWidths[:, 0].tolist() == pytest.approx([0.1, expectedWidth(0.1, 10, 0.3), expectedWidth(0.1, 10, 0.3)], rel = 1e-5)
+    assert raft_polygon.lineThicknesses[:, 0].tolist() == pytest.approx([0.0, 0.3, 0.3], rel = 1e-5)
+    assert raft_polygon.lineFeedrates[:, 0].tolist() == pytest.approx([100, 20, 20])  # In mm/s, where F is in mm/min.
+
+    model_polygon = layers[2].polygons[0]
+    assert layers[2].thickness == pytest.approx(0.2)
+    assert model_polygon.lineWidths[:, 0].tolist() == pytest.approx([0.1, expectedWidth(0.1, 10, 0.2), expectedWidth(0.1, 10, 0.2)], rel = 1e-5)
+    assert model_polygon.lineFeedrates[:, 0].tolist() == pytest.approx([20, 30, 30])
+
+    # The points are stored as (x, z, -y).
+    assert layers[4].polygons[0].data == pytest.approx(numpy.array([[20, 0.8, -20], [10, 1.0, -10], [20, 1.0, -10]]))
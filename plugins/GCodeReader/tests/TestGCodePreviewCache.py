@@ -0,0 +1,113 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import sys
+from unittest.mock import patch
+
+import numpy
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from GCodePreviewCache import GCodePreviewCache
+from cura.LayerDataBuilder import LayerDataBuilder
+from cura.LayerPolygon import LayerPolygon
+
+color_map = numpy.linspace(0, 1, 15 * 4, dtype = numpy.float32).reshape((15, 4))
+material_color_map = numpy.linspace(0, 1, 8 * 4, dtype = numpy.float32).reshape((8, 4))
+
+
+@pytest.fixture(autouse = True)
+def mockColorMap():
+    with patch("cura.LayerPolygon.LayerPolygon.getColorMap", return_value = color_map):
+        yield
+
+
+def createPolygon(extruder, point_count, offset):
+    points = (numpy.arange(point_count * 3, dtype = numpy.float32).reshape((-1, 3)) + offset)
+    line_types = numpy.full((point_count - 1, 1), LayerPolygon.InfillType, dtype = numpy.int32)
+    line_types[0] = LayerPolygon.MoveUnretractedType
+    line_widths = numpy.full((point_count - 1, 1), 0.4, dtype = numpy.float32)
+    line_thicknesses = numpy.full((point_count - 1, 1), 0.2, dtype = numpy.float32)
+    line_feedrates = numpy.arange(point_count - 1, dtype = numpy.float32).reshape((-1, 1)) + 30
+    return LayerPolygon(extruder, line_types, points, line_widths, line_thicknesses, line_feedrates)
+
+
+def createBuilder():
+    builder = LayerDataBuilder()
+    for layer_number in range(3):
+        builder.addLayer(layer_number)
+        builder.setLayerHeight(layer_number, 0.2 * (layer_number + 1))
+        builder.setLayerThickness(layer_number, 0.2)
+        for extruder in range(2):
+            polygon = createPolygon(extruder, 5 + layer_number + extruder, layer_number * 10)
+            polygon.buildCache()
+            builder.getLayer(layer_number).polygons.append(polygon)
+    builder.addLayer(3)  # An empty layer.
+    return builder
+
+
+def test_storeAndLoad(tmp_path):
+    cache = GCodePreviewCache(str(tmp_path), 1024 * 1024)
+    key = cache.createKey("content", "settings")
+    assert cache.load(key) is None
+
+    original = createBuilder()
+    cache.store(key, original)
+    loaded = cache.load(key)
+
+    assert loaded is not None
+    assert list(loaded.getLayers()) == list(original.getLayers())
+    for number, layer in original.getLayers().items():
+        loaded_layer = loaded.getLayer(number)
+        assert loaded_layer.height == layer.height
+        assert loaded_layer.thickness == layer.thickness
+        assert len(loaded_layer.polygons) == len(layer.polygons)
+        for loaded_polygon, polygon in zip(loaded_layer.polygons, layer.polygons):
+            assert loaded_polygon.extruder == polygon.extruder
+            numpy.testing.assert_array_equal(loaded_polygon.data, polygon.data)
+            numpy.testing.assert_array_equal(loaded_polygon.types, polygon.types)
+            numpy.testing.assert_array_equal(loaded_polygon.lineWidths, polygon.lineWidths)
+            numpy.testing.assert_array_equal(loaded_polygon.lineThicknesses, polygon.lineThicknesses)
+            numpy.testing.assert_array_equal(loaded_polygon.lineFeedrates, polygon.lineFeedrates)
+            assert loaded_polygon.lineMeshVertexCount() == polygon.lineMeshVertexCount()
+
+    expected = original.build(material_color_map)
+    actual = loaded.build(material_color_map)
+    numpy.testing.assert_array_equal(expected.getVertices(), actual.getVertices())
+    numpy.testing.assert_array_equal(expected.getIndices(), actual.getIndices())
+    assert expected.getElementCounts() == actual.getElementCounts()
+
+
+def test_keyDependsOnSettings(tmp_path):
+    cache = GCodePreviewCache(str(tmp_path), 1024 * 1024)
+    cache.store(cache.createKey("content", "settings"), createBuilder())
+
+    assert cache.load(cache.createKey("content", "other settings")) is None
+    assert cache.load(cache.createKey("other content", "settings")) is None
+
+
+def test_evictLeastRecentlyUsed(tmp_path):
+    cache = GCodePreviewCache(str(tmp_path), 1024 * 1024)
+    keys = [cache.createKey(str(index), "settings") for index in range(3)]
+    for index, key in enumerate(keys):
+        cache.store(key, createBuilder())
+        os.utime(os.path.join(str(tmp_path), key, "metadata.json"), (1000 + index, 1000 + index))  # Used in this order.
+    entry_size = sum(entry.stat().st_size for entry in os.scandir(os.path.join(str(tmp_path), keys[0])))
+
+    cache.load(keys[0])  # Now the first entry is the most recently used one.
+    cache.setMaxSize(entry_size * 2)
+
+    assert cache.load(keys[0]) is not None
+    assert cache.load(keys[1]) is None
+    assert cache.load(keys[2]) is not None
+
+
+def test_disabled(tmp_path):
+    cache = GCodePreviewCache(str(tmp_path), 0)
+    key = cache.createKey("content", "settings")
+    cache.store(key, createBuilder())
+
+    assert cache.load(key) is None
+    assert not os.listdir(str(tmp_path))
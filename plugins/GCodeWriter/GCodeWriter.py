@@ -3,6 +3,10 @@
 
 import re  # For escaping characters in the settings.
 import json
+import math
+from typing import Callable, Iterator, Optional
+
+from UM.Job import Job
 
 from UM.Mesh.MeshWriter import MeshWriter
 from UM.Logger import Logger
@@ -67,6 +71,8 @@ class GCodeWriter(MeshWriter):
         :param nodes: This is ignored.
         :param mode: Additional information on how to format the g-code in the
             file. This must always be text mode.
+        :param progress_callback: Optional keyword argument. Called every now
+            and then with the fraction of the g-code that was written so far.
         """
 
         if mode != MeshWriter.OutputMode.TextMode:
@@ -74,27 +80,49 @@ class GCodeWriter(MeshWriter):
             self.setInformation(catalog.i18nc("@error:not supported", "GCodeWriter does not support non-text mode."))
             return False
 
+        gcode_chunks = self.iterateGCode(kwargs.get("progress_callback"))
+        if gcode_chunks is None:
+            return False
+        for gcode in gcode_chunks:
+            stream.write(gcode)
+        return True
+
+    def iterateGCode(self, progress_callback: Optional[Callable[[float], None]] = None) -> Optional[Iterator[str]]:
+        """Get the g-code of the active build plate piece by piece, as it would be written to a file.
+
+        The g-code is read from the g-code list one item at a time, so the complete file never needs to be in memory.
+        This is what :py:meth:`write` writes, and what other writers can use to process the g-code as it is written.
+
+        :param progress_callback: Called every now and then with the fraction of the g-code that was produced so far.
+        :return: The pieces of g-code, or None if there is no g-code to write. The reason is set as information then.
+        """
+
         active_build_plate = Application.getInstance().getMultiBuildPlateModel().activeBuildPlate
         scene = Application.getInstance().getController().getScene()
-        if not hasattr(scene, "gcode_dict"):
+        gcode_dict = getattr(scene, "gcode_dict", None)
+        gcode_list = gcode_dict.get(active_build_plate, None) if gcode_dict is not None else None
+        if gcode_list is None:
             self.setInformation(catalog.i18nc("@warning:status", "Please prepare G-code before exporting."))
-            return False
-        gcode_dict = getattr(scene, "gcode_dict")
-        gcode_list = gcode_dict.get(active_build_plate, None)
-        if gcode_list is not None:
-            has_settings = False
-            for gcode in gcode_list:
-                if gcode[:len(self._setting_keyword)] == self._setting_keyword:
-                    has_settings = True
-                stream.write(gcode)
-            # Serialise the current container stack and put it at the end of the file.
-            if not has_settings:
-                settings = self._serialiseSettings(Application.getInstance().getGlobalContainerStack())
-                stream.write(settings)
-            return True
-
-        self.setInformation(catalog.i18nc("@warning:status", "Please prepare G-code before exporting."))
-        return False
+            return None
+        return self._iterateGCodeList(gcode_list, progress_callback)
+
+    def _iterateGCodeList(self, gcode_list, progress_callback: Optional[Callable[[float], None]]) -> Iterator[str]:
+        gcode_count = len(gcode_list)
+        progress_step = max(math.floor(gcode_count / 100), 1)
+        has_settings = False
+        for index, gcode in enumerate(gcode_list):
+            if gcode[:len(self._setting_keyword)] == self._setting_keyword:
+                has_settings = True
+            yield gcode
+            if (index + 1) % progress_step == 0:
+                if progress_callback is not None:
+                    progress_callback(min((index + 1) / gcode_count, 1.0))
+                Job.yieldThread()  # Let the interface update while writing large files.
+        # Serialise the current container stack and put it at the end of the file.
+        if not has_settings:
+            yield self._serialiseSettings(Application.getInstance().getGlobalContainerStack())
+        if progress_callback is not None:
+            progress_callback(1.0)
 
     def _serialiseSettings(self, stack):
         """Serialises a container stack to prepare it for writing at the end of the g-code.
@@ -21,6 +21,8 @@ from UM.i18n import i18nCatalog
 from cura import ApplicationMetadata
 from cura.CuraApplication import CuraApplication
 
+from .ScriptExecutor import ScriptExecutor, ScriptTiming
+
 i18n_catalog = i18nCatalog("cura")
 
 if TYPE_CHECKING:
@@ -43,6 +45,7 @@ class PostProcessingPlugin(QObject, Extension):
         # Script list contains instances of scripts in loaded_scripts.
         # There can be duplicates, which will be executed in sequence.
         self._script_list = []  # type: List[Script]
+        self._script_timings = []  # type: List[ScriptTiming]  # How long each script took the last time they were executed.
         self._selected_script_index = -1
         self._global_container_stack = Application.getInstance().getGlobalContainerStack()
         if self._global_container_stack:
@@ -68,6 +71,11 @@ class PostProcessingPlugin(QObject, Extension):
         except IndexError:
             return ""
 
+    def getScriptTimings(self) -> List[ScriptTiming]:
+        """Get how long each post-processing script took, the last time the scripts were executed."""
+
+        return self._script_timings
+
     def execute(self, output_device) -> None:
         """Execute all post-processing scripts on the gcode."""
 
@@ -86,11 +94,17 @@ class PostProcessingPlugin(QObject, Extension):
             return
 
         if ";POSTPROCESSED" not in gcode_list[0]:
+            script_executor = ScriptExecutor()
+            self._script_timings = []
             for script in self._script_list:
                 try:
-                    gcode_list = script.execute(gcode_list)
+                    gcode_list, timing = script_executor.execute(script, gcode_list)
                 except Exception:
                     Logger.logException("e", "Exception in post-processing script.")
+                    continue
+                self._script_timings.append(timing)
+                Logger.log("d", "Post-processing script %s took %.3f seconds (%.3f seconds of processing, %s).",
+                           timing.script_name, timing.duration, timing.processing_time, "per layer" if timing.layer_local else "all layers at once")
             if len(self._script_list):  # Add comment to g-code if any changes were made.
                 gcode_list[0] += ";POSTPROCESSED\n"
             # Add all the active post processor names to data[0]
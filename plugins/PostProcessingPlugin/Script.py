@@ -1,7 +1,7 @@
 # Copyright (c) 2015 Jaime van Kessel
 # Copyright (c) 2018 Ultimaker B.V.
 # The PostProcessingPlugin is released under the terms of the LGPLv3 or higher.
-from typing import Optional, Any, Dict, TYPE_CHECKING, List
+from typing import Callable, Optional, Any, Dict, TYPE_CHECKING, List
 
 from UM.Signal import Signal, signalemitter
 from UM.i18n import i18nCatalog
@@ -188,3 +188,16 @@ class Script:
         It gets a list of g-code strings and needs to return a (modified) list.
         """
         raise NotImplementedError()
+
+    def getLayerProcessor(self, data: List[str]) -> Optional[Callable[[int, str], str]]:
+        """Get a function that applies this script to one item of the g-code list, if the script allows that.
+
+        Scripts that change each layer without looking at the other layers can implement this, so that the layers can
+        be processed in parallel. The function gets the index of an item in the g-code list and the g-code of that
+        item, and returns the new g-code for it. It may be called in another process, so it may not use the
+        application or the settings: anything it needs has to be read here.
+
+        :param data: The g-code list that :py:meth:`execute` would get, to find out anything that depends on all of it.
+        :return: The function, or None to call :py:meth:`execute` with all of the g-code instead.
+        """
+        return None
@@ -0,0 +1,115 @@
+# Copyright (c) 2026 UltiMaker
+# The PostProcessingPlugin is released under the terms of the LGPLv3 or higher.
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+from cura.Utils.WorkerProcesses import canForkWorkerProcesses, getForkContext
+
+if TYPE_CHECKING:
+    from .Script import Script
+
+LayerProcessor = Callable[[int, str], str]
+
+
+class ScriptTiming(NamedTuple):
+    """How long it took to execute one post-processing script."""
+
+    script_name: str
+    layer_local: bool  # Whether the script was executed per layer.
+    duration: float  # Wall time, in seconds.
+    processing_time: float  # Time spent in the script itself, summed over all worker processes, in seconds.
+
+
+# The layer processor of the script that a worker process executes.
+_worker_layer_processor = None  # type: Optional[LayerProcessor]
+
+
+def _initializeWorker(layer_processor: LayerProcessor) -> None:
+    global _worker_layer_processor
+    _worker_layer_processor = layer_processor
+
+
+def _processChunk(start_index: int, layers: List[str]) -> Tuple[List[str], float]:
+    assert _worker_layer_processor is not None
+    start_time = time.perf_counter()
+    result = [_worker_layer_processor(start_index + offset, layer) for offset, layer in enumerate(layers)]
+    return result, time.perf_counter() - start_time
+
+
+class ScriptExecutor:
+    """Executes post-processing scripts on g-code.
+
+    Scripts that provide a layer processor (see :py:meth:`Script.getLayerProcessor`) are executed on chunks of the
+    g-code list. For large enough g-code, where processes can be forked, these chunks are divided over worker processes
+    (see :py:mod:`cura.Utils.WorkerProcesses`). The g-code list is only changed once all chunks were processed, so it's
+    left as it was if the script fails. All other scripts get all of the g-code at once, in this process.
+
+    :param max_workers: The maximum number of worker processes. Zero executes all scripts in this process. By default,
+    one fewer than the number of CPUs.
+    """
+
+    ChunksPerWorker = 4  # Smaller chunks balance the work better, but each chunk needs to be sent to a worker and back.
+    MinimumChunkSize = 8
+    MinimumWorkerDataSize = 1000000  # Number of characters of g-code below which forking takes longer than it saves.
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        if max_workers is None:
+            max_workers = (os.cpu_count() or 1) - 1
+        if not canForkWorkerProcesses():
+            max_workers = 0
+        self._max_workers = max_workers
+
+    def execute(self, script: "Script", data: List[str]) -> Tuple[List[str], ScriptTiming]:
+        """Execute a script on g-code.
+
+        :param script: The script to execute.
+        :param data: The g-code list. Layer-local scripts change it in place, but only if they succeed for all of it.
+        :return: The g-code list after the script was executed, and how long that took.
+        """
+
+        start_time = time.perf_counter()
+        layer_processor = script.getLayerProcessor(data)
+        if layer_processor is None:
+            data = script.execute(data)
+            duration = time.perf_counter() - start_time
+            return data, ScriptTiming(type(script).__name__, False, duration, duration)
+
+        processing_time = 0.0
+        changed_layers = []  # type: List[Tuple[int, str]]
+        for start_index, layers, processed_layers, chunk_processing_time in self._processChunks(layer_processor, data):
+            processing_time += chunk_processing_time
+            for offset, (layer, processed_layer) in enumerate(zip(layers, processed_layers)):
+                if processed_layer != layer:  # Leave unchanged layers alone, since replacing them may be costly.
+                    changed_layers.append((start_index + offset, processed_layer))
+        for index, processed_layer in changed_layers:
+            data[index] = processed_layer
+        return data, ScriptTiming(type(script).__name__, True, time.perf_counter() - start_time, processing_time)
+
+    def _processChunks(self, layer_processor: LayerProcessor, data: List[str]) -> Iterator[Tuple[int, List[str], List[str], float]]:
+        """Apply a layer processor to all chunks of the g-code list, producing the chunks in order.
+
+        :return: For each chunk the index of the first layer in it, the original layers and the processed layers, and
+        the time it took to process them.
+        """
+
+        chunk_size = max(math.ceil(len(data) / max(self._max_workers * self.ChunksPerWorker, 1)), self.MinimumChunkSize)
+        chunks = [(start_index, data[start_index:start_index + chunk_size]) for start_index in range(0, len(data), chunk_size)]
+
+        if self._max_workers < 1 or len(chunks) < 2 or sum(len(layer) for layer in data) < self.MinimumWorkerDataSize:
+            for start_index, layers in chunks:
+                start_time = time.perf_counter()
+                processed_layers = [layer_processor(start_index + offset, layer) for offset, layer in enumerate(layers)]
+                yield start_index, layers, processed_layers, time.perf_counter() - start_time
+            return
+
+        with ProcessPoolExecutor(max_workers = min(self._max_workers, len(chunks)),
+                                 mp_context = getForkContext(),
+                                 initializer = _initializeWorker,
+                                 initargs = (layer_processor, )) as pool:
+            results = pool.map(_processChunk, [start_index for start_index, _ in chunks], [layers for _, layers in chunks])
+            for (start_index, layers), (processed_layers, processing_time) in zip(chunks, results):
+                yield start_index, layers, processed_layers, processing_time
@@ -95,7 +95,9 @@ class SearchAndReplace(Script):
             }
         }"""
 
-    def execute(self, data):
+    def _getSearchSettings(self, data):
+        """Get the compiled search pattern, the replacement and the range of items of data to search in."""
+
         global_stack = Application.getInstance().getGlobalContainerStack()
         extruder = global_stack.extruderList
         retract_enabled = bool(extruder[0].getProperty("retraction_enable", "value"))
@@ -110,7 +112,6 @@ class SearchAndReplace(Script):
         if enable_layer_search:
             ignore_start = True
             ignore_end = True
-        first_instance_only = bool(self.getSettingValueByKey("first_instance_only"))
 
         # Account for missing layer numbers when a raft is used
         start_index = 1
@@ -144,11 +145,29 @@ class SearchAndReplace(Script):
                 if num == end_layer:
                     end_index = data_list[index]
 
-        # Make replacements
-        replace_one = False
         if not is_regex:
             search_string = re.escape(search_string)
         search_regex = re.compile(search_string)
+        return search_regex, replace_string, start_index, end_index
+
+    def getLayerProcessor(self, data):
+        # Replacing the first instance only depends on the layers before, so that needs all data at once.
+        if bool(self.getSettingValueByKey("first_instance_only")):
+            return None
+        search_regex, replace_string, start_index, end_index = self._getSearchSettings(data)
+
+        def replaceInLayer(index, layer):
+            if start_index <= index <= end_index:
+                return re.sub(search_regex, replace_string, layer)
+            return layer
+        return replaceInLayer
+
+    def execute(self, data):
+        search_regex, replace_string, start_index, end_index = self._getSearchSettings(data)
+        first_instance_only = bool(self.getSettingValueByKey("first_instance_only"))
+
+        # Make replacements
+        replace_one = False
         for num in range(start_index, end_index + 1, 1):
             layer = data[num]
             # First_instance only
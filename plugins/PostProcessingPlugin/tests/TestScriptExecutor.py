@@ -0,0 +1,73 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import pytest
+
+from ..ScriptExecutor import ScriptExecutor
+
+
+class UpperCaseScript:
+    """A layer-local script, that changes every odd item."""
+
+    def getLayerProcessor(self, data):
+        return lambda index, layer: layer.upper() if index % 2 == 1 else layer
+
+    def execute(self, data):
+        return [layer.upper() if index % 2 == 1 else layer for index, layer in enumerate(data)]
+
+
+class CountingScript:
+    """A script that needs all layers at once."""
+
+    def getLayerProcessor(self, data):
+        return None
+
+    def execute(self, data):
+        return data + [";{count} layers\n".format(count = len(data))]
+
+
+class FailingScript:
+    """A layer-local script that fails on the last layer, after changing the others."""
+
+    def getLayerProcessor(self, data):
+        return lambda index, layer: layer.upper() if index < len(data) - 1 else 1 / 0
+
+    def execute(self, data):
+        raise ZeroDivisionError()
+
+
+@pytest.fixture(autouse = True)
+def useWorkersForSmallData(monkeypatch):
+    monkeypatch.setattr(ScriptExecutor, "MinimumWorkerDataSize", 0)
+
+
+def _gcode():
+    return [";layer {index}\nG1 X{index}\n".format(index = index) for index in range(200)]
+
+
+@pytest.mark.parametrize("max_workers", [0, 3])
+def test_layerLocalScript(max_workers):
+    gcode = _gcode()
+    result, timing = ScriptExecutor(max_workers).execute(UpperCaseScript(), gcode)
+
+    assert result == UpperCaseScript().execute(_gcode())
+    assert result is gcode  # Changed in place.
+    assert timing.script_name == "UpperCaseScript"
+    assert timing.layer_local
+
+
+@pytest.mark.parametrize("max_workers", [0, 3])
+def test_wholeFileScript(max_workers):
+    result, timing = ScriptExecutor(max_workers).execute(CountingScript(), _gcode())
+
+    assert result == _gcode() + [";200 layers\n"]
+    assert not timing.layer_local
+    assert timing.duration == timing.processing_time
+
+
+@pytest.mark.parametrize("max_workers", [0, 3])
+def test_failingScript(max_workers):
+    gcode = _gcode()
+    with pytest.raises(ZeroDivisionError):
+        ScriptExecutor(max_workers).execute(FailingScript(), gcode)
+    assert gcode == _gcode()  # Left as it was, although the other layers were processed.
@@ -0,0 +1,249 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from typing import Dict, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+import numpy
+
+from UM.Mesh.MeshData import MeshData
+
+from cura.LayerPolygon import LayerPolygon
+
+if TYPE_CHECKING:
+    from cura.Layer import Layer
+    from cura.LayerData import LayerData
+
+
+class LayerRange(NamedTuple):
+    """Where the lines of one layer are in the mesh of the layer data."""
+
+    number: int
+    layer: "Layer"
+    vertex_begin: int
+    vertex_end: int
+    index_begin: int  # In lines, so in pairs of indices.
+    index_end: int
+
+
+class LayerDataChunk:
+    """A range of consecutive layers, with a mesh of its own.
+
+    Drawing a chunk only needs the vertex buffers of the chunk, so the layers that are not shown don't take memory on
+    the GPU and don't need to be processed by the shaders. Chunks that are far away can be drawn with a level of detail
+    mesh, which only has every so many layers of the chunk.
+    """
+
+    def __init__(self, layer_data: "LayerData", layer_ranges: List[LayerRange], previous_line_types: numpy.ndarray,
+                 mesh: Optional[MeshData] = None) -> None:
+        """
+        :param layer_data: The layer data that the layers are in.
+        :param layer_ranges: The layers of the chunk, in order.
+        :param previous_line_types: The type of the line before every vertex of the layer data.
+        :param mesh: The mesh to draw the chunk with, if it already exists. It must have the layers at the same indices
+        as the layer data.
+        """
+
+        self._layer_data = layer_data
+        self._layer_ranges = layer_ranges
+        self._previous_line_types = previous_line_types
+        self._element_offsets: Dict[int, int] = {}  # Where each layer starts in the indices of the mesh.
+        offset = 0 if mesh is None else layer_ranges[0].index_begin * 2
+        for layer_range in layer_ranges:
+            self._element_offsets[layer_range.number] = offset
+            offset += (layer_range.index_end - layer_range.index_begin) * 2
+        self._element_end = offset
+
+        self._can_decimate = mesh is None  # Only when the layers of the mesh are known to be one after the other.
+        self._mesh = mesh if mesh is not None else self._createMesh(layer_ranges)
+        vertices = layer_data.getVertices()[layer_ranges[0].vertex_begin:layer_ranges[-1].vertex_end]
+        if len(vertices) > 0:
+            self._bounds = (vertices.min(axis = 0), vertices.max(axis = 0))  # type: Optional[Tuple[numpy.ndarray, numpy.ndarray]]
+        else:
+            self._bounds = None
+        self._lod_meshes: Dict[int, MeshData] = {}
+
+    def getFirstLayer(self) -> int:
+        return self._layer_ranges[0].number
+
+    def getLastLayer(self) -> int:
+        return self._layer_ranges[-1].number
+
+    def getLayerRanges(self) -> List[LayerRange]:
+        return self._layer_ranges
+
+    def getMesh(self) -> MeshData:
+        return self._mesh
+
+    def getBounds(self) -> Optional[Tuple[numpy.ndarray, numpy.ndarray]]:
+        """The minimum and maximum coordinates of the vertices of the chunk, or None if it has no vertices."""
+
+        return self._bounds
+
+    def getLayerHeight(self) -> float:
+        """The average distance between the layers of the chunk."""
+
+        if self._bounds is None:
+            return 0.0
+        return float(self._bounds[1][1] - self._bounds[0][1]) / len(self._layer_ranges)
+
+    def getElementOffset(self, layer: int) -> int:
+        """Where the lines of a layer start in the indices of the mesh.
+
+        For layers below the chunk that's the start of the chunk, for layers above it the end.
+        """
+
+        if layer in self._element_offsets:
+            return self._element_offsets[layer]
+        if layer < self.getFirstLayer():
+            return self._element_offsets[self.getFirstLayer()]
+        return self._element_end
+
+    def getLodMesh(self, factor: int) -> MeshData:
+        """Get a mesh with only every so many layers of the chunk, to draw it with less detail."""
+
+        if factor <= 1 or not self._can_decimate:
+            return self._mesh
+        if factor not in self._lod_meshes:
+            self._lod_meshes[factor] = self._createMesh(self._layer_ranges[::factor])
+        return self._lod_meshes[factor]
+
+    def _createMesh(self, layer_ranges: List[LayerRange]) -> MeshData:
+        """Create a mesh with the lines of some layers of the layer data."""
+
+        layer_data = self._layer_data
+        # Consecutive layers are next to each other in the layer data, so each run of them is taken with one slice. Only
+        # the level of detail meshes skip layers, so they need to concatenate the runs.
+        runs = []  # type: List[List[int]]  # The begin and end of the vertices and of the lines of each run of layers.
+        for layer_range in layer_ranges:
+            if runs and runs[-1][1] == layer_range.vertex_begin and runs[-1][3] == layer_range.index_begin:
+                runs[-1][1] = layer_range.vertex_end
+                runs[-1][3] = layer_range.index_end
+            else:
+                runs.append([layer_range.vertex_begin, layer_range.vertex_end, layer_range.index_begin, layer_range.index_end])
+        all_indices = layer_data.getIndices().reshape((-1, 2))
+        indices = []
+        vertex_offset = 0
+        for vertex_begin, vertex_end, index_begin, index_end in runs:
+            indices.append(all_indices[index_begin:index_end] - (vertex_begin - vertex_offset))
+            vertex_offset += vertex_end - vertex_begin
+
+        def gather(values: Optional[numpy.ndarray]) -> Optional[numpy.ndarray]:
+            if values is None:
+                return None
+            if len(runs) == 1:
+                return values[runs[0][0]:runs[0][1]]  # A view, which needs no copy since the layer data is immutable.
+            return numpy.concatenate([values[vertex_begin:vertex_end] for vertex_begin, vertex_end, _, _ in runs])
+
+        attributes = {}
+        for name in layer_data.getAttributeNames():
+            attribute = dict(layer_data.getAttribute(name))
+            attribute["value"] = gather(attribute["value"])
+            attributes[name] = attribute
+
+        attributes["prev_line_types"] = {"value": gather(self._previous_line_types), "opengl_name": "a_prev_line_type", "opengl_type": "float"}
+
+        return MeshData(vertices = gather(layer_data.getVertices()), normals = gather(layer_data.getNormals()),
+                        indices = numpy.concatenate(indices).reshape(-1) if indices else numpy.zeros(0, dtype = numpy.int32),
+                        colors = gather(layer_data.getColors()), attributes = attributes)
+
+
+class LayerDataChunks:
+    """Splits layer data in chunks of consecutive layers.
+
+    :param vertices_per_chunk: Layers are added to a chunk until it has at least this many vertices.
+    """
+
+    def __init__(self, vertices_per_chunk: int = 250000) -> None:
+        self._vertices_per_chunk = vertices_per_chunk
+        self._layer_data = None  # type: Optional[LayerData]
+        self._chunks = []  # type: List[LayerDataChunk]
+
+    def getChunks(self, layer_data: "LayerData") -> List[LayerDataChunk]:
+        """Get the chunks of layer data.
+
+        When the layer data was built incrementally from the layer data of the previous call, the chunks of the layers
+        that didn't change are reused.
+        """
+
+        if layer_data is self._layer_data:
+            return self._chunks
+
+        previous_line_types = self._getPreviousLineTypes(layer_data)
+        layer_ranges = self._getLayerRanges(layer_data)
+        if layer_ranges is None:
+            # The mesh is not built layer by layer, so draw it as a whole.
+            all_layer_ranges = [LayerRange(number, layer_data.getLayer(number), 0, 0, 0, 0) for number in sorted(layer_data.getLayers())]
+            chunks = [self._createWholeChunk(layer_data, all_layer_ranges, previous_line_types)] if all_layer_ranges else []
+        else:
+            chunks = []
+            old_chunks = {(chunk.getFirstLayer(), chunk.getLastLayer()): chunk for chunk in self._chunks}
+            begin = 0
+            while begin < len(layer_ranges):
+                end = begin
+                vertex_count = 0
+                while end < len(layer_ranges) and vertex_count < self._vertices_per_chunk:
+                    vertex_count += layer_ranges[end].vertex_end - layer_ranges[end].vertex_begin
+                    end += 1
+                chunk_ranges = layer_ranges[begin:end]
+                old_chunk = old_chunks.get((chunk_ranges[0].number, chunk_ranges[-1].number))
+                if old_chunk is not None and old_chunk.getLayerRanges() == chunk_ranges:
+                    chunks.append(old_chunk)  # Same layers at the same place, so the mesh is still the same.
+                else:
+                    chunks.append(LayerDataChunk(layer_data, chunk_ranges, previous_line_types))
+                begin = end
+
+        self._layer_data = layer_data
+        self._chunks = chunks
+        return chunks
+
+    @staticmethod
+    def _getPreviousLineTypes(layer_data: "LayerData") -> numpy.ndarray:
+        """Get the type of the line before every vertex, to find where lines start.
+
+        The first line of the print comes after a travel move.
+        """
+
+        line_types = layer_data.getAttribute("line_types")["value"]
+        return numpy.concatenate((numpy.array([LayerPolygon.MoveUnretractedType], dtype = line_types.dtype), line_types[:-1]))
+
+    @staticmethod
+    def _createWholeChunk(layer_data: "LayerData", layer_ranges: List[LayerRange], previous_line_types: numpy.ndarray) -> LayerDataChunk:
+        element_counts = layer_data.getElementCounts()
+        index = 0
+        vertex_count = len(layer_data.getVertices()) if layer_data.getVertices() is not None else 0
+        ranges = []
+        for layer_range in layer_ranges:
+            line_count = element_counts.get(layer_range.number, 0) // 2
+            ranges.append(layer_range._replace(vertex_end = vertex_count, index_begin = index, index_end = index + line_count))
+            index += line_count
+
+        # A mesh with the same arrays as the layer data, since the layer data itself can't get another attribute.
+        attributes = {name: layer_data.getAttribute(name) for name in layer_data.getAttributeNames()}
+        attributes["prev_line_types"] = {"value": previous_line_types, "opengl_name": "a_prev_line_type", "opengl_type": "float"}
+        mesh = MeshData(vertices = layer_data.getVertices(), normals = layer_data.getNormals(), indices = layer_data.getIndices(),
+                        colors = layer_data.getColors(), attributes = attributes)
+        return LayerDataChunk(layer_data, ranges, previous_line_types, mesh = mesh)
+
+    @staticmethod
+    def _getLayerRanges(layer_data: "LayerData") -> Optional[List[LayerRange]]:
+        """Find where the layers are in the mesh, or None if they are not stored one after the other."""
+
+        ranges = []
+        vertex = 0
+        index = 0
+        element_counts = layer_data.getElementCounts()
+        for number in sorted(layer_data.getLayers()):
+            layer = layer_data.getLayer(number)
+            vertex_count = layer.lineMeshVertexCount()
+            line_count = layer.lineMeshElementCount()
+            if element_counts.get(number) != line_count * 2:
+                return None
+            ranges.append(LayerRange(number, layer, vertex, vertex + vertex_count, index, index + line_count))
+            vertex += vertex_count
+            index += line_count
+
+        vertices = layer_data.getVertices()
+        indices = layer_data.getIndices()
+        if vertices is None or indices is None or len(vertices) != vertex or len(indices) != index * 2:
+            return None
+        return ranges
@@ -16,16 +16,24 @@ from UM.View.RenderBatch import RenderBatch
 from UM.View.GL.OpenGL import OpenGL
 
 from cura.Settings.ExtruderManager import ExtruderManager
-from cura.LayerPolygon import LayerPolygon
 
 import os.path
 import numpy
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 
 ## RenderPass used to display g-code paths.
+from .LayerDataChunks import LayerDataChunk, LayerDataChunks
 from .NozzleNode import NozzleNode
 
+if TYPE_CHECKING:
+    from UM.Scene.Camera import Camera
+    from cura.LayerData import LayerData
+
 
 class SimulationPass(RenderPass):
+    LodLayerPixels = 1.0  # Layers of chunks that are far away are skipped as long as the gaps are at most this many pixels.
+    MaxLodFactor = 8  # Draw at least every this many layers.
+
     def __init__(self, width, height):
         super().__init__("simulationview", width, height)
 
@@ -44,6 +52,7 @@ class SimulationPass(RenderPass):
 
         self._layer_view = None
         self._compatibility_mode = None
+        self._layer_data_chunks: Dict[int, LayerDataChunks] = {}  # By ID of the node with the layer data.
 
         self._scene.sceneChanged.connect(self._onSceneChanged)
 
@@ -123,6 +132,7 @@ class SimulationPass(RenderPass):
         head_position = None  # Indicates the current position of the print head
         nozzle_node = None
         not_a_vector = Vector(math.nan, math.nan, math.nan)
+        rendered_layer_data: Set[int] = set()
 
         for node in DepthFirstIterator(self._scene.getRoot()):
 
@@ -143,51 +153,43 @@ class SimulationPass(RenderPass):
 
                 # Render all layers below a certain number as line mesh instead of vertices.
                 if self._layer_view.getCurrentLayer() > -1 and ((not self._layer_view._only_show_top_layers) or (not self._layer_view.getCompatibilityMode())):
-                    start = 0
-                    end = 0
+                    rendered_layer_data.add(id(node))
+                    current_layer_num = self._layer_view._current_layer_num
+                    minimum_layer_num = self._layer_view.getMinimumLayer()
                     vertex_before_head = not_a_vector
                     vertex_after_head = not_a_vector
                     vertex_distance_ratio = 0.0
                     towards_next_vertex = 0
-                    element_counts = layer_data.getElementCounts()
-                    for layer in sorted(element_counts.keys()):
-                        # In the current layer, we show just the indicated paths
-                        if layer == self._layer_view._current_layer_num:
-                            # We look for the position of the head, searching the point of the current path
-                            index = int(self._layer_view.getCurrentPath()) if not math.isnan(
-                                self._layer_view.getCurrentPath()) else 0
-                            for polygon in layer_data.getLayer(layer).polygons:
-                                # The size indicates all values in the two-dimension array, and the second dimension is
-                                # always size 3 because we have 3D points.
-                                if index >= polygon.data.size // 3 :
-                                    index -= polygon.data.size // 3
-                                    continue
-                                # The head position is calculated and translated
-                                ratio = self._layer_view.getCurrentPath() - math.floor(self._layer_view.getCurrentPath())
-                                pos_a = Vector(polygon.data[index][0], polygon.data[index][1],
-                                               polygon.data[index][2])
-                                vertex_before_head = pos_a
-                                vertex_distance_ratio = ratio
-                                if ratio <= 0.0001 or index + 1 == len(polygon.data):
-                                    # in case there multiple polygons and polygon changes, the first point has the same value as the last point in the previous polygon
-                                    head_position = pos_a + node.getWorldPosition()
-                                else:
-                                    pos_b = Vector(polygon.data[index + 1][0],
-                                                   polygon.data[index + 1][1],
-                                                   polygon.data[index + 1][2])
-                                    vec = pos_a * (1.0 - ratio) + pos_b * ratio
-                                    head_position = vec + node.getWorldPosition()
-                                    vertex_after_head = pos_b
-                                    towards_next_vertex = 2  # Add two to the index to print the current and next vertices as an 'unfinished' line (to the nozzle).
-                                break
+                    current_layer = layer_data.getLayer(current_layer_num)
+                    # In the current layer, we show just the indicated paths
+                    if current_layer is not None:
+                        # We look for the position of the head, searching the point of the current path
+                        index = int(self._layer_view.getCurrentPath()) if not math.isnan(
+                            self._layer_view.getCurrentPath()) else 0
+                        for polygon in current_layer.polygons:
+                            # The size indicates all values in the two-dimension array, and the second dimension is
+                            # always size 3 because we have 3D points.
+                            if index >= polygon.data.size // 3 :
+                                index -= polygon.data.size // 3
+                                continue
+                            # The head position is calculated and translated
+                            ratio = self._layer_view.getCurrentPath() - math.floor(self._layer_view.getCurrentPath())
+                            pos_a = Vector(polygon.data[index][0], polygon.data[index][1],
+                                           polygon.data[index][2])
+                            vertex_before_head = pos_a
+                            vertex_distance_ratio = ratio
+                            if ratio <= 0.0001 or index + 1 == len(polygon.data):
+                                # in case there multiple polygons and polygon changes, the first point has the same value as the last point in the previous polygon
+                                head_position = pos_a + node.getWorldPosition()
+                            else:
+                                pos_b = Vector(polygon.data[index + 1][0],
+                                               polygon.data[index + 1][1],
+                                               polygon.data[index + 1][2])
+                                vec = pos_a * (1.0 - ratio) + pos_b * ratio
+                                head_position = vec + node.getWorldPosition()
+                                vertex_after_head = pos_b
+                                towards_next_vertex = 2  # Add two to the index to print the current and next vertices as an 'unfinished' line (to the nozzle).
                             break
-                        if self._layer_view.getMinimumLayer() > layer:
-                            start += element_counts[layer]
-                        end += element_counts[layer]
-
-                    # Calculate the range of paths in the last layer
-                    current_layer_start = end
-                    current_layer_end = end + int( self._layer_view.getCurrentPath()) * 2  # Because each point is used twice
 
                     # This uses glDrawRangeElements internally to only draw a certain range of lines.
                     # All the layers but the current selected layer are rendered first
@@ -203,32 +205,48 @@ class SimulationPass(RenderPass):
                     self._layer_shader.setUniformValue("u_next_vertex", not_a_vector)
                     self._layer_shader.setUniformValue("u_last_line_ratio", 1.0)
 
-                    # The first line does not have a previous line: add a MoveUnretractedType in front for start detection
-                    # this way the first start of the layer can also be drawn
-                    prev_line_types = numpy.concatenate([numpy.asarray([LayerPolygon.MoveUnretractedType], dtype = numpy.float32), layer_data._attributes["line_types"]["value"]])
-                    # Remove the last element
-                    prev_line_types = prev_line_types[0:layer_data._attributes["line_types"]["value"].size]
-                    layer_data._attributes["prev_line_types"] =  {'opengl_type': 'float', 'value': prev_line_types, 'opengl_name': 'a_prev_line_type'}
-
-                    layers_batch = RenderBatch(self._current_shader, type = RenderBatch.RenderType.Solid, mode = RenderBatch.RenderMode.Lines, range = (start, end), backface_cull = True)
-                    layers_batch.addItem(node.getWorldTransformation(), layer_data)
-                    layers_batch.render(self._scene.getActiveCamera())
-
-                    # Current selected layer is rendered
-                    current_layer_batch = RenderBatch(self._layer_shader, type = RenderBatch.RenderType.Solid, mode = RenderBatch.RenderMode.Lines, range = (current_layer_start, current_layer_end))
-                    current_layer_batch.addItem(node.getWorldTransformation(), layer_data)
-                    current_layer_batch.render(self._scene.getActiveCamera())
-
-                    # Last line may be partial
-                    if vertex_after_head != not_a_vector and vertex_after_head != not_a_vector:
-                        self._layer_shader.setUniformValue("u_last_vertex", vertex_before_head)
-                        self._layer_shader.setUniformValue("u_next_vertex", vertex_after_head)
-                        self._layer_shader.setUniformValue("u_last_line_ratio", vertex_distance_ratio)
-                        last_line_start = current_layer_end
-                        last_line_end = current_layer_end + towards_next_vertex
-                        last_line_batch = RenderBatch(self._layer_shader, type = RenderBatch.RenderType.Solid, mode=RenderBatch.RenderMode.Lines, range = (last_line_start, last_line_end))
-                        last_line_batch.addItem(node.getWorldTransformation(), layer_data)
-                        last_line_batch.render(self._scene.getActiveCamera())
+                    # Only the chunks of layers that are in view are drawn. Chunks that are entirely in view and far away
+                    # are drawn with less detail.
+                    camera = self._scene.getActiveCamera()
+                    current_layer_chunk = None
+                    for chunk in self._getLayerDataChunks(node, layer_data):
+                        if chunk.getFirstLayer() <= current_layer_num <= chunk.getLastLayer():
+                            current_layer_chunk = chunk
+                        start = chunk.getElementOffset(minimum_layer_num)
+                        end = chunk.getElementOffset(current_layer_num)
+                        if end <= start:
+                            continue
+                        mesh = chunk.getMesh()
+                        render_range: Optional[Tuple[int, int]] = (start, end)
+                        if current_layer_chunk is not chunk and minimum_layer_num <= chunk.getFirstLayer():
+                            lod_factor = self._getLodFactor(chunk, node, camera)
+                            if lod_factor > 1:
+                                mesh = chunk.getLodMesh(lod_factor)
+                                render_range = None
+                        layers_batch = RenderBatch(self._current_shader, type = RenderBatch.RenderType.Solid, mode = RenderBatch.RenderMode.Lines, range = render_range, backface_cull = True)
+                        layers_batch.addItem(node.getWorldTransformation(), mesh)
+                        layers_batch.render(camera)
+
+                    if current_layer_chunk is not None:
+                        # Calculate the range of paths in the last layer
+                        current_layer_start = current_layer_chunk.getElementOffset(current_layer_num)
+                        current_layer_end = current_layer_start + int( self._layer_view.getCurrentPath()) * 2  # Because each point is used twice
+
+                        # Current selected layer is rendered
+                        current_layer_batch = RenderBatch(self._layer_shader, type = RenderBatch.RenderType.Solid, mode = RenderBatch.RenderMode.Lines, range = (current_layer_start, current_layer_end))
+                        current_layer_batch.addItem(node.getWorldTransformation(), current_layer_chunk.getMesh())
+                        current_layer_batch.render(camera)
+
+                        # Last line may be partial
+                        if vertex_after_head != not_a_vector and vertex_after_head != not_a_vector:
+                            self._layer_shader.setUniformValue("u_last_vertex", vertex_before_head)
+                            self._layer_shader.setUniformValue("u_next_vertex", vertex_after_head)
+                            self._layer_shader.setUniformValue("u_last_line_ratio", vertex_distance_ratio)
+                            last_line_start = current_layer_end
+                            last_line_end = current_layer_end + towards_next_vertex
+                            last_line_batch = RenderBatch(self._layer_shader, type = RenderBatch.RenderType.Solid, mode=RenderBatch.RenderMode.Lines, range = (last_line_start, last_line_end))
+                            last_line_batch.addItem(node.getWorldTransformation(), current_layer_chunk.getMesh())
+                            last_line_batch.render(camera)
 
                     self._old_current_layer = self._layer_view.getCurrentLayer()
                     self._old_current_path = self._layer_view.getCurrentPath()
@@ -263,6 +281,41 @@ class SimulationPass(RenderPass):
 
         self.release()
 
+        # Forget the chunks of layer data that is no longer shown.
+        for node_id in set(self._layer_data_chunks) - rendered_layer_data:
+            del self._layer_data_chunks[node_id]
+
+    def _getLayerDataChunks(self, node: SceneNode, layer_data: "LayerData") -> List[LayerDataChunk]:
+        if id(node) not in self._layer_data_chunks:
+            self._layer_data_chunks[id(node)] = LayerDataChunks()
+        return self._layer_data_chunks[id(node)].getChunks(layer_data)
+
+    def _getLodFactor(self, chunk: LayerDataChunk, node: SceneNode, camera: "Camera") -> int:
+        """Find how many layers of a chunk can be skipped without the gaps between the drawn layers becoming visible.
+
+        :return: Draw every so many layers of the chunk.
+        """
+
+        bounds = chunk.getBounds()
+        layer_height = chunk.getLayerHeight()
+        if bounds is None or layer_height <= 0 or camera is None:
+            return 1
+        # The size of a millimetre on the screen, in pixels, at the part of the chunk that is nearest to the camera.
+        pixels_per_millimetre = camera.getProjectionMatrix().getData()[1, 1] * camera.getViewportHeight() / 2
+        if camera.isPerspective():
+            node_position = node.getWorldPosition()
+            offset = numpy.array([node_position.x, node_position.y, node_position.z])
+            camera_position = camera.getWorldPosition()
+            eye = numpy.array([camera_position.x, camera_position.y, camera_position.z])
+            distance = float(numpy.linalg.norm(eye - numpy.clip(eye, bounds[0] + offset, bounds[1] + offset)))
+            pixels_per_millimetre /= max(distance, 1.0)
+
+        layer_pixels = layer_height * pixels_per_millimetre
+        factor = 1
+        while factor < self.MaxLodFactor and layer_pixels * factor * 2 <= self.LodLayerPixels:
+            factor *= 2
+        return factor
+
     def _onSceneChanged(self, changed_object: SceneNode):
         if changed_object.callDecoration("getLayerData"):  # Any layer data has changed.
             self._switching_layers = True
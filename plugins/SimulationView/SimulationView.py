@@ -44,6 +44,8 @@ from typing import Optional, TYPE_CHECKING, List, cast
 
 if TYPE_CHECKING:
     from UM.Scene.SceneNode import SceneNode
+    from cura.Layer import Layer
+    from cura.LayerData import LayerData
     from UM.Scene.Scene import Scene
     from UM.Settings.ContainerStack import ContainerStack
 
@@ -98,8 +100,8 @@ class SimulationView(CuraView):
         self._min_line_width = sys.float_info.max
         self._min_flow_rate = sys.float_info.max
         self._max_flow_rate = sys.float_info.min
-        self._cumulative_line_duration_layer: Optional[int] = None
-        self._cumulative_line_duration: List[float] = []
+        self._cumulative_line_duration_layer: Optional["Layer"] = None
+        self._cumulative_line_duration = numpy.zeros(0)
 
         self._global_container_stack: Optional[ContainerStack] = None
         self._proxy = None
@@ -194,28 +196,18 @@ class SimulationView(CuraView):
         return self._current_path_num
 
     def setTime(self, time: float) -> None:
+        """Go to the path that is printed at a time since the start of the current layer.
+
+        :param time: The time in the simulation, in seconds.
+        """
         cumulative_line_duration = self.cumulativeLineDuration()
         if len(cumulative_line_duration) > 0:
             self._current_time = time
-            left_i = 0
-            right_i = len(cumulative_line_duration) - 1
-            total_duration = cumulative_line_duration[-1]
-            # make an educated guess about where to start
-            i = int(right_i * max(0.0, min(1.0, self._current_time / total_duration)))
-            # binary search for the correct path
-            while left_i < right_i:
-                if cumulative_line_duration[i] <= self._current_time:
-                    left_i = i + 1
-                else:
-                    right_i = i
-                i = int((left_i + right_i) / 2)
-
-            left_value = cumulative_line_duration[i - 1] if i > 0 else 0.0
-            right_value = cumulative_line_duration[i]
-
-            if not (left_value <= self._current_time <= right_value):
-                Logger.warn(
-                    f"Binary search error (out of bounds): index {i}: left value {left_value} right value {right_value} and current time is {self._current_time}")
+            # The first path that ends after the time.
+            i = min(int(numpy.searchsorted(cumulative_line_duration, self._current_time, side = "right")), len(cumulative_line_duration) - 1)
+
+            left_value = float(cumulative_line_duration[i - 1]) if i > 0 else 0.0
+            right_value = float(cumulative_line_duration[i])
 
             segment_duration = right_value - left_value
             fractional_value = 0.0 if segment_duration == 0.0 else (self._current_time - left_value) / segment_duration
@@ -230,7 +222,7 @@ class SimulationView(CuraView):
         """
         total_duration = 0.0
         if len(self.cumulativeLineDuration()) > 0:
-            total_duration = self.cumulativeLineDuration()[-1]
+            total_duration = float(self.cumulativeLineDuration()[-1])
 
         if self._current_time + time_increase > total_duration:
             # If we have reached the end of the simulation, go to the next layer.
@@ -244,42 +236,63 @@ class SimulationView(CuraView):
         else:
             self.setTime(self._current_time + time_increase)
 
-    def cumulativeLineDuration(self) -> List[float]:
+    def setPrintTime(self, time: float) -> None:
+        """Go to the layer and path that are printed at a time since the start of the print.
+
+        :param time: The time in the simulation, in seconds.
+        """
+        layer_data = self._getPrintLayerData()
+        if layer_data is None:
+            return
+        layer_numbers, layer_end_times = layer_data.getPrintTimeline()
+        if len(layer_numbers) == 0:
+            return
+        # The layer data has the actual print times, which the simulation runs faster than.
+        print_time = time * SimulationView.SIMULATION_FACTOR
+        i = min(int(numpy.searchsorted(layer_end_times, print_time, side = "right")), len(layer_numbers) - 1)
+        layer_start_time = float(layer_end_times[i - 1]) if i > 0 else 0.0
+        self.setLayer(int(layer_numbers[i]))
+        self.setTime((print_time - layer_start_time) / SimulationView.SIMULATION_FACTOR)
+
+    def getPrintTime(self) -> float:
+        """The time since the start of the print of the current path, in the time of the simulation, in seconds."""
+
+        layer_data = self._getPrintLayerData()
+        if layer_data is None:
+            return self._current_time
+        layer_numbers, layer_end_times = layer_data.getPrintTimeline()
+        i = int(numpy.searchsorted(layer_numbers, self.getCurrentLayer()))
+        layer_start_time = float(layer_end_times[i - 1]) if 0 < i <= len(layer_end_times) else 0.0
+        return layer_start_time / SimulationView.SIMULATION_FACTOR + self._current_time
+
+    def cumulativeLineDuration(self) -> numpy.ndarray:
+        """The time in the simulation from the start of the current layer to the end of every path, in seconds."""
+
+        layer = self.getLayerData()
         # Make sure _cumulative_line_duration is initialized properly
-        if self.getCurrentLayer() != self._cumulative_line_duration_layer:
-            #clear cache
-            self._cumulative_line_duration = []
-            total_duration = 0.0
-            polylines = self.getLayerData()
-            if polylines is not None:
-                for polyline in polylines.polygons:
-                    for line_index in range(len(polyline.lineLengths)):
-                        line_length = polyline.lineLengths[line_index]
-                        line_feedrate = polyline.lineFeedrates[line_index][0]
-
-                        if line_feedrate > 0.0:
-                            line_duration = line_length / line_feedrate
-                        else:
-                            # Something is wrong with this line, set an arbitrary non-null duration
-                            line_duration = 0.1
-
-                        total_duration += line_duration / SimulationView.SIMULATION_FACTOR
-                        self._cumulative_line_duration.append(total_duration)
-
-                    # for tool change we add an extra tool path
-                    self._cumulative_line_duration.append(total_duration)
+        if layer is not self._cumulative_line_duration_layer:
+            if layer is not None:
+                self._cumulative_line_duration = layer.cumulativeLineDuration() / SimulationView.SIMULATION_FACTOR
+            else:
+                self._cumulative_line_duration = numpy.zeros(0)
             # set current cached layer
-            self._cumulative_line_duration_layer = self.getCurrentLayer()
+            self._cumulative_line_duration_layer = layer
 
         return self._cumulative_line_duration
 
-    def getLayerData(self) -> Optional["LayerData"]:
+    def getLayerData(self) -> Optional["Layer"]:
+        layer_data = self._getPrintLayerData()
+        if layer_data is None:
+            return None
+        return layer_data.getLayer(self.getCurrentLayer())
+
+    def _getPrintLayerData(self) -> Optional["LayerData"]:
         scene = self.getController().getScene()
         for node in DepthFirstIterator(scene.getRoot()):  # type: ignore
             layer_data = node.callDecoration("getLayerData")
             if not layer_data:
                 continue
-            return layer_data.getLayer(self.getCurrentLayer())
+            return layer_data
         return None
 
     def getMinimumPath(self) -> int:
@@ -384,7 +397,7 @@ class SimulationView(CuraView):
                 actual_path_num = int(self._current_path_num)
                 cumulative_line_duration = self.cumulativeLineDuration()
                 if actual_path_num < len(cumulative_line_duration):
-                    self._current_time = cumulative_line_duration[actual_path_num]
+                    self._current_time = float(cumulative_line_duration[actual_path_num])
 
             self._startUpdateTopLayers()
             self.currentPathNumChanged.emit()
@@ -590,7 +603,7 @@ class SimulationView(CuraView):
         self._max_thickness = sys.float_info.min
         self._min_flow_rate = sys.float_info.max
         self._max_flow_rate = sys.float_info.min
-        self._cumulative_line_duration = []
+        self._cumulative_line_duration_layer = None
 
         # The colour scheme is only influenced by the visible lines, so filter the lines by if they should be visible.
         visible_line_types = []
@@ -58,6 +58,10 @@ class SimulationViewProxy(QObject):
     def advanceTime(self, duration: float) -> None:
         self._simulation_view.advanceTime(duration)
 
+    @pyqtSlot(float)
+    def setPrintTime(self, time: float) -> None:
+        self._simulation_view.setPrintTime(time)
+
     @pyqtProperty(int, notify=currentPathChanged)
     def minimumPath(self):
         return self._simulation_view.getMinimumPath()
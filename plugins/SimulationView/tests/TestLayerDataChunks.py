@@ -0,0 +1,122 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import sys
+from unittest.mock import patch
+
+import numpy
+import pytest
+
+from cura.LayerDataBuilder import LayerDataBuilder
+from cura.LayerPolygon import LayerPolygon
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from LayerDataChunks import LayerDataChunks
+
+color_map = numpy.linspace(0, 1, 15 * 4, dtype = numpy.float32).reshape((15, 4))
+material_color_map = numpy.array([[1, 0, 0, 1], [0, 1, 0, 1]], dtype = numpy.float32)
+
+
+@pytest.fixture(autouse = True)
+def mockColorMap():
+    with patch("cura.LayerPolygon.LayerPolygon.getColorMap", return_value = color_map):
+        yield
+
+
+def addLayers(builder, layer_numbers):
+    random = numpy.random.default_rng(0)
+    for layer_number in layer_numbers:
+        builder.addLayer(layer_number)
+        for _ in range(3):
+            line_count = int(random.integers(1, 20))
+            points = random.random((line_count + 1, 3), dtype = numpy.float32)
+            points[:, 1] = layer_number  # So every layer is at its own height.
+            polygon = LayerPolygon(0, random.integers(0, 15, (line_count, 1)).astype(numpy.uint8), points,
+                                   random.random((line_count, 1), dtype = numpy.float32),
+                                   random.random((line_count, 1), dtype = numpy.float32),
+                                   random.random((line_count, 1), dtype = numpy.float32))
+            polygon.buildCache()
+            builder.getLayer(layer_number).polygons.append(polygon)
+
+
+def getLines(mesh, begin = 0, end = None):
+    """The coordinates and line types of the ends of the lines in a range of the indices of a mesh."""
+
+    indices = mesh.getIndices().reshape(-1)[begin:end]
+    return numpy.concatenate((mesh.getVertices()[indices], mesh.getAttribute("line_types")["value"][indices].reshape((-1, 1)),
+                              mesh.getAttribute("prev_line_types")["value"][indices].reshape((-1, 1))), axis = 1)
+
+
+def test_chunksHaveTheLinesOfTheirLayers():
+    builder = LayerDataBuilder()
+    addLayers(builder, range(10))
+    layer_data = builder.build(material_color_map)
+    chunks = LayerDataChunks(vertices_per_chunk = 100).getChunks(layer_data)
+
+    assert len(chunks) > 1
+    assert [chunk.getFirstLayer() for chunk in chunks[1:]] == [chunk.getLastLayer() + 1 for chunk in chunks[:-1]]
+    line_types = layer_data.getAttribute("line_types")["value"]
+    all_lines = numpy.concatenate((layer_data.getVertices()[layer_data.getIndices()], line_types[layer_data.getIndices()].reshape((-1, 1)),
+                                   numpy.concatenate(([LayerPolygon.MoveUnretractedType], line_types[:-1]))[layer_data.getIndices()].reshape((-1, 1))), axis = 1)
+    element_offset = 0
+    for chunk in chunks:
+        for layer_number in range(chunk.getFirstLayer(), chunk.getLastLayer() + 1):
+            element_count = layer_data.getElementCounts()[layer_number]
+            begin = chunk.getElementOffset(layer_number)
+            numpy.testing.assert_array_equal(getLines(chunk.getMesh(), begin, begin + element_count), all_lines[element_offset:element_offset + element_count])
+            element_offset += element_count
+        assert chunk.getElementOffset(-1) == 0
+        assert chunk.getElementOffset(100) == len(chunk.getMesh().getIndices())
+
+
+def test_lodMesh():
+    builder = LayerDataBuilder()
+    addLayers(builder, range(8))
+    layer_data = builder.build(material_color_map)
+    chunk = LayerDataChunks(vertices_per_chunk = 1000000).getChunks(layer_data)[0]
+
+    assert chunk.getLodMesh(1) is chunk.getMesh()
+    lod_mesh = chunk.getLodMesh(4)
+    assert set(lod_mesh.getVertices()[lod_mesh.getIndices()][:, 1]) == {0, 4}  # Only every 4th layer.
+    assert chunk.getLodMesh(4) is lod_mesh
+
+
+def test_reuseChunksWhenBuildingIncrementally():
+    builder = LayerDataBuilder()
+    addLayers(builder, range(6))
+    chunks = LayerDataChunks(vertices_per_chunk = 100)
+    first_chunks = list(chunks.getChunks(builder.buildIncrementally(material_color_map)))
+    addLayers(builder, range(6, 12))
+    second_chunks = chunks.getChunks(builder.buildIncrementally(material_color_map))
+
+    assert second_chunks[:len(first_chunks) - 1] == first_chunks[:-1]  # Only the last chunk could have gotten more layers.
+    assert second_chunks[-1].getLastLayer() == 11
+
+
+def test_chunkMeshesAreViewsOnTheLayerData():
+    builder = LayerDataBuilder()
+    addLayers(builder, range(6))
+    layer_data = builder.build(material_color_map)
+    chunk = LayerDataChunks(vertices_per_chunk = 1000000).getChunks(layer_data)[0]
+
+    assert len(chunk.getLayerRanges()) == 6
+    assert numpy.shares_memory(chunk.getMesh().getVertices(), layer_data.getVertices())
+    assert numpy.shares_memory(chunk.getMesh().getAttribute("line_types")["value"], layer_data.getAttribute("line_types")["value"])
+
+
+def test_wholeChunkLeavesTheLayerDataAlone():
+    builder = LayerDataBuilder()
+    addLayers(builder, range(4))
+    layer_data = builder.build(material_color_map)
+    with patch.object(LayerDataChunks, "_getLayerRanges", return_value = None):  # As if the layers are not stored one after the other.
+        chunks = LayerDataChunks().getChunks(layer_data)
+
+    assert len(chunks) == 1
+    assert "prev_line_types" not in layer_data.getAttributeNames()
+    mesh = chunks[0].getMesh()
+    numpy.testing.assert_array_equal(mesh.getIndices(), layer_data.getIndices())
+    line_types = layer_data.getAttribute("line_types")["value"]
+    numpy.testing.assert_array_equal(mesh.getAttribute("prev_line_types")["value"][1:], line_types[:-1])
+    assert chunks[0].getElementOffset(3) == sum(layer_data.getElementCounts()[layer_number] for layer_number in range(3))
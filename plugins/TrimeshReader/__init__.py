@@ -1,8 +1,6 @@
 # Copyright (c) 2019 Ultimaker
 # Cura is released under the terms of the LGPLv3 or higher.
 
-from . import TrimeshReader
-
 from UM.i18n import i18nCatalog
 i18n_catalog = i18nCatalog("uranium")
 
@@ -43,4 +41,5 @@ def getMetaData():
     }
 
 def register(app):
+    from . import TrimeshReader  # Imports trimesh, so it's deferred until one of these files is opened.
     return {"mesh_reader": TrimeshReader.TrimeshReader()}
@@ -0,0 +1,213 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import threading
+from collections import deque
+from time import time
+from typing import Deque, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy
+
+
+def prepareGCodeLines(lines: Sequence[str], first_line_number: int) -> List[bytes]:
+    """Turn lines of g-code into the numbered, checksummed commands that are sent to the printer.
+
+    Comments and surrounding whitespace are removed. Lines without a command, and the M0 and M1 pauses (which are
+    handled as an LCD menu pause), are replaced by M105 so every line number is still sent. The checksums of all lines
+    are computed at once.
+
+    :param lines: The lines of g-code.
+    :param first_line_number: The line number of the first line. The other lines are numbered consecutively.
+    :return: For every line the command to send, including the line ending.
+    """
+
+    commands = []
+    for line_number, line in enumerate(lines, first_line_number):
+        comment_start = line.find(";")
+        if comment_start >= 0:
+            line = line[:comment_start]
+        line = line.strip()
+        if line == "" or line == "M0" or line == "M1":
+            line = "M105"
+        commands.append(("N%d%s" % (line_number, line)).encode())
+    if not commands:
+        return []
+
+    # The checksum is the XOR of all bytes of the command. Every command is at least "N0M105", so no range is empty.
+    lengths = numpy.fromiter((len(command) for command in commands), dtype = numpy.int64, count = len(commands))
+    starts = numpy.zeros(len(commands), dtype = numpy.int64)
+    numpy.cumsum(lengths[:-1], out = starts[1:])
+    data = numpy.frombuffer(b"".join(commands), dtype = numpy.uint8)
+    checksums = numpy.bitwise_xor.reduceat(data, starts).tolist()
+    return [b"%s*%d\n" % (command, checksum) for command, checksum in zip(commands, checksums)]
+
+
+class StreamStatistics(NamedTuple):
+    """How fast commands were sent to the printer since the print started."""
+
+    commands_sent: int
+    bytes_sent: int
+    commands_acknowledged: int
+    resends: int
+    commands_in_flight: int
+    commands_per_second: float
+    bytes_per_second: float
+
+
+class GCodeStreamer:
+    """Keeps track of the g-code of a USB print, and of the commands that the printer didn't acknowledge yet.
+
+    The firmware buffers the commands it receives, and acknowledges every command with "ok" when it's processed. To
+    keep the buffer filled on fast printers, more commands are sent ahead before the acknowledgements come in, but never
+    more than fit in the buffer of the firmware, like the planner buffer in ``scripts/check_gcode_buffer.py``.
+
+    The commands for the lines are prepared in batches, shortly before they are needed. Prepared batches are kept only
+    around the current line, to be able to resend lines cheaply.
+
+    :param max_commands_in_flight: The maximum number of commands that can be sent without being acknowledged.
+    :param max_bytes_in_flight: The maximum number of bytes of the commands that can be sent without being acknowledged,
+    like the size of the serial receive buffer of the firmware. 0 for no limit.
+    :param batch_size: The number of lines to prepare at a time.
+    """
+
+    def __init__(self, max_commands_in_flight: int = 4, max_bytes_in_flight: int = 0, batch_size: int = 1024) -> None:
+        self._max_commands_in_flight = max(max_commands_in_flight, 1)
+        self._max_bytes_in_flight = max_bytes_in_flight
+        self._batch_size = batch_size
+
+        self._lines: List[str] = []
+        self._position = 0  # The line to send next.
+        self._prepared_batches: Dict[int, List[bytes]] = {}  # By batch number.
+
+        self._lock = threading.Lock()  # Commands can be sent from the serial thread and from the interface.
+        self._in_flight: Deque[int] = deque()  # The sizes of the commands that were not acknowledged yet.
+        self._bytes_in_flight = 0
+        self._start_time = time()
+        self._commands_sent = 0
+        self._bytes_sent = 0
+        self._commands_acknowledged = 0
+        self._resends = 0
+
+    def setMaxCommandsInFlight(self, max_commands_in_flight: int) -> None:
+        self._max_commands_in_flight = max(max_commands_in_flight, 1)
+
+    def setMaxBytesInFlight(self, max_bytes_in_flight: int) -> None:
+        self._max_bytes_in_flight = max_bytes_in_flight
+
+    def start(self, lines: List[str]) -> None:
+        """Start streaming the lines of a new print. Every line is sent with its index as line number."""
+
+        self._lines = lines
+        self._position = 0
+        self._prepared_batches.clear()
+        with self._lock:
+            self._in_flight.clear()
+            self._bytes_in_flight = 0
+            self._start_time = time()
+            self._commands_sent = 0
+            self._bytes_sent = 0
+            self._commands_acknowledged = 0
+            self._resends = 0
+
+    def clear(self) -> None:
+        """Stop streaming the current print."""
+
+        self._lines = []
+        self._position = 0
+        self._prepared_batches.clear()
+
+    def getLineCount(self) -> int:
+        return len(self._lines)
+
+    def getPosition(self) -> int:
+        return self._position
+
+    def setPosition(self, position: int) -> None:
+        """Continue streaming from another line, when the printer requests to resend it.
+
+        The printer drops the commands that it received after the line that needs to be resent, so none of the commands
+        are in flight anymore.
+        """
+
+        self._position = position
+        with self._lock:
+            self._resends += 1
+            self._clearInFlight()
+
+    def isDone(self) -> bool:
+        return self._position >= len(self._lines)
+
+    def peekLine(self) -> Optional[bytes]:
+        """The command of the line to send next, or None if all lines were sent."""
+
+        if self._position < 0 or self._position >= len(self._lines):
+            return None
+        batch_number = self._position // self._batch_size
+        batch = self._prepared_batches.get(batch_number)
+        if batch is None:
+            batch_start = batch_number * self._batch_size
+            batch = prepareGCodeLines(self._lines[batch_start:batch_start + self._batch_size], batch_start)
+            self._prepared_batches[batch_number] = batch
+            for old_batch_number in [number for number in self._prepared_batches if number < batch_number - 1]:
+                del self._prepared_batches[old_batch_number]  # Keep the previous batch for resends.
+        return batch[self._position % self._batch_size]
+
+    def nextLine(self) -> Optional[bytes]:
+        """The command of the line to send next, moving on to the line after it. None if all lines were sent."""
+
+        line = self.peekLine()
+        if line is not None:
+            self._position += 1
+        return line
+
+    def canSend(self, size: int) -> bool:
+        """Whether a command of a number of bytes can be sent without overflowing the buffer of the firmware."""
+
+        with self._lock:
+            if not self._in_flight:
+                return True  # Even if it's larger than the buffer, there's nothing else to wait for.
+            if len(self._in_flight) >= self._max_commands_in_flight:
+                return False
+            return self._max_bytes_in_flight <= 0 or self._bytes_in_flight + size <= self._max_bytes_in_flight
+
+    def canSendNextLine(self) -> bool:
+        line = self.peekLine()
+        return line is not None and self.canSend(len(line))
+
+    def commandSent(self, size: int) -> None:
+        """Register that a command of a number of bytes was sent to the printer."""
+
+        with self._lock:
+            self._in_flight.append(size)
+            self._bytes_in_flight += size
+            self._commands_sent += 1
+            self._bytes_sent += size
+
+    def commandAcknowledged(self) -> None:
+        """Register that the printer acknowledged the oldest command that was in flight."""
+
+        with self._lock:
+            self._commands_acknowledged += 1
+            if self._in_flight:
+                self._bytes_in_flight -= self._in_flight.popleft()
+
+    def resetCommandsInFlight(self) -> None:
+        """Assume that the printer is not processing any command anymore, when acknowledgements got lost."""
+
+        with self._lock:
+            self._clearInFlight()
+
+    def getStatistics(self) -> StreamStatistics:
+        with self._lock:
+            duration = max(time() - self._start_time, 1e-6)
+            return StreamStatistics(commands_sent = self._commands_sent,
+                                    bytes_sent = self._bytes_sent,
+                                    commands_acknowledged = self._commands_acknowledged,
+                                    resends = self._resends,
+                                    commands_in_flight = len(self._in_flight),
+                                    commands_per_second = self._commands_sent / duration,
+                                    bytes_per_second = self._bytes_sent / duration)
+
+    def _clearInFlight(self) -> None:
+        self._in_flight.clear()
+        self._bytes_in_flight = 0
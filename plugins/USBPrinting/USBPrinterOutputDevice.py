@@ -18,6 +18,7 @@ from cura.PrinterOutput.GenericOutputController import GenericOutputController
 
 from .AutoDetectBaudJob import AutoDetectBaudJob
 from .AvrFirmwareUpdater import AvrFirmwareUpdater
+from .GCodeStreamer import GCodeStreamer, StreamStatistics
 
 from io import StringIO # To write the g-code output.
 from queue import Queue
@@ -27,7 +28,6 @@ from time import time
 from typing import Union, Optional, List, cast, TYPE_CHECKING
 
 import re
-import functools  # Used for reduce
 
 if TYPE_CHECKING:
     from UM.FileHandler.FileHandler import FileHandler
@@ -37,6 +37,10 @@ catalog = i18nCatalog("cura")
 
 
 class USBPrinterOutputDevice(PrinterOutputDevice):
+    _temperature_pattern = re.compile(rb"[B|T\d*]: ?\d+\.?\d*")  # 'T:' for extruder and 'B:' for bed.
+    _extruder_temperature_pattern = re.compile(rb"T(\d*): ?(\d+\.?\d*)\s*\/?(\d+\.?\d*)?")
+    _bed_temperature_pattern = re.compile(rb"B: ?(\d+\.?\d*)\s*\/?(\d+\.?\d*)?")
+
     def __init__(self, serial_port: str, baud_rate: Optional[int] = None) -> None:
         super().__init__(serial_port, connection_type = ConnectionType.UsbConnection)
         self.setName(catalog.i18nc("@item:inmenu", "USB printing"))
@@ -50,9 +54,8 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
 
         self._timeout = 3
 
-        # List of gcode lines to be printed
-        self._gcode = [] # type: List[str]
-        self._gcode_position = 0
+        # The gcode lines to be printed, and the commands that the printer is still processing.
+        self._gcode_streamer = GCodeStreamer()
 
         self._use_auto_detect = True
 
@@ -98,6 +101,10 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
         CuraApplication.getInstance().getOnExitCallbackManager().addCallback(self._checkActivePrintingUponAppExit)
 
         CuraApplication.getInstance().getPreferences().addPreference("usb_printing/enabled", False)
+        # How many commands to send ahead, before the printer acknowledged them. Most firmware buffers 4 commands.
+        CuraApplication.getInstance().getPreferences().addPreference("usb_printing/commands_in_flight", 4)
+        # The size of the serial receive buffer of the firmware in bytes, to not send more than that ahead. 0 if unknown.
+        CuraApplication.getInstance().getPreferences().addPreference("usb_printing/firmware_receive_buffer_size", 0)
 
     # This is a callback function that checks if there is any printing in progress via USB when the application tries
     # to exit. If so, it will show a confirmation before
@@ -162,20 +169,22 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
 
         :param gcode: The g-code to print.
         """
-        self._gcode.clear()
         self._paused = False
 
-        self._gcode.extend(gcode.split("\n"))
-
+        gcode_lines = gcode.split("\n")
         # Reset line number. If this is not done, first line is sometimes ignored
-        self._gcode.insert(0, "M110")
-        self._gcode_position = 0
+        gcode_lines.insert(0, "M110")
+
+        preferences = CuraApplication.getInstance().getPreferences()
+        self._gcode_streamer.setMaxCommandsInFlight(int(preferences.getValue("usb_printing/commands_in_flight")))
+        self._gcode_streamer.setMaxBytesInFlight(int(preferences.getValue("usb_printing/firmware_receive_buffer_size")))
+        self._gcode_streamer.start(gcode_lines)
         self._print_start_time = time()
 
         self._print_estimated_time = int(CuraApplication.getInstance().getPrintInformation().currentPrintTime.getDisplayString(DurationFormat.Format.Seconds))
 
-        for i in range(0, 4):  # Push first 4 entries before accepting other inputs
-            self._sendNextGcodeLine()
+        # Fill the buffer of the printer before accepting other inputs.
+        self._sendNextGcodeLines()
 
         self._is_printing = True
         self.writeFinished.emit(self)
@@ -244,9 +253,14 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
         else:
             self._sendCommand(command)
 
-    def _sendCommand(self, command: Union[str, bytes]):
+    def _sendCommand(self, command: Union[str, bytes]) -> bool:
+        """Write a command to the serial port.
+
+        :return: Whether the command was written. If not, it's not registered as sent to the printer either.
+        """
+
         if self._serial is None or self._connection_state != ConnectionState.Connected:
-            return
+            return False
 
         new_command = cast(bytes, command) if type(command) is bytes else cast(str, command).encode() # type: bytes
         if not new_command.endswith(b"\n"):
@@ -254,12 +268,15 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
         try:
             self._command_received.clear()
             self._serial.write(new_command)
+            self._gcode_streamer.commandSent(len(new_command))
+            return True
         except SerialTimeoutException:
             Logger.log("w", "Timeout when sending command to printer via USB.")
             self._command_received.set()
         except SerialException:
             Logger.logException("w", "An unexpected exception occurred while writing to the serial.")
             self.setConnectionState(ConnectionState.Error)
+        return False
 
     def _update(self):
         while self._connection_state == ConnectionState.Connected and self._serial is not None:
@@ -281,8 +298,8 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
                     self.sendCommand("M105")
                     self._last_temperature_request = time()
 
-            if re.search(b"[B|T\d*]: ?\d+\.?\d*", line):  # Temperature message. 'T:' for extruder and 'B:' for bed
-                extruder_temperature_matches = re.findall(b"T(\d*): ?(\d+\.?\d*)\s*\/?(\d+\.?\d*)?", line)
+            if b":" in line and self._temperature_pattern.search(line):  # Temperature message.
+                extruder_temperature_matches = self._extruder_temperature_pattern.findall(line)
                 # Update all temperature values
                 matched_extruder_nrs = []
                 for match in extruder_temperature_matches:
@@ -304,7 +321,7 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
                     if match[2]:
                         extruder.updateTargetHotendTemperature(float(match[2]))
 
-                bed_temperature_matches = re.findall(b"B: ?(\d+\.?\d*)\s*\/?(\d+\.?\d*)?", line)
+                bed_temperature_matches = self._bed_temperature_pattern.findall(line)
                 if bed_temperature_matches:
                     match = bed_temperature_matches[0]
                     if match[0]:
@@ -322,15 +339,19 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
 
             if line.startswith(b"ok") or self._firmware_idle_count > 1:
                 self._printer_busy = False
+                if line.startswith(b"ok"):
+                    self._gcode_streamer.commandAcknowledged()
+                else:
+                    self._gcode_streamer.resetCommandsInFlight()  # The acknowledgements got lost.
 
                 self._command_received.set()
                 if not self._command_queue.empty():
                     self._sendCommand(self._command_queue.get())
-                elif self._is_printing:
+                if self._is_printing:
                     if self._paused:
                         pass  # Nothing to do!
                     else:
-                        self._sendNextGcodeLine()
+                        self._sendNextGcodeLines()
 
             if line.startswith(b"echo:busy:"):
                 self._printer_busy = True
@@ -342,11 +363,11 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
                 elif line.lower().startswith(b"resend") or line.startswith(b"rs"):
                     # A resend can be requested either by Resend, resend or rs.
                     try:
-                        self._gcode_position = int(line.replace(b"N:", b" ").replace(b"N", b" ").replace(b":", b" ").split()[-1])
+                        self._gcode_streamer.setPosition(int(line.replace(b"N:", b" ").replace(b"N", b" ").replace(b":", b" ").split()[-1]))
                     except:
                         if line.startswith(b"rs"):
                             # In some cases of the RS command it needs to be handled differently.
-                            self._gcode_position = int(line.split()[1])
+                            self._gcode_streamer.setPosition(int(line.split()[1]))
 
     def _setFirmwareName(self, name):
         new_name = re.findall(r"FIRMWARE_NAME:(.*);", str(name))
@@ -360,6 +381,11 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
     def getFirmwareName(self):
         return self._firmware_name
 
+    def getStreamStatistics(self) -> StreamStatistics:
+        """How fast the commands of the current (or last) print are sent to the printer."""
+
+        return self._gcode_streamer.getStatistics()
+
     def pausePrint(self):
         self._paused = True
 
@@ -368,8 +394,7 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
         self._sendNextGcodeLine() #Send one line of g-code next so that we'll trigger an "ok" response loop even if we're not polling temperatures.
 
     def cancelPrint(self):
-        self._gcode_position = 0
-        self._gcode.clear()
+        self._gcode_streamer.clear()
         self._printers[0].updateActivePrintJob(None)
         self._is_printing = False
         self._paused = False
@@ -384,42 +409,50 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
         self.printers[0].homeHead()
         self._sendCommand("M84")
 
-    def _sendNextGcodeLine(self):
+    def _sendNextGcodeLines(self):
+        """Send lines of g-code until the buffer of the printer is full, or the print is done."""
+
+        if self._gcode_streamer.isDone():
+            self._sendNextGcodeLine()  # Finishes the print.
+            return
+        if self._serial is None or self._connection_state != ConnectionState.Connected:
+            return  # Nothing would be sent, so the buffer would never get full.
+        while self._gcode_streamer.canSendNextLine():
+            if not self._sendNextGcodeLine() or self._connection_state != ConnectionState.Connected:
+                break  # The line is sent again with the next acknowledgement, or the print is stopped.
+
+    def _sendNextGcodeLine(self) -> bool:
         """
-        Send the next line of g-code, at the current `_gcode_position`, via a
-        serial port to the printer.
+        Send the next line of g-code, at the current position of the g-code
+        streamer, via a serial port to the printer.
 
         If the print is done, this sets `_is_printing` to `False` as well.
+
+        :return: Whether a line was sent. The streamer only moves on to the next line if so.
         """
-        try:
-            line = self._gcode[self._gcode_position]
-        except IndexError:  # End of print, or print got cancelled.
+        line_number = self._gcode_streamer.getPosition()
+        line = self._gcode_streamer.peekLine()
+        if line is None:  # End of print, or print got cancelled.
+            if self._is_printing:
+                statistics = self._gcode_streamer.getStatistics()
+                Logger.log("i", "Sent {commands} commands ({kib} KiB) at {rate:.1f} commands per second, with {resends} resends.".format(
+                    commands = statistics.commands_sent, kib = statistics.bytes_sent // 1024, rate = statistics.commands_per_second, resends = statistics.resends))
             self._printers[0].updateActivePrintJob(None)
             self._is_printing = False
-            return
+            return False
 
-        if ";" in line:
-            line = line[:line.find(";")]
-
-        line = line.strip()
- 
-        # Don't send empty lines. But we do have to send something, so send M105 instead.
-        # Don't send the M0 or M1 to the machine, as M0 and M1 are handled as an LCD menu pause.
-        if line == "" or line == "M0" or line == "M1":
-            line = "M105"
-
-        checksum = functools.reduce(lambda x, y: x ^ y, map(ord, "N%d%s" % (self._gcode_position, line)))
-
-        self._sendCommand("N%d%s*%d" % (self._gcode_position, line, checksum))
+        if not self._sendCommand(line):
+            return False
+        self._gcode_streamer.nextLine()
 
         print_job = self._printers[0].activePrintJob
         try:
-            progress = self._gcode_position / len(self._gcode)
+            progress = line_number / self._gcode_streamer.getLineCount()
         except ZeroDivisionError:
             # There is nothing to send!
             if print_job is not None:
                 print_job.updateState("error")
-            return
+            return True
 
         elapsed_time = int(time() - self._print_start_time)
 
@@ -435,5 +468,4 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
         if progress > .1:
             estimated_time = int(self._print_estimated_time * (1 - progress) + elapsed_time)
         print_job.updateTimeTotal(estimated_time)
-
-        self._gcode_position += 1
+        return True
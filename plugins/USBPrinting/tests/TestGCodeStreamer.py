@@ -0,0 +1,82 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import functools
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from GCodeStreamer import GCodeStreamer, prepareGCodeLines
+
+
+def referenceCommand(line_number, line):
+    """How the commands were built line by line before they were prepared in batches."""
+
+    if ";" in line:
+        line = line[:line.find(";")]
+    line = line.strip()
+    if line == "" or line == "M0" or line == "M1":
+        line = "M105"
+    checksum = functools.reduce(lambda x, y: x ^ y, map(ord, "N%d%s" % (line_number, line)))
+    return ("N%d%s*%d\n" % (line_number, line, checksum)).encode()
+
+
+def test_prepareGCodeLines():
+    lines = ["M110", ";LAYER:0", "G1 X10 Y20 E0.5 ;Comment", "   G0 Z0.3  ", "", "M0", "M1", "M104 S210", "T1"]
+
+    assert prepareGCodeLines(lines, 0) == [referenceCommand(number, line) for number, line in enumerate(lines)]
+    assert prepareGCodeLines(lines, 998) == [referenceCommand(number, line) for number, line in enumerate(lines, 998)]
+    assert prepareGCodeLines([], 0) == []
+
+
+def test_streamAcrossBatches():
+    lines = ["G1 X{index}".format(index = index) for index in range(25)]
+    streamer = GCodeStreamer(batch_size = 4)
+    streamer.start(lines)
+
+    sent = []
+    while not streamer.isDone():
+        sent.append(streamer.nextLine())
+    assert sent == [referenceCommand(number, line) for number, line in enumerate(lines)]
+    assert streamer.nextLine() is None
+
+    streamer.setPosition(5)  # Resend from an earlier line.
+    assert streamer.nextLine() == referenceCommand(5, lines[5])
+    assert streamer.getStatistics().resends == 1
+
+
+def test_commandsInFlightWindow():
+    streamer = GCodeStreamer(max_commands_in_flight = 3)
+    streamer.start(["G1 X{index}".format(index = index) for index in range(10)])
+
+    while streamer.canSendNextLine():
+        streamer.commandSent(len(streamer.nextLine()))
+    assert streamer.getPosition() == 3  # The window is full.
+
+    streamer.commandAcknowledged()
+    assert streamer.canSendNextLine()
+    streamer.commandSent(len(streamer.nextLine()))
+    assert not streamer.canSendNextLine()
+
+    streamer.resetCommandsInFlight()  # Lost acknowledgements.
+    assert streamer.canSendNextLine()
+    statistics = streamer.getStatistics()
+    assert statistics.commands_sent == 4
+    assert statistics.commands_acknowledged == 1
+    assert statistics.commands_in_flight == 0
+
+
+def test_bytesInFlightWindow():
+    streamer = GCodeStreamer(max_commands_in_flight = 100, max_bytes_in_flight = 30)
+    streamer.start(["G1 X1", "G1 X2", "G1 X3"])  # Every command is 11 bytes.
+
+    while streamer.canSendNextLine():
+        streamer.commandSent(len(streamer.nextLine()))
+    assert streamer.getPosition() == 2
+    assert streamer.getStatistics().bytes_sent == 22
+
+    # A command that is larger than the buffer can still be sent when nothing else is in flight.
+    streamer.commandAcknowledged()
+    streamer.commandAcknowledged()
+    assert streamer.canSend(100)
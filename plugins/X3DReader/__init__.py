@@ -1,7 +1,5 @@
 # Seva Alekseyev with National Institutes of Health, 2016
 
-from . import X3DReader
-
 from UM.i18n import i18nCatalog
 catalog = i18nCatalog("cura")
 
@@ -17,4 +15,5 @@ def getMetaData():
 
 
 def register(app):
+    from . import X3DReader  # Only imported once an X3D file is opened, see the activation triggers in plugin.json.
     return {"mesh_reader": X3DReader.X3DReader()}
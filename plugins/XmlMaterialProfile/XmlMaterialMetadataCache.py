@@ -0,0 +1,145 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from UM.Logger import Logger
+
+MetadataParser = Callable[[str], Optional[Any]]
+
+
+def _getFileState(file_name: str) -> Tuple[int, int]:
+    stat = os.stat(file_name)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class XmlMaterialMetadataCache:
+    """Keeps the metadata parsed from material files, so that they don't all need to be parsed at every start-up.
+
+    The material files are parsed before their metadata is asked for, all at once. The parsed metadata is stored on
+    disk, by the hash of the contents of the files. At the next start, only the files of which the modification time or
+    size changed are parsed again.
+
+    The metadata is looked up by the hash of the contents of a file, so it's only used for exactly the same contents.
+
+    The files are parsed in this process, one by one. Worker processes are not forked, since the parser belongs to a
+    settings container class, which forked workers may not use (see :py:mod:`cura.Utils.WorkerProcesses`). Spawned
+    worker processes would run ``cura_app.py`` again before they could import the parser, which starts another
+    instance of Cura, and a frozen build would start the whole executable again. Since only new and changed files are
+    parsed, that mostly happens at the first start after installing or upgrading.
+
+    :param file_name: Where to store the parsed metadata.
+    :param parser: Parses the serialized contents of a material file. It returns None for files that it can't parse,
+    which are then parsed in the normal way when loading them.
+    :param parser_version: The version of the parser. All metadata is parsed again when it changes.
+    """
+
+    Version = 1  # Increase when changing the format of the file.
+
+    def __init__(self, file_name: str, parser: MetadataParser, parser_version: str) -> None:
+        self._file_name = file_name
+        self._parser = parser
+        self._parser_version = parser_version
+
+        self._file_states: Dict[str, Tuple[Tuple[int, int], str]] = {}  # By file name, the modification time and size, and the content hash.
+        self._parsed_metadata: Dict[str, Any] = {}  # By content hash. None for files that the parser can't handle.
+
+    @staticmethod
+    def hashSerialized(serialized: str) -> str:
+        return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+    def getParsedMetadata(self, serialized: str) -> Optional[Any]:
+        """Get the parsed metadata of the contents of a material file, or None if it was not parsed beforehand."""
+
+        return self._parsed_metadata.get(self.hashSerialized(serialized))
+
+    def preload(self, file_names: List[str]) -> None:
+        """Parse the metadata of material files that were not parsed at an earlier start, and store it.
+
+        :param file_names: All material files of which the metadata will be asked for.
+        """
+
+        self._load()
+        files_to_parse = []
+        file_states: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        for file_name in file_names:
+            cached_state = self._file_states.get(file_name)
+            try:
+                file_state = _getFileState(file_name)
+            except OSError:
+                continue
+            if cached_state is not None and cached_state[0] == file_state and cached_state[1] in self._parsed_metadata:
+                file_states[file_name] = cached_state
+            else:
+                files_to_parse.append(file_name)
+
+        for file_name in files_to_parse:
+            file_state, content_hash, parsed = self._parseFile(file_name)
+            if file_state is None or content_hash is None:
+                continue
+            file_states[file_name] = (file_state, content_hash)
+            self._parsed_metadata[content_hash] = parsed
+
+        # Forget the metadata of files that were removed or changed.
+        used_hashes = {content_hash for _, content_hash in file_states.values()}
+        self._parsed_metadata = {content_hash: parsed for content_hash, parsed in self._parsed_metadata.items() if content_hash in used_hashes}
+        changed = file_states != self._file_states
+        self._file_states = file_states
+        if changed:
+            self._save()
+        Logger.info("Parsed the metadata of {parsed} material files beforehand, {cached} were cached.".format(parsed = len(files_to_parse), cached = len(file_states) - len(files_to_parse)))
+
+    def _parseFile(self, file_name: str) -> Tuple[Optional[Tuple[int, int]], Optional[str], Optional[Any]]:
+        """Parse the metadata of a material file.
+
+        :return: The modification time and size of the file, the hash of its contents and the parsed metadata. The
+        parsed metadata is None if the parser can't handle the file.
+        """
+
+        try:
+            file_state = _getFileState(file_name)
+            with open(file_name, encoding = "utf-8") as f:
+                serialized = f.read()
+        except (OSError, UnicodeDecodeError):
+            return None, None, None
+        try:
+            parsed = self._parser(serialized)
+        except Exception:  # Parsed again when the file is loaded, which reports the problem.
+            parsed = None
+        return file_state, self.hashSerialized(serialized), parsed
+
+    def _load(self) -> None:
+        try:
+            with open(self._file_name, "rb") as f:
+                cache = pickle.load(f)
+            if cache["version"] != self.Version or cache["parser_version"] != self._parser_version:
+                return
+            self._file_states = cache["file_states"]
+            self._parsed_metadata = cache["parsed_metadata"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:  # Unpickling can raise about anything if the file is damaged.
+            Logger.warning("Unable to read the cached material metadata {file_name}: {err}".format(file_name = self._file_name, err = str(e)))
+
+    def _save(self) -> None:
+        cache = {
+            "version": self.Version,
+            "parser_version": self._parser_version,
+            "file_states": self._file_states,
+            "parsed_metadata": self._parsed_metadata
+        }
+        temp_file_name = None
+        try:
+            os.makedirs(os.path.dirname(self._file_name), exist_ok = True)
+            file_descriptor, temp_file_name = tempfile.mkstemp(prefix = os.path.basename(self._file_name), dir = os.path.dirname(self._file_name))
+            with os.fdopen(file_descriptor, "wb") as f:
+                pickle.dump(cache, f, protocol = pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file_name, self._file_name)
+        except (OSError, pickle.PicklingError) as e:
+            Logger.warning("Unable to store the cached material metadata {file_name}: {err}".format(file_name = self._file_name, err = str(e)))
+            if temp_file_name is not None and os.path.exists(temp_file_name):
+                os.remove(temp_file_name)
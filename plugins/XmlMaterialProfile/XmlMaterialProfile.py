@@ -23,8 +23,10 @@ from cura.Machines.VariantType import VariantType
 
 try:
     from .XmlMaterialValidator import XmlMaterialValidator
+    from .XmlMaterialMetadataCache import XmlMaterialMetadataCache
 except (ImportError, SystemError):
     import XmlMaterialValidator  # type: ignore  # This fixes the tests not being able to import.
+    from XmlMaterialMetadataCache import XmlMaterialMetadataCache  # type: ignore
 
 
 class XmlMaterialProfile(InstanceContainer):
@@ -33,6 +35,8 @@ class XmlMaterialProfile(InstanceContainer):
     CurrentFdmMaterialVersion = "1.3"
     Version = 1
 
+    __metadata_cache = None  # type: Optional[XmlMaterialMetadataCache]  # Created when the first metadata is deserialized.
+
     def __init__(self, container_id, *args, **kwargs):
         super().__init__(container_id, *args, **kwargs)
         self._inherited_files = []
@@ -849,24 +853,51 @@ class XmlMaterialProfile(InstanceContainer):
 
     @classmethod
     def deserializeMetadata(cls, serialized: str, container_id: str) -> List[Dict[str, Any]]:
-        result_metadata = [] #All the metadata that we found except the base (because the base is returned).
+        parsed_metadata = cls._getMetadataCache().getParsedMetadata(serialized)
+        if parsed_metadata is None:
+            #Update the serialized data to the latest version.
+            serialized = cls._updateSerialized(serialized)
+
+            try:
+                data = ET.fromstring(serialized)
+            except:
+                Logger.logException("e", "An exception occurred while parsing the material profile")
+                return []
+            parsed_metadata = cls._parseMetadata(data)
+        return cls._createMetadata(parsed_metadata, container_id)
 
-        #Update the serialized data to the latest version.
-        serialized = cls._updateSerialized(serialized)
+    @classmethod
+    def _getMetadataCache(cls) -> XmlMaterialMetadataCache:
+        """Get the cache with the parsed metadata of all material files, parsing the files that are not cached yet."""
 
-        base_metadata = {
-            "type": "material",
-            "status": "unknown", #TODO: Add material verification.
-            "container_type": XmlMaterialProfile,
-            "id": container_id,
-            "base_file": container_id
-        }
+        if cls.__metadata_cache is None:
+            cls.__metadata_cache = XmlMaterialMetadataCache(os.path.join(Resources.getCacheStoragePath(), "xml_material_metadata.cache"),
+                                                            cls._parseSerializedMetadata,
+                                                            "{version}-{setting_version}".format(version = cls.Version, setting_version = CuraApplication.SettingVersion))
+            cls.__metadata_cache.preload(Resources.getAllResourcesOfType(CuraApplication.ResourceTypes.MaterialInstanceContainer))
+        return cls.__metadata_cache
 
-        try:
-            data = ET.fromstring(serialized)
-        except:
-            Logger.logException("e", "An exception occurred while parsing the material profile")
-            return []
+    @classmethod
+    def _parseSerializedMetadata(cls, serialized: str) -> Optional[Dict[str, Any]]:
+        """Parse the metadata of a material file for the metadata cache.
+
+        Files of older versions are not parsed, since they need to be upgraded first.
+        """
+
+        data = ET.fromstring(serialized)
+        if data.attrib.get("version") != cls.CurrentFdmMaterialVersion:
+            return None
+        return cls._parseMetadata(data)
+
+    @classmethod
+    def _parseMetadata(cls, data: ET.Element) -> Dict[str, Any]:
+        """Get all information that the metadata is created from out of the XML of a material.
+
+        Nothing in here depends on the other containers, so that it can be cached and be done in other processes. The
+        metadata of the containers is created from it by :py:meth:`_createMetadata`.
+        """
+
+        base_metadata = {}  # type: Dict[str, Any]
 
         #TODO: Implement the <inherits> tag. It's unused at the moment though.
 
@@ -924,21 +955,88 @@ class XmlMaterialProfile(InstanceContainer):
         except StopIteration: #No 'hardware compatible' setting.
             common_compatibility = True
         base_metadata["compatible"] = common_compatibility
-        result_metadata.append(base_metadata)
-
-        # Map machine human-readable names to IDs
-        product_id_map = FormatMaps.getProductIdMap()
 
+        machines = []
         for machine in data.iterfind("./um:settings/um:machine", cls.__namespaces):
             machine_compatibility = common_compatibility
             for entry in machine.iterfind("./um:setting[@key='hardware compatible']", cls.__namespaces):
                 if entry.text is not None:
                     machine_compatibility = cls._parseCompatibleValue(entry.text)
 
-            for identifier in machine.iterfind("./um:machine_identifier", cls.__namespaces):
-                machine_id_list = product_id_map.get(identifier.get("product", ""), [])
+            identifiers = [(identifier.get("product"), identifier.get("manufacturer")) for identifier in machine.iterfind("./um:machine_identifier", cls.__namespaces)]
+
+            buildplates = []
+            for buildplate in machine.iterfind("./um:buildplate", cls.__namespaces):
+                buildplate_id = buildplate.get("id")
+                if buildplate_id is None:
+                    continue
+
+                buildplate_compatibility = True
+                buildplate_recommended = True
+                for entry in buildplate.iterfind("./um:setting", cls.__namespaces):
+                    key = entry.get("key")
+                    if entry.text is not None:
+                        if key == "hardware compatible":
+                            buildplate_compatibility = cls._parseCompatibleValue(entry.text)
+                        elif key == "hardware recommended":
+                            buildplate_recommended = cls._parseCompatibleValue(entry.text)
+                buildplates.append((buildplate_id, buildplate_compatibility, buildplate_recommended))
+
+            hotends = []
+            for hotend in machine.iterfind("./um:hotend", cls.__namespaces):
+                hotend_name = hotend.get("id")
+                if hotend_name is None:
+                    continue
+
+                hotend_compatibility = machine_compatibility
+                for entry in hotend.iterfind("./um:setting[@key='hardware compatible']", cls.__namespaces):
+                    if entry.text is not None:
+                        hotend_compatibility = cls._parseCompatibleValue(entry.text)
+
+                hotend_buildplates = []
+                for buildplate in hotend.iterfind("./um:buildplate", cls.__namespaces):
+                    # The "id" field for buildplate in material profiles is actually name
+                    buildplate_name = buildplate.get("id")
+                    if buildplate_name is None:
+                        continue
+
+                    buildplate_mapped_settings, buildplate_unmapped_settings, buildplate_reserialize_settings = cls._getSettingsDictForNode(buildplate)
+                    hotend_buildplates.append((buildplate_name, buildplate_unmapped_settings, buildplate_reserialize_settings))
+                hotends.append((hotend_name, hotend_compatibility, hotend_buildplates))
+
+            machines.append((machine_compatibility, identifiers, buildplates, hotends))
+
+        return {"base_metadata": base_metadata, "machines": machines}
+
+    @classmethod
+    def _createMetadata(cls, parsed_metadata: Dict[str, Any], container_id: str) -> List[Dict[str, Any]]:
+        """Create the metadata of a material and of its machine and variant specific containers.
+
+        :param parsed_metadata: The information from the XML of the material, from :py:meth:`_parseMetadata`.
+        :param container_id: The ID of the base material.
+        """
+
+        parsed_metadata = copy.deepcopy(parsed_metadata)  # The parsed metadata may be cached, so don't share any of it.
+        result_metadata = [] #All the metadata that we found except the base (because the base is returned).
+
+        base_metadata = {
+            "type": "material",
+            "status": "unknown", #TODO: Add material verification.
+            "container_type": XmlMaterialProfile,
+            "id": container_id,
+            "base_file": container_id
+        }
+        base_metadata.update(parsed_metadata["base_metadata"])
+        result_metadata.append(base_metadata)
+
+        # Map machine human-readable names to IDs
+        product_id_map = FormatMaps.getProductIdMap()
+
+        for machine_compatibility, identifiers, buildplates, hotends in parsed_metadata["machines"]:
+            for product, manufacturer in identifiers:
+                machine_id_list = product_id_map.get(product if product is not None else "", [])
                 if not machine_id_list:
-                    machine_id_list = cls.getPossibleDefinitionIDsFromName(identifier.get("product"))
+                    machine_id_list = cls.getPossibleDefinitionIDsFromName(product)
 
                 for machine_id in machine_id_list:
                     definition_metadatas = ContainerRegistry.getInstance().findDefinitionContainersMetadata(id = machine_id)
@@ -947,7 +1045,7 @@ class XmlMaterialProfile(InstanceContainer):
 
                     definition_metadata = definition_metadatas[0]
 
-                    machine_manufacturer = identifier.get("manufacturer", definition_metadata.get("manufacturer", "Unknown")) #If the XML material doesn't specify a manufacturer, use the one in the actual printer definition.
+                    machine_manufacturer = manufacturer if manufacturer is not None else definition_metadata.get("manufacturer", "Unknown") #If the XML material doesn't specify a manufacturer, use the one in the actual printer definition.
 
                     # Always create the instance of the material even if it is not compatible, otherwise it will never
                     # show as incompatible if the material profile doesn't define hotends in the machine - CURA-5444
@@ -967,15 +1065,10 @@ class XmlMaterialProfile(InstanceContainer):
 
                     result_metadata.append(new_material_metadata)
 
-                    buildplates = machine.iterfind("./um:buildplate", cls.__namespaces)
                     buildplate_map = {}  # type: Dict[str, Dict[str, bool]]
                     buildplate_map["buildplate_compatible"] = {}
                     buildplate_map["buildplate_recommended"] = {}
-                    for buildplate in buildplates:
-                        buildplate_id = buildplate.get("id")
-                        if buildplate_id is None:
-                            continue
-
+                    for buildplate_id, buildplate_compatibility, buildplate_recommended in buildplates:
                         variant_metadata = ContainerRegistry.getInstance().findInstanceContainersMetadata(id = buildplate_id)
                         if not variant_metadata:
                             # It is not really properly defined what "ID" is so also search for variants by name.
@@ -984,30 +1077,10 @@ class XmlMaterialProfile(InstanceContainer):
                         if not variant_metadata:
                             continue
 
-                        settings = buildplate.iterfind("./um:setting", cls.__namespaces)
-                        buildplate_compatibility = True
-                        buildplate_recommended = True
-                        for entry in settings:
-                            key = entry.get("key")
-                            if entry.text is not None:
-                                if key == "hardware compatible":
-                                    buildplate_compatibility = cls._parseCompatibleValue(entry.text)
-                                elif key == "hardware recommended":
-                                    buildplate_recommended = cls._parseCompatibleValue(entry.text)
-
                         buildplate_map["buildplate_compatible"][buildplate_id] = buildplate_compatibility
                         buildplate_map["buildplate_recommended"][buildplate_id] = buildplate_recommended
 
-                    for hotend in machine.iterfind("./um:hotend", cls.__namespaces):
-                        hotend_name = hotend.get("id")
-                        if hotend_name is None:
-                            continue
-
-                        hotend_compatibility = machine_compatibility
-                        for entry in hotend.iterfind("./um:setting[@key='hardware compatible']", cls.__namespaces):
-                            if entry.text is not None:
-                                hotend_compatibility = cls._parseCompatibleValue(entry.text)
-
+                    for hotend_name, hotend_compatibility, hotend_buildplates in hotends:
                         new_hotend_specific_material_id = container_id + "_" + machine_id + "_" + hotend_name.replace(" ", "_")
 
                         # Same as above, do not overwrite existing metadata.
@@ -1028,14 +1101,7 @@ class XmlMaterialProfile(InstanceContainer):
                         #
                         # Buildplates in Hotends
                         #
-                        buildplates = hotend.iterfind("./um:buildplate", cls.__namespaces)
-                        for buildplate in buildplates:
-                            # The "id" field for buildplate in material profiles is actually name
-                            buildplate_name = buildplate.get("id")
-                            if buildplate_name is None:
-                                continue
-
-                            buildplate_mapped_settings, buildplate_unmapped_settings, buildplate_reserialize_settings = cls._getSettingsDictForNode(buildplate)
+                        for buildplate_name, buildplate_unmapped_settings, buildplate_reserialize_settings in hotend_buildplates:
                             buildplate_compatibility = buildplate_unmapped_settings.get("hardware compatible",
                                                                                         buildplate_map["buildplate_compatible"])
                             buildplate_recommended = buildplate_unmapped_settings.get("hardware recommended",
@@ -0,0 +1,70 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from XmlMaterialMetadataCache import XmlMaterialMetadataCache
+
+parsed_contents = []
+
+
+def parseMaterial(serialized):
+    parsed_contents.append(serialized)
+    if serialized.startswith("old"):
+        return None  # Needs to be upgraded first.
+    return {"name": serialized}
+
+
+def createFiles(directory, contents):
+    file_names = []
+    for index, content in enumerate(contents):
+        file_name = os.path.join(directory, "material_{index}.xml.fdm_material".format(index = index))
+        with open(file_name, "w", encoding = "utf-8") as f:
+            f.write(content)
+        file_names.append(file_name)
+    return file_names
+
+
+def test_preload(tmp_path):
+    file_names = createFiles(str(tmp_path), ["pla", "abs", "old nylon"])
+    cache = XmlMaterialMetadataCache(os.path.join(str(tmp_path), "cache", "metadata.cache"), parseMaterial, "1")
+
+    cache.preload(file_names + [os.path.join(str(tmp_path), "removed.xml.fdm_material")])
+
+    assert cache.getParsedMetadata("pla") == {"name": "pla"}
+    assert cache.getParsedMetadata("abs") == {"name": "abs"}
+    assert cache.getParsedMetadata("old nylon") is None
+    assert cache.getParsedMetadata("petg") is None  # Not preloaded.
+
+
+def test_preloadFromDisk(tmp_path):
+    file_names = createFiles(str(tmp_path), ["pla", "abs"])
+    cache_file_name = os.path.join(str(tmp_path), "metadata.cache")
+    XmlMaterialMetadataCache(cache_file_name, parseMaterial, "1").preload(file_names)
+
+    parsed_contents.clear()
+    cache = XmlMaterialMetadataCache(cache_file_name, parseMaterial, "1")
+    cache.preload(file_names)
+    assert parsed_contents == []  # Nothing changed, so nothing needs to be parsed again.
+    assert cache.getParsedMetadata("abs") == {"name": "abs"}
+
+    with open(file_names[1], "w", encoding = "utf-8") as f:
+        f.write("abs, changed")
+    cache = XmlMaterialMetadataCache(cache_file_name, parseMaterial, "1")
+    cache.preload(file_names)
+    assert parsed_contents == ["abs, changed"]
+    assert cache.getParsedMetadata("abs") is None
+    assert cache.getParsedMetadata("abs, changed") == {"name": "abs, changed"}
+
+
+def test_preloadOtherParserVersion(tmp_path):
+    file_names = createFiles(str(tmp_path), ["pla"])
+    cache_file_name = os.path.join(str(tmp_path), "metadata.cache")
+    XmlMaterialMetadataCache(cache_file_name, parseMaterial, "1").preload(file_names)
+
+    parsed_contents.clear()
+    XmlMaterialMetadataCache(cache_file_name, parseMaterial, "2").preload(file_names)
+    assert parsed_contents == ["pla"]
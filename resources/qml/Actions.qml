@@ -45,6 +45,7 @@ Item
     property alias reloadAll: reloadAllAction
     property alias arrangeAll: arrangeAllAction
     property alias arrangeAllGrid: arrangeAllGridAction
+    property alias arrangeAllOnBuildPlates: arrangeAllOnBuildPlatesAction
     property alias resetAllTranslation: resetAllTranslationAction
     property alias resetAll: resetAllAction
 
@@ -482,6 +483,13 @@ Item
         shortcut: "Shift+Ctrl+R"
     }
 
+    Action
+    {
+        id: arrangeAllOnBuildPlatesAction
+        text: catalog.i18nc("@action:inmenu menubar:edit","Arrange All Models on Fewest Build Plates")
+        onTriggered: Printer.arrangeAllOnBuildPlates()
+    }
+
     Action
     {
         id: dropAllAction
@@ -67,6 +67,11 @@ Cura.Menu
     Cura.MenuItem { action: Cura.Actions.selectAll }
     Cura.MenuItem { action: Cura.Actions.arrangeAll }
     Cura.MenuItem { action: Cura.Actions.arrangeAllGrid }
+    Cura.MenuItem
+    {
+        action: Cura.Actions.arrangeAllOnBuildPlates
+        visible: UM.Preferences.getValue("cura/use_multi_build_plate")
+    }
     Cura.MenuItem { action: Cura.Actions.deleteAll }
     Cura.MenuItem { action: Cura.Actions.reloadAll }
     Cura.MenuItem { action: Cura.Actions.resetAllTranslation }
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+"""Compares reading sliced layer messages per path segment with reading them per layer.
+
+The per segment variant mirrors what ProcessSlicedLayersJob used to do: copy every attribute of every path segment into
+its own array. The per layer variant uses LayerSegmentData, which copies each attribute of all segments of a layer into
+one array with a single concatenation.
+"""
+
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "plugins", "CuraEngineBackend"))
+
+from LayerSegmentData import LayerSegmentData
+
+
+class FakeLayerMessage:
+    def __init__(self, segments, height):
+        self._segments = segments
+        self.height = height
+
+    def repeatedMessageCount(self, name):
+        return len(self._segments)
+
+    def getRepeatedMessage(self, name, index):
+        return self._segments[index]
+
+
+def create_layers(layer_count: int, segments_per_layer: int, lines_per_segment: int):
+    rng = numpy.random.default_rng(0)
+    layers = []
+    for layer_nr in range(layer_count):
+        segments = []
+        for _ in range(segments_per_layer):
+            segments.append(SimpleNamespace(
+                extruder = int(rng.integers(0, 2)),
+                point_type = 0,
+                points = rng.random((lines_per_segment + 1) * 2, dtype = numpy.float32).tobytes(),
+                line_type = rng.integers(0, 15, lines_per_segment, dtype = numpy.uint8).tobytes(),
+                line_width = rng.random(lines_per_segment, dtype = numpy.float32).tobytes(),
+                line_thickness = rng.random(lines_per_segment, dtype = numpy.float32).tobytes(),
+                line_feedrate = rng.random(lines_per_segment, dtype = numpy.float32).tobytes()
+            ))
+        layers.append(FakeLayerMessage(segments, (layer_nr + 1) * 200.0))
+    return layers
+
+
+def read_per_segment(layers) -> int:
+    segment_count = 0
+    for layer in layers:
+        for p in range(layer.repeatedMessageCount("path_segment")):
+            polygon = layer.getRepeatedMessage("path_segment", p)
+            for attribute, dtype in (("line_type", "u1"), ("line_width", "f4"), ("line_thickness", "f4"), ("line_feedrate", "f4")):
+                numpy.frombuffer(getattr(polygon, attribute), dtype = dtype).copy()
+            points = numpy.frombuffer(polygon.points, dtype = "f4").copy().reshape((-1, 2))
+            new_points = numpy.empty((len(points), 3), numpy.float32)
+            new_points[:, 0] = points[:, 0]
+            new_points[:, 1] = layer.height / 1000
+            new_points[:, 2] = -points[:, 1]
+            segment_count += 1
+    return segment_count
+
+
+def read_per_layer(layers) -> int:
+    segment_count = 0
+    for layer in layers:
+        segment_data = LayerSegmentData(layer)
+        for index in range(segment_data.segmentCount()):
+            segment_data.getSegment(index)
+            segment_count += 1
+    return segment_count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--layers", type = int, default = 2000)
+    parser.add_argument("--segments", type = int, default = 50, help = "Path segments per layer.")
+    parser.add_argument("--lines", type = int, default = 20, help = "Line segments per path segment.")
+    args = parser.parse_args()
+
+    layers = create_layers(args.layers, args.segments, args.lines)
+    for name, function in (("per segment", read_per_segment), ("per layer", read_per_layer)):
+        start = time.perf_counter()
+        segment_count = function(layers)
+        print("Reading {count} segments {name}: {duration:.3f}s".format(count = segment_count, name = name, duration = time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
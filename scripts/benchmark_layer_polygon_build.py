@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+"""Measures the wall time and peak memory of LayerPolygon.build for a print with many line segments.
+
+It compares the current implementation with the previous one, which duplicated every attribute of every line with
+numpy.tile before masking out the vertices that are not needed. Run it from the root of the repository, with Uranium
+available.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import numpy
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cura.LayerPolygon import LayerPolygon
+
+
+def legacy_build(polygon, vertex_offset, vertices, colors, line_dimensions, feedrates, extruders, line_types):
+    """The attribute part of LayerPolygon.build, as it was before filling the attributes directly."""
+
+    types = polygon.types
+    needed_points_list = numpy.ones((len(types), 2), dtype = bool)
+    needed_points_list[1:, 0][:, numpy.newaxis] = types[1:] != types[:-1]
+    index_list = (numpy.arange(len(types)).reshape((-1, 1)) + numpy.array([[0, 1]])).reshape((-1, 1))[needed_points_list.reshape((-1, 1))]
+    begin = vertex_offset
+    end = vertex_offset + int(numpy.sum(needed_points_list))
+    vertices[begin:end, :] = polygon.data[index_list, :]
+    colors[begin:end, :] = numpy.tile(polygon.getColors(), (1, 2)).reshape((-1, 4))[needed_points_list.ravel()]
+    line_dimensions[begin:end, 0] = numpy.tile(polygon.lineWidths, (1, 2)).reshape((-1, 1))[needed_points_list.ravel()][:, 0]
+    line_dimensions[begin:end, 1] = numpy.tile(polygon.lineThicknesses, (1, 2)).reshape((-1, 1))[needed_points_list.ravel()][:, 0]
+    feedrates[begin:end] = numpy.tile(polygon.lineFeedrates, (1, 2)).reshape((-1, 1))[needed_points_list.ravel()][:, 0]
+    extruders[begin:end] = polygon.extruder
+    line_types[begin:end] = numpy.tile(types, (1, 2)).reshape((-1, 1))[needed_points_list.ravel()][:, 0]
+    return end
+
+
+def create_polygons(segment_count: int, segments_per_polygon: int):
+    rng = numpy.random.default_rng(0)
+    polygons = []
+    for _ in range(segment_count // segments_per_polygon):
+        # Runs of equal line types, like the engine produces.
+        types = numpy.repeat(rng.integers(0, 15, segments_per_polygon // 10 + 1, dtype = numpy.uint8), 10)[:segments_per_polygon]
+        polygon = LayerPolygon(0, types.reshape((-1, 1)),
+                               rng.random((segments_per_polygon + 1, 3), dtype = numpy.float32),
+                               rng.random((segments_per_polygon, 1), dtype = numpy.float32),
+                               rng.random((segments_per_polygon, 1), dtype = numpy.float32),
+                               rng.random((segments_per_polygon, 1), dtype = numpy.float32))
+        polygon.buildCache()
+        polygons.append(polygon)
+    return polygons
+
+
+def measure(name, polygons, build_function) -> None:
+    vertex_count = sum(polygon.lineMeshVertexCount() for polygon in polygons)
+    index_count = sum(polygon.lineMeshElementCount() for polygon in polygons)
+    arrays = (numpy.empty((vertex_count, 3), numpy.float32), numpy.empty((vertex_count, 4), numpy.float32),
+              numpy.empty((vertex_count, 2), numpy.float32), numpy.empty(vertex_count, numpy.float32),
+              numpy.empty(vertex_count, numpy.float32), numpy.empty(vertex_count, numpy.float32))
+    indices = numpy.empty((index_count, 2), numpy.int32)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    vertex_offset = 0
+    index_offset = 0
+    for polygon in polygons:
+        if build_function is None:
+            polygon.build(vertex_offset, index_offset, *arrays, indices)
+            vertex_offset += polygon.lineMeshVertexCount()
+            index_offset += polygon.lineMeshElementCount()
+        else:
+            vertex_offset = build_function(polygon, vertex_offset, *arrays)
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("{name}: {duration:.2f}s, peak temporary memory {peak:.1f} MB".format(name = name, duration = duration, peak = peak / 1024 / 1024))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--segments", type = int, default = 10_000_000, help = "Total number of line segments.")
+    parser.add_argument("--segments-per-polygon", type = int, default = 100_000)
+    args = parser.parse_args()
+
+    color_map = numpy.linspace(0, 1, 15 * 4).reshape((15, 4))
+    with patch("cura.LayerPolygon.LayerPolygon.getColorMap", return_value = color_map):
+        polygons = create_polygons(args.segments, args.segments_per_polygon)
+        measure("tiled", polygons, legacy_build)
+        for polygon in polygons:
+            polygon.buildCache()
+        measure("fused", polygons, None)
+
+
+if __name__ == "__main__":
+    main()
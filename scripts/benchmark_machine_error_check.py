@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+"""Measures how long the setting error check takes after changing a single setting.
+
+The setting definitions of fdmprinter are loaded into extruder stacks, and the settings are validated with the
+MachineErrorChecker like in Cura: first all settings in every stack, as when the machine changes, and then for every
+changed setting only that setting and the settings that depend on it. Slicing waits for the check, plus the delay of
+its timer after the last change. Run it from the root of the repository.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Iterable, List
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from UM.Settings.ContainerStack import ContainerStack
+from UM.Settings.DefinitionContainer import DefinitionContainer
+
+from cura.CuraApplication import CuraApplication
+from cura.Machines.MachineErrorChecker import MachineErrorChecker
+
+
+def load_definition(file_name: str) -> DefinitionContainer:
+    CuraApplication._initializeSettingDefinitions()  # The properties and setting types that Cura adds.
+    definition = DefinitionContainer(os.path.splitext(os.path.splitext(os.path.basename(file_name))[0])[0])
+    with open(file_name, encoding = "utf-8") as f:
+        definition.deserialize(f.read(), file_name)
+    return definition
+
+
+def create_stacks(definition: DefinitionContainer, count: int) -> List[ContainerStack]:
+    stacks = []
+    for position in range(count):
+        stack = ContainerStack("extruder_{position}".format(position = position))
+        stack.addContainer(definition)
+        stacks.append(stack)
+    return stacks
+
+
+def time_check(stacks: List[ContainerStack], keys: Iterable[str], repeat: int) -> float:
+    """Validate the settings in every stack like the MachineErrorChecker does, and get the median time it took, in seconds."""
+
+    keys = list(keys)
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for stack in stacks:
+            for key in keys:
+                MachineErrorChecker._hasError(stack, key)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--definition", default = os.path.join("resources", "definitions", "fdmprinter.def.json"), help = "The definition file with the settings.")
+    parser.add_argument("--keys", nargs = "+", default = ["layer_height", "infill_sparse_density", "wall_thickness", "speed_print", "material_print_temperature", "retraction_amount", "support_enable", "adhesion_type"],
+                        help = "The settings to change.")
+    parser.add_argument("--extruders", type = int, default = 2, help = "Number of extruder stacks to check.")
+    parser.add_argument("--repeat", type = int, default = 5, help = "Number of times to measure every check. The median is reported.")
+    args = parser.parse_args()
+
+    definition = load_definition(args.definition)
+    stacks = create_stacks(definition, args.extruders)
+    delay = 0.1  # The interval of the timer of the MachineErrorChecker.
+
+    def get_definition(key: str):
+        definitions = definition.findDefinitions(key = key)
+        return definitions[0] if definitions else None
+
+    all_keys = definition.getAllKeys()
+    duration = time_check(stacks, all_keys, args.repeat)
+    checks = len(all_keys) * len(stacks)
+    print("All settings: {checks} checks in {duration:.3f}s ({per_check:.0f}us per check), {time:.3f}s to slice".format(
+        checks = checks, duration = duration, per_check = duration / checks * 1e6, time = delay + duration))
+    for key in args.keys:
+        start = time.perf_counter()
+        dependents = MachineErrorChecker.findDependents(key, get_definition)
+        find_duration = time.perf_counter() - start
+        duration = time_check(stacks, {key} | dependents, args.repeat)
+        checks = (len(dependents) + 1) * len(stacks)
+        print("{key}: {dependents} dependent settings ({find_duration:.1f}ms to find), {checks} checks in {duration:.3f}s, {time:.3f}s to slice".format(
+            key = key, dependents = len(dependents), find_duration = find_duration * 1000, checks = checks, duration = duration, time = delay + find_duration + duration))
+
+
+if __name__ == "__main__":
+    main()
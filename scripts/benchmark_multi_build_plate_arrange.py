@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+"""Measures how well and how fast objects are packed on multiple build plates.
+
+For every number of objects it packs random rectangles, the bounding boxes of the convex hulls that the
+MultiBuildPlateArrange packs, and reports the number of build plates used against the lower bound from the total area,
+the fraction of the area of the used build plates that is covered, and the time it took. Run it from the root of the
+repository.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cura.Arranging.RectanglePacker import packOnBuildPlates
+
+
+def create_sizes(object_count: int, min_size: float, max_size: float):
+    random.seed(0)
+    return [(random.uniform(min_size, max_size), random.uniform(min_size, max_size)) for _ in range(object_count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--counts", type = int, nargs = "+", default = [100, 300, 1000, 3000], help = "Numbers of objects to measure with.")
+    parser.add_argument("--plate-size", type = float, nargs = 2, default = [220.0, 220.0], help = "Width and depth of the build plates, in mm.")
+    parser.add_argument("--object-size", type = float, nargs = 2, default = [5.0, 60.0], help = "Minimum and maximum size of the objects, in mm.")
+    parser.add_argument("--lock-rotation", action = "store_true", help = "Don't turn objects by 90 degrees.")
+    args = parser.parse_args()
+
+    plate_width, plate_depth = args.plate_size
+    for object_count in args.counts:
+        sizes = create_sizes(object_count, *args.object_size)
+        start = time.perf_counter()
+        placements = packOnBuildPlates(sizes, plate_width, plate_depth, allow_rotation = not args.lock_rotation)
+        duration = time.perf_counter() - start
+
+        placed = [(size, placement) for size, placement in zip(sizes, placements) if placement is not None]
+        plate_count = max((placement.build_plate for _, placement in placed), default = -1) + 1
+        covered_area = sum(width * depth for (width, depth), _ in placed)
+        lower_bound = math.ceil(sum(width * depth for width, depth in sizes) / (plate_width * plate_depth))
+        utilisation = covered_area / (plate_count * plate_width * plate_depth) if plate_count > 0 else 0.0
+        print("{count} objects: {plates} build plates (at least {lower_bound}), {utilisation:.1%} utilisation, {not_placed} not placed, {duration:.3f}s ({per_object:.0f}us per object)".format(
+            count = object_count, plates = plate_count, lower_bound = lower_bound, utilisation = utilisation, not_placed = object_count - len(placed),
+            duration = duration, per_object = duration / object_count * 1e6))
+
+
+if __name__ == "__main__":
+    main()
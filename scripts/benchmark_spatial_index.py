@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+"""Measures how the time to find the objects with overlapping convex hulls grows with the number of objects.
+
+It compares comparing every pair of objects, like the push-apart pass of PlatformPhysics did before, with finding the
+neighbours of every object in a SpatialIndex. With the index the time should grow about linearly with the number of
+objects. Run it from the root of the repository.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cura.Scene.SpatialIndex import SpatialIndex
+
+
+def create_bounds(object_count: int, object_size: float):
+    """Spread objects over a build plate of which the area grows with the number of objects, like a full plate."""
+
+    random.seed(0)
+    plate_size = (object_count ** 0.5) * object_size * 1.5
+    bounds = []
+    for _ in range(object_count):
+        x = random.uniform(0, plate_size)
+        y = random.uniform(0, plate_size)
+        bounds.append((x, y, x + random.uniform(0.5, 1) * object_size, y + random.uniform(0.5, 1) * object_size))
+    return bounds
+
+
+def brute_force(bounds) -> int:
+    overlaps = 0
+    for index, (min_x, min_y, max_x, max_y) in enumerate(bounds):
+        for other_index, (other_min_x, other_min_y, other_max_x, other_max_y) in enumerate(bounds):
+            if index != other_index and other_min_x <= max_x and min_x <= other_max_x and other_min_y <= max_y and min_y <= other_max_y:
+                overlaps += 1
+    return overlaps
+
+
+def indexed(bounds, cell_size: float) -> int:
+    index = SpatialIndex(cell_size)
+    for item, item_bounds in enumerate(bounds):
+        index.update(item, item_bounds)
+    overlaps = 0
+    for item, item_bounds in enumerate(bounds):
+        overlaps += sum(1 for other_item in index.query(item_bounds) if other_item != item)
+    return overlaps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--counts", type = int, nargs = "+", default = [100, 200, 400, 800, 1600], help = "Numbers of objects to measure with.")
+    parser.add_argument("--object-size", type = float, default = 20.0, help = "Size of the objects, in mm.")
+    args = parser.parse_args()
+
+    for object_count in args.counts:
+        bounds = create_bounds(object_count, args.object_size)
+        start = time.perf_counter()
+        brute_force_overlaps = brute_force(bounds)
+        brute_force_duration = time.perf_counter() - start
+        start = time.perf_counter()
+        indexed_overlaps = indexed(bounds, args.object_size)
+        indexed_duration = time.perf_counter() - start
+        assert brute_force_overlaps == indexed_overlaps
+        print("{count} objects: all pairs {brute_force:.3f}s, spatial index {indexed:.3f}s ({per_object:.1f}us per object)".format(
+            count = object_count, brute_force = brute_force_duration, indexed = indexed_duration, per_object = indexed_duration / object_count * 1e6))
+
+
+if __name__ == "__main__":
+    main()
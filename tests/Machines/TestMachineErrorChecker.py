@@ -0,0 +1,173 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from UM.Settings.SettingRelation import RelationType
+from UM.Settings.Validator import ValidatorState
+
+from cura.Machines.MachineErrorChecker import MachineErrorChecker
+
+
+def createDefinitions(relations):
+    """Create mock setting definitions with relations between them.
+
+    :param relations: Tuples of the key of a setting, the key of a setting that depends on it, and the relation type.
+    """
+
+    definitions = {}
+    for key, target_key, _ in relations:
+        for setting_key in (key, target_key):
+            if setting_key not in definitions:
+                definition = MagicMock()
+                definition.key = setting_key
+                definition.relations = []
+                definitions[setting_key] = definition
+    for key, target_key, relation_type in relations:
+        relation = MagicMock()
+        relation.type = relation_type
+        relation.target = definitions[target_key]
+        definitions[key].relations.append(relation)
+    return definitions
+
+
+def test_findDependentsTransitive():
+    definitions = createDefinitions([
+        ("layer_height", "layer_height_0", RelationType.RequiredByTarget),
+        ("layer_height_0", "initial_layer_speed", RelationType.RequiredByTarget),
+        ("layer_height_0", "layer_height", RelationType.RequiresTarget),  # Reverse relations don't count.
+        ("initial_layer_speed", "layer_height", RelationType.RequiredByTarget),  # A cycle back to the changed setting.
+        ("infill_sparse_density", "infill_line_distance", RelationType.RequiredByTarget)
+    ])
+
+    assert MachineErrorChecker.findDependents("layer_height", definitions.get) == {"layer_height_0", "initial_layer_speed"}
+    assert MachineErrorChecker.findDependents("infill_line_distance", definitions.get) == set()
+
+
+def test_findDependentsUnknownSetting():
+    assert MachineErrorChecker.findDependents("does_not_exist", lambda key: None) == set()
+
+
+def createStack(stack_id, keys, error_keys):
+    """Create a mock extruder stack of which the settings in error_keys have errors. Change error_keys to fix them."""
+
+    stack = MagicMock()
+    stack.getId.return_value = stack_id
+    stack.getAllKeys.return_value = set(keys)
+
+    def getProperty(key, property_name):
+        if property_name == "enabled":
+            return True
+        if property_name == "validationState":
+            return ValidatorState.MinimumError if key in error_keys else ValidatorState.Valid
+    stack.getProperty.side_effect = getProperty
+    return stack
+
+
+@pytest.fixture
+def error_keys():
+    return {"extruder_0": set(), "extruder_1": set()}
+
+
+@pytest.fixture
+def error_checker(application, error_keys):
+    keys = ["layer_height", "layer_height_0", "infill_sparse_density"]
+    definitions = createDefinitions([("layer_height", "layer_height_0", RelationType.RequiredByTarget)])
+    global_stack = MagicMock()
+    global_stack.extruderList = [createStack(stack_id, keys, stack_error_keys) for stack_id, stack_error_keys in error_keys.items()]
+    global_stack.getSettingDefinition.side_effect = definitions.get
+    application.getMachineManager.return_value.activeMachine = global_stack
+
+    with patch("cura.CuraApplication.CuraApplication.getInstance", MagicMock(return_value = application)):
+        checker = MachineErrorChecker()
+    checker._error_check_timer = MagicMock()  # The timer is triggered by calling _rescheduleCheck.
+    checker._max_check_time_per_update = 10
+    return checker
+
+
+def finishCheck(checker):
+    """Do what the calls on the main thread would do, until the check in progress is finished."""
+
+    while checker._check_in_progress:
+        checker._checkStack()
+
+
+def runCheck(checker):
+    """Do what the timer and the calls on the main thread would do, until the check is finished."""
+
+    checker._rescheduleCheck()
+    finishCheck(checker)
+
+
+def test_incrementalCheckKeepsAndRemovesErrors(error_checker, error_keys):
+    error_keys["extruder_0"].add("layer_height_0")
+    error_checker.startErrorCheck()
+    runCheck(error_checker)
+    assert error_checker.hasError
+    assert error_checker.getErrorKeys() == {"layer_height_0"}
+
+    # The setting with the error isn't checked again, so its error is kept.
+    error_checker.startErrorCheckPropertyChanged("infill_sparse_density", "value")
+    error_checker._rescheduleCheck()
+    assert {key for _, key in error_checker._stacks_and_keys_to_check} == {"infill_sparse_density"}
+    finishCheck(error_checker)
+    assert error_checker.hasError
+    assert error_checker.getErrorKeys() == {"layer_height_0"}
+
+    # The setting with the error depends on the changed setting, so it's checked again.
+    error_keys["extruder_0"].clear()
+    error_checker.startErrorCheckPropertyChanged("layer_height", "value")
+    runCheck(error_checker)
+    assert not error_checker.hasError
+    assert error_checker.getErrorKeys() == set()
+
+
+def test_interruptedCheckRequeuesUncheckedKeys(error_checker):
+    error_checker.startErrorCheck()
+    runCheck(error_checker)
+
+    error_checker.startErrorCheckPropertyChanged("layer_height", "value")
+    error_checker._rescheduleCheck()
+    error_checker._max_check_time_per_update = 0  # Check one key at a time.
+    error_checker._checkStack()
+    assert len(error_checker._stacks_and_keys_to_check) == 3
+
+    # Another setting changes while checking. The timer marks the check in progress to be discarded.
+    error_checker.startErrorCheckPropertyChanged("infill_sparse_density", "value")
+    error_checker._rescheduleCheck()
+    error_checker._checkStack()
+    assert not error_checker._check_in_progress
+    assert error_checker._keys_to_check == {"layer_height", "layer_height_0", "infill_sparse_density"}
+    assert not error_checker._check_all_keys
+
+    # If all settings were being checked, all of them are checked again.
+    error_checker.startErrorCheck()
+    error_checker._rescheduleCheck()
+    error_checker._checkStack()
+    error_checker.startErrorCheckPropertyChanged("infill_sparse_density", "value")
+    error_checker._rescheduleCheck()
+    error_checker._checkStack()
+    assert error_checker._check_all_keys
+
+
+def test_resultReadyFollowsNeedToWaitForResult(error_checker):
+    assert not error_checker.needToWaitForResult
+    assert error_checker.waitForResult(0)
+
+    error_checker.startErrorCheckPropertyChanged("layer_height", "enabled")  # Only changes of the value are checked.
+    assert not error_checker.needToWaitForResult
+    assert error_checker.waitForResult(0)
+
+    error_checker.startErrorCheckPropertyChanged("layer_height", "value")
+    assert error_checker.needToWaitForResult
+    assert not error_checker.waitForResult(0)
+
+    error_checker._rescheduleCheck()
+    assert error_checker.needToWaitForResult
+    assert not error_checker.waitForResult(0)
+
+    finishCheck(error_checker)
+    assert not error_checker.needToWaitForResult
+    assert error_checker.waitForResult(0)
@@ -1,10 +1,12 @@
 # Copyright (c) 2024 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
+import time
+
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from plugins.CuraEngineBackend.StartSliceJob import GcodeStartEndFormatter
+from plugins.CuraEngineBackend.StartSliceJob import GcodeStartEndFormatter, StartSliceJob
 
 
 class MockValueProvider:
@@ -316,3 +318,54 @@ def test_startEndGCode_replace(cura_application, extruder_manager, exception_typ
             formatter.format(original_gcode)
     else:
         assert formatter.format(original_gcode) == expected_gcode
+
+
+slice_settings = {
+    "extruder_nr": 0,
+    "machine_start_gcode": "M140 S{material_bed_temperature}\nM104 S{material_print_temperature}",
+    "machine_end_gcode": "M104 S0",
+    "machine_extruder_prestart_code": "",
+    "machine_extruder_start_code": "",
+    "machine_extruder_end_code": "",
+    "material_bed_temp_prepend": True,
+    "material_print_temp_prepend": True,
+    "material_bed_temperature": 60.0,
+    "material_print_temperature": 200.0,
+    "speed_travel": 150.0
+}
+
+def createSettingStack(metadata):
+    stack = MagicMock()
+    stack.getId = MagicMock(return_value = "stack")
+    stack.getAllKeys = MagicMock(return_value = set(slice_settings))
+    stack.getProperty = MagicMock(side_effect = lambda key, property_name: slice_settings.get(key))
+    stack.getMetaDataEntry = MagicMock(side_effect = lambda key, default = None: metadata.get(key, default))
+    for container in (stack.material, stack.quality, stack.qualityChanges):
+        container.getMetaDataEntry = MagicMock(side_effect = lambda key, default = None: default)
+    return stack
+
+def buildSliceFingerprint(clock):
+    """Build the settings of a slice message as if it's the given time, and get its fingerprint."""
+
+    global_stack = createSettingStack({})
+    extruder_stack = createSettingStack({"position": "0"})
+    application = MagicMock()
+    application.getGlobalContainerStack = MagicMock(return_value = global_stack)
+    application.getExtruderManager().getInitialExtruderNr = MagicMock(return_value = 0)
+    extruder_manager = MagicMock()
+    extruder_manager.getActiveExtruderStacks = MagicMock(return_value = [extruder_stack])
+    strftime = time.strftime
+
+    with patch("plugins.CuraEngineBackend.StartSliceJob.CuraApplication.getInstance", MagicMock(return_value = application)), \
+            patch("plugins.CuraEngineBackend.StartSliceJob.ExtruderManager.getInstance", MagicMock(return_value = extruder_manager)), \
+            patch("plugins.CuraEngineBackend.StartSliceJob.QCoreApplication"), \
+            patch("time.strftime", lambda time_format: strftime(time_format, time.localtime(clock))):
+        job = StartSliceJob(MagicMock())
+        job._buildGlobalSettingsMessage(global_stack)
+        job._buildExtruderMessage(extruder_stack)
+    return job.getSliceFingerprint()
+
+def test_sliceFingerprintIgnoresClock():
+    now = time.time()
+    assert buildSliceFingerprint(now) == buildSliceFingerprint(now + 1)  # A second later.
+    assert buildSliceFingerprint(now) == buildSliceFingerprint(now + 24 * 60 * 60)  # Another day.
@@ -0,0 +1,77 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+
+from cura.Settings.BundledMetadataIndex import BundledMetadataIndex
+
+
+def createResources(root):
+    os.makedirs(os.path.join(root, "definitions"))
+    os.makedirs(os.path.join(root, "quality", "some_printer"))
+    with open(os.path.join(root, "definitions", "some_printer.def.json"), "w") as f:
+        f.write("{}")
+    with open(os.path.join(root, "quality", "some_printer", "some_printer_normal.inst.cfg"), "w") as f:
+        f.write("[general]")
+    with open(os.path.join(root, "quality", "some_printer", "README.txt"), "w") as f:
+        f.write("Not a container.")
+
+
+def test_findContainerFiles(tmp_path):
+    createResources(str(tmp_path))
+
+    files = BundledMetadataIndex.findContainerFiles([str(tmp_path)])
+
+    assert files == {
+        "some_printer": os.path.join(str(tmp_path), "definitions", "some_printer.def.json"),
+        "some_printer_normal": os.path.join(str(tmp_path), "quality", "some_printer", "some_printer_normal.inst.cfg")
+    }
+
+
+def test_resourceHashChangesWithFiles(tmp_path):
+    createResources(str(tmp_path))
+    files = BundledMetadataIndex.findContainerFiles([str(tmp_path)])
+    resource_hash = BundledMetadataIndex.computeResourceHash(files, "5.0.0")
+
+    assert BundledMetadataIndex.computeResourceHash(files, "5.0.0") == resource_hash
+    assert BundledMetadataIndex.computeResourceHash(files, "5.1.0") != resource_hash
+
+    with open(files["some_printer"], "w") as f:
+        f.write("{\"version\": 2}")
+    assert BundledMetadataIndex.computeResourceHash(files, "5.0.0") != resource_hash
+
+
+def test_writeAndLoad(tmp_path):
+    file_name = os.path.join(str(tmp_path), "cache", "bundled_metadata.index")
+    metadata = {
+        "some_printer": {"id": "some_printer", "name": "Some Printer", "setting_version": "25", "container_type": BundledMetadataIndex},
+        "some_printer_normal": {"id": "some_printer_normal", "type": "quality", "weight": -2}
+    }
+    files = {
+        "some_printer": os.path.join(str(tmp_path), "definitions", "some_printer.def.json"),
+        "some_printer_normal": os.path.join(str(tmp_path), "quality", "some_printer_normal.inst.cfg")
+    }
+    BundledMetadataIndex(file_name).write("some_hash", metadata, files)
+
+    index = BundledMetadataIndex(file_name)
+    assert index.load("some_hash")
+    assert sorted(index.getContainerIds()) == ["some_printer", "some_printer_normal"]
+    assert index.hasMetadata("some_printer", files["some_printer"])
+    assert not index.hasMetadata("some_printer", os.path.join(str(tmp_path), "user", "some_printer.def.json"))  # A container with the same ID in another file.
+    assert index.getMetadata("some_printer") == metadata["some_printer"]
+    assert index.getMetadata("some_printer_normal") == metadata["some_printer_normal"]
+    assert index.getMetadata("other_printer") is None
+    index.close()
+
+    assert not index.load("other_hash")  # The bundled files changed.
+    assert index.getMetadata("some_printer") is None
+
+
+def test_loadInvalidFile(tmp_path):
+    file_name = os.path.join(str(tmp_path), "bundled_metadata.index")
+    index = BundledMetadataIndex(file_name)
+    assert not index.load("some_hash")  # Doesn't exist yet.
+
+    with open(file_name, "wb") as f:
+        f.write(b"Not an index.")
+    assert not index.load("some_hash")
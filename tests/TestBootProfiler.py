@@ -0,0 +1,94 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import json
+import os
+import time
+
+from cura.Utils.BootProfiler import BootProfiler, profileBoot
+
+
+def test_measureWithoutRecording():
+    profiler = BootProfiler()
+    with profiler.measure("initialize"):
+        pass
+    assert profiler.getSpans() == []
+
+
+def test_measureNested():
+    profiler = BootProfiler()
+    profiler.start()
+    with profiler.measure("initialize"):
+        with profiler.measure("load plugins"):
+            time.sleep(0.02)
+        with profiler.measure("load plugins"):
+            time.sleep(0.01)
+        time.sleep(0.01)
+
+    spans = profiler.getSpans()
+    assert [span.path for span in spans] == [("initialize", ), ("initialize", "load plugins"), ("initialize", "load plugins")]
+    outer = spans[0]
+    assert outer.duration >= spans[1].duration + spans[2].duration
+    assert abs(outer.self_duration - (outer.duration - spans[1].duration - spans[2].duration)) < 1e-6
+
+    top_offenders = profiler.getTopOffenders(1)
+    assert top_offenders[0][0] == "load plugins"  # The two spans are counted together.
+
+
+def test_toFoldedStacks():
+    profiler = BootProfiler()
+    profiler.start()
+    with profiler.measure("initialize"):
+        with profiler.measure("import plugin SolidView"):
+            pass
+
+    lines = profiler.toFoldedStacks().splitlines()
+    assert [line.rsplit(" ", 1)[0] for line in lines] == ["initialize", "initialize;import_plugin_SolidView"]
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_instrument():
+    class PluginRegistry:
+        def loadPlugin(self, plugin_id):
+            return plugin_id.lower()
+
+    profiler = BootProfiler()
+    profiler.start()
+    registry = PluginRegistry()
+    profiler.instrument(registry, "loadPlugin", lambda plugin_id: "load plugin " + plugin_id)
+
+    assert registry.loadPlugin("SolidView") == "solidview"
+    assert [span.name for span in profiler.getSpans()] == ["load plugin SolidView"]
+
+
+def test_profileBoot():
+    @profileBoot()
+    def initialize():
+        return 42
+
+    profiler = BootProfiler.getInstance()
+    profiler.start()
+    try:
+        assert initialize() == 42
+    finally:
+        profiler.stop()
+    assert [span.name for span in profiler.getSpans()] == ["test_profileBoot.<locals>.initialize"]
+
+
+def test_finish(tmp_path):
+    profiler = BootProfiler()
+    profiler.start()
+    with profiler.measure("initialize", phase = 1):
+        pass
+    report_path = os.path.join(str(tmp_path), "boot_profile")
+    profiler.finish(report_path)
+
+    assert not profiler.isRecording()
+    with open(report_path + ".json") as f:
+        trace = json.load(f)
+    assert [event["args"] for event in trace["traceEvents"] if event["ph"] == "X"] == [{"phase": 1}]
+    assert os.path.exists(report_path + ".folded")
+
+    with profiler.measure("after finishing"):
+        pass
+    assert len(profiler.getSpans()) == 1
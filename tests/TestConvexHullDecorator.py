@@ -1,9 +1,13 @@
 import copy
+import math
 from unittest.mock import patch, MagicMock
 
+import numpy
 import pytest
 
 from UM.Math.Polygon import Polygon
+from UM.Math.Quaternion import Quaternion
+from UM.Math.Vector import Vector
 from UM.Mesh.MeshBuilder import MeshBuilder
 from UM.Scene.GroupDecorator import GroupDecorator
 from UM.Scene.SceneNode import SceneNode
@@ -164,6 +168,59 @@ def test_compute2DConvexHullMeshData(convex_hull_decorator):
     assert convex_hull_decorator._compute2DConvexHull() == Polygon([[5.0, -5.0], [-5.0, -5.0], [-5.0, 5.0], [5.0, 5.0]])
 
 
+def test_compute2DConvexHullMeshDataTransformed(convex_hull_decorator):
+    node = SceneNode()
+    mb = MeshBuilder()
+    mb.addCube(10, 10, 20)
+    node.setMeshData(mb.build())
+
+    convex_hull_decorator._getSettingProperty = MagicMock(return_value = 0)
+
+    with patch("UM.Application.Application.getInstance", MagicMock(return_value=mocked_application)):
+        convex_hull_decorator.setNode(node)
+
+    mocked_stack = MagicMock()
+    mocked_stack.getProperty = MagicMock(return_value=1)
+    convex_hull_decorator._global_stack = mocked_stack
+
+    # Moved and turned around the vertical axis, so the hull in the coordinates of the mesh is transformed.
+    node.setPosition(Vector(20, 0, 30))
+    node.rotate(Quaternion.fromAngleAxis(math.pi / 2, Vector.Unit_Y))
+    points = convex_hull_decorator._compute2DConvexHull().getPoints()
+    assert convex_hull_decorator._2d_convex_hull_local is not None
+    assert numpy.allclose(points.min(axis = 0), [10, 25])
+    assert numpy.allclose(points.max(axis = 0), [30, 35])
+
+    # Tilted, so the hull is computed from the transformed vertices.
+    node.rotate(Quaternion.fromAngleAxis(math.pi / 4, Vector.Unit_X))
+    assert convex_hull_decorator._transformLocal2DConvexHull(node.getMeshData(), node.getWorldTransformation()) is None
+    expected = convex_hull_decorator._computeProjected2DConvexHull(node.getMeshData().getConvexHullTransformedVertices(node.getWorldTransformation()))
+    assert convex_hull_decorator._compute2DConvexHull() == expected
+
+
+def test_compute2DConvexHullMeshDataScaled(convex_hull_decorator):
+    node = SceneNode()
+    mb = MeshBuilder()
+    mb.addCube(0.14, 0.14, 0.14)
+    node.setMeshData(mb.build())
+
+    convex_hull_decorator._getSettingProperty = MagicMock(return_value = 0)
+
+    with patch("UM.Application.Application.getInstance", MagicMock(return_value=mocked_application)):
+        convex_hull_decorator.setNode(node)
+
+    mocked_stack = MagicMock()
+    mocked_stack.getProperty = MagicMock(return_value=1)
+    convex_hull_decorator._global_stack = mocked_stack
+
+    # The hull in the coordinates of the mesh is scaled up, so it may not be rounded like the hull on the build plate.
+    node.setScale(Vector(100, 100, 100))
+    points = convex_hull_decorator._compute2DConvexHull().getPoints()
+    assert convex_hull_decorator._2d_convex_hull_local is not None
+    assert numpy.allclose(points.min(axis = 0), [-7, -7], atol = 0.01)
+    assert numpy.allclose(points.max(axis = 0), [7, 7], atol = 0.01)
+
+
 def test_compute2DConvexHullMeshDataGrouped(convex_hull_decorator):
     parent_node = SceneNode()
     parent_node.addDecorator(GroupDecorator())
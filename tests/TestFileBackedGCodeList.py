@@ -0,0 +1,66 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import copy
+
+import pytest
+
+from cura.Scene.FileBackedGCodeList import FileBackedGCodeList
+from cura.Scene.GCodeListDecorator import GCodeListDecorator
+
+
+def test_appendAndRead():
+    gcode_list = FileBackedGCodeList()
+    gcode_list.append(";LAYER:0\nG1 X10 Y10\n")
+    gcode_list.append(";LAYER:1\nG1 X20 Y20 ; ünïcödé\n")
+    gcode_list.insert(0, ";FLAVOR:Marlin\n")
+
+    assert len(gcode_list) == 3
+    assert gcode_list[0] == ";FLAVOR:Marlin\n"
+    assert gcode_list[-1] == ";LAYER:1\nG1 X20 Y20 ; ünïcödé\n"
+    assert gcode_list[1:] == [";LAYER:0\nG1 X10 Y10\n", ";LAYER:1\nG1 X20 Y20 ; ünïcödé\n"]
+    assert "".join(gcode_list) == ";FLAVOR:Marlin\n;LAYER:0\nG1 X10 Y10\n;LAYER:1\nG1 X20 Y20 ; ünïcödé\n"
+
+
+def test_modify():
+    gcode_list = FileBackedGCodeList(["A\n", "B\n", "C\n"])
+    gcode_list[0] += ";POSTPROCESSED\n"
+    del gcode_list[1]
+    gcode_list[1:] = ["D\n", "E\n"]
+
+    assert gcode_list == ["A\n;POSTPROCESSED\n", "D\n", "E\n"]
+    assert gcode_list.fileSize() > len("".join(gcode_list))  # The replaced g-code is not removed from the file.
+
+
+def test_indexOutOfRange():
+    gcode_list = FileBackedGCodeList(["A\n"])
+    with pytest.raises(IndexError):
+        gcode_list[1]
+    with pytest.raises(IndexError):
+        gcode_list[-2] = "B\n"
+
+
+def test_readWhileAppending():
+    gcode_list = FileBackedGCodeList()
+    for layer_nr in range(100):
+        gcode_list.append(";LAYER:{layer_nr}\n".format(layer_nr = layer_nr))
+        assert gcode_list[layer_nr] == ";LAYER:{layer_nr}\n".format(layer_nr = layer_nr)  # Needs to map the grown file again.
+    assert list(gcode_list) == [";LAYER:{layer_nr}\n".format(layer_nr = layer_nr) for layer_nr in range(100)]
+
+
+def test_emptyItems():
+    gcode_list = FileBackedGCodeList(["", ""])
+    assert gcode_list == ["", ""]
+
+
+def test_close():
+    gcode_list = FileBackedGCodeList(["A\n"])
+    gcode_list.close()
+    assert len(gcode_list) == 0
+
+
+def test_inDecorator():
+    decorator = GCodeListDecorator()
+    decorator.setGCodeList(FileBackedGCodeList(["Test"]))
+    copied_decorator = copy.deepcopy(decorator)
+    assert copied_decorator.getGCodeList() == ["Test"]
@@ -1,5 +1,9 @@
 from unittest.mock import patch
 
+import numpy
+
+from UM.Math.Polygon import Polygon
+
 from cura.HitChecker import HitChecker
 from cura.OneAtATimeIterator import OneAtATimeIterator
 from cura.Scene.CuraSceneNode import CuraSceneNode
@@ -9,10 +13,10 @@ def test_anyTwoNodesBlockEachOther_True():
     node1 = CuraSceneNode(no_setting_override=True)
     node2 = CuraSceneNode(no_setting_override=True)
     # node1 and node2 block each other
-    hit_map = {
-        node1: {node1: 0, node2: 1},
-        node2: {node1: 1, node2: 0}
-    }
+    hit_map = numpy.array([
+        [0, 1],
+        [1, 0],
+    ], dtype = bool)
 
     with patch.object(HitChecker, "_buildHitMap", return_value=hit_map):
         hit_checker = HitChecker([node1, node2])
@@ -24,10 +28,10 @@ def test_anyTwoNodesBlockEachOther_False():
     node1 = CuraSceneNode(no_setting_override=True)
     node2 = CuraSceneNode(no_setting_override=True)
     # node1 blocks node2, but node2 doesn't block node1
-    hit_map = {
-        node1: {node1: 0, node2: 1},
-        node2: {node1: 0, node2: 0}
-    }
+    hit_map = numpy.array([
+        [0, 1],
+        [0, 0],
+    ], dtype = bool)
 
     with patch.object(HitChecker, "_buildHitMap", return_value=hit_map):
         hit_checker = HitChecker([node1, node2])
@@ -40,11 +44,11 @@ def test_canPrintBefore():
     node2 = CuraSceneNode(no_setting_override=True)
     node3 = CuraSceneNode(no_setting_override=True)
     # nodes can be printed only in order node1 -> node2 -> node3
-    hit_map = {
-        node1: {node1: 0, node2: 0, node3: 0},
-        node2: {node1: 1, node2: 0, node3: 0},
-        node3: {node1: 1, node2: 1, node3: 0},
-    }
+    hit_map = numpy.array([
+        [0, 0, 0],
+        [1, 0, 0],
+        [1, 1, 0],
+    ], dtype = bool)
 
     with patch.object(HitChecker, "_buildHitMap", return_value=hit_map):
         hit_checker = HitChecker([node1, node2, node3])
@@ -71,11 +75,11 @@ def test_canPrintAfter():
     node3 = CuraSceneNode(no_setting_override=True)
     
     # nodes can be printed only in order node1 -> node2 -> node3
-    hit_map = {
-        node1: {node1: 0, node2: 0, node3: 0},
-        node2: {node1: 1, node2: 0, node3: 0},
-        node3: {node1: 1, node2: 1, node3: 0},
-    }
+    hit_map = numpy.array([
+        [0, 0, 0],
+        [1, 0, 0],
+        [1, 1, 0],
+    ], dtype = bool)
 
     with patch.object(HitChecker, "_buildHitMap", return_value=hit_map):
         hit_checker = HitChecker([node1, node2, node3])
@@ -101,11 +105,11 @@ def test_calculateScore():
     node2 = CuraSceneNode(no_setting_override=True)
     node3 = CuraSceneNode(no_setting_override=True)
 
-    hit_map = {
-        node1: {node1: 0, node2: 0, node3: 0},  # sum is 0
-        node2: {node1: 1, node2: 0, node3: 0},  # sum is 1
-        node3: {node1: 1, node2: 1, node3: 0},  # sum is 2
-    }
+    hit_map = numpy.array([
+        [0, 0, 0],  # sum is 0
+        [1, 0, 0],  # sum is 1
+        [1, 1, 0],  # sum is 2
+    ], dtype = bool)
 
     with patch.object(HitChecker, "_buildHitMap", return_value=hit_map):
         hit_checker = HitChecker([node1, node2, node3])
@@ -125,11 +129,11 @@ def test_canPrintNodesInProvidedOrder():
     node3 = CuraSceneNode(no_setting_override=True)
 
     # nodes can be printed only in order node1 -> node2 -> node3
-    hit_map = {
-        node1: {node1: 0, node2: 0, node3: 0}, # 0
-        node2: {node1: 1, node2: 0, node3: 0}, # 1
-        node3: {node1: 1, node2: 1, node3: 0}, # 2
-    }
+    hit_map = numpy.array([
+        [0, 0, 0],  # 0
+        [1, 0, 0],  # 1
+        [1, 1, 0],  # 2
+    ], dtype = bool)
 
     with patch.object(HitChecker, "_buildHitMap", return_value=hit_map):
         hit_checker = HitChecker([node1, node2, node3])
@@ -138,4 +142,62 @@ def test_canPrintNodesInProvidedOrder():
         assert not hit_checker.canPrintNodesInProvidedOrder([node2, node1, node3])
         assert not hit_checker.canPrintNodesInProvidedOrder([node2, node3, node1])
         assert not hit_checker.canPrintNodesInProvidedOrder([node3, node1, node2])
-        assert not hit_checker.canPrintNodesInProvidedOrder([node3, node2, node1])
\ No newline at end of file
+        assert not hit_checker.canPrintNodesInProvidedOrder([node3, node2, node1])
+
+def test_getPrintOrder():
+    node1 = CuraSceneNode(no_setting_override=True)
+    node2 = CuraSceneNode(no_setting_override=True)
+    node3 = CuraSceneNode(no_setting_override=True)
+
+    # nodes can be printed only in order node1 -> node2 -> node3
+    hit_map = numpy.array([
+        [0, 0, 0],
+        [1, 0, 0],
+        [1, 1, 0],
+    ], dtype = bool)
+
+    with patch.object(HitChecker, "_buildHitMap", return_value=hit_map):
+        hit_checker = HitChecker([node1, node2, node3])
+        assert hit_checker.getPrintOrder([node3, node1, node2]) == [node1, node2, node3]
+        assert OneAtATimeIterator._getNodesOrderedAutomatically(hit_checker, [node3, node2, node1]) == [node1, node2, node3]
+
+
+def test_getPrintOrder_Cycle():
+    node1 = CuraSceneNode(no_setting_override=True)
+    node2 = CuraSceneNode(no_setting_override=True)
+    node3 = CuraSceneNode(no_setting_override=True)
+
+    # node1 must be printed before node2, node2 before node3 and node3 before node1
+    hit_map = numpy.array([
+        [0, 0, 1],
+        [1, 0, 0],
+        [0, 1, 0],
+    ], dtype = bool)
+
+    with patch.object(HitChecker, "_buildHitMap", return_value=hit_map):
+        hit_checker = HitChecker([node1, node2, node3])
+        assert not hit_checker.anyTwoNodesBlockEachOther([node1, node2, node3])
+        assert hit_checker.getPrintOrder([node1, node2, node3]) == []
+        assert OneAtATimeIterator._getNodesOrderedAutomatically(hit_checker, [node1, node2, node3]) == []
+
+
+def test_getPrintOrder_TakesLastPossibleNode():
+    nodes = [CuraSceneNode(no_setting_override=True) for _ in range(3)]
+    hit_map = numpy.zeros((3, 3), dtype = bool)  # Any order is possible.
+
+    with patch.object(HitChecker, "_buildHitMap", return_value=hit_map):
+        hit_checker = HitChecker(nodes)
+        assert hit_checker.getPrintOrder(nodes) == list(reversed(nodes))
+
+
+def test_intersectPolygons():
+    squares = [Polygon(numpy.array([[x, 0], [x + 10, 0], [x + 10, 10], [x, 10]], numpy.float32)) for x in (0, 5, 30)]
+    triangle = Polygon(numpy.array([[20, 0], [29, 0], [20, 9]], numpy.float32))
+    polygons = squares + [triangle]
+
+    result = HitChecker._intersectPolygons(polygons, polygons)
+
+    for index_a, polygon_a in enumerate(polygons):
+        for index_b, polygon_b in enumerate(polygons):
+            assert result[index_a, index_b] == bool(polygon_a.intersectsPolygon(polygon_b))
+    assert result[0, 1] and not result[0, 2] and not result[2, 3]
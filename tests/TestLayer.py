@@ -1,3 +1,6 @@
+import numpy
+import pytest
+
 from cura.Layer import Layer
 from unittest.mock import MagicMock
 
@@ -37,3 +40,17 @@ def test_elementCount():
     layer.polygons.append(layer_polygon)
     assert layer.build(0, 0, [], [], [], [], [] ,[] , []) == (9001, 9002)
     assert layer.elementCount == 12
+
+
+def test_cumulativeLineDuration():
+    layer = Layer(0)
+    for line_lengths, line_feedrates in (([10.0, 20.0], [[5.0], [10.0]]), ([3.0], [[0.0]])):
+        layer_polygon = MagicMock()
+        layer_polygon.lineLengths = numpy.array(line_lengths)
+        layer_polygon.lineFeedrates = numpy.array(line_feedrates)
+        layer.polygons.append(layer_polygon)
+
+    # The durations of the lines, plus an extra path for every tool change. A feedrate of 0 gives an arbitrary duration.
+    numpy.testing.assert_allclose(layer.cumulativeLineDuration(), [2.0, 4.0, 4.0, 4.1, 4.1])
+    assert layer.duration == pytest.approx(4.1)
+    assert Layer(1).duration == 0.0
@@ -0,0 +1,113 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import patch
+
+import numpy
+import pytest
+
+from cura.LayerDataBuilder import LayerDataBuilder
+from cura.LayerPolygon import LayerPolygon
+
+color_map = numpy.linspace(0, 1, 15 * 4, dtype = numpy.float32).reshape((15, 4))
+material_color_map = numpy.array([[1, 0, 0, 1], [0, 1, 0, 1]], dtype = numpy.float32)
+
+
+def createBuilder(layer_numbers):
+    random = numpy.random.default_rng(0)
+    builder = LayerDataBuilder()
+    for layer_number in layer_numbers:
+        builder.addLayer(layer_number)
+        for _ in range(3):
+            line_count = int(random.integers(1, 20))
+            polygon = LayerPolygon(int(random.integers(0, 2)),
+                                   random.integers(0, 15, (line_count, 1)).astype(numpy.uint8),
+                                   random.random((line_count + 1, 3), dtype = numpy.float32),
+                                   random.random((line_count, 1), dtype = numpy.float32),
+                                   random.random((line_count, 1), dtype = numpy.float32),
+                                   random.random((line_count, 1), dtype = numpy.float32))
+            polygon.buildCache()
+            builder.getLayer(layer_number).polygons.append(polygon)
+    return builder
+
+
+def assertSameLayerData(expected, actual):
+    numpy.testing.assert_array_equal(expected.getVertices(), actual.getVertices())
+    numpy.testing.assert_array_equal(expected.getIndices(), actual.getIndices())
+    numpy.testing.assert_array_equal(expected.getColors(), actual.getColors())
+    for name in ("line_dimensions", "extruders", "colors", "line_types", "feedrates"):
+        numpy.testing.assert_array_equal(expected.getAttribute(name)["value"], actual.getAttribute(name)["value"])
+    assert expected.getElementCounts() == actual.getElementCounts()
+
+
+@pytest.fixture(autouse = True)
+def mockColorMap():
+    with patch("cura.LayerPolygon.LayerPolygon.getColorMap", return_value = color_map):
+        yield
+
+
+def test_buildIncrementally():
+    expected = createBuilder(range(10)).build(material_color_map, 0.5)
+
+    builder = createBuilder(range(10))
+    all_layers = dict(builder.getLayers())
+    builder.getLayers().clear()
+    for layer_number in range(10):
+        builder.getLayers()[layer_number] = all_layers[layer_number]
+        partial = builder.buildIncrementally(material_color_map, 0.5)
+        assert sorted(partial.getLayers()) == list(range(layer_number + 1))
+
+    assertSameLayerData(expected, builder.buildIncrementally(material_color_map, 0.5))
+
+
+def test_buildIncrementallyOutOfOrder():
+    expected = createBuilder(range(10)).build(material_color_map)
+
+    builder = createBuilder(range(10))
+    all_layers = dict(builder.getLayers())
+    builder.getLayers().clear()
+    builder.getLayers().update({layer_number: all_layers[layer_number] for layer_number in range(5, 10)})
+    builder.buildIncrementally(material_color_map)
+    builder.getLayers().update({layer_number: all_layers[layer_number] for layer_number in range(5)})
+
+    assertSameLayerData(expected, builder.buildIncrementally(material_color_map))
+
+
+def test_partialLayerDataIsNotChangedAfterwards():
+    builder = createBuilder(range(4))
+    all_layers = dict(builder.getLayers())
+    builder.getLayers().clear()
+    builder.getLayers()[0] = all_layers[0]
+    partial = builder.buildIncrementally(material_color_map)
+    vertices = partial.getVertices().copy()
+
+    builder.getLayers().update(all_layers)
+    builder.buildIncrementally(material_color_map)
+
+    numpy.testing.assert_array_equal(vertices, partial.getVertices())
+    assert list(partial.getLayers()) == [0]
+
+
+def test_rebuildDoesNotChangeEarlierLayerData():
+    builder = createBuilder(range(4))
+    first = builder.build(material_color_map)
+    polygon = first.getLayer(0).polygons[0]
+    polygon_range = (polygon.lineMeshVertexCount(), polygon._vertex_begin, polygon._index_begin)
+    element_counts = {layer_number: first.getLayer(layer_number).elementCount for layer_number in range(4)}
+
+    second = builder.build(material_color_map)
+
+    assert second.getLayer(0) is not first.getLayer(0)
+    assert (polygon.lineMeshVertexCount(), polygon._vertex_begin, polygon._index_begin) == polygon_range
+    assert {layer_number: first.getLayer(layer_number).elementCount for layer_number in range(4)} == element_counts
+    assertSameLayerData(first, second)
+
+
+def test_printTimeline():
+    layer_data = createBuilder([2, 0, 1]).build(material_color_map)
+
+    layer_numbers, layer_end_times = layer_data.getPrintTimeline()
+    assert list(layer_numbers) == [0, 1, 2]
+    numpy.testing.assert_allclose(layer_end_times, numpy.cumsum([layer_data.getLayer(layer_number).duration for layer_number in range(3)]))
+    # Scrubbing to a time in the second layer.
+    assert layer_numbers[numpy.searchsorted(layer_end_times, layer_end_times[0] + 0.001, side = "right")] == 1
@@ -0,0 +1,81 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import patch
+
+import numpy
+import pytest
+
+from cura.LayerPolygon import LayerPolygon
+
+color_map = numpy.linspace(0, 1, 15 * 4).reshape((15, 4))
+
+
+def createPolygon(line_count, seed = 0):
+    random = numpy.random.default_rng(seed)
+    polygon = LayerPolygon(1,
+                           random.integers(0, 15, (line_count, 1)).astype(numpy.uint8),
+                           random.random((line_count + 1, 3), dtype = numpy.float32),
+                           random.random((line_count, 1), dtype = numpy.float32),
+                           random.random((line_count, 1), dtype = numpy.float32),
+                           random.random((line_count, 1), dtype = numpy.float32))
+    polygon.buildCache()
+    return polygon
+
+
+def buildArrays(polygon, vertex_offset = 0):
+    vertex_count = vertex_offset + polygon.lineMeshVertexCount()
+    arrays = {
+        "vertices": numpy.zeros((vertex_count, 3), numpy.float32),
+        "colors": numpy.zeros((vertex_count, 4), numpy.float32),
+        "line_dimensions": numpy.zeros((vertex_count, 2), numpy.float32),
+        "feedrates": numpy.zeros(vertex_count, numpy.float32),
+        "extruders": numpy.zeros(vertex_count, numpy.float32),
+        "line_types": numpy.zeros(vertex_count, numpy.float32),
+        "indices": numpy.zeros((polygon.lineMeshElementCount(), 2), numpy.int32)
+    }
+    polygon.build(vertex_offset, 0, arrays["vertices"], arrays["colors"], arrays["line_dimensions"], arrays["feedrates"],
+                  arrays["extruders"], arrays["line_types"], arrays["indices"])
+    return arrays
+
+
+def legacyVertexArrays(polygon):
+    """The per-vertex arrays as they were computed by duplicating every attribute for the start and end of each line."""
+
+    types = polygon.types
+    needed_points = numpy.ones((len(types), 2), dtype = bool)
+    needed_points[1:, 0][:, numpy.newaxis] = types[1:] != types[:-1]
+    mask = needed_points.ravel()
+    index_list = (numpy.arange(len(types)).reshape((-1, 1)) + numpy.array([[0, 1]])).reshape((-1, 1))[needed_points.reshape((-1, 1))]
+    return {
+        "vertices": polygon.data[index_list, :],
+        "colors": numpy.tile(polygon.getColors(), (1, 2)).reshape((-1, 4))[mask],
+        "line_dimensions": numpy.stack((numpy.tile(polygon.lineWidths, (1, 2)).reshape((-1, 1))[mask][:, 0],
+                                        numpy.tile(polygon.lineThicknesses, (1, 2)).reshape((-1, 1))[mask][:, 0]), axis = 1),
+        "feedrates": numpy.tile(polygon.lineFeedrates, (1, 2)).reshape((-1, 1))[mask][:, 0],
+        "line_types": numpy.tile(types, (1, 2)).reshape((-1, 1))[mask][:, 0]
+    }
+
+
+@pytest.fixture(autouse = True)
+def mockColorMap():
+    with patch("cura.LayerPolygon.LayerPolygon.getColorMap", return_value = color_map):
+        yield
+
+
+@pytest.mark.parametrize("line_count", [1, 2, 50, 1000])
+def test_buildMatchesPerVertexDuplication(line_count):
+    expected = legacyVertexArrays(createPolygon(line_count))
+    arrays = buildArrays(createPolygon(line_count))
+
+    for name, expected_values in expected.items():
+        numpy.testing.assert_array_equal(arrays[name], expected_values.astype(numpy.float32), err_msg = name)
+    assert (arrays["extruders"] == 1).all()
+
+
+def test_buildWithOffset():
+    without_offset = buildArrays(createPolygon(100))
+    with_offset = buildArrays(createPolygon(100), vertex_offset = 10)
+
+    numpy.testing.assert_array_equal(with_offset["vertices"][10:], without_offset["vertices"])
+    numpy.testing.assert_array_equal(with_offset["indices"], without_offset["indices"] + 10)
@@ -0,0 +1,83 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import math
+from unittest.mock import MagicMock
+
+import numpy
+import pytest
+
+from cura.Arranging.Nest2DArrange import ArrangedItem, ArrangementResult, Nest2DArrange, _NestProblem, _getFootprint, _getPlacements, _nest, fewestBinsThenSmallestFootprint
+from cura.Utils.WorkerProcesses import canForkWorkerProcesses
+
+factor = 100
+
+
+def rectangle(width, depth):
+    return (numpy.array([[0, 0], [width, 0], [width, depth], [0, depth]]) * factor).astype(numpy.int64)
+
+
+def createProblem():
+    polygons = [rectangle(40, 30), rectangle(60, 20), rectangle(25, 25), rectangle(80, 10)]
+    return _NestProblem(polygons, [], [], 150 * factor, 120 * factor, int(1.5 * factor), factor)
+
+
+def createArranger(**kwargs):
+    return Nest2DArrange([], MagicMock(), factor = factor, **kwargs)
+
+
+def test_getFootprint():
+    problem = _NestProblem([rectangle(20, 10), rectangle(20, 10), rectangle(20, 10)], [], [], 100 * factor, 100 * factor, 0, factor)
+
+    # Only the objects on the first build plate count.
+    placements = [(0, 0.0, 0, 0), (0, 0.0, 40 * factor, 0), (1, 0.0, 500 * factor, 500 * factor)]
+    assert _getFootprint(problem, placements) == pytest.approx(60 * 10)
+
+    # The second object is turned a quarter, so it's 10 wide and 20 deep, at x from 30 to 40.
+    placements = [(0, 0.0, 0, 0), (0, math.pi / 2, 40 * factor, 0), (1, 0.0, 500 * factor, 500 * factor)]
+    assert _getFootprint(problem, placements) == pytest.approx(40 * 20)
+
+    assert _getFootprint(problem, [(1, 0.0, 0, 0)] * 3) == 0.0
+
+
+def test_fewestBinsThenSmallestFootprint():
+    compact_on_two = ArrangementResult("center", None, 2, 100.0, [])
+    spread_out_on_one = ArrangementResult("center", None, 1, 900.0, [])
+    compact_on_one = ArrangementResult("bottom_left", None, 1, 400.0, [])
+
+    assert fewestBinsThenSmallestFootprint(compact_on_one) == (1, 400.0)
+    assert min([compact_on_two, spread_out_on_one, compact_on_one], key = fewestBinsThenSmallestFootprint) is compact_on_one
+
+
+def test_arrangedItem():
+    item = ArrangedItem(1, 0.5, 200, -300)
+
+    assert item.binId() == 1
+    assert item.rotation() == 0.5
+    assert item.translation().x() == 200
+    assert item.translation().y() == -300
+    assert not item.isFixed()
+
+
+@pytest.mark.skipif(not canForkWorkerProcesses(), reason = "Worker processes can't be forked on this platform.")
+def test_workersFindSamePlacementAsInProcess():
+    problem = createProblem()
+    candidates = [(starting_point, None) for starting_point in Nest2DArrange.StartingPoints]
+
+    # With one strategy, both ways nest the objects in the same way.
+    in_process_fits, in_process_items = createArranger()._findFirstPlacement(problem, candidates[:1])
+    workers_fit, worker_items = createArranger(max_workers = 2)._findBestPlacementInWorkers(problem, candidates[:1])
+    assert workers_fit == in_process_fits
+    assert _getPlacements(worker_items) == _getPlacements(in_process_items)
+
+    # With all strategies, the workers take the best one by the objective, or the first one of equally good ones.
+    expected = None
+    for starting_point, rotations in candidates:
+        num_bins, node_items = _nest(problem, starting_point, rotations)
+        placements = _getPlacements(node_items)
+        result = ArrangementResult(starting_point, rotations, num_bins, _getFootprint(problem, placements), placements)
+        if expected is None or fewestBinsThenSmallestFootprint(result) < fewestBinsThenSmallestFootprint(expected):
+            expected = result
+    workers_fit, worker_items = createArranger(max_workers = 2)._findBestPlacementInWorkers(problem, candidates)
+    assert workers_fit == (expected.num_bins == 1)
+    assert _getPlacements(worker_items) == expected.placements
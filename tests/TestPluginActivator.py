@@ -0,0 +1,80 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from cura.PluginActivator import PluginActivator
+
+
+class PluginRegistry:
+    def __init__(self, metadata):
+        self._metadata = metadata
+        self.loaded_plugin_ids = []
+
+    def getMetaData(self, plugin_id):
+        return self._metadata[plugin_id]
+
+    def loadPlugin(self, plugin_id):
+        self.loaded_plugin_ids.append(plugin_id)
+
+    def loadPlugins(self):
+        for plugin_id in self._metadata:
+            self.loadPlugin(plugin_id)
+
+
+@pytest.fixture()
+def plugin_registry():
+    return PluginRegistry({
+        "STLReader": {"plugin": {"name": "STL Reader"}},
+        "X3DReader": {"plugin": {"name": "X3D Reader", "activation": {"file_extensions": ["x3d"]}}},
+        "MakerbotWriter": {"plugin": {"name": "Makerbot Printfile Writer", "activation": {"mime_types": ["application/x-makerbot"]}}},
+        "BrokenPlugin": {"plugin": {"name": "Broken", "activation": {"moon_phases": ["full"]}}}
+    })
+
+
+@pytest.fixture()
+def application(plugin_registry):
+    app = MagicMock()
+    app.getPluginRegistry = MagicMock(return_value = plugin_registry)
+    return app
+
+
+def test_deferTriggeredPlugins(application, plugin_registry):
+    activator = PluginActivator(application)
+    load_plugin = plugin_registry.loadPlugin
+
+    with activator.deferTriggeredPlugins():
+        plugin_registry.loadPlugins()
+
+    # Invalid triggers are loaded at start-up, and so are writers, since output devices need them from the start.
+    assert plugin_registry.loaded_plugin_ids == ["STLReader", "MakerbotWriter", "BrokenPlugin"]
+    assert activator.getDeferredPluginIds() == ["X3DReader"]
+    assert plugin_registry.loadPlugin == load_plugin  # Only changed while loading the plug-ins at start-up.
+
+
+def test_activateFileExtension(application, plugin_registry):
+    activator = PluginActivator(application)
+    with activator.deferTriggeredPlugins():
+        plugin_registry.loadPlugins()
+    plugin_registry.loaded_plugin_ids.clear()
+
+    activator.activateFileExtension("/models/benchy.stl")
+    assert plugin_registry.loaded_plugin_ids == []
+
+    activator.activateFileExtension("/models/BENCHY.X3D")
+    activator.activateFileExtension("/models/cube.x3d")
+    assert plugin_registry.loaded_plugin_ids == ["X3DReader"]  # Only once.
+    assert activator.getDeferredPluginIds() == []
+
+
+def test_activatePlugin(application, plugin_registry):
+    activator = PluginActivator(application)
+    with activator.deferTriggeredPlugins():
+        plugin_registry.loadPlugins()
+    plugin_registry.loaded_plugin_ids.clear()
+
+    activator.activatePlugin("STLReader")  # Not deferred, so loaded already.
+    activator.activatePlugin("X3DReader")
+    assert plugin_registry.loaded_plugin_ids == ["X3DReader"]
@@ -0,0 +1,64 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import random
+
+from cura.Arranging.RectanglePacker import RectanglePacker, packOnBuildPlates
+
+
+def overlaps(first, second) -> bool:
+    return first[0] < second[2] - 1e-9 and second[0] < first[2] - 1e-9 and first[1] < second[3] - 1e-9 and second[1] < first[3] - 1e-9
+
+
+def placedBounds(size, placement):
+    width, depth = (size[1], size[0]) if placement.rotated else size
+    return placement.x, placement.y, placement.x + width, placement.y + depth
+
+
+def test_fourQuartersFitOnOnePlate():
+    placements = packOnBuildPlates([(50, 50)] * 4, 100, 100)
+
+    assert all(placement is not None and placement.build_plate == 0 for placement in placements)
+    bounds = [placedBounds((50, 50), placement) for placement in placements]
+    assert not any(overlaps(bounds[i], bounds[j]) for i in range(4) for j in range(i))
+
+
+def test_rotation():
+    # A tall and a wide object only fit on one plate if one of them is turned.
+    sizes = [(100, 40), (40, 100)]
+    assert {placement.build_plate for placement in packOnBuildPlates(sizes, 100, 100)} == {0}
+    assert {placement.build_plate for placement in packOnBuildPlates(sizes, 100, 100, allow_rotation = False)} == {0, 1}
+
+
+def test_tooLarge():
+    placements = packOnBuildPlates([(150, 10), (10, 10)], 100, 100)
+    assert placements[0] is None
+    assert placements[1] is not None and placements[1].build_plate == 0
+
+    assert packOnBuildPlates([(80, 80)], 100, 100, common_obstacles = [(40, 40, 60, 60)]) == [None]
+
+
+def test_obstacles():
+    obstacle = (0, 0, 60, 100)  # Only a strip of 40mm is free on the first plate.
+    placements = packOnBuildPlates([(50, 50), (30, 30)], 100, 100, obstacles = {0: [obstacle]})
+
+    assert placements[0].build_plate == 1
+    assert placements[1].build_plate == 0
+    assert not overlaps(placedBounds((30, 30), placements[1]), obstacle)
+
+
+def test_noOverlaps():
+    random.seed(0)
+    sizes = [(random.uniform(5, 60), random.uniform(5, 60)) for _ in range(300)]
+    disallowed_area = (100, 100, 130, 130)
+    placements = packOnBuildPlates(sizes, 220, 220, common_obstacles = [disallowed_area])
+
+    plates = {}
+    for size, placement in zip(sizes, placements):
+        bounds = placedBounds(size, placement)
+        assert bounds[0] >= 0 and bounds[1] >= 0 and bounds[2] <= 220 + RectanglePacker.Epsilon and bounds[3] <= 220 + RectanglePacker.Epsilon
+        assert not overlaps(bounds, disallowed_area)
+        plates.setdefault(placement.build_plate, []).append(bounds)
+    assert sorted(plates) == list(range(len(plates)))  # No empty build plates in between.
+    for bounds in plates.values():
+        assert not any(overlaps(bounds[i], bounds[j]) for i in range(len(bounds)) for j in range(i))
@@ -0,0 +1,77 @@
+# Copyright (c) 2026 UltiMaker
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import random
+
+import numpy
+
+from cura.Scene.SpatialIndex import SpatialIndex
+
+
+class FakePolygon:
+    def __init__(self, points):
+        self._points = numpy.array(points, numpy.float32)
+
+    def getPoints(self):
+        return self._points
+
+
+def test_query():
+    index = SpatialIndex(10)
+    index.update("a", (0, 0, 5, 5))
+    index.update("b", (20, 20, 25, 25))
+    index.update("c", (5, 0, 30, 2))  # Spans several cells.
+
+    assert index.query((4, 4, 6, 6)) == ["a"]
+    assert index.query((5, 1, 5, 1)) == ["a", "c"]  # Touching counts.
+    assert index.query((100, 100, 110, 110)) == []
+    assert index.query((-1000, -1000, 1000, 1000)) == ["a", "b", "c"]
+
+
+def test_updateAndRemove():
+    index = SpatialIndex(10)
+    index.update("a", (0, 0, 5, 5))
+    index.update("a", (50, 50, 55, 55))  # Moved.
+
+    assert index.query((0, 0, 5, 5)) == []
+    assert index.query((50, 50, 51, 51)) == ["a"]
+    assert index.getBounds("a") == (50, 50, 55, 55)
+
+    index.remove("a")
+    index.remove("a")  # Not in the index any more, so nothing happens.
+    assert len(index) == 0
+    assert "a" not in index
+    assert index.query((50, 50, 51, 51)) == []
+
+
+def test_largeItems():
+    index = SpatialIndex(1)
+    index.update("large", (-1000, -1000, 1000, 1000))
+    index.update("small", (0, 0, 1, 1))
+
+    assert index.query((500, 500, 501, 501)) == ["large"]
+    assert index.query((0, 0, 0, 0)) == ["large", "small"]
+    index.remove("large")
+    assert index.query((500, 500, 501, 501)) == []
+
+
+def test_sameAsComparingAllPairs():
+    rng = random.Random(0)
+    index = SpatialIndex(7)
+    bounds = {}
+    for item in range(200):
+        x, y = rng.uniform(-100, 100), rng.uniform(-100, 100)
+        bounds[item] = (x, y, x + rng.uniform(0, 20), y + rng.uniform(0, 20))
+        index.update(item, bounds[item])
+
+    for min_x, min_y, max_x, max_y in bounds.values():
+        expected = [item for item, (item_min_x, item_min_y, item_max_x, item_max_y) in bounds.items()
+                    if item_min_x <= max_x and min_x <= item_max_x and item_min_y <= max_y and min_y <= item_max_y]
+        assert index.query((min_x, min_y, max_x, max_y)) == expected
+
+
+def test_getPolygonBounds():
+    polygons = [FakePolygon([[0, 0], [10, 5], [3, -2]]), None, FakePolygon([[-4, 1], [2, 8]]), FakePolygon(numpy.zeros((0, 2)))]
+
+    assert SpatialIndex.getPolygonBounds(polygons) == (-4, -2, 10, 8)
+    assert SpatialIndex.getPolygonBounds([None]) is None